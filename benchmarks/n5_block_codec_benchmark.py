@@ -0,0 +1,79 @@
+# pyright: strict
+
+"""Compares decoding N5 block payloads the old way (decompress to bytes, wrap as big endian, convert to native)
+with decode_n5_block_data, which decompresses straight into its output and byteswaps in place.
+
+For each codec this prints the best time out of a few runs and the peak of memory allocated while decoding,
+as a multiple of the size of the decoded block. The ideal is 1.0x: the output array and nothing else.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from webilastik.datasource.n5_attributes import (
+    BloscCompressor, GzipCompressor, Lz4Compressor, N5Compressor, RawCompressor, ZstdCompressor
+)
+from webilastik.datasource.n5_datasource import decode_n5_block_data
+
+
+compressors: Dict[str, Callable[[], N5Compressor]] = {
+    "raw": RawCompressor,
+    "gzip": GzipCompressor,
+    "blosc": BloscCompressor,
+    "zstd": ZstdCompressor,
+    "lz4": Lz4Compressor,
+}
+
+def legacy_decode(payload: bytes, *, num_elements: int, dtype: "np.dtype[Any]", compression: N5Compressor) -> "np.ndarray[Any, Any]":
+    compressed_buffer: "np.ndarray[Any, Any]" = np.frombuffer(payload, dtype=np.uint8)
+    decompressed_buffer = compression.decompress(compressed_buffer.tobytes())
+    big_endian_data: "np.ndarray[Any, Any]" = np.frombuffer(decompressed_buffer, dtype=dtype.newbyteorder(">"), count=num_elements)
+    # consumers (e.g. filters and classifiers) need native data, so they'd do this conversion anyway
+    return big_endian_data.astype(dtype.newbyteorder("="))
+
+def measure(decode: Callable[[], "np.ndarray[Any, Any]"], repetitions: int) -> Tuple[float, int]:
+    timings: List[float] = []
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        _ = decode()
+        timings.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    _ = decode()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (min(timings), peak_bytes)
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    _ = argparser.add_argument("--shape", nargs="+", type=int, default=[64, 256, 256])
+    _ = argparser.add_argument("--dtype", default="uint16")
+    _ = argparser.add_argument("--compressions", nargs="+", choices=list(compressors.keys()), default=list(compressors.keys()))
+    _ = argparser.add_argument("--repetitions", type=int, default=10)
+    args = argparser.parse_args()
+
+    dtype: "np.dtype[Any]" = np.dtype(args.dtype)
+    data: "np.ndarray[Any, Any]" = (np.random.rand(*args.shape) * 200).astype(dtype.newbyteorder(">"))
+    raw_bytes = data.tobytes()
+    print(f"Decoding a {'x'.join(str(s) for s in args.shape)} {dtype} block ({len(raw_bytes) / 1024 ** 2:.1f} MiB)")
+
+    for compression_name in args.compressions:
+        compression = compressors[compression_name]()
+        payload = bytes(compression.compress(raw_bytes, typesize=dtype.itemsize))
+        expected = data.reshape(-1)
+        assert (legacy_decode(payload, num_elements=data.size, dtype=dtype, compression=compression) == expected).all()
+        assert (decode_n5_block_data(payload, num_elements=data.size, dtype=dtype, compression=compression) == expected).all()
+
+        for label, decode in [
+            ("legacy", lambda: legacy_decode(payload, num_elements=data.size, dtype=dtype, compression=compression)),
+            ("direct", lambda: decode_n5_block_data(payload, num_elements=data.size, dtype=dtype, compression=compression)),
+        ]:
+            seconds, peak_bytes = measure(decode, repetitions=args.repetitions)
+            print(
+                f"{compression_name:>6} {label}: {seconds * 1000:8.2f} ms, "
+                f"peak allocations {peak_bytes / len(raw_bytes):.2f}x the block size"
+            )
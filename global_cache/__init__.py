@@ -1,21 +1,68 @@
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
 from typing_extensions import ParamSpec
-import functools
-import os
-import sys
+from functools import wraps
+import time
+
+from webilastik.caching import (
+    ByteBudgetedCache, CacheInfo, CacheMiss, ComputeMany, SingleFlight, get_max_bytes_from_env, make_call_key
+)
 
 P = ParamSpec("P")
 T = TypeVar("T", bound=Callable[..., Any])
 
-ENV_VAR_NAME = "LRU_CACHE_MAX_SIZE"
-DEFAULT_SIZE = 128
-_max_size_env_var = os.environ.get(ENV_VAR_NAME)
-if _max_size_env_var is None:
-    print(f"{ENV_VAR_NAME} was not set, defaulting to {DEFAULT_SIZE}", file=sys.stderr)
-    _maxsize = DEFAULT_SIZE
-else:
-    print(f"Setting lru_cache maxsize to {_max_size_env_var}", file=sys.stderr)
-    _maxsize = int(_max_size_env_var)
+ENV_VAR_NAME = "GLOBAL_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+_cache: "ByteBudgetedCache[Any]" = ByteBudgetedCache(max_bytes=get_max_bytes_from_env(ENV_VAR_NAME, default=DEFAULT_MAX_BYTES))
+_single_flight: "SingleFlight[Any]" = SingleFlight()
 
 def global_cache(func: T) -> T:
-    return functools.lru_cache(maxsize=_maxsize)(func) #type: ignore
\ No newline at end of file
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = make_call_key(func, args, kwargs)
+        value = _cache.get(key)
+        if not isinstance(value, CacheMiss):
+            return value
+
+        def compute() -> Any:
+            # a previous flight for this key might have landed since the lookup above
+            value = _cache.peek(key)
+            if not isinstance(value, CacheMiss):
+                return value
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            _cache.put(key, value, cost=time.perf_counter() - start)
+            return value
+
+        return _single_flight.do(key, compute)
+
+    def call_many(calls: Sequence[Tuple[Any, ...]], compute_many: "ComputeMany[Any] | None" = None) -> List[Any]:
+        """Looks up all calls, then computes all of the misses in a single batch"""
+        keys = [make_call_key(func, args, {}) for args in calls]
+        values: List[Any] = [_cache.get(key) for key in keys]
+        miss_indices = [idx for idx, value in enumerate(values) if isinstance(value, CacheMiss)]
+        compute_calls: "ComputeMany[Any]" = compute_many or (lambda miss_calls: [func(*args) for args in miss_calls])
+
+        def compute(indices: Sequence[int]) -> List[Any]:
+            miss_keys = [keys[miss_indices[idx]] for idx in indices]
+            # previous flights for these keys might have landed since the lookups above
+            computed: List[Any] = [_cache.peek(key) for key in miss_keys]
+            to_compute = [idx for idx, value in enumerate(computed) if isinstance(value, CacheMiss)]
+            if to_compute:
+                start = time.perf_counter()
+                fresh_values = compute_calls([calls[miss_indices[indices[idx]]] for idx in to_compute])
+                cost = (time.perf_counter() - start) / len(to_compute)
+                for idx, value in zip(to_compute, fresh_values):
+                    computed[idx] = value
+                    _cache.put(miss_keys[idx], value, cost=cost)
+            return computed
+
+        for idx, value in zip(miss_indices, _single_flight.do_many([keys[idx] for idx in miss_indices], compute)):
+            values[idx] = value
+        return values
+
+    wrapper.call_many = call_many # pyright: ignore [reportFunctionMemberAccess]
+    return wrapper #type: ignore
+
+def get_cache_info() -> CacheInfo:
+    return _cache.info()
@@ -1,49 +1,65 @@
-from typing import Any, Callable, Tuple, TypeVar
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
 from typing_extensions import ParamSpec
-import pickle
 from functools import wraps
-from pathlib import Path
-import sys
-import os
 
 import redis # pyright: ignore [reportMissingTypeStubs]
 
-from webilastik.utility import get_env_var_or_exit
+from webilastik.caching import CacheMiss, ComputeMany, SingleFlight
+from webilastik.caching.redis_backend import RedisBackend, make_redis_key
 
 P = ParamSpec("P")
 T = TypeVar("T", bound=Callable[..., Any])
 
-def parse_ip_port(value: str) -> Tuple[str, int]:
-    ip_str, port = value.split(":")
-    return ip_str, int(port)
-
-REDIS_HOST_PORT = os.environ.get("REDIS_HOST_PORT")
-if REDIS_HOST_PORT is not None:
-    redis_host, port_str = REDIS_HOST_PORT.split(":")
-    redis_factory = lambda: redis.Redis(host=redis_host, port=int(port_str))
-else:
-    REDIS_UNIX_SOCKET_PATH = get_env_var_or_exit(var_name="REDIS_UNIX_SOCKET_PATH", parser=Path)
-    if not REDIS_UNIX_SOCKET_PATH.exists():
-        print(f"Redis socket path {REDIS_UNIX_SOCKET_PATH} does not exist", file=sys.stderr)
-        exit(1)
-    if not REDIS_UNIX_SOCKET_PATH.is_socket():
-        print(f"Redis socket path {REDIS_UNIX_SOCKET_PATH} is not a socket", file=sys.stderr)
-        exit(1)
-    redis_factory = lambda: redis.Redis(unix_socket_path=str(REDIS_UNIX_SOCKET_PATH))
-
-def _redis_cache(func: T) -> T: #FIXME: use Callabe[P, OUT] ?
+_backend = RedisBackend.from_env()
+# duplicate calls are coalesced within this process first, so that only one thread per process polls redis for a value
+_single_flight: "SingleFlight[Any]" = SingleFlight()
+
+def get_redis_client() -> redis.Redis:
+    return _backend.get_client()
+
+def _redis_cache(func: T, ttl: int) -> T: #FIXME: use Callabe[P, OUT] ?
     @wraps(func)
-    def wrapper(*args, **kwargs):
-        r = redis_factory()
-        key_tuple = (func.__qualname__, tuple(args), sorted(kwargs.items(), key=lambda x: x[0]))
-        key  = pickle.dumps(key_tuple)
-        raw_value = r.get(key)
-        if raw_value is not None:
-            value = pickle.loads(raw_value) # pyright: ignore [reportArgumentType]
-        else:
-            value = func(*args, **kwargs)
-            _ = r.set(key, pickle.dumps(value))
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = make_redis_key(func, args, kwargs)
+        value = _backend.get(key)
+        if isinstance(value, CacheMiss):
+            value = _single_flight.do(key, lambda: _backend.compute_once(key, lambda: func(*args, **kwargs), ttl=ttl))
         return value
+
+    def call_many(calls: Sequence[Tuple[Any, ...]], compute_many: "ComputeMany[Any] | None" = None) -> List[Any]:
+        """Looks up all calls in a single round trip, then computes the misses in one batch and stores them in
+        another round trip.
+
+        Misses that are already being computed elsewhere are waited for like in a regular call
+        """
+        keys = [make_redis_key(func, args, {}) for args in calls]
+        values = _backend.get_many(keys)
+        miss_indices = [idx for idx, value in enumerate(values) if isinstance(value, CacheMiss)]
+        compute_calls: "ComputeMany[Any]" = compute_many or (lambda miss_calls: [func(*args) for args in miss_calls])
+
+        def compute(indices: Sequence[int]) -> List[Any]:
+            flight_indices = [miss_indices[idx] for idx in indices]
+            computed = _backend.compute_many(
+                [keys[idx] for idx in flight_indices],
+                lambda computed_indices: compute_calls([calls[flight_indices[idx]] for idx in computed_indices]),
+                ttl=ttl,
+            )
+            for computed_idx, (idx, value) in enumerate(zip(flight_indices, computed)):
+                if isinstance(value, CacheMiss):
+                    args = calls[idx]
+                    computed[computed_idx] = _backend.compute_once(keys[idx], lambda: compute_calls([args])[0], ttl=ttl)
+            return computed
+
+        for idx, value in zip(miss_indices, _single_flight.do_many([keys[idx] for idx in miss_indices], compute)):
+            values[idx] = value
+        return values
+
+    wrapper.call_many = call_many # pyright: ignore [reportFunctionMemberAccess]
     return wrapper #type: ignore
 
-global_cache = _redis_cache
+def redis_cache(*, ttl: int) -> Callable[[T], T]:
+    """A global_cache variant whose entries expire after 'ttl' seconds (or never, if 'ttl' is 0)"""
+    return lambda func: _redis_cache(func, ttl=ttl)
+
+def global_cache(func: T) -> T:
+    return _redis_cache(func, ttl=_backend.ttl)
@@ -0,0 +1,143 @@
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
+from typing_extensions import ParamSpec
+from functools import wraps
+from contextlib import ExitStack
+from pathlib import Path
+import atexit
+import os
+import pickle
+import threading
+
+from webilastik.caching import CacheInfo, CacheMiss, ComputeMany, SingleFlight, get_max_bytes_from_env, make_call_key
+from webilastik.caching.array_codec import decode_value, encode_value
+from webilastik.caching.shm_arena import SharedMemoryArena
+
+P = ParamSpec("P")
+T = TypeVar("T", bound=Callable[..., Any])
+
+# The first process to import this module creates the arena and advertises it via environment variables, which
+# are inherited by the worker processes it spawns (e.g. the ones in executor_getter), so that they attach to it.
+# Values are copied out of the shared memory on every hit, so that they stay valid no matter how soon the arena
+# wraps around and overwrites them.
+
+SHM_NAME_ENV_VAR = "GLOBAL_CACHE_SHM_NAME"
+SHM_LOCK_PATH_ENV_VAR = "GLOBAL_CACHE_SHM_LOCK_PATH"
+SHM_BYTES_ENV_VAR = "GLOBAL_CACHE_SHM_BYTES"
+DEFAULT_SHM_BYTES = 1024 ** 3
+# how long to wait for another process that is computing the same value before computing it anyway
+COMPUTE_LEASE_TIMEOUT_SECONDS = 60.0
+
+_shm_name = os.environ.get(SHM_NAME_ENV_VAR)
+_shm_lock_path = os.environ.get(SHM_LOCK_PATH_ENV_VAR)
+if _shm_name is not None and _shm_lock_path is not None:
+    _arena = SharedMemoryArena.attach(name=_shm_name, lock_path=Path(_shm_lock_path))
+else:
+    _arena = SharedMemoryArena.create(data_size=get_max_bytes_from_env(SHM_BYTES_ENV_VAR, default=DEFAULT_SHM_BYTES))
+    os.environ[SHM_NAME_ENV_VAR] = _arena.shm.name
+    os.environ[SHM_LOCK_PATH_ENV_VAR] = str(_arena.lock_path)
+
+def _close_arena() -> None:
+    try:
+        _arena.close()
+    except BufferError:
+        # views into the arena are still alive. The owner must still unlink the segment
+        if _arena.is_owner:
+            _arena.shm.unlink()
+            _arena.lock_path.unlink(missing_ok=True)
+
+_ = atexit.register(_close_arena)
+
+_single_flight: "SingleFlight[Any]" = SingleFlight()
+
+_stats_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+def _count_lookup(*, hit: bool) -> None:
+    global _hits, _misses
+    with _stats_lock:
+        if hit:
+            _hits += 1
+        else:
+            _misses += 1
+
+def _compute(key: bytes, compute: Callable[[], Any]) -> Any:
+    with _arena.compute_lease(key, timeout=COMPUTE_LEASE_TIMEOUT_SECONDS):
+        # whoever held the lease before might have just cached this value
+        raw_value = _arena.get(key)
+        if not isinstance(raw_value, CacheMiss):
+            return decode_value(raw_value)
+        value = compute()
+        _ = _arena.put(key, encode_value(value))
+        return value
+
+def global_cache(func: T) -> T:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = pickle.dumps(make_call_key(func, args, kwargs))
+        raw_value = _arena.get(key)
+        _count_lookup(hit=not isinstance(raw_value, CacheMiss))
+        if not isinstance(raw_value, CacheMiss):
+            return decode_value(raw_value)
+        return _single_flight.do(key, lambda: _compute(key, lambda: func(*args, **kwargs)))
+
+    def call_many(calls: Sequence[Tuple[Any, ...]], compute_many: "ComputeMany[Any] | None" = None) -> List[Any]:
+        """Looks up all calls, then computes the misses that no other process is computing in a single batch"""
+        keys = [pickle.dumps(make_call_key(func, args, {})) for args in calls]
+        values: List[Any] = []
+        miss_indices: List[int] = []
+        for idx, key in enumerate(keys):
+            raw_value = _arena.get(key)
+            _count_lookup(hit=not isinstance(raw_value, CacheMiss))
+            if isinstance(raw_value, CacheMiss):
+                miss_indices.append(idx)
+                values.append(raw_value)
+            else:
+                values.append(decode_value(raw_value))
+        compute_calls: "ComputeMany[Any]" = compute_many or (lambda miss_calls: [func(*args) for args in miss_calls])
+
+        def compute(indices: Sequence[int]) -> List[Any]:
+            flight_keys = [keys[miss_indices[idx]] for idx in indices]
+            flight_calls = [calls[miss_indices[idx]] for idx in indices]
+            computed: List[Any] = [CacheMiss() for _ in indices]
+            with ExitStack() as leases:
+                # leases are only taken if they're free, so that overlapping batches can't deadlock each other
+                leased = [
+                    flight_idx for flight_idx, key in enumerate(flight_keys)
+                    if leases.enter_context(_arena.compute_lease(key, timeout=0))
+                ]
+                to_compute: List[int] = []
+                for flight_idx in leased:
+                    raw_value = _arena.get(flight_keys[flight_idx])
+                    if isinstance(raw_value, CacheMiss):
+                        to_compute.append(flight_idx)
+                    else:
+                        computed[flight_idx] = decode_value(raw_value)
+                if to_compute:
+                    for flight_idx, value in zip(to_compute, compute_calls([flight_calls[idx] for idx in to_compute])):
+                        _ = _arena.put(flight_keys[flight_idx], encode_value(value))
+                        computed[flight_idx] = value
+            # the rest are being computed by other processes, and are waited for like in a regular call
+            for flight_idx, value in enumerate(computed):
+                if isinstance(value, CacheMiss):
+                    args = flight_calls[flight_idx]
+                    computed[flight_idx] = _compute(flight_keys[flight_idx], lambda: compute_calls([args])[0])
+            return computed
+
+        for idx, value in zip(miss_indices, _single_flight.do_many([keys[idx] for idx in miss_indices], compute)):
+            values[idx] = value
+        return values
+
+    wrapper.call_many = call_many # pyright: ignore [reportFunctionMemberAccess]
+    return wrapper #type: ignore
+
+def get_cache_info() -> CacheInfo:
+    with _stats_lock:
+        return CacheInfo(
+            hits=_hits,
+            misses=_misses,
+            evictions=0, # entries are overwritten by newer ones as the arena wraps around; they're not tracked
+            num_entries=_arena.count_entries(),
+            current_bytes=_arena.get_used_bytes(),
+            max_bytes=_arena.data_size,
+        )
@@ -0,0 +1,114 @@
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
+from typing_extensions import ParamSpec
+from functools import wraps
+import threading
+import time
+
+from webilastik.caching import (
+    ByteBudgetedCache, CacheMiss, ComputeMany, SingleFlight, TieredCacheInfo, get_max_bytes_from_env
+)
+from webilastik.caching.redis_backend import RedisBackend, make_redis_key
+
+P = ParamSpec("P")
+T = TypeVar("T", bound=Callable[..., Any])
+
+# A small per-process cache (L1) in front of the redis server shared by all processes of the session (L2).
+# L2 hits are promoted into L1 and freshly computed values are written through to both tiers.
+
+L1_ENV_VAR_NAME = "GLOBAL_CACHE_L1_MAX_BYTES"
+DEFAULT_L1_MAX_BYTES = 256 * 1024 ** 2
+
+_l1: "ByteBudgetedCache[Any]" = ByteBudgetedCache(max_bytes=get_max_bytes_from_env(L1_ENV_VAR_NAME, default=DEFAULT_L1_MAX_BYTES))
+_l2 = RedisBackend.from_env()
+_single_flight: "SingleFlight[Any]" = SingleFlight()
+
+_stats_lock = threading.Lock()
+_l2_hits = 0
+_l2_misses = 0
+
+def _count_l2_lookups(*, hits: int, misses: int) -> None:
+    global _l2_hits, _l2_misses
+    with _stats_lock:
+        _l2_hits += hits
+        _l2_misses += misses
+
+def _compute(key: bytes, compute: Callable[[], Any]) -> Any:
+    # a previous flight for this key might have landed in L1 since this thread looked it up
+    value = _l1.peek(key)
+    if not isinstance(value, CacheMiss):
+        return value
+    start = time.perf_counter()
+    # only one process computes the value; the others wait for it to show up in L2
+    value = _l2.compute_once(key, compute)
+    _l1.put(key, value, cost=time.perf_counter() - start)
+    return value
+
+def global_cache(func: T) -> T:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = make_redis_key(func, args, kwargs)
+        value = _l1.get(key)
+        if not isinstance(value, CacheMiss):
+            return value
+
+        start = time.perf_counter()
+        value = _l2.get(key)
+        if not isinstance(value, CacheMiss):
+            _count_l2_lookups(hits=1, misses=0)
+            # if evicted from L1, this value costs another trip to L2 rather than a recomputation
+            _l1.put(key, value, cost=time.perf_counter() - start)
+            return value
+        _count_l2_lookups(hits=0, misses=1)
+
+        return _single_flight.do(key, lambda: _compute(key, lambda: func(*args, **kwargs)))
+
+    def call_many(calls: Sequence[Tuple[Any, ...]], compute_many: "ComputeMany[Any] | None" = None) -> List[Any]:
+        keys = [make_redis_key(func, args, {}) for args in calls]
+        values: List[Any] = [_l1.get(key) for key in keys]
+        l1_miss_indices = [idx for idx, value in enumerate(values) if isinstance(value, CacheMiss)]
+
+        start = time.perf_counter()
+        l2_values = _l2.get_many([keys[idx] for idx in l1_miss_indices])
+        l2_fetch_cost = (time.perf_counter() - start) / max(len(l1_miss_indices), 1)
+
+        l2_miss_indices: List[int] = []
+        for idx, l2_value in zip(l1_miss_indices, l2_values):
+            if isinstance(l2_value, CacheMiss):
+                l2_miss_indices.append(idx)
+            else:
+                values[idx] = l2_value
+                _l1.put(keys[idx], l2_value, cost=l2_fetch_cost)
+        _count_l2_lookups(hits=len(l1_miss_indices) - len(l2_miss_indices), misses=len(l2_miss_indices))
+        compute_calls: "ComputeMany[Any]" = compute_many or (lambda miss_calls: [func(*args) for args in miss_calls])
+
+        def compute(indices: Sequence[int]) -> List[Any]:
+            flight_indices = [l2_miss_indices[idx] for idx in indices]
+            # previous flights for these keys might have landed in L1 since this thread looked them up
+            computed: List[Any] = [_l1.peek(keys[idx]) for idx in flight_indices]
+            to_compute = [flight_idx for flight_idx, value in enumerate(computed) if isinstance(value, CacheMiss)]
+            start = time.perf_counter()
+            # only one process computes each value; the others wait for it to show up in L2
+            l2_computed = _l2.compute_many(
+                [keys[flight_indices[flight_idx]] for flight_idx in to_compute],
+                lambda computed_indices: compute_calls([calls[flight_indices[to_compute[idx]]] for idx in computed_indices]),
+            )
+            cost = (time.perf_counter() - start) / max(len(to_compute), 1)
+            for flight_idx, value in zip(to_compute, l2_computed):
+                key, args = keys[flight_indices[flight_idx]], calls[flight_indices[flight_idx]]
+                if isinstance(value, CacheMiss):
+                    value = _compute(key, lambda: compute_calls([args])[0])
+                else:
+                    _l1.put(key, value, cost=cost)
+                computed[flight_idx] = value
+            return computed
+
+        for idx, value in zip(l2_miss_indices, _single_flight.do_many([keys[idx] for idx in l2_miss_indices], compute)):
+            values[idx] = value
+        return values
+
+    wrapper.call_many = call_many # pyright: ignore [reportFunctionMemberAccess]
+    return wrapper #type: ignore
+
+def get_cache_info() -> TieredCacheInfo:
+    with _stats_lock:
+        return TieredCacheInfo(l1=_l1.info(), l2_hits=_l2_hits, l2_misses=_l2_misses)
@@ -148,9 +148,9 @@ export class LabelHeaderDto {
   }
 }
 
-export function parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_(
+export function parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_(
   value: JsonValue,
-): "precomputed" | "n5" | "deepzoom" | MessageParsingError {
+): "precomputed" | "n5" | "deepzoom" | "zarr" | MessageParsingError {
   const tmp_0 = parse_as_str(value);
   if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "precomputed") {
     return tmp_0;
@@ -163,17 +163,22 @@ export function parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_
   if (!(tmp_2 instanceof MessageParsingError) && tmp_2 === "deepzoom") {
     return tmp_2;
   }
-  return new MessageParsingError(`Could not parse ${value} as 'precomputed' | 'n5' | 'deepzoom'`);
+  const tmp_3 = parse_as_str(value);
+  if (!(tmp_3 instanceof MessageParsingError) && tmp_3 === "zarr") {
+    return tmp_3;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'precomputed' | 'n5' | 'deepzoom' | 'zarr'`);
 }
 export function parse_as_None(value: JsonValue): undefined | MessageParsingError {
   return ensureJsonUndefined(value);
 }
-export function parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_0None_endof_(
+export function parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_0None_endof_(
   value: JsonValue,
-): "precomputed" | "n5" | "deepzoom" | undefined | MessageParsingError {
-  const parsed_option_0 = parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_(
-    value,
-  );
+): "precomputed" | "n5" | "deepzoom" | "zarr" | undefined | MessageParsingError {
+  const parsed_option_0 =
+    parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_(
+      value,
+    );
   if (!(parsed_option_0 instanceof MessageParsingError)) {
     return parsed_option_0;
   }
@@ -182,7 +187,7 @@ export function parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5
     return parsed_option_1;
   }
   return new MessageParsingError(
-    `Could not parse ${JSON.stringify(value)} into 'precomputed' | 'n5' | 'deepzoom' | undefined`,
+    `Could not parse ${JSON.stringify(value)} into 'precomputed' | 'n5' | 'deepzoom' | 'zarr' | undefined`,
   );
 }
 export function parse_as_Literal_of__quote_http_quote_0_quote_https_quote_0_quote_file_quote_0_quote_memory_quote__endof_(
@@ -270,7 +275,7 @@ export function parse_as_UrlDto(value: JsonValue): UrlDto | MessageParsingError
     return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a UrlDto`);
   }
   const temp_datascheme =
-    parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_0None_endof_(
+    parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_0None_endof_(
       valueObject.datascheme,
     );
   if (temp_datascheme instanceof MessageParsingError) return temp_datascheme;
@@ -302,7 +307,7 @@ export function parse_as_UrlDto(value: JsonValue): UrlDto | MessageParsingError
 // Automatically generated via DataTransferObject for UrlDto
 // Do not edit!
 export class UrlDto {
-  public datascheme: "precomputed" | "n5" | "deepzoom" | undefined;
+  public datascheme: "precomputed" | "n5" | "deepzoom" | "zarr" | undefined;
   public protocol: "http" | "https" | "file" | "memory";
   public hostname: string;
   public port: number | undefined;
@@ -310,7 +315,7 @@ export class UrlDto {
   public search: { [key: string]: string } | undefined;
   public fragment: string | undefined;
   constructor(_params: {
-    datascheme: "precomputed" | "n5" | "deepzoom" | undefined;
+    datascheme: "precomputed" | "n5" | "deepzoom" | "zarr" | undefined;
     protocol: "http" | "https" | "file" | "memory";
     hostname: string;
     port: number | undefined;
@@ -700,6 +705,109 @@ export class ZipFsDto {
   }
 }
 
+export function parse_as_Literal_of__quote_identity_quote_0_quote_murmurhash3_x86_128_quote__endof_(
+  value: JsonValue,
+): "identity" | "murmurhash3_x86_128" | MessageParsingError {
+  const tmp_0 = parse_as_str(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "identity") {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_str(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "murmurhash3_x86_128") {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'identity' | 'murmurhash3_x86_128'`);
+}
+export function parse_as_Literal_of__quote_raw_quote_0_quote_gzip_quote__endof_(
+  value: JsonValue,
+): "raw" | "gzip" | MessageParsingError {
+  const tmp_0 = parse_as_str(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "raw") {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_str(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "gzip") {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'raw' | 'gzip'`);
+}
+export function parse_as_PrecomputedChunksShardingDto(
+  value: JsonValue,
+): PrecomputedChunksShardingDto | MessageParsingError {
+  const valueObject = ensureJsonObject(value);
+  if (valueObject instanceof MessageParsingError) {
+    return valueObject;
+  }
+  if (valueObject["__class__"] != "PrecomputedChunksShardingDto") {
+    return new MessageParsingError(
+      `Could not deserialize ${JSON.stringify(valueObject)} as a PrecomputedChunksShardingDto`,
+    );
+  }
+  const temp_preshift_bits = parse_as_int(valueObject.preshift_bits);
+  if (temp_preshift_bits instanceof MessageParsingError) return temp_preshift_bits;
+  const temp_hash = parse_as_Literal_of__quote_identity_quote_0_quote_murmurhash3_x86_128_quote__endof_(
+    valueObject.hash,
+  );
+  if (temp_hash instanceof MessageParsingError) return temp_hash;
+  const temp_minishard_bits = parse_as_int(valueObject.minishard_bits);
+  if (temp_minishard_bits instanceof MessageParsingError) return temp_minishard_bits;
+  const temp_shard_bits = parse_as_int(valueObject.shard_bits);
+  if (temp_shard_bits instanceof MessageParsingError) return temp_shard_bits;
+  const temp_minishard_index_encoding = parse_as_Literal_of__quote_raw_quote_0_quote_gzip_quote__endof_(
+    valueObject.minishard_index_encoding,
+  );
+  if (temp_minishard_index_encoding instanceof MessageParsingError) return temp_minishard_index_encoding;
+  const temp_data_encoding = parse_as_Literal_of__quote_raw_quote_0_quote_gzip_quote__endof_(valueObject.data_encoding);
+  if (temp_data_encoding instanceof MessageParsingError) return temp_data_encoding;
+  return new PrecomputedChunksShardingDto({
+    preshift_bits: temp_preshift_bits,
+    hash: temp_hash,
+    minishard_bits: temp_minishard_bits,
+    shard_bits: temp_shard_bits,
+    minishard_index_encoding: temp_minishard_index_encoding,
+    data_encoding: temp_data_encoding,
+  });
+}
+// Automatically generated via DataTransferObject for PrecomputedChunksShardingDto
+// Do not edit!
+export class PrecomputedChunksShardingDto {
+  public preshift_bits: number;
+  public hash: "identity" | "murmurhash3_x86_128";
+  public minishard_bits: number;
+  public shard_bits: number;
+  public minishard_index_encoding: "raw" | "gzip";
+  public data_encoding: "raw" | "gzip";
+  constructor(_params: {
+    preshift_bits: number;
+    hash: "identity" | "murmurhash3_x86_128";
+    minishard_bits: number;
+    shard_bits: number;
+    minishard_index_encoding: "raw" | "gzip";
+    data_encoding: "raw" | "gzip";
+  }) {
+    this.preshift_bits = _params.preshift_bits;
+    this.hash = _params.hash;
+    this.minishard_bits = _params.minishard_bits;
+    this.shard_bits = _params.shard_bits;
+    this.minishard_index_encoding = _params.minishard_index_encoding;
+    this.data_encoding = _params.data_encoding;
+  }
+  public toJsonValue(): JsonObject {
+    return {
+      "__class__": "PrecomputedChunksShardingDto",
+      preshift_bits: this.preshift_bits,
+      hash: this.hash,
+      minishard_bits: this.minishard_bits,
+      shard_bits: this.shard_bits,
+      minishard_index_encoding: this.minishard_index_encoding,
+      data_encoding: this.data_encoding,
+    };
+  }
+  public static fromJsonValue(value: JsonValue): PrecomputedChunksShardingDto | MessageParsingError {
+    return parse_as_PrecomputedChunksShardingDto(value);
+  }
+}
+
 export function parse_as_Union_of_OsfsDto0HttpFsDto0BucketFSDto0ZipFsDto_endof_(
   value: JsonValue,
 ): OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto | MessageParsingError {
@@ -765,9 +873,9 @@ export function parse_as_Literal_of__quote_uint8_quote_0_quote_uint16_quote_0_qu
     `Could not parse ${value} as 'uint8' | 'uint16' | 'uint32' | 'uint64' | 'int64' | 'float32'`,
   );
 }
-export function parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(
+export function parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote_0_quote_png_quote_0_quote_compressed_segmentation_quote__endof_(
   value: JsonValue,
-): "raw" | "jpeg" | MessageParsingError {
+): "raw" | "jpeg" | "png" | "compressed_segmentation" | MessageParsingError {
   const tmp_0 = parse_as_str(value);
   if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "raw") {
     return tmp_0;
@@ -776,7 +884,43 @@ export function parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(
   if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "jpeg") {
     return tmp_1;
   }
-  return new MessageParsingError(`Could not parse ${value} as 'raw' | 'jpeg'`);
+  const tmp_2 = parse_as_str(value);
+  if (!(tmp_2 instanceof MessageParsingError) && tmp_2 === "png") {
+    return tmp_2;
+  }
+  const tmp_3 = parse_as_str(value);
+  if (!(tmp_3 instanceof MessageParsingError) && tmp_3 === "compressed_segmentation") {
+    return tmp_3;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'raw' | 'jpeg' | 'png' | 'compressed_segmentation'`);
+}
+export function parse_as_Union_of_PrecomputedChunksShardingDto0None_endof_(
+  value: JsonValue,
+): PrecomputedChunksShardingDto | undefined | MessageParsingError {
+  const parsed_option_0 = parse_as_PrecomputedChunksShardingDto(value);
+  if (!(parsed_option_0 instanceof MessageParsingError)) {
+    return parsed_option_0;
+  }
+  const parsed_option_1 = parse_as_None(value);
+  if (!(parsed_option_1 instanceof MessageParsingError)) {
+    return parsed_option_1;
+  }
+  return new MessageParsingError(
+    `Could not parse ${JSON.stringify(value)} into PrecomputedChunksShardingDto | undefined`,
+  );
+}
+export function parse_as_Union_of_Tuple_of_int0int0int_endof_0None_endof_(
+  value: JsonValue,
+): [number, number, number] | undefined | MessageParsingError {
+  const parsed_option_0 = parse_as_Tuple_of_int0int0int_endof_(value);
+  if (!(parsed_option_0 instanceof MessageParsingError)) {
+    return parsed_option_0;
+  }
+  const parsed_option_1 = parse_as_None(value);
+  if (!(parsed_option_1 instanceof MessageParsingError)) {
+    return parsed_option_1;
+  }
+  return new MessageParsingError(`Could not parse ${JSON.stringify(value)} into [number,number,number] | undefined`);
 }
 export function parse_as_PrecomputedChunksDataSourceDto(
   value: JsonValue,
@@ -809,8 +953,19 @@ export function parse_as_PrecomputedChunksDataSourceDto(
       valueObject.dtype,
     );
   if (temp_dtype instanceof MessageParsingError) return temp_dtype;
-  const temp_encoder = parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(valueObject.encoder);
+  const temp_encoder =
+    parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote_0_quote_png_quote_0_quote_compressed_segmentation_quote__endof_(
+      valueObject.encoder,
+    );
   if (temp_encoder instanceof MessageParsingError) return temp_encoder;
+  const temp_sharding = parse_as_Union_of_PrecomputedChunksShardingDto0None_endof_(valueObject.sharding);
+  if (temp_sharding instanceof MessageParsingError) return temp_sharding;
+  const temp_compressed_segmentation_block_size = parse_as_Union_of_Tuple_of_int0int0int_endof_0None_endof_(
+    valueObject.compressed_segmentation_block_size,
+  );
+  if (temp_compressed_segmentation_block_size instanceof MessageParsingError) {
+    return temp_compressed_segmentation_block_size;
+  }
   return new PrecomputedChunksDataSourceDto({
     url: temp_url,
     filesystem: temp_filesystem,
@@ -821,6 +976,8 @@ export function parse_as_PrecomputedChunksDataSourceDto(
     spatial_resolution: temp_spatial_resolution,
     dtype: temp_dtype,
     encoder: temp_encoder,
+    sharding: temp_sharding,
+    compressed_segmentation_block_size: temp_compressed_segmentation_block_size,
   });
 }
 // Automatically generated via DataTransferObject for PrecomputedChunksDataSourceDto
@@ -834,7 +991,9 @@ export class PrecomputedChunksDataSourceDto {
   public tile_shape: Shape5DDto;
   public spatial_resolution: [number, number, number];
   public dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-  public encoder: "raw" | "jpeg";
+  public encoder: "raw" | "jpeg" | "png" | "compressed_segmentation";
+  public sharding: PrecomputedChunksShardingDto | undefined;
+  public compressed_segmentation_block_size: [number, number, number] | undefined;
   constructor(_params: {
     url: UrlDto;
     filesystem: OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto;
@@ -844,7 +1003,9 @@ export class PrecomputedChunksDataSourceDto {
     tile_shape: Shape5DDto;
     spatial_resolution: [number, number, number];
     dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-    encoder: "raw" | "jpeg";
+    encoder: "raw" | "jpeg" | "png" | "compressed_segmentation";
+    sharding: PrecomputedChunksShardingDto | undefined;
+    compressed_segmentation_block_size: [number, number, number] | undefined;
   }) {
     this.url = _params.url;
     this.filesystem = _params.filesystem;
@@ -855,6 +1016,8 @@ export class PrecomputedChunksDataSourceDto {
     this.spatial_resolution = _params.spatial_resolution;
     this.dtype = _params.dtype;
     this.encoder = _params.encoder;
+    this.sharding = _params.sharding;
+    this.compressed_segmentation_block_size = _params.compressed_segmentation_block_size;
   }
   public toJsonValue(): JsonObject {
     return {
@@ -868,6 +1031,8 @@ export class PrecomputedChunksDataSourceDto {
       spatial_resolution: [this.spatial_resolution[0], this.spatial_resolution[1], this.spatial_resolution[2]],
       dtype: this.dtype,
       encoder: this.encoder,
+      sharding: toJsonValue(this.sharding),
+      compressed_segmentation_block_size: toJsonValue(this.compressed_segmentation_block_size),
     };
   }
   public static fromJsonValue(value: JsonValue): PrecomputedChunksDataSourceDto | MessageParsingError {
@@ -1227,6 +1392,129 @@ export class N5XzCompressorDto {
   }
 }
 
+export function parse_as_N5BloscCompressorDto(value: JsonValue): N5BloscCompressorDto | MessageParsingError {
+  const valueObject = ensureJsonObject(value);
+  if (valueObject instanceof MessageParsingError) {
+    return valueObject;
+  }
+  if (valueObject["type"] != "blosc") {
+    return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a N5BloscCompressorDto`);
+  }
+  const temp_cname = parse_as_str(valueObject.cname);
+  if (temp_cname instanceof MessageParsingError) return temp_cname;
+  const temp_clevel = parse_as_int(valueObject.clevel);
+  if (temp_clevel instanceof MessageParsingError) return temp_clevel;
+  const temp_shuffle = parse_as_int(valueObject.shuffle);
+  if (temp_shuffle instanceof MessageParsingError) return temp_shuffle;
+  const temp_blocksize = parse_as_int(valueObject.blocksize);
+  if (temp_blocksize instanceof MessageParsingError) return temp_blocksize;
+  return new N5BloscCompressorDto({
+    cname: temp_cname,
+    clevel: temp_clevel,
+    shuffle: temp_shuffle,
+    blocksize: temp_blocksize,
+  });
+}
+// Automatically generated via DataTransferObject for N5BloscCompressorDto
+// Do not edit!
+export class N5BloscCompressorDto {
+  public cname: string;
+  public clevel: number;
+  public shuffle: number;
+  public blocksize: number;
+  constructor(_params: {
+    cname: string;
+    clevel: number;
+    shuffle: number;
+    blocksize: number;
+  }) {
+    this.cname = _params.cname;
+    this.clevel = _params.clevel;
+    this.shuffle = _params.shuffle;
+    this.blocksize = _params.blocksize;
+  }
+  public toJsonValue(): JsonObject {
+    return {
+      "type": "blosc",
+      cname: this.cname,
+      clevel: this.clevel,
+      shuffle: this.shuffle,
+      blocksize: this.blocksize,
+    };
+  }
+  public static fromJsonValue(value: JsonValue): N5BloscCompressorDto | MessageParsingError {
+    return parse_as_N5BloscCompressorDto(value);
+  }
+}
+
+export function parse_as_N5ZstdCompressorDto(value: JsonValue): N5ZstdCompressorDto | MessageParsingError {
+  const valueObject = ensureJsonObject(value);
+  if (valueObject instanceof MessageParsingError) {
+    return valueObject;
+  }
+  if (valueObject["type"] != "zstd") {
+    return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a N5ZstdCompressorDto`);
+  }
+  const temp_level = parse_as_int(valueObject.level);
+  if (temp_level instanceof MessageParsingError) return temp_level;
+  return new N5ZstdCompressorDto({
+    level: temp_level,
+  });
+}
+// Automatically generated via DataTransferObject for N5ZstdCompressorDto
+// Do not edit!
+export class N5ZstdCompressorDto {
+  public level: number;
+  constructor(_params: {
+    level: number;
+  }) {
+    this.level = _params.level;
+  }
+  public toJsonValue(): JsonObject {
+    return {
+      "type": "zstd",
+      level: this.level,
+    };
+  }
+  public static fromJsonValue(value: JsonValue): N5ZstdCompressorDto | MessageParsingError {
+    return parse_as_N5ZstdCompressorDto(value);
+  }
+}
+
+export function parse_as_N5Lz4CompressorDto(value: JsonValue): N5Lz4CompressorDto | MessageParsingError {
+  const valueObject = ensureJsonObject(value);
+  if (valueObject instanceof MessageParsingError) {
+    return valueObject;
+  }
+  if (valueObject["type"] != "lz4") {
+    return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a N5Lz4CompressorDto`);
+  }
+  const temp_blockSize = parse_as_int(valueObject.blockSize);
+  if (temp_blockSize instanceof MessageParsingError) return temp_blockSize;
+  return new N5Lz4CompressorDto({
+    blockSize: temp_blockSize,
+  });
+}
+// Automatically generated via DataTransferObject for N5Lz4CompressorDto
+// Do not edit!
+export class N5Lz4CompressorDto {
+  public blockSize: number;
+  constructor(_params: {
+    blockSize: number;
+  }) {
+    this.blockSize = _params.blockSize;
+  }
+  public toJsonValue(): JsonObject {
+    return {
+      "type": "lz4",
+      blockSize: this.blockSize,
+    };
+  }
+  public static fromJsonValue(value: JsonValue): N5Lz4CompressorDto | MessageParsingError {
+    return parse_as_N5Lz4CompressorDto(value);
+  }
+}
+
 export function parse_as_N5RawCompressorDto(value: JsonValue): N5RawCompressorDto | MessageParsingError {
   const valueObject = ensureJsonObject(value);
   if (valueObject instanceof MessageParsingError) {
@@ -1287,9 +1575,17 @@ export function parse_as_Union_of_Tuple_of_str0_varlen__endof_0None_endof_(
   }
   return new MessageParsingError(`Could not parse ${JSON.stringify(value)} into Array<string> | undefined`);
 }
-export function parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+export function parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
   value: JsonValue,
-): N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto | MessageParsingError {
+):
+  | N5GzipCompressorDto
+  | N5Bzip2CompressorDto
+  | N5XzCompressorDto
+  | N5BloscCompressorDto
+  | N5ZstdCompressorDto
+  | N5Lz4CompressorDto
+  | N5RawCompressorDto
+  | MessageParsingError {
   const parsed_option_0 = parse_as_N5GzipCompressorDto(value);
   if (!(parsed_option_0 instanceof MessageParsingError)) {
     return parsed_option_0;
@@ -1302,14 +1598,26 @@ export function parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzC
   if (!(parsed_option_2 instanceof MessageParsingError)) {
     return parsed_option_2;
   }
-  const parsed_option_3 = parse_as_N5RawCompressorDto(value);
+  const parsed_option_3 = parse_as_N5BloscCompressorDto(value);
   if (!(parsed_option_3 instanceof MessageParsingError)) {
     return parsed_option_3;
   }
+  const parsed_option_4 = parse_as_N5ZstdCompressorDto(value);
+  if (!(parsed_option_4 instanceof MessageParsingError)) {
+    return parsed_option_4;
+  }
+  const parsed_option_5 = parse_as_N5Lz4CompressorDto(value);
+  if (!(parsed_option_5 instanceof MessageParsingError)) {
+    return parsed_option_5;
+  }
+  const parsed_option_6 = parse_as_N5RawCompressorDto(value);
+  if (!(parsed_option_6 instanceof MessageParsingError)) {
+    return parsed_option_6;
+  }
   return new MessageParsingError(
     `Could not parse ${
       JSON.stringify(value)
-    } into N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto`,
+    } into N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5BloscCompressorDto | N5ZstdCompressorDto | N5Lz4CompressorDto | N5RawCompressorDto`,
   );
 }
 export function parse_as_N5DatasetAttributesDto(value: JsonValue): N5DatasetAttributesDto | MessageParsingError {
@@ -1329,7 +1637,7 @@ export function parse_as_N5DatasetAttributesDto(value: JsonValue): N5DatasetAttr
     );
   if (temp_dataType instanceof MessageParsingError) return temp_dataType;
   const temp_compression =
-    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
       valueObject.compression,
     );
   if (temp_compression instanceof MessageParsingError) return temp_compression;
@@ -1348,13 +1656,27 @@ export class N5DatasetAttributesDto {
   public blockSize: Array<number>;
   public axes: Array<string> | undefined;
   public dataType: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-  public compression: N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+  public compression:
+    | N5GzipCompressorDto
+    | N5Bzip2CompressorDto
+    | N5XzCompressorDto
+    | N5BloscCompressorDto
+    | N5ZstdCompressorDto
+    | N5Lz4CompressorDto
+    | N5RawCompressorDto;
   constructor(_params: {
     dimensions: Array<number>;
     blockSize: Array<number>;
     axes: Array<string> | undefined;
     dataType: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-    compression: N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+    compression:
+      | N5GzipCompressorDto
+      | N5Bzip2CompressorDto
+      | N5XzCompressorDto
+      | N5BloscCompressorDto
+      | N5ZstdCompressorDto
+      | N5Lz4CompressorDto
+      | N5RawCompressorDto;
   }) {
     this.dimensions = _params.dimensions;
     this.blockSize = _params.blockSize;
@@ -1402,7 +1724,7 @@ export function parse_as_N5DataSourceDto(value: JsonValue): N5DataSourceDto | Me
     );
   if (temp_dtype instanceof MessageParsingError) return temp_dtype;
   const temp_compressor =
-    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
       valueObject.compressor,
     );
   if (temp_compressor instanceof MessageParsingError) return temp_compressor;
@@ -1430,7 +1752,14 @@ export class N5DataSourceDto {
   public tile_shape: Shape5DDto;
   public spatial_resolution: [number, number, number];
   public dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-  public compressor: N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+  public compressor:
+    | N5GzipCompressorDto
+    | N5Bzip2CompressorDto
+    | N5XzCompressorDto
+    | N5BloscCompressorDto
+    | N5ZstdCompressorDto
+    | N5Lz4CompressorDto
+    | N5RawCompressorDto;
   public c_axiskeys_on_disk: string;
   constructor(_params: {
     url: UrlDto;
@@ -1440,7 +1769,14 @@ export class N5DataSourceDto {
     tile_shape: Shape5DDto;
     spatial_resolution: [number, number, number];
     dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-    compressor: N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+    compressor:
+      | N5GzipCompressorDto
+      | N5Bzip2CompressorDto
+      | N5XzCompressorDto
+      | N5BloscCompressorDto
+      | N5ZstdCompressorDto
+      | N5Lz4CompressorDto
+      | N5RawCompressorDto;
     c_axiskeys_on_disk: string;
   }) {
     this.url = _params.url;
@@ -1551,6 +1887,269 @@ export class SkimageDataSourceDto {
   }
 }
 
+export function parse_as_Literal_of_203_endof_(value: JsonValue): 2 | 3 | MessageParsingError {
+  const tmp_0 = parse_as_int(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === 2) {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_int(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === 3) {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 2 | 3`);
+}
+export function parse_as_Literal_of__quote_little_quote_0_quote_big_quote__endof_(
+  value: JsonValue,
+): "little" | "big" | MessageParsingError {
+  const tmp_0 = parse_as_str(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "little") {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_str(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "big") {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'little' | 'big'`);
+}
+export function parse_as_Literal_of__quote_C_quote_0_quote_F_quote__endof_(
+  value: JsonValue,
+): "C" | "F" | MessageParsingError {
+  const tmp_0 = parse_as_str(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "C") {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_str(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "F") {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'C' | 'F'`);
+}
+export function parse_as_Literal_of__quote_default_quote_0_quote_v2_quote__endof_(
+  value: JsonValue,
+): "default" | "v2" | MessageParsingError {
+  const tmp_0 = parse_as_str(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "default") {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_str(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "v2") {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'default' | 'v2'`);
+}
+export function parse_as_bool(value: JsonValue): boolean | MessageParsingError {
+  return ensureJsonBoolean(value);
+}
+export function parse_as_Union_of_Shape5DDto0None_endof_(
+  value: JsonValue,
+): Shape5DDto | undefined | MessageParsingError {
+  const parsed_option_0 = parse_as_Shape5DDto(value);
+  if (!(parsed_option_0 instanceof MessageParsingError)) {
+    return parsed_option_0;
+  }
+  const parsed_option_1 = parse_as_None(value);
+  if (!(parsed_option_1 instanceof MessageParsingError)) {
+    return parsed_option_1;
+  }
+  return new MessageParsingError(`Could not parse ${JSON.stringify(value)} into Shape5DDto | undefined`);
+}
+export function parse_as_Literal_of__quote_start_quote_0_quote_end_quote__endof_(
+  value: JsonValue,
+): "start" | "end" | MessageParsingError {
+  const tmp_0 = parse_as_str(value);
+  if (!(tmp_0 instanceof MessageParsingError) && tmp_0 === "start") {
+    return tmp_0;
+  }
+  const tmp_1 = parse_as_str(value);
+  if (!(tmp_1 instanceof MessageParsingError) && tmp_1 === "end") {
+    return tmp_1;
+  }
+  return new MessageParsingError(`Could not parse ${value} as 'start' | 'end'`);
+}
+export function parse_as_ZarrDataSourceDto(value: JsonValue): ZarrDataSourceDto | MessageParsingError {
+  const valueObject = ensureJsonObject(value);
+  if (valueObject instanceof MessageParsingError) {
+    return valueObject;
+  }
+  if (valueObject["__class__"] != "ZarrDataSourceDto") {
+    return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a ZarrDataSourceDto`);
+  }
+  const temp_url = parse_as_UrlDto(valueObject.url);
+  if (temp_url instanceof MessageParsingError) return temp_url;
+  const temp_filesystem = parse_as_Union_of_OsfsDto0HttpFsDto0BucketFSDto0ZipFsDto_endof_(valueObject.filesystem);
+  if (temp_filesystem instanceof MessageParsingError) return temp_filesystem;
+  const temp_path = parse_as_str(valueObject.path);
+  if (temp_path instanceof MessageParsingError) return temp_path;
+  const temp_interval = parse_as_Interval5DDto(valueObject.interval);
+  if (temp_interval instanceof MessageParsingError) return temp_interval;
+  const temp_tile_shape = parse_as_Shape5DDto(valueObject.tile_shape);
+  if (temp_tile_shape instanceof MessageParsingError) return temp_tile_shape;
+  const temp_spatial_resolution = parse_as_Tuple_of_int0int0int_endof_(valueObject.spatial_resolution);
+  if (temp_spatial_resolution instanceof MessageParsingError) return temp_spatial_resolution;
+  const temp_dtype =
+    parse_as_Literal_of__quote_uint8_quote_0_quote_uint16_quote_0_quote_uint32_quote_0_quote_uint64_quote_0_quote_int64_quote_0_quote_float32_quote__endof_(
+      valueObject.dtype,
+    );
+  if (temp_dtype instanceof MessageParsingError) return temp_dtype;
+  const temp_c_axiskeys_on_disk = parse_as_str(valueObject.c_axiskeys_on_disk);
+  if (temp_c_axiskeys_on_disk instanceof MessageParsingError) return temp_c_axiskeys_on_disk;
+  const temp_zarr_format = parse_as_Literal_of_203_endof_(valueObject.zarr_format);
+  if (temp_zarr_format instanceof MessageParsingError) return temp_zarr_format;
+  const temp_compressor =
+    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
+      valueObject.compressor,
+    );
+  if (temp_compressor instanceof MessageParsingError) return temp_compressor;
+  const temp_fill_value = parse_as_str(valueObject.fill_value);
+  if (temp_fill_value instanceof MessageParsingError) return temp_fill_value;
+  const temp_endian = parse_as_Literal_of__quote_little_quote_0_quote_big_quote__endof_(valueObject.endian);
+  if (temp_endian instanceof MessageParsingError) return temp_endian;
+  const temp_order = parse_as_Literal_of__quote_C_quote_0_quote_F_quote__endof_(valueObject.order);
+  if (temp_order instanceof MessageParsingError) return temp_order;
+  const temp_chunk_key_encoding = parse_as_Literal_of__quote_default_quote_0_quote_v2_quote__endof_(
+    valueObject.chunk_key_encoding,
+  );
+  if (temp_chunk_key_encoding instanceof MessageParsingError) return temp_chunk_key_encoding;
+  const temp_dimension_separator = parse_as_str(valueObject.dimension_separator);
+  if (temp_dimension_separator instanceof MessageParsingError) return temp_dimension_separator;
+  const temp_chunk_checksum = parse_as_bool(valueObject.chunk_checksum);
+  if (temp_chunk_checksum instanceof MessageParsingError) return temp_chunk_checksum;
+  const temp_shard_shape = parse_as_Union_of_Shape5DDto0None_endof_(valueObject.shard_shape);
+  if (temp_shard_shape instanceof MessageParsingError) return temp_shard_shape;
+  const temp_shard_index_location = parse_as_Literal_of__quote_start_quote_0_quote_end_quote__endof_(
+    valueObject.shard_index_location,
+  );
+  if (temp_shard_index_location instanceof MessageParsingError) return temp_shard_index_location;
+  const temp_shard_index_checksum = parse_as_bool(valueObject.shard_index_checksum);
+  if (temp_shard_index_checksum instanceof MessageParsingError) return temp_shard_index_checksum;
+  return new ZarrDataSourceDto({
+    url: temp_url,
+    filesystem: temp_filesystem,
+    path: temp_path,
+    interval: temp_interval,
+    tile_shape: temp_tile_shape,
+    spatial_resolution: temp_spatial_resolution,
+    dtype: temp_dtype,
+    c_axiskeys_on_disk: temp_c_axiskeys_on_disk,
+    zarr_format: temp_zarr_format,
+    compressor: temp_compressor,
+    fill_value: temp_fill_value,
+    endian: temp_endian,
+    order: temp_order,
+    chunk_key_encoding: temp_chunk_key_encoding,
+    dimension_separator: temp_dimension_separator,
+    chunk_checksum: temp_chunk_checksum,
+    shard_shape: temp_shard_shape,
+    shard_index_location: temp_shard_index_location,
+    shard_index_checksum: temp_shard_index_checksum,
+  });
+}
+// Automatically generated via DataTransferObject for ZarrDataSourceDto
+// Do not edit!
+export class ZarrDataSourceDto {
+  public url: UrlDto;
+  public filesystem: OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto;
+  public path: string;
+  public interval: Interval5DDto;
+  public tile_shape: Shape5DDto;
+  public spatial_resolution: [number, number, number];
+  public dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
+  public c_axiskeys_on_disk: string;
+  public zarr_format: 2 | 3;
+  public compressor:
+    | N5GzipCompressorDto
+    | N5Bzip2CompressorDto
+    | N5XzCompressorDto
+    | N5BloscCompressorDto
+    | N5ZstdCompressorDto
+    | N5Lz4CompressorDto
+    | N5RawCompressorDto;
+  public fill_value: string;
+  public endian: "little" | "big";
+  public order: "C" | "F";
+  public chunk_key_encoding: "default" | "v2";
+  public dimension_separator: string;
+  public chunk_checksum: boolean;
+  public shard_shape: Shape5DDto | undefined;
+  public shard_index_location: "start" | "end";
+  public shard_index_checksum: boolean;
+  constructor(_params: {
+    url: UrlDto;
+    filesystem: OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto;
+    path: string;
+    interval: Interval5DDto;
+    tile_shape: Shape5DDto;
+    spatial_resolution: [number, number, number];
+    dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
+    c_axiskeys_on_disk: string;
+    zarr_format: 2 | 3;
+    compressor:
+      | N5GzipCompressorDto
+      | N5Bzip2CompressorDto
+      | N5XzCompressorDto
+      | N5BloscCompressorDto
+      | N5ZstdCompressorDto
+      | N5Lz4CompressorDto
+      | N5RawCompressorDto;
+    fill_value: string;
+    endian: "little" | "big";
+    order: "C" | "F";
+    chunk_key_encoding: "default" | "v2";
+    dimension_separator: string;
+    chunk_checksum: boolean;
+    shard_shape: Shape5DDto | undefined;
+    shard_index_location: "start" | "end";
+    shard_index_checksum: boolean;
+  }) {
+    this.url = _params.url;
+    this.filesystem = _params.filesystem;
+    this.path = _params.path;
+    this.interval = _params.interval;
+    this.tile_shape = _params.tile_shape;
+    this.spatial_resolution = _params.spatial_resolution;
+    this.dtype = _params.dtype;
+    this.c_axiskeys_on_disk = _params.c_axiskeys_on_disk;
+    this.zarr_format = _params.zarr_format;
+    this.compressor = _params.compressor;
+    this.fill_value = _params.fill_value;
+    this.endian = _params.endian;
+    this.order = _params.order;
+    this.chunk_key_encoding = _params.chunk_key_encoding;
+    this.dimension_separator = _params.dimension_separator;
+    this.chunk_checksum = _params.chunk_checksum;
+    this.shard_shape = _params.shard_shape;
+    this.shard_index_location = _params.shard_index_location;
+    this.shard_index_checksum = _params.shard_index_checksum;
+  }
+  public toJsonValue(): JsonObject {
+    return {
+      "__class__": "ZarrDataSourceDto",
+      url: this.url.toJsonValue(),
+      filesystem: toJsonValue(this.filesystem),
+      path: this.path,
+      interval: this.interval.toJsonValue(),
+      tile_shape: this.tile_shape.toJsonValue(),
+      spatial_resolution: [this.spatial_resolution[0], this.spatial_resolution[1], this.spatial_resolution[2]],
+      dtype: this.dtype,
+      c_axiskeys_on_disk: this.c_axiskeys_on_disk,
+      zarr_format: this.zarr_format,
+      compressor: toJsonValue(this.compressor),
+      fill_value: this.fill_value,
+      endian: this.endian,
+      order: this.order,
+      chunk_key_encoding: this.chunk_key_encoding,
+      dimension_separator: this.dimension_separator,
+      chunk_checksum: this.chunk_checksum,
+      shard_shape: toJsonValue(this.shard_shape),
+      shard_index_location: this.shard_index_location,
+      shard_index_checksum: this.shard_index_checksum,
+    };
+  }
+  public static fromJsonValue(value: JsonValue): ZarrDataSourceDto | MessageParsingError {
+    return parse_as_ZarrDataSourceDto(value);
+  }
+}
+
 export function parse_as_PrecomputedChunksSinkDto(value: JsonValue): PrecomputedChunksSinkDto | MessageParsingError {
   const valueObject = ensureJsonObject(value);
   if (valueObject instanceof MessageParsingError) {
@@ -1578,8 +2177,21 @@ export function parse_as_PrecomputedChunksSinkDto(value: JsonValue): Precomputed
   if (temp_scale_key instanceof MessageParsingError) return temp_scale_key;
   const temp_resolution = parse_as_Tuple_of_int0int0int_endof_(valueObject.resolution);
   if (temp_resolution instanceof MessageParsingError) return temp_resolution;
-  const temp_encoding = parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(valueObject.encoding);
+  const temp_encoding =
+    parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote_0_quote_png_quote_0_quote_compressed_segmentation_quote__endof_(
+      valueObject.encoding,
+    );
   if (temp_encoding instanceof MessageParsingError) return temp_encoding;
+  const temp_sharding = parse_as_Union_of_PrecomputedChunksShardingDto0None_endof_(valueObject.sharding);
+  if (temp_sharding instanceof MessageParsingError) return temp_sharding;
+  const temp_compressed_segmentation_block_size = parse_as_Union_of_Tuple_of_int0int0int_endof_0None_endof_(
+    valueObject.compressed_segmentation_block_size,
+  );
+  if (temp_compressed_segmentation_block_size instanceof MessageParsingError) {
+    return temp_compressed_segmentation_block_size;
+  }
+  const temp_gzip_chunks = parse_as_bool(valueObject.gzip_chunks);
+  if (temp_gzip_chunks instanceof MessageParsingError) return temp_gzip_chunks;
   return new PrecomputedChunksSinkDto({
     filesystem: temp_filesystem,
     path: temp_path,
@@ -1589,6 +2201,9 @@ export function parse_as_PrecomputedChunksSinkDto(value: JsonValue): Precomputed
     scale_key: temp_scale_key,
     resolution: temp_resolution,
     encoding: temp_encoding,
+    sharding: temp_sharding,
+    compressed_segmentation_block_size: temp_compressed_segmentation_block_size,
+    gzip_chunks: temp_gzip_chunks,
   });
 }
 // Automatically generated via DataTransferObject for PrecomputedChunksSinkDto
@@ -1601,7 +2216,10 @@ export class PrecomputedChunksSinkDto {
   public dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
   public scale_key: string;
   public resolution: [number, number, number];
-  public encoding: "raw" | "jpeg";
+  public encoding: "raw" | "jpeg" | "png" | "compressed_segmentation";
+  public sharding: PrecomputedChunksShardingDto | undefined;
+  public compressed_segmentation_block_size: [number, number, number] | undefined;
+  public gzip_chunks: boolean;
   constructor(_params: {
     filesystem: OsfsDto | HttpFsDto | BucketFSDto;
     path: string;
@@ -1610,7 +2228,10 @@ export class PrecomputedChunksSinkDto {
     dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
     scale_key: string;
     resolution: [number, number, number];
-    encoding: "raw" | "jpeg";
+    encoding: "raw" | "jpeg" | "png" | "compressed_segmentation";
+    sharding: PrecomputedChunksShardingDto | undefined;
+    compressed_segmentation_block_size: [number, number, number] | undefined;
+    gzip_chunks: boolean;
   }) {
     this.filesystem = _params.filesystem;
     this.path = _params.path;
@@ -1620,6 +2241,9 @@ export class PrecomputedChunksSinkDto {
     this.scale_key = _params.scale_key;
     this.resolution = _params.resolution;
     this.encoding = _params.encoding;
+    this.sharding = _params.sharding;
+    this.compressed_segmentation_block_size = _params.compressed_segmentation_block_size;
+    this.gzip_chunks = _params.gzip_chunks;
   }
   public toJsonValue(): JsonObject {
     return {
@@ -1632,6 +2256,9 @@ export class PrecomputedChunksSinkDto {
       scale_key: this.scale_key,
       resolution: [this.resolution[0], this.resolution[1], this.resolution[2]],
       encoding: this.encoding,
+      sharding: toJsonValue(this.sharding),
+      compressed_segmentation_block_size: toJsonValue(this.compressed_segmentation_block_size),
+      gzip_chunks: this.gzip_chunks,
     };
   }
   public static fromJsonValue(value: JsonValue): PrecomputedChunksSinkDto | MessageParsingError {
@@ -1665,7 +2292,7 @@ export function parse_as_N5DataSinkDto(value: JsonValue): N5DataSinkDto | Messag
     );
   if (temp_dtype instanceof MessageParsingError) return temp_dtype;
   const temp_compressor =
-    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
       valueObject.compressor,
     );
   if (temp_compressor instanceof MessageParsingError) return temp_compressor;
@@ -1690,7 +2317,14 @@ export class N5DataSinkDto {
   public spatial_resolution: [number, number, number];
   public c_axiskeys: string;
   public dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-  public compressor: N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+  public compressor:
+    | N5GzipCompressorDto
+    | N5Bzip2CompressorDto
+    | N5XzCompressorDto
+    | N5BloscCompressorDto
+    | N5ZstdCompressorDto
+    | N5Lz4CompressorDto
+    | N5RawCompressorDto;
   constructor(_params: {
     filesystem: OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto;
     path: string;
@@ -1699,7 +2333,14 @@ export class N5DataSinkDto {
     spatial_resolution: [number, number, number];
     c_axiskeys: string;
     dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
-    compressor: N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+    compressor:
+      | N5GzipCompressorDto
+      | N5Bzip2CompressorDto
+      | N5XzCompressorDto
+      | N5BloscCompressorDto
+      | N5ZstdCompressorDto
+      | N5Lz4CompressorDto
+      | N5RawCompressorDto;
   }) {
     this.filesystem = _params.filesystem;
     this.path = _params.path;
@@ -1728,13 +2369,131 @@ export class N5DataSinkDto {
   }
 }
 
-export function parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+export function parse_as_ZarrDataSinkDto(value: JsonValue): ZarrDataSinkDto | MessageParsingError {
+  const valueObject = ensureJsonObject(value);
+  if (valueObject instanceof MessageParsingError) {
+    return valueObject;
+  }
+  if (valueObject["__class__"] != "ZarrDataSinkDto") {
+    return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a ZarrDataSinkDto`);
+  }
+  const temp_filesystem = parse_as_Union_of_OsfsDto0HttpFsDto0BucketFSDto0ZipFsDto_endof_(valueObject.filesystem);
+  if (temp_filesystem instanceof MessageParsingError) return temp_filesystem;
+  const temp_path = parse_as_str(valueObject.path);
+  if (temp_path instanceof MessageParsingError) return temp_path;
+  const temp_interval = parse_as_Interval5DDto(valueObject.interval);
+  if (temp_interval instanceof MessageParsingError) return temp_interval;
+  const temp_tile_shape = parse_as_Shape5DDto(valueObject.tile_shape);
+  if (temp_tile_shape instanceof MessageParsingError) return temp_tile_shape;
+  const temp_shard_shape = parse_as_Union_of_Shape5DDto0None_endof_(valueObject.shard_shape);
+  if (temp_shard_shape instanceof MessageParsingError) return temp_shard_shape;
+  const temp_spatial_resolution = parse_as_Tuple_of_int0int0int_endof_(valueObject.spatial_resolution);
+  if (temp_spatial_resolution instanceof MessageParsingError) return temp_spatial_resolution;
+  const temp_c_axiskeys = parse_as_str(valueObject.c_axiskeys);
+  if (temp_c_axiskeys instanceof MessageParsingError) return temp_c_axiskeys;
+  const temp_dtype =
+    parse_as_Literal_of__quote_uint8_quote_0_quote_uint16_quote_0_quote_uint32_quote_0_quote_uint64_quote_0_quote_int64_quote_0_quote_float32_quote__endof_(
+      valueObject.dtype,
+    );
+  if (temp_dtype instanceof MessageParsingError) return temp_dtype;
+  const temp_compressor =
+    parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
+      valueObject.compressor,
+    );
+  if (temp_compressor instanceof MessageParsingError) return temp_compressor;
+  const temp_zarr_format = parse_as_Literal_of_203_endof_(valueObject.zarr_format);
+  if (temp_zarr_format instanceof MessageParsingError) return temp_zarr_format;
+  return new ZarrDataSinkDto({
+    filesystem: temp_filesystem,
+    path: temp_path,
+    interval: temp_interval,
+    tile_shape: temp_tile_shape,
+    shard_shape: temp_shard_shape,
+    spatial_resolution: temp_spatial_resolution,
+    c_axiskeys: temp_c_axiskeys,
+    dtype: temp_dtype,
+    compressor: temp_compressor,
+    zarr_format: temp_zarr_format,
+  });
+}
+// Automatically generated via DataTransferObject for ZarrDataSinkDto
+// Do not edit!
+export class ZarrDataSinkDto {
+  public filesystem: OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto;
+  public path: string;
+  public interval: Interval5DDto;
+  public tile_shape: Shape5DDto;
+  public shard_shape: Shape5DDto | undefined;
+  public spatial_resolution: [number, number, number];
+  public c_axiskeys: string;
+  public dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
+  public compressor:
+    | N5GzipCompressorDto
+    | N5Bzip2CompressorDto
+    | N5XzCompressorDto
+    | N5BloscCompressorDto
+    | N5ZstdCompressorDto
+    | N5Lz4CompressorDto
+    | N5RawCompressorDto;
+  public zarr_format: 2 | 3;
+  constructor(_params: {
+    filesystem: OsfsDto | HttpFsDto | BucketFSDto | ZipFsDto;
+    path: string;
+    interval: Interval5DDto;
+    tile_shape: Shape5DDto;
+    shard_shape: Shape5DDto | undefined;
+    spatial_resolution: [number, number, number];
+    c_axiskeys: string;
+    dtype: "uint8" | "uint16" | "uint32" | "uint64" | "int64" | "float32";
+    compressor:
+      | N5GzipCompressorDto
+      | N5Bzip2CompressorDto
+      | N5XzCompressorDto
+      | N5BloscCompressorDto
+      | N5ZstdCompressorDto
+      | N5Lz4CompressorDto
+      | N5RawCompressorDto;
+    zarr_format: 2 | 3;
+  }) {
+    this.filesystem = _params.filesystem;
+    this.path = _params.path;
+    this.interval = _params.interval;
+    this.tile_shape = _params.tile_shape;
+    this.shard_shape = _params.shard_shape;
+    this.spatial_resolution = _params.spatial_resolution;
+    this.c_axiskeys = _params.c_axiskeys;
+    this.dtype = _params.dtype;
+    this.compressor = _params.compressor;
+    this.zarr_format = _params.zarr_format;
+  }
+  public toJsonValue(): JsonObject {
+    return {
+      "__class__": "ZarrDataSinkDto",
+      filesystem: toJsonValue(this.filesystem),
+      path: this.path,
+      interval: this.interval.toJsonValue(),
+      tile_shape: this.tile_shape.toJsonValue(),
+      shard_shape: toJsonValue(this.shard_shape),
+      spatial_resolution: [this.spatial_resolution[0], this.spatial_resolution[1], this.spatial_resolution[2]],
+      c_axiskeys: this.c_axiskeys,
+      dtype: this.dtype,
+      compressor: toJsonValue(this.compressor),
+      zarr_format: this.zarr_format,
+    };
+  }
+  public static fromJsonValue(value: JsonValue): ZarrDataSinkDto | MessageParsingError {
+    return parse_as_ZarrDataSinkDto(value);
+  }
+}
+
+export function parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
   value: JsonValue,
 ):
   | PrecomputedChunksDataSourceDto
   | N5DataSourceDto
   | SkimageDataSourceDto
   | DziLevelDataSourceDto
+  | ZarrDataSourceDto
   | MessageParsingError {
   const parsed_option_0 = parse_as_PrecomputedChunksDataSourceDto(value);
   if (!(parsed_option_0 instanceof MessageParsingError)) {
@@ -1752,10 +2511,14 @@ export function parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto
   if (!(parsed_option_3 instanceof MessageParsingError)) {
     return parsed_option_3;
   }
+  const parsed_option_4 = parse_as_ZarrDataSourceDto(value);
+  if (!(parsed_option_4 instanceof MessageParsingError)) {
+    return parsed_option_4;
+  }
   return new MessageParsingError(
     `Could not parse ${
       JSON.stringify(value)
-    } into PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto`,
+    } into PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto`,
   );
 }
 export function parse_as_Tuple_of_Tuple_of_int0int0int_endof_0_varlen__endof_(
@@ -1780,7 +2543,7 @@ export function parse_as_PixelAnnotationDto(value: JsonValue): PixelAnnotationDt
     return new MessageParsingError(`Could not deserialize ${JSON.stringify(valueObject)} as a PixelAnnotationDto`);
   }
   const temp_raw_data =
-    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
       valueObject.raw_data,
     );
   if (temp_raw_data instanceof MessageParsingError) return temp_raw_data;
@@ -1794,10 +2557,20 @@ export function parse_as_PixelAnnotationDto(value: JsonValue): PixelAnnotationDt
 // Automatically generated via DataTransferObject for PixelAnnotationDto
 // Do not edit!
 export class PixelAnnotationDto {
-  public raw_data: PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto;
+  public raw_data:
+    | PrecomputedChunksDataSourceDto
+    | N5DataSourceDto
+    | SkimageDataSourceDto
+    | DziLevelDataSourceDto
+    | ZarrDataSourceDto;
   public points: Array<[number, number, number]>;
   constructor(_params: {
-    raw_data: PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto;
+    raw_data:
+      | PrecomputedChunksDataSourceDto
+      | N5DataSourceDto
+      | SkimageDataSourceDto
+      | DziLevelDataSourceDto
+      | ZarrDataSourceDto;
     points: Array<[number, number, number]>;
   }) {
     this.raw_data = _params.raw_data;
@@ -1849,9 +2622,6 @@ export class RpcErrorDto {
   }
 }
 
-export function parse_as_bool(value: JsonValue): boolean | MessageParsingError {
-  return ensureJsonBoolean(value);
-}
 export function parse_as_SetLiveUpdateParams(value: JsonValue): SetLiveUpdateParams | MessageParsingError {
   const valueObject = ensureJsonObject(value);
   if (valueObject instanceof MessageParsingError) {
@@ -2451,9 +3221,9 @@ export class JobDto {
   }
 }
 
-export function parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
+export function parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
   value: JsonValue,
-): PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | MessageParsingError {
+): PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto | MessageParsingError {
   const parsed_option_0 = parse_as_PrecomputedChunksSinkDto(value);
   if (!(parsed_option_0 instanceof MessageParsingError)) {
     return parsed_option_0;
@@ -2466,8 +3236,14 @@ export function parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLeve
   if (!(parsed_option_2 instanceof MessageParsingError)) {
     return parsed_option_2;
   }
+  const parsed_option_3 = parse_as_ZarrDataSinkDto(value);
+  if (!(parsed_option_3 instanceof MessageParsingError)) {
+    return parsed_option_3;
+  }
   return new MessageParsingError(
-    `Could not parse ${JSON.stringify(value)} into PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto`,
+    `Could not parse ${
+      JSON.stringify(value)
+    } into PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto`,
   );
 }
 export function parse_as_ExportJobDto(value: JsonValue): ExportJobDto | MessageParsingError {
@@ -2488,7 +3264,7 @@ export function parse_as_ExportJobDto(value: JsonValue): ExportJobDto | MessageP
     valueObject.status,
   );
   if (temp_status instanceof MessageParsingError) return temp_status;
-  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
+  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
     valueObject.datasink,
   );
   if (temp_datasink instanceof MessageParsingError) return temp_datasink;
@@ -2507,13 +3283,13 @@ export class ExportJobDto {
   public num_args: number | undefined;
   public uuid: string;
   public status: JobFinishedDto | JobIsPendingDto | JobIsRunningDto | JobCanceledDto;
-  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   constructor(_params: {
     name: string;
     num_args: number | undefined;
     uuid: string;
     status: JobFinishedDto | JobIsPendingDto | JobIsRunningDto | JobCanceledDto;
-    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   }) {
     this.name = _params.name;
     this.num_args = _params.num_args;
@@ -2554,7 +3330,7 @@ export function parse_as_OpenDatasinkJobDto(value: JsonValue): OpenDatasinkJobDt
     valueObject.status,
   );
   if (temp_status instanceof MessageParsingError) return temp_status;
-  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
+  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
     valueObject.datasink,
   );
   if (temp_datasink instanceof MessageParsingError) return temp_datasink;
@@ -2573,13 +3349,13 @@ export class OpenDatasinkJobDto {
   public num_args: number | undefined;
   public uuid: string;
   public status: JobFinishedDto | JobIsPendingDto | JobIsRunningDto | JobCanceledDto;
-  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   constructor(_params: {
     name: string;
     num_args: number | undefined;
     uuid: string;
     status: JobFinishedDto | JobIsPendingDto | JobIsRunningDto | JobCanceledDto;
-    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   }) {
     this.name = _params.name;
     this.num_args = _params.num_args;
@@ -2730,9 +3506,9 @@ export class ZipDirectoryJobDto {
   }
 }
 
-export function parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0None_endof_(
+export function parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto0None_endof_(
   value: JsonValue,
-): PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | undefined | MessageParsingError {
+): PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto | undefined | MessageParsingError {
   const parsed_option_0 = parse_as_PrecomputedChunksSinkDto(value);
   if (!(parsed_option_0 instanceof MessageParsingError)) {
     return parsed_option_0;
@@ -2745,14 +3521,18 @@ export function parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLeve
   if (!(parsed_option_2 instanceof MessageParsingError)) {
     return parsed_option_2;
   }
-  const parsed_option_3 = parse_as_None(value);
+  const parsed_option_3 = parse_as_ZarrDataSinkDto(value);
   if (!(parsed_option_3 instanceof MessageParsingError)) {
     return parsed_option_3;
   }
+  const parsed_option_4 = parse_as_None(value);
+  if (!(parsed_option_4 instanceof MessageParsingError)) {
+    return parsed_option_4;
+  }
   return new MessageParsingError(
     `Could not parse ${
       JSON.stringify(value)
-    } into PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | undefined`,
+    } into PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto | undefined`,
   );
 }
 export function parse_as_TransferFileJobDto(value: JsonValue): TransferFileJobDto | MessageParsingError {
@@ -2775,9 +3555,10 @@ export function parse_as_TransferFileJobDto(value: JsonValue): TransferFileJobDt
   if (temp_status instanceof MessageParsingError) return temp_status;
   const temp_target_url = parse_as_UrlDto(valueObject.target_url);
   if (temp_target_url instanceof MessageParsingError) return temp_target_url;
-  const temp_result_sink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0None_endof_(
-    valueObject.result_sink,
-  );
+  const temp_result_sink =
+    parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto0None_endof_(
+      valueObject.result_sink,
+    );
   if (temp_result_sink instanceof MessageParsingError) return temp_result_sink;
   return new TransferFileJobDto({
     name: temp_name,
@@ -2796,14 +3577,14 @@ export class TransferFileJobDto {
   public uuid: string;
   public status: JobFinishedDto | JobIsPendingDto | JobIsRunningDto | JobCanceledDto;
   public target_url: UrlDto;
-  public result_sink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | undefined;
+  public result_sink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto | undefined;
   constructor(_params: {
     name: string;
     num_args: number | undefined;
     uuid: string;
     status: JobFinishedDto | JobIsPendingDto | JobIsRunningDto | JobCanceledDto;
     target_url: UrlDto;
-    result_sink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | undefined;
+    result_sink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto | undefined;
   }) {
     this.name = _params.name;
     this.num_args = _params.num_args;
@@ -2914,18 +3695,21 @@ export function parse_as_Union_of_Tuple_of_LabelHeaderDto0_varlen__endof_0None_e
   }
   return new MessageParsingError(`Could not parse ${JSON.stringify(value)} into Array<LabelHeaderDto> | undefined`);
 }
-export function parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+export function parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
   value: JsonValue,
 ):
-  | Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto>
+  | Array<
+    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto
+  >
   | MessageParsingError {
   const arr = ensureJsonArray(value);
   if (arr instanceof MessageParsingError) return arr;
-  const out: Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto> =
-    [];
+  const out: Array<
+    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto
+  > = [];
   for (let item of arr) {
     let parsed_item =
-      parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+      parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
         item,
       );
     if (parsed_item instanceof MessageParsingError) return parsed_item;
@@ -2933,14 +3717,16 @@ export function parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5Data
   }
   return out;
 }
-export function parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_0None_endof_(
+export function parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_0None_endof_(
   value: JsonValue,
 ):
-  | Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto>
+  | Array<
+    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto
+  >
   | undefined
   | MessageParsingError {
   const parsed_option_0 =
-    parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+    parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
       value,
     );
   if (!(parsed_option_0 instanceof MessageParsingError)) {
@@ -2953,7 +3739,7 @@ export function parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceD
   return new MessageParsingError(
     `Could not parse ${
       JSON.stringify(value)
-    } into Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto> | undefined`,
+    } into Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto> | undefined`,
   );
 }
 export function parse_as_PixelClassificationExportAppletStateDto(
@@ -2978,7 +3764,7 @@ export function parse_as_PixelClassificationExportAppletStateDto(
   );
   if (temp_populated_labels instanceof MessageParsingError) return temp_populated_labels;
   const temp_datasource_suggestions =
-    parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_0None_endof_(
+    parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_0None_endof_(
       valueObject.datasource_suggestions,
     );
   if (temp_datasource_suggestions instanceof MessageParsingError) return temp_datasource_suggestions;
@@ -2999,7 +3785,13 @@ export class PixelClassificationExportAppletStateDto {
   >;
   public populated_labels: Array<LabelHeaderDto> | undefined;
   public datasource_suggestions:
-    | Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto>
+    | Array<
+      | PrecomputedChunksDataSourceDto
+      | N5DataSourceDto
+      | SkimageDataSourceDto
+      | DziLevelDataSourceDto
+      | ZarrDataSourceDto
+    >
     | undefined;
   public upstream_ready: boolean;
   constructor(_params: {
@@ -3008,7 +3800,13 @@ export class PixelClassificationExportAppletStateDto {
     >;
     populated_labels: Array<LabelHeaderDto> | undefined;
     datasource_suggestions:
-      | Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto>
+      | Array<
+        | PrecomputedChunksDataSourceDto
+        | N5DataSourceDto
+        | SkimageDataSourceDto
+        | DziLevelDataSourceDto
+        | ZarrDataSourceDto
+      >
       | undefined;
     upstream_ready: boolean;
   }) {
@@ -3967,11 +4765,11 @@ export function parse_as_StartPixelProbabilitiesExportJobParamsDto(
     );
   }
   const temp_datasource =
-    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
       valueObject.datasource,
     );
   if (temp_datasource instanceof MessageParsingError) return temp_datasource;
-  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
+  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
     valueObject.datasink,
   );
   if (temp_datasink instanceof MessageParsingError) return temp_datasink;
@@ -3983,11 +4781,21 @@ export function parse_as_StartPixelProbabilitiesExportJobParamsDto(
 // Automatically generated via DataTransferObject for StartPixelProbabilitiesExportJobParamsDto
 // Do not edit!
 export class StartPixelProbabilitiesExportJobParamsDto {
-  public datasource: PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto;
-  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+  public datasource:
+    | PrecomputedChunksDataSourceDto
+    | N5DataSourceDto
+    | SkimageDataSourceDto
+    | DziLevelDataSourceDto
+    | ZarrDataSourceDto;
+  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   constructor(_params: {
-    datasource: PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto;
-    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+    datasource:
+      | PrecomputedChunksDataSourceDto
+      | N5DataSourceDto
+      | SkimageDataSourceDto
+      | DziLevelDataSourceDto
+      | ZarrDataSourceDto;
+    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   }) {
     this.datasource = _params.datasource;
     this.datasink = _params.datasink;
@@ -4017,11 +4825,11 @@ export function parse_as_StartSimpleSegmentationExportJobParamsDto(
     );
   }
   const temp_datasource =
-    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
       valueObject.datasource,
     );
   if (temp_datasource instanceof MessageParsingError) return temp_datasource;
-  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
+  const temp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
     valueObject.datasink,
   );
   if (temp_datasink instanceof MessageParsingError) return temp_datasink;
@@ -4036,12 +4844,22 @@ export function parse_as_StartSimpleSegmentationExportJobParamsDto(
 // Automatically generated via DataTransferObject for StartSimpleSegmentationExportJobParamsDto
 // Do not edit!
 export class StartSimpleSegmentationExportJobParamsDto {
-  public datasource: PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto;
-  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+  public datasource:
+    | PrecomputedChunksDataSourceDto
+    | N5DataSourceDto
+    | SkimageDataSourceDto
+    | DziLevelDataSourceDto
+    | ZarrDataSourceDto;
+  public datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
   public label_header: LabelHeaderDto;
   constructor(_params: {
-    datasource: PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto;
-    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto;
+    datasource:
+      | PrecomputedChunksDataSourceDto
+      | N5DataSourceDto
+      | SkimageDataSourceDto
+      | DziLevelDataSourceDto
+      | ZarrDataSourceDto;
+    datasink: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto;
     label_header: LabelHeaderDto;
   }) {
     this.datasource = _params.datasource;
@@ -4194,7 +5012,7 @@ export function parse_as_GetDatasourcesFromUrlResponseDto(
     );
   }
   const temp_datasources =
-    parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+    parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
       valueObject.datasources,
     );
   if (temp_datasources instanceof MessageParsingError) return temp_datasources;
@@ -4206,10 +5024,16 @@ export function parse_as_GetDatasourcesFromUrlResponseDto(
 // Do not edit!
 export class GetDatasourcesFromUrlResponseDto {
   public datasources: Array<
-    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto
+    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto
   >;
   constructor(_params: {
-    datasources: Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto>;
+    datasources: Array<
+      | PrecomputedChunksDataSourceDto
+      | N5DataSourceDto
+      | SkimageDataSourceDto
+      | DziLevelDataSourceDto
+      | ZarrDataSourceDto
+    >;
   }) {
     this.datasources = _params.datasources;
   }
@@ -4320,7 +5144,7 @@ export function parse_as_CheckDatasourceCompatibilityParams(
     );
   }
   const temp_datasources =
-    parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+    parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
       valueObject.datasources,
     );
   if (temp_datasources instanceof MessageParsingError) return temp_datasources;
@@ -4332,10 +5156,16 @@ export function parse_as_CheckDatasourceCompatibilityParams(
 // Do not edit!
 export class CheckDatasourceCompatibilityParams {
   public datasources: Array<
-    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto
+    PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto | ZarrDataSourceDto
   >;
   constructor(_params: {
-    datasources: Array<PrecomputedChunksDataSourceDto | N5DataSourceDto | SkimageDataSourceDto | DziLevelDataSourceDto>;
+    datasources: Array<
+      | PrecomputedChunksDataSourceDto
+      | N5DataSourceDto
+      | SkimageDataSourceDto
+      | DziLevelDataSourceDto
+      | ZarrDataSourceDto
+    >;
   }) {
     this.datasources = _params.datasources;
   }
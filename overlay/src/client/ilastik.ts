@@ -2,7 +2,7 @@ import { vec3 } from "gl-matrix"
 import { DatasetNameComponent, ExportPattern, ExtensionComponent, OutputTypeComponent, TimestampComponent } from "../util/export_pattern"
 import { assertUnreachable, fetchJson, parseJson, PermissionError, RequestFailure, sleep, UnauthorizedRequestError } from "../util/misc"
 import { Path, Url } from "../util/parsed_url"
-import { DataType, ensureDataType } from "../util/precomputed_chunks"
+import { DataType, Encoding, ensureDataType } from "../util/precomputed_chunks"
 import {
     ensureJsonObject, ensureJsonString, fromBase64, JsonableValue, JsonValue, toBase64, toJsonValue
 } from "../util/serialization"
@@ -27,19 +27,25 @@ import {
     OsfsDto,
     Point5DDto,
     PrecomputedChunksSinkDto,
+    PrecomputedChunksShardingDto,
     SaveProjectParamsDto,
     Shape5DDto,
     N5DataSinkDto,
     SkimageDataSourceDto,
     ListFsDirRequest,
     ListFsDirResponse,
-    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_,
+    parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_,
     PixelAnnotationDto,
     N5Bzip2CompressorDto,
     N5GzipCompressorDto,
     N5RawCompressorDto,
     N5XzCompressorDto,
+    N5BloscCompressorDto,
+    N5ZstdCompressorDto,
+    N5Lz4CompressorDto,
     N5DataSourceDto,
+    ZarrDataSourceDto,
+    ZarrDataSinkDto,
     DziLevelDataSourceDto,
     DziImageElementDto,
     DziLevelSinkDto,
@@ -892,7 +898,9 @@ export class Interval5D{
 
 export type FsDataSourceDto = PixelAnnotationDto["raw_data"]; //FIXME: define this alias automatically
 
-export type DataSourceUnion = PrecomputedChunksDataSource | N5DataSource | SkimageDataSource | DziLevelDataSource
+export type DataSourceUnion = (
+    PrecomputedChunksDataSource | N5DataSource | SkimageDataSource | DziLevelDataSource | ZarrDataSource
+)
 
 export abstract class FsDataSource{
     public readonly url: Url
@@ -946,11 +954,14 @@ export abstract class FsDataSource{
         if(dto instanceof DziLevelDataSourceDto){
             return DziLevelDataSource.fromDto(dto)
         }
+        if(dto instanceof ZarrDataSourceDto){
+            return ZarrDataSource.fromDto(dto)
+        }
         assertUnreachable(dto)
     }
 
     public static fromBase64(encoded: string): Error | ReturnType<typeof FsDataSource.fromDto>{
-        const dtoResult = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+        const dtoResult = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
             JSON.parse(fromBase64(encoded))
         )
         if(dtoResult instanceof Error){
@@ -981,16 +992,22 @@ export abstract class FsDataSource{
 }
 
 export class PrecomputedChunksDataSource extends FsDataSource{
-    public readonly encoder: "jpeg" | "raw"
+    public readonly encoder: Encoding
     public readonly scale_key: Path
+    public readonly sharding: PrecomputedChunksShardingDto | undefined
+    public readonly compressed_segmentation_block_size: [number, number, number] | undefined
 
     public constructor(params: ConstructorParameters<typeof FsDataSource>[0] & {
-        encoder: "jpeg" | "raw",
+        encoder: Encoding,
         scale_key: Path,
+        sharding: PrecomputedChunksShardingDto | undefined,
+        compressed_segmentation_block_size: [number, number, number] | undefined,
     }){
         super(params)
         this.encoder = params.encoder
         this.scale_key = params.scale_key
+        this.sharding = params.sharding
+        this.compressed_segmentation_block_size = params.compressed_segmentation_block_size
     }
 
     public hasSameScaleAs(other: FsDataSource): boolean {
@@ -1008,7 +1025,9 @@ export class PrecomputedChunksDataSource extends FsDataSource{
             spatial_resolution: dto.spatial_resolution,
             dtype: ensureDataType(dto.dtype), //FIXME?
             encoder: dto.encoder,
-            scale_key: Path.parse(dto.scale_key)
+            scale_key: Path.parse(dto.scale_key),
+            sharding: dto.sharding,
+            compressed_segmentation_block_size: dto.compressed_segmentation_block_size,
         })
     }
 
@@ -1023,6 +1042,8 @@ export class PrecomputedChunksDataSource extends FsDataSource{
             dtype: this.dtype,
             encoder: this.encoder,
             scale_key: this.scale_key.raw,
+            sharding: this.sharding,
+            compressed_segmentation_block_size: this.compressed_segmentation_block_size,
         })
     }
 }
@@ -1094,6 +1115,58 @@ export class N5DataSource extends FsDataSource{
     }
 }
 
+export class ZarrDataSource extends FsDataSource{
+    public readonly compressor: N5Compressor
+    public readonly c_axiskeys: string
+    public readonly dto: ZarrDataSourceDto
+
+    public constructor(params: ConstructorParameters<typeof FsDataSource>[0] & {
+        compressor: N5Compressor,
+        c_axiskeys: string,
+        dto: ZarrDataSourceDto,
+    }){
+        super(params)
+        this.compressor = params.compressor
+        this.c_axiskeys = params.c_axiskeys
+        this.dto = params.dto //the remaining zarr metadata is only needed by the server, so it is kept as-is
+    }
+
+    public hasSameScaleAs(other: FsDataSource): boolean {
+        return other instanceof ZarrDataSource &&
+            this.spatial_resolution.every((val, idx) => val == other.spatial_resolution[idx])
+    }
+
+    public static fromDto(dto: ZarrDataSourceDto) : ZarrDataSource{
+        return new ZarrDataSource({
+            filesystem: Filesystem.fromDto(dto.filesystem),
+            path: Path.fromDto(dto.path),
+            url: Url.fromDto(dto.url),
+            interval: Interval5D.fromDto(dto.interval),
+            tile_shape: Shape5D.fromDto(dto.tile_shape),
+            spatial_resolution: dto.spatial_resolution,
+            dtype: ensureDataType(dto.dtype), //FIXME?
+            compressor: N5Compressor.create_from_dto(dto.compressor),
+            c_axiskeys: dto.c_axiskeys_on_disk,
+            dto,
+        })
+    }
+
+    public toDto(): ZarrDataSourceDto{
+        return new ZarrDataSourceDto({
+            ...this.dto,
+            filesystem: this.filesystem.toDto(),
+            path: this.path.toDto(),
+            url: this.url.toDto(),
+            interval: this.interval.toDto(),
+            tile_shape: this.tile_shape.toDto(),
+            spatial_resolution: this.spatial_resolution,
+            dtype: this.dtype,
+            compressor: this.compressor.to_dto(),
+            c_axiskeys_on_disk: this.c_axiskeys,
+        })
+    }
+}
+
 export class DziSizeElement{
     public readonly Width: number
     public readonly Height: number
@@ -1444,7 +1517,7 @@ export class BucketFs extends Filesystem{
 
 }
 
-export type DataSinkUnion = PrecomputedChunksSink | N5DataSink | DziLevelSink
+export type DataSinkUnion = PrecomputedChunksSink | N5DataSink | DziLevelSink | ZarrDataSink
 
 export abstract class FsDataSink{
     public readonly filesystem: Filesystem
@@ -1470,7 +1543,9 @@ export abstract class FsDataSink{
         this.resolution = params.resolution
     }
 
-    public static fromDto(message: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto): DataSinkUnion{
+    public static fromDto(
+        message: PrecomputedChunksSinkDto | N5DataSinkDto | DziLevelSinkDto | ZarrDataSinkDto
+    ): DataSinkUnion{
         if(message instanceof PrecomputedChunksSinkDto){
             return PrecomputedChunksSink.fromDto(message)
         }
@@ -1480,6 +1555,9 @@ export abstract class FsDataSink{
         if(message instanceof DziLevelSinkDto){
             return DziLevelSink.fromDto(message)
         }
+        if(message instanceof ZarrDataSinkDto){
+            return ZarrDataSink.fromDto(message)
+        }
         assertUnreachable(message)
     }
 
@@ -1488,15 +1566,24 @@ export abstract class FsDataSink{
 
 export class PrecomputedChunksSink extends FsDataSink{
     public readonly scale_key: Path
-    public readonly encoding: "raw" | "jpeg"
+    public readonly encoding: Encoding
+    public readonly sharding: PrecomputedChunksShardingDto | undefined
+    public readonly compressed_segmentation_block_size: [number, number, number] | undefined
+    public readonly gzip_chunks: boolean
 
     public constructor(params: ConstructorParameters<typeof FsDataSink>[0] & {
         scale_key: Path,
-        encoding: "raw" | "jpeg",
+        encoding: Encoding,
+        sharding: PrecomputedChunksShardingDto | undefined,
+        compressed_segmentation_block_size: [number, number, number] | undefined,
+        gzip_chunks: boolean,
     }){
         super(params)
         this.scale_key = params.scale_key
         this.encoding = params.encoding
+        this.sharding = params.sharding
+        this.compressed_segmentation_block_size = params.compressed_segmentation_block_size
+        this.gzip_chunks = params.gzip_chunks
     }
 
     public static fromDto(message: PrecomputedChunksSinkDto): PrecomputedChunksSink{
@@ -1509,6 +1596,9 @@ export class PrecomputedChunksSink extends FsDataSink{
             scale_key: Path.parse(message.scale_key),
             resolution: message.resolution,
             encoding: message.encoding,
+            sharding: message.sharding,
+            compressed_segmentation_block_size: message.compressed_segmentation_block_size,
+            gzip_chunks: message.gzip_chunks,
         })
     }
 
@@ -1522,6 +1612,9 @@ export class PrecomputedChunksSink extends FsDataSink{
             resolution: this.resolution,
             scale_key: this.scale_key.toDto(),
             tile_shape: this.tile_shape.toDto(),
+            sharding: this.sharding,
+            compressed_segmentation_block_size: this.compressed_segmentation_block_size,
+            gzip_chunks: this.gzip_chunks,
         })
     }
 
@@ -1541,11 +1634,16 @@ export class PrecomputedChunksSink extends FsDataSink{
             dtype: this.dtype,
             encoder: this.encoding,
             scale_key: this.scale_key,
+            sharding: this.sharding,
+            compressed_segmentation_block_size: this.compressed_segmentation_block_size,
         })
     }
 }
 
-export type N5CompressorDto = N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5RawCompressorDto;
+export type N5CompressorDto = (
+    N5GzipCompressorDto | N5Bzip2CompressorDto | N5XzCompressorDto | N5BloscCompressorDto | N5ZstdCompressorDto |
+    N5Lz4CompressorDto | N5RawCompressorDto
+);
 
 export abstract class N5Compressor{
     public abstract to_dto(): N5CompressorDto;
@@ -1560,6 +1658,15 @@ export abstract class N5Compressor{
         if(dto instanceof N5XzCompressorDto){
             return XzCompressor.from_dto(dto)
         }
+        if(dto instanceof N5BloscCompressorDto){
+            return BloscCompressor.from_dto(dto)
+        }
+        if(dto instanceof N5ZstdCompressorDto){
+            return ZstdCompressor.from_dto(dto)
+        }
+        if(dto instanceof N5Lz4CompressorDto){
+            return Lz4Compressor.from_dto(dto)
+        }
         return RawCompressor.from_dto(dto)
     }
 }
@@ -1612,6 +1719,60 @@ export class XzCompressor extends N5Compressor{
     }
 }
 
+export class BloscCompressor extends N5Compressor{
+    cname: string
+    clevel: number
+    shuffle: number
+    blocksize: number
+    constructor(params: {cname: string, clevel: number, shuffle: number, blocksize: number}){
+        super()
+        this.cname = params.cname
+        this.clevel = params.clevel
+        this.shuffle = params.shuffle
+        this.blocksize = params.blocksize
+    }
+
+    public to_dto(): N5BloscCompressorDto{
+        return new N5BloscCompressorDto({cname: this.cname, clevel: this.clevel, shuffle: this.shuffle, blocksize: this.blocksize})
+    }
+
+    public static from_dto(dto: N5BloscCompressorDto): BloscCompressor{
+        return new BloscCompressor({cname: dto.cname, clevel: dto.clevel, shuffle: dto.shuffle, blocksize: dto.blocksize})
+    }
+}
+
+export class ZstdCompressor extends N5Compressor{
+    level: number
+    constructor(params: {level: number}){
+        super()
+        this.level = params.level
+    }
+
+    public to_dto(): N5ZstdCompressorDto{
+        return new N5ZstdCompressorDto({level: this.level})
+    }
+
+    public static from_dto(dto: N5ZstdCompressorDto): ZstdCompressor{
+        return new ZstdCompressor({level: dto.level})
+    }
+}
+
+export class Lz4Compressor extends N5Compressor{
+    blockSize: number
+    constructor(params: {blockSize: number}){
+        super()
+        this.blockSize = params.blockSize
+    }
+
+    public to_dto(): N5Lz4CompressorDto{
+        return new N5Lz4CompressorDto({blockSize: this.blockSize})
+    }
+
+    public static from_dto(dto: N5Lz4CompressorDto): Lz4Compressor{
+        return new Lz4Compressor({blockSize: dto.blockSize})
+    }
+}
+
 export class RawCompressor extends N5Compressor{
     public to_dto(): N5RawCompressorDto{
         return new N5RawCompressorDto({})
@@ -1678,6 +1839,81 @@ export class N5DataSink extends FsDataSink{
     }
 }
 
+export class ZarrDataSink extends FsDataSink{
+    public readonly compressor: N5Compressor
+    public readonly c_axiskeys: string
+    public readonly shard_shape: Shape5D | undefined
+    public readonly zarr_format: 2 | 3
+
+    public constructor(params: ConstructorParameters<typeof FsDataSink>[0] & {
+        c_axiskeys: string,
+        compressor: N5Compressor,
+        shard_shape: Shape5D | undefined,
+        zarr_format: 2 | 3,
+    }){
+        super(params)
+        this.c_axiskeys = params.c_axiskeys
+        this.compressor = params.compressor
+        this.shard_shape = params.shard_shape
+        this.zarr_format = params.zarr_format
+    }
+    public static fromDto(message: ZarrDataSinkDto): ZarrDataSink{
+        return new ZarrDataSink({
+            filesystem: Filesystem.fromDto(message.filesystem),
+            path: Path.parse(message.path),
+            dtype: message.dtype,
+            tile_shape: Shape5D.fromDto(message.tile_shape),
+            interval: Interval5D.fromDto(message.interval),
+            resolution: message.spatial_resolution,
+            compressor: N5Compressor.create_from_dto(message.compressor),
+            c_axiskeys: message.c_axiskeys,
+            shard_shape: message.shard_shape && Shape5D.fromDto(message.shard_shape),
+            zarr_format: message.zarr_format,
+        })
+    }
+    public toDto(): ZarrDataSinkDto{
+        return new ZarrDataSinkDto({
+            filesystem: this.filesystem.toDto(),
+            path: this.path.toDto(),
+            dtype: this.dtype,
+            compressor: this.compressor.to_dto(),
+            interval: this.interval.toDto(),
+            spatial_resolution: this.resolution,
+            tile_shape: this.tile_shape.toDto(),
+            shard_shape: this.shard_shape?.toDto(),
+            c_axiskeys: this.c_axiskeys,
+            zarr_format: this.zarr_format,
+        })
+    }
+    public toDataSource(): ZarrDataSource{
+        //FIXME: stop using URLs; have datasources encode al the stuff they need in properties
+        const datasourceUrl = this.filesystem.url.joinPath(this.path).updatedWith({
+            datascheme: "zarr",
+        })
+        return ZarrDataSource.fromDto(new ZarrDataSourceDto({
+            url: datasourceUrl.toDto(),
+            filesystem: this.filesystem.toDto(),
+            path: this.path.toDto(),
+            interval: this.interval.toDto(),
+            tile_shape: this.tile_shape.toDto(),
+            spatial_resolution: this.resolution,
+            dtype: this.dtype,
+            c_axiskeys_on_disk: this.c_axiskeys,
+            zarr_format: this.zarr_format,
+            compressor: this.compressor.to_dto(),
+            fill_value: "0",
+            endian: "little",
+            order: "C",
+            chunk_key_encoding: this.zarr_format == 3 ? "default" : "v2",
+            dimension_separator: "/",
+            chunk_checksum: false,
+            shard_shape: this.shard_shape?.toDto(),
+            shard_index_location: "end",
+            shard_index_checksum: false,
+        }))
+    }
+}
+
 export class DziLevelSink extends FsDataSink{
     public readonly dzi_image: DziImageElement
     public readonly level_index: number
@@ -1,7 +1,10 @@
-import { Bzip2Compressor, DataSinkUnion, DziImageElement, DziLevelSink, DziSizeElement, Filesystem, GzipCompressor, Interval5D, N5DataSink, PrecomputedChunksSink, RawCompressor, Shape5D, XzCompressor, ZipFs } from "../../client/ilastik";
+import {
+    BloscCompressor, Bzip2Compressor, DataSinkUnion, DziImageElement, DziLevelSink, DziSizeElement, Filesystem, GzipCompressor, Interval5D,
+    Lz4Compressor, N5DataSink, PrecomputedChunksSink, RawCompressor, Shape5D, XzCompressor, ZipFs, ZstdCompressor
+} from "../../client/ilastik";
 import { assertUnreachable } from "../../util/misc";
 import { Path } from "../../util/parsed_url";
-import { DataType } from "../../util/precomputed_chunks";
+import { DataType, Encoding, encodings } from "../../util/precomputed_chunks";
 import { CssClasses } from "../css_classes";
 import { Select } from "./input_widget";
 import { TabsWidget } from "./tabs_widget";
@@ -199,7 +202,8 @@ class DziDatasinkConfigWidget extends DatasinkInputForm{
 export class MissingSinkParametersError extends Error{}
 
 class PrecomputedChunksDatasinkConfigWidget extends DatasinkInputForm{
-    public readonly encoderSelector: Select<"raw" | "jpeg">;
+    public readonly encoderSelector: Select<Encoding>;
+    public readonly gzipCheckbox: BooleanInput;
     public readonly scaleKeyInput: PathInput;
 
     constructor(params: {parentElement: HTMLElement | undefined, disableEncoding: boolean}){
@@ -207,13 +211,14 @@ class PrecomputedChunksDatasinkConfigWidget extends DatasinkInputForm{
             parentElement: undefined,
             value: new Path({components: ["exported_data"]})
         })
-        const encoderSelector = new Select<"raw" | "jpeg">({
+        const encoderSelector = new Select<Encoding>({
             popupTitle: "Select an encoding",
             parentElement: undefined,
-            options: ["raw", "jpeg"], //FIXME?
+            options: encodings.slice(),
             renderer: (opt) => new Span({parentElement: undefined, innerText: opt}),
             disabled: params.disableEncoding,
         })
+        const gzipCheckbox = new BooleanInput({parentElement: undefined, value: false, disabled: params.disableEncoding})
         super({...params, children: [
             new Paragraph({parentElement: undefined, cssClasses: [CssClasses.ItkInputParagraph], children: [
                 new Label({
@@ -229,10 +234,19 @@ class PrecomputedChunksDatasinkConfigWidget extends DatasinkInputForm{
             new Paragraph({parentElement: undefined, cssClasses: [CssClasses.ItkInputParagraph], children: [
                 new Label({innerText: "Encoding: ", parentElement: undefined}),
                 encoderSelector,
-            ]})
+            ]}),
+            new Paragraph({parentElement: undefined, cssClasses: [CssClasses.ItkInputParagraph], children: [
+                new Label({
+                    innerText: "Gzip chunks: ",
+                    parentElement: undefined,
+                    title: "Compresses each chunk file with gzip, which mostly pays off for raw and compressed_segmentation chunks"
+                }),
+                gzipCheckbox,
+            ]}),
         ]})
         this.scaleKeyInput = scaleKeyInput
         this.encoderSelector = encoderSelector
+        this.gzipCheckbox = gzipCheckbox
     }
 
     public tryMakeDataSink(params: {
@@ -258,6 +272,9 @@ class PrecomputedChunksDatasinkConfigWidget extends DatasinkInputForm{
             interval: params.interval,
             resolution: params.resolution,
             tile_shape: params.tile_shape,
+            sharding: undefined,
+            compressed_segmentation_block_size: undefined,
+            gzip_chunks: this.gzipCheckbox.value,
         })
     }
 }
@@ -333,9 +350,62 @@ class N5XzCompressorInput{
     }
 }
 
+class N5BloscCompressorInput{
+    private numberInput: NumberInput;
+    constructor(params: {parentElement: ContainerWidget<TagName>, value?: BloscCompressor}){
+        new Label({parentElement: params.parentElement, innerText: "Level: "})
+        this.numberInput = new NumberInput({
+            parentElement: params.parentElement,
+            value: params.value === undefined ? 5 : params.value.clevel,
+            min: 0,
+            max: 9,
+            step: 1
+        })
+    }
+    public getValue(): BloscCompressor | undefined{
+        let clevel = this.numberInput.value
+        return clevel === undefined ? undefined : new BloscCompressor({cname: "lz4", clevel, shuffle: 1, blocksize: 0})
+    }
+    public setValue(value: BloscCompressor | undefined){
+        this.numberInput.value = value?.clevel
+    }
+}
+
+class N5ZstdCompressorInput{
+    private numberInput: NumberInput;
+    constructor(params: {parentElement: ContainerWidget<TagName>, value?: ZstdCompressor}){
+        new Label({parentElement: params.parentElement, innerText: "Level: "})
+        this.numberInput = new NumberInput({
+            parentElement: params.parentElement,
+            value: params.value === undefined ? 3 : params.value.level,
+            min: 1,
+            max: 19,
+            step: 1
+        })
+    }
+    public getValue(): ZstdCompressor | undefined{
+        let level = this.numberInput.value
+        return level === undefined ? undefined : new ZstdCompressor({level})
+    }
+    public setValue(value: ZstdCompressor | undefined){
+        this.numberInput.value = value?.level
+    }
+}
+
+class N5Lz4CompressorInput{
+    public getValue(): Lz4Compressor{
+        return new Lz4Compressor({blockSize: 65536})
+    }
+    public setValue(_value: Lz4Compressor){
+    }
+}
+
 class N5DatasinkConfigWidget extends DatasinkInputForm{
     private compressorParameterContainer: Paragraph;
-    private compressorInput: N5GzipCompressorInput | N5Bzip2CompressorInput | N5XzCompressorInput | N5RawCompressotInput
+    private compressorInput: (
+        N5GzipCompressorInput | N5Bzip2CompressorInput | N5XzCompressorInput | N5BloscCompressorInput | N5ZstdCompressorInput |
+        N5Lz4CompressorInput | N5RawCompressotInput
+    )
     private readonly axisKeysInput: AxesKeysInput;
 
     constructor(params: {parentElement: HTMLElement | undefined, disabled?: boolean}){
@@ -348,10 +418,10 @@ class N5DatasinkConfigWidget extends DatasinkInputForm{
             ]}),
             new Paragraph({parentElement: undefined, cssClasses: [CssClasses.ItkInputParagraph], children: [
                 new Label({parentElement: undefined, innerText: "Compression scheme: "}),
-                new Select<"raw" | "gzip" | "bzip" | "xz">({
+                new Select<"raw" | "gzip" | "bzip" | "xz" | "blosc" | "zstd" | "lz4">({
                     popupTitle: "Select a compression mode",
                     parentElement: undefined,
-                    options: ["raw", "gzip", "bzip", "xz"],
+                    options: ["raw", "gzip", "bzip", "xz", "blosc", "zstd", "lz4"],
                     renderer: (opt) => new Span({parentElement: undefined, innerText: opt}),
                     disabled: params.disabled,
                     onChange: (val) => {
@@ -364,6 +434,12 @@ class N5DatasinkConfigWidget extends DatasinkInputForm{
                             this.compressorInput = new N5Bzip2CompressorInput({parentElement: this.compressorParameterContainer})
                         }else if(val == "xz"){
                             this.compressorInput = new N5XzCompressorInput({parentElement: this.compressorParameterContainer})
+                        }else if(val == "blosc"){
+                            this.compressorInput = new N5BloscCompressorInput({parentElement: this.compressorParameterContainer})
+                        }else if(val == "zstd"){
+                            this.compressorInput = new N5ZstdCompressorInput({parentElement: this.compressorParameterContainer})
+                        }else if(val == "lz4"){
+                            this.compressorInput = new N5Lz4CompressorInput()
                         }else{
                             assertUnreachable(val)
                         }
@@ -412,7 +488,7 @@ export class DatasinkConfigWidget{
             parentElement: params.parentElement,
             tabBodyWidgets: new Map<string, PrecomputedChunksDatasinkConfigWidget | N5DatasinkConfigWidget | DziDatasinkConfigWidget>([
                 ["Deep Zoom", new DziDatasinkConfigWidget({parentElement: undefined})],
-                ["Precomputed Chunks", new PrecomputedChunksDatasinkConfigWidget({parentElement: undefined, disableEncoding: true})],
+                ["Precomputed Chunks", new PrecomputedChunksDatasinkConfigWidget({parentElement: undefined, disableEncoding: false})],
                 ["N5", new N5DatasinkConfigWidget({parentElement: undefined})],
             ])
         })
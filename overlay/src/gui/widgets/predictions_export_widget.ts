@@ -2,7 +2,7 @@ import { Applet } from '../../client/applets/applet';
 import { JsonValue } from '../../util/serialization';
 import { assertUnreachable, createElement, createFieldset } from '../../util/misc';
 import { CollapsableWidget } from './collapsable_applet_gui';
-import { BucketFs, Color, FsDataSource, FsDataSink, Session, PrecomputedChunksSink, Shape5D, ZipFs, DziLevelDataSource } from '../../client/ilastik';
+import { BucketFs, Color, FsDataSource, FsDataSink, Filesystem, Session, PrecomputedChunksSink, Shape5D, ZipFs, DziLevelDataSource } from '../../client/ilastik';
 import { CssClasses } from '../css_classes';
 import { ErrorPopupWidget, PopupWidget } from './popup';
 import {
@@ -110,8 +110,10 @@ class Job{
 
         let dataProxyGuiUrl: Url | undefined = undefined;
 
-        if(jobDto instanceof TransferFileJobDto){
-            const targetUrl = Url.fromDto(jobDto.target_url);
+        if(jobDto instanceof TransferFileJobDto || jobDto instanceof ZipDirectoryJobDto){
+            const targetUrl = jobDto instanceof TransferFileJobDto ?
+                Url.fromDto(jobDto.target_url) :
+                Filesystem.fromDto(jobDto.output_fs).getUrl(Path.parse(jobDto.output_path));
             dataProxyGuiUrl = BucketFs.tryGetDataProxyGuiUrl({url: targetUrl.parent})
             new ButtonWidget({parentElement: out, contents: "Open", onClick: async () => DataSourceSelectionWidget.tryOpenViews({
                 urls: [targetUrl], viewer: params.viewer, session: params.session
@@ -2,7 +2,7 @@ import { Url } from "../util/parsed_url";
 import { ensureJsonArray, ensureJsonNumberTripplet, ensureJsonObject, ensureJsonString, JsonObject, JsonValue } from "../util/serialization"
 
 
-export const encodings = ["raw", "jpeg", "compressed_segmentation"] as const;
+export const encodings = ["raw", "jpeg", "png", "compressed_segmentation"] as const;
 export type Encoding = typeof encodings[number];
 export function ensureEncoding(value: string): Encoding{
     const variant = encodings.find(variant => variant === value)
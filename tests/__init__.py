@@ -4,7 +4,7 @@ from datetime import datetime
 import os
 from pathlib import Path, PurePosixPath
 import time
-from typing import Any, Dict, Literal, Mapping, Sequence, Tuple
+from typing import Any, Dict, List, Literal, Mapping, Sequence, Tuple
 import uuid
 import json
 from collections.abc import Mapping as MappingAbc
@@ -26,12 +26,15 @@ from webilastik.datasource.precomputed_chunks_info import RawEncoder
 from webilastik.datasource.precomputed_chunks_datasource import PrecomputedChunksDataSource
 from webilastik.features.ilp_filter import IlpGaussianSmoothing, IlpHessianOfGaussianEigenvalues
 from webilastik.features.ilp_filter import IlpFilter
+from webilastik.filesystem import FsDirectoryContents, FsFileContents, FsFileNotFoundException, FsIoException, FsRead, IFilesystem
 from webilastik.filesystem.os_fs import OsFs
 from webilastik.filesystem.http_fs import HttpFs
 from webilastik.filesystem.bucket_fs import BucketFs
 from webilastik.ui.applet.brushing_applet import Label
 from webilastik.ui.datasource import try_get_datasources_from_url
+from webilastik.server.rpc.dto import FsDto
 from webilastik.utility import get_now_string
+from webilastik.utility.url import Url
 
 from webilastik.config import (
     WEBILASTIK_ALLOW_LOCAL_FS,
@@ -117,6 +120,36 @@ def get_test_output_bucket_fs() -> Tuple[BucketFs, PurePosixPath]:
     now_str = f"{now.year:02}y{now.month:02}m{now.day:02}d__{now.hour:02}h{now.minute:02}m{now.second:02}s"
     return (BucketFs(bucket_name="hbp-image-service"), PurePosixPath(f"/tmp/test-{now_str}"))
 
+class ReadCountingFs(IFilesystem):
+    """Forwards everything to another filesystem, recording how many reads go through each of read_file and read_files"""
+
+    def __init__(self, fs: IFilesystem) -> None:
+        self.fs = fs
+        self.num_read_file_calls = 0
+        self.read_files_batch_sizes: List[int] = []
+        super().__init__()
+
+    def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
+        return self.fs.list_contents(path)
+    def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        return self.fs.create_file(path=path, contents=contents)
+    def create_directory(self, path: PurePosixPath) -> "None | FsIoException":
+        return self.fs.create_directory(path)
+    def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        self.num_read_file_calls += 1
+        return self.fs.read_file(path, offset=offset, num_bytes=num_bytes)
+    def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+        self.read_files_batch_sizes.append(len(reads))
+        return self.fs.read_files(reads)
+    def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
+        return self.fs.get_size(path)
+    def delete(self, path: PurePosixPath) -> "None | FsIoException":
+        return self.fs.delete(path)
+    def to_dto(self) -> FsDto:
+        return self.fs.to_dto()
+    def geturl(self, path: PurePosixPath) -> Url:
+        return self.fs.geturl(path)
+
 def create_precomputed_chunks_sink(
     *, shape: Shape5D, dtype: "np.dtype[Any]", chunk_size: Shape5D, fs: "OsFs | HttpFs | BucketFs | None" = None
 ) -> PrecomputedChunksSink:
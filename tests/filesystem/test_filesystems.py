@@ -1,13 +1,27 @@
 #pyright: strict
 
-from pathlib import PurePosixPath
-from webilastik.filesystem import create_filesystem_from_url
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import tempfile
+import threading
+import time
+from typing import Dict, List, Set
+from urllib.parse import parse_qs, urlparse
+from pathlib import Path, PurePosixPath
+from aiohttp import ClientSession, web
+import numpy as np
+from webilastik.filesystem import FsFileNotFoundException, create_filesystem_from_url
 from webilastik.filesystem.os_fs import OsFs
 from webilastik.filesystem.bucket_fs import BucketFs
 import uuid
-from zipfile import ZipFile, ZIP_STORED
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
 from webilastik.filesystem.zip_fs import ZipFs
+from webilastik.filesystem.async_fs import AsyncHttpFs
+from webilastik.filesystem.http_fs import HttpFs
+from webilastik.utility.url import Url
+from tests import ReadCountingFs
 
 def test_osfs_bucketfs():
     osfs = OsFs.create()
@@ -29,6 +43,10 @@ def test_osfs_bucketfs():
         retrieved_piece = fs.read_file(file_path, offset=2, num_bytes=3)
         assert(retrieved_piece == contents[2:2+3])
 
+        batched_contents = fs.read_files([(file_path, 0, None), (file_path, 2, 3), (file_path.parent / "missing.txt", 0, None)])
+        assert batched_contents[:2] == [contents, contents[2:2+3]]
+        assert isinstance(batched_contents[2], FsFileNotFoundException)
+
         listing_result = fs.list_contents(file_path.parent)
         assert not isinstance(listing_result, Exception)
         assert file_path in listing_result.files
@@ -38,6 +56,59 @@ def test_osfs_bucketfs():
         assert not isinstance(listing_result, Exception)
         assert file_path not in listing_result.files
 
+def test_osfs_read_file_as_buffer():
+    temp_fs = OsFs.create_scratch_dir()
+    assert not isinstance(temp_fs, Exception), str(temp_fs)
+    file_path = PurePosixPath("/some_tile")
+    contents = bytes(range(256)) * (OsFs.MMAP_MIN_BYTES // 256 + 1)
+    assert not isinstance(temp_fs.create_file(path=file_path, contents=contents), Exception)
+
+    buffer = temp_fs.read_file_as_buffer(file_path)
+    assert isinstance(buffer, memoryview)
+    assert buffer == contents
+    assert temp_fs.read_file_as_buffer(file_path, offset=-10) == contents[-10:]
+    assert temp_fs.read_file_as_buffer(file_path, offset=3, num_bytes=5) == contents[3:3+5]
+    assert isinstance(temp_fs.read_file_as_buffer(PurePosixPath("/missing")), FsFileNotFoundException)
+
+    # rewriting the file must not pull the rug from under buffers that are still alive
+    assert not isinstance(temp_fs.create_file(path=file_path, contents=b"short"), Exception)
+    assert buffer == contents
+    assert temp_fs.read_file_as_buffer(file_path) == b"short"
+
+def test_osfs_create_file_from_chunks():
+    temp_fs = OsFs.create_scratch_dir()
+    assert not isinstance(temp_fs, Exception), str(temp_fs)
+    data = np.arange(1000, dtype=np.uint16).reshape(10, 100)
+
+    assert not isinstance(temp_fs.create_file(path=PurePosixPath("/from_view"), contents=memoryview(data)), Exception)
+    assert temp_fs.read_file(PurePosixPath("/from_view")) == data.tobytes()
+
+    chunks = (memoryview(row) for row in data)
+    assert not isinstance(temp_fs.create_file(path=PurePosixPath("/from_chunks"), contents=chunks), Exception)
+    assert temp_fs.read_file(PurePosixPath("/from_chunks")) == data.tobytes()
+
+
+def test_osfs_listing_skips_files_being_written():
+    temp_fs = OsFs.create_scratch_dir()
+    assert not isinstance(temp_fs, Exception), str(temp_fs)
+    assert not isinstance(temp_fs.create_file(path=PurePosixPath("/dir/done.bin"), contents=b"done"), Exception)
+    # a temp file left behind by a writer that crashed
+    _ = temp_fs.resolve_path(PurePosixPath(f"/dir/.crashed.bin.{uuid.uuid4()}.tmp")).write_bytes(b"partial")
+
+    listings: List[List[str]] = []
+    def chunks():
+        yield b"first half"
+        listing = temp_fs.list_contents(PurePosixPath("/dir"))
+        assert not isinstance(listing, Exception)
+        listings.append(sorted(f.as_posix() for f in listing.files))
+        yield b"second half"
+
+    assert not isinstance(temp_fs.create_file(path=PurePosixPath("/dir/in_progress.bin"), contents=chunks()), Exception)
+    assert listings == [["/dir/done.bin"]]
+    listing = temp_fs.list_contents(PurePosixPath("/dir"))
+    assert not isinstance(listing, Exception)
+    assert sorted(f.as_posix() for f in listing.files) == ["/dir/done.bin", "/dir/in_progress.bin"]
+
 
 def test_zip_fs():
     temp_fs = OsFs.create_scratch_dir()
@@ -106,10 +177,342 @@ def test_zip_fs():
     assert zip_fs.read_file(PurePosixPath(entry1_path)) == entry1_contents
 
 
+def test_zip_fs_ranged_reads():
+    temp_fs = OsFs.create_scratch_dir()
+    assert not isinstance(temp_fs, Exception), str(temp_fs)
+    zip_path = PurePosixPath("/ranged.zip")
+    stored_contents = np.random.default_rng(0).integers(0, 256, size=100_000, dtype=np.uint8).tobytes()
+    deflated_contents = b"0123456789" * 1000
+    with ZipFile(temp_fs.resolve_path(zip_path), mode="w") as zip_file:
+        zip_file.writestr("stored.bin", stored_contents, compress_type=ZIP_STORED)
+        zip_file.writestr("dir/deflated.txt", deflated_contents, compress_type=ZIP_DEFLATED)
+        zip_file.writestr("empty.bin", b"")
+
+    zip_fs = ZipFs.create(zip_file_fs=temp_fs, zip_file_path=zip_path)
+    assert not isinstance(zip_fs, Exception), str(zip_fs)
+    for offset, num_bytes in [(0, 10), (50_000, 1234), (len(stored_contents) - 7, 7), (0, len(stored_contents))]:
+        assert zip_fs.read_file(PurePosixPath("/stored.bin"), offset=offset, num_bytes=num_bytes) == stored_contents[offset:offset + num_bytes]
+    assert isinstance(zip_fs.read_file(PurePosixPath("/stored.bin"), offset=len(stored_contents) - 7, num_bytes=8), Exception)
+    assert zip_fs.read_file(PurePosixPath("/dir/deflated.txt"), offset=4321, num_bytes=5) == deflated_contents[4321:4326]
+    assert zip_fs.read_file(PurePosixPath("/dir/deflated.txt")) == deflated_contents
+    assert zip_fs.read_file(PurePosixPath("/empty.bin")) == b""
+    assert isinstance(zip_fs.read_file(PurePosixPath("/missing.bin")), FsFileNotFoundException)
+
+    # an archive that was rewritten is not served from the directory cached for its previous version
+    with ZipFile(temp_fs.resolve_path(zip_path), mode="w") as zip_file:
+        zip_file.writestr("other.bin", b"other contents")
+    zip_fs = ZipFs.create(zip_file_fs=temp_fs, zip_file_path=zip_path)
+    assert not isinstance(zip_fs, Exception), str(zip_fs)
+    assert zip_fs.read_file(PurePosixPath("/other.bin")) == b"other contents"
+    assert not zip_fs.exists(PurePosixPath("/stored.bin"))
+
+
+def test_zip_fs_batched_reads():
+    temp_fs = OsFs.create_scratch_dir()
+    assert not isinstance(temp_fs, Exception), str(temp_fs)
+    zip_path = PurePosixPath("/batched.zip")
+    stored_contents = np.random.default_rng(1).integers(0, 256, size=50_000, dtype=np.uint8).tobytes()
+    deflated_contents = b"abcdefghij" * 1000
+    with ZipFile(temp_fs.resolve_path(zip_path), mode="w") as zip_file:
+        zip_file.writestr("stored.bin", stored_contents, compress_type=ZIP_STORED)
+        zip_file.writestr("deflated.txt", deflated_contents, compress_type=ZIP_DEFLATED)
+        zip_file.writestr("empty.bin", b"")
+
+    counting_fs = ReadCountingFs(temp_fs)
+    zip_fs = ZipFs.create(zip_file_fs=counting_fs, zip_file_path=zip_path)
+    assert not isinstance(zip_fs, Exception), str(zip_fs)
+    num_read_file_calls = counting_fs.num_read_file_calls
+    num_batches = len(counting_fs.read_files_batch_sizes)
+
+    results = zip_fs.read_files([
+        (PurePosixPath("/stored.bin"), 100, 10),
+        (PurePosixPath("/stored.bin"), 40_000, 1000),
+        (PurePosixPath("/deflated.txt"), 0, None),
+        (PurePosixPath("/missing.bin"), 0, None),
+        (PurePosixPath("/empty.bin"), 0, None),
+    ])
+    assert results[0] == stored_contents[100:110]
+    assert results[1] == stored_contents[40_000:41_000]
+    assert results[2] == deflated_contents
+    assert isinstance(results[3], FsFileNotFoundException)
+    assert results[4] == b""
+    # all archive reads of the batch go out together instead of once per member
+    assert counting_fs.num_read_file_calls == num_read_file_calls
+    assert len(counting_fs.read_files_batch_sizes) == num_batches + 1
+
+
+def test_writable_zip_fs():
+    temp_fs = OsFs.create_scratch_dir()
+    assert not isinstance(temp_fs, Exception), str(temp_fs)
+    zip_path = PurePosixPath("/exports/streamed.zip")
+    contents = np.random.default_rng(0).integers(0, 256, size=100_000, dtype=np.uint8).tobytes()
+
+    zip_fs = ZipFs.create_writable(zip_file_fs=temp_fs, zip_file_path=zip_path, chunk_size=1024, max_queued_chunks=2)
+    assert zip_fs.create_file(path=PurePosixPath("/single.bin"), contents=contents) is None
+    chunks = (memoryview(contents)[start:start + 999] for start in range(0, len(contents), 999))
+    assert zip_fs.create_file(path=PurePosixPath("/dir/chunked.bin"), contents=chunks) is None
+    assert isinstance(zip_fs.create_file(path=PurePosixPath("/single.bin"), contents=b"again"), Exception)
+    # members can't be read back while the archive is still being streamed out
+    assert isinstance(zip_fs.read_file(PurePosixPath("/single.bin")), Exception)
+    assert zip_fs.close() is None
+
+    assert zip_fs.read_file(PurePosixPath("/dir/chunked.bin"), offset=500, num_bytes=10) == contents[500:510]
+    with ZipFile(temp_fs.resolve_path(zip_path)) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.read("single.bin") == contents
+        assert zip_file.read("dir/chunked.bin") == contents
+
+    reopened_zip_fs = ZipFs.create(zip_file_fs=temp_fs, zip_file_path=zip_path)
+    assert not isinstance(reopened_zip_fs, Exception), str(reopened_zip_fs)
+    assert reopened_zip_fs.read_file(PurePosixPath("/single.bin")) == contents
+
+    # rewriting the archive with members of the same sizes doesn't leave its old directory behind in the cache
+    new_contents = bytes(reversed(contents))
+    rewriting_zip_fs = ZipFs.create_writable(zip_file_fs=temp_fs, zip_file_path=zip_path)
+    assert rewriting_zip_fs.create_file(path=PurePosixPath("/single.bin"), contents=new_contents[100:]) is None
+    new_chunked_contents = new_contents[-100:] + new_contents
+    new_chunks = (memoryview(new_chunked_contents)[start:start + 999] for start in range(0, len(new_chunked_contents), 999))
+    assert rewriting_zip_fs.create_file(path=PurePosixPath("/dir/chunked.bin"), contents=new_chunks) is None
+    assert rewriting_zip_fs.close() is None
+    assert temp_fs.get_size(zip_path) == zip_fs.zip_file_size
+    reopened_zip_fs = ZipFs.create(zip_file_fs=temp_fs, zip_file_path=zip_path)
+    assert not isinstance(reopened_zip_fs, Exception), str(reopened_zip_fs)
+    assert reopened_zip_fs.read_file(PurePosixPath("/dir/chunked.bin"), offset=10, num_bytes=20) == new_contents[-90:-70]
+
+    # an aborted archive is never published, neither at a new path nor over an existing archive
+    for abort_path in [PurePosixPath("/exports/aborted.zip"), zip_path]:
+        aborted_zip_fs = ZipFs.create_writable(zip_file_fs=temp_fs, zip_file_path=abort_path, chunk_size=1024)
+        assert aborted_zip_fs.create_file(path=PurePosixPath("/single.bin"), contents=contents) is None
+        assert aborted_zip_fs.abort() is None
+        assert isinstance(aborted_zip_fs.create_file(path=PurePosixPath("/other.bin"), contents=b"other"), Exception)
+    assert not temp_fs.exists(PurePosixPath("/exports/aborted.zip"))
+    with ZipFile(temp_fs.resolve_path(zip_path)) as zip_file:
+        assert zip_file.read("single.bin") == new_contents[100:]
+
+def test_async_http_fs():
+    uploads: Dict[str, bytes] = {}
+
+    async def handle_upload(request: web.Request) -> web.Response:
+        uploads[request.match_info["name"]] = await request.read()
+        return web.Response()
+
+    async def check_async_http_fs(served_dir: Path):
+        app = web.Application()
+        app.add_routes([web.post("/uploads/{name}", handle_upload), web.static("/", served_dir)])
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        port: int = runner.addresses[0][1]
+        try:
+            async with ClientSession() as session:
+                fs = AsyncHttpFs(HttpFs(protocol="http", hostname="127.0.0.1", port=port, path=PurePosixPath("/")), session=session)
+                assert await fs.read_file(PurePosixPath("/file.bin")) == b"0123456789"
+                assert await fs.read_file(PurePosixPath("/file.bin"), offset=2, num_bytes=3) == b"234"
+                assert await fs.get_size(PurePosixPath("/file.bin")) == 10
+                assert isinstance(await fs.read_file(PurePosixPath("/missing.bin")), FsFileNotFoundException)
+                assert await fs.exists(PurePosixPath("/missing.bin")) == False
+
+                assert await fs.create_file(path=PurePosixPath("/uploads/single.bin"), contents=b"0123") is None
+                chunked_contents = [b"01", memoryview(b"2345"), memoryview(np.arange(3, dtype=np.uint16))]
+                assert await fs.create_file(path=PurePosixPath("/uploads/chunked.bin"), contents=chunked_contents) is None
+        finally:
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _ = (Path(tmp_dir) / "file.bin").write_bytes(b"0123456789")
+        asyncio.run(check_async_http_fs(Path(tmp_dir)))
+    assert uploads == {"single.bin": b"0123", "chunked.bin": b"012345" + np.arange(3, dtype=np.uint16).tobytes()}
+
+def test_bucket_fs_caches_object_urls():
+    object_contents = b"0123456789"
+    data_proxy_requests: List[str] = []
+    valid_signatures: Set[str] = set()
+    existing_objects: Set[str] = {"some/object.bin"}
+
+    class FakeDataProxyHandler(BaseHTTPRequestHandler):
+        """Mimics the data-proxy redirecting to signed object urls, and the object store checking their signatures"""
+
+        def _respond(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            _ = self.wfile.write(body)
+
+        def do_HEAD(self):
+            object_path = urlparse(self.path).path[len("/swift/test-bucket/"):]
+            # like the real data-proxy, the fake one signs urls for any path, so only the object store knows what exists
+            self.send_response(200 if object_path in existing_objects else 404)
+            self.send_header("Content-Length", str(len(object_contents)))
+            self.end_headers()
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/api/v1/buckets/test-bucket":
+                prefix = parse_qs(url.query).get("prefix", [""])[0]
+                objects = [{"name": name} for name in sorted(existing_objects) if name.startswith(prefix)]
+                return self._respond(200, json.dumps({"objects": objects}).encode("utf8"))
+            if url.path.startswith("/api/v1/buckets/"):
+                data_proxy_requests.append(url.path)
+                signature = f"sig{len(data_proxy_requests)}"
+                valid_signatures.add(signature)
+                object_path = url.path[len("/api/v1/buckets/"):]
+                object_url = f"http://127.0.0.1:{port}/swift/{object_path}?temp_url_sig={signature}&temp_url_expires={int(time.time()) + 3600}"
+                return self._respond(200, json.dumps({"url": object_url}).encode("utf8"))
+            if parse_qs(url.query)["temp_url_sig"][0] not in valid_signatures:
+                return self._respond(401, b"")
+            range_start, range_end = self.headers["Range"][len("bytes="):].split("-")
+            return self._respond(200, object_contents[int(range_start) : int(range_end) + 1 if range_end else None])
+
+        def do_PUT(self):
+            url = urlparse(self.path)
+            if url.path.startswith("/api/v1/buckets/"):
+                object_path = url.path[len("/api/v1/buckets/"):]
+                object_url = f"http://127.0.0.1:{port}/swift/{object_path}?temp_url_sig=upload"
+                return self._respond(200, json.dumps({"url": object_url}).encode("utf8"))
+            _ = self.rfile.read(int(self.headers["Content-Length"]))
+            return self._respond(201, b"")
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDataProxyHandler)
+    port = server.server_address[1]
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    class LocalBucketFs(BucketFs):
+        API_URL = Url(protocol="http", hostname="127.0.0.1", port=port, path=PurePosixPath("/api/v1/buckets"))
+
+    try:
+        fs = LocalBucketFs(bucket_name="test-bucket")
+        path = PurePosixPath("/some/object.bin")
+        assert fs.read_file(path) == object_contents
+        assert fs.read_file(path, offset=2, num_bytes=3) == object_contents[2:2+3]
+        assert fs.get_size(path) == len(object_contents)
+        assert len(data_proxy_requests) == 1
+
+        valid_signatures.clear() # the object store stops accepting the cached url before it was expected to expire
+        assert fs.read_file(path) == object_contents
+        assert len(data_proxy_requests) == 2
+
+        # overwriting the object must not leave a url to its previous version behind
+        osfs = OsFs.create()
+        assert not isinstance(osfs, Exception)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = PurePosixPath(tmp_dir) / "source.bin"
+            _ = Path(source_path).write_bytes(object_contents)
+            assert fs.transfer_file(source_fs=osfs, source_path=source_path, target_path=path) is None
+        assert fs.read_file(path) == object_contents
+        assert len(data_proxy_requests) == 3
+
+        assert fs.exists(path) == True
+        assert fs.exists(PurePosixPath("/some")) == True
+        assert fs.exists(PurePosixPath("/some/missing.bin")) == False
+        # an object deleted behind this process' back stops existing, even though its url is still cached and unexpired
+        existing_objects.clear()
+        assert fs.get_cached_swift_object_url(path) is not None
+        assert fs.exists(path) == False
+        assert fs.get_cached_swift_object_url(path) is None
+    finally:
+        server.shutdown()
+
+def test_bucket_fs_paginates_and_caches_listings():
+    object_names = sorted([f"dir/file{i}.bin" for i in range(7)] + ["dir/subdir/file.bin"])
+    listing_requests: List[str] = []
+
+    class FakeDataProxyHandler(BaseHTTPRequestHandler):
+        def _respond(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            _ = self.wfile.write(body)
+
+        def do_HEAD(self):
+            object_name = urlparse(self.path).path[len("/swift/"):]
+            self.send_response(200 if object_name in object_names else 404)
+            self.send_header("Content-Length", "10")
+            self.end_headers()
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            object_name = url.path[len("/api/v1/buckets/test-bucket/"):]
+            if object_name:
+                if object_name not in object_names:
+                    return self._respond(404, b"")
+                object_url = f"http://127.0.0.1:{port}/swift/{object_name}?temp_url_expires={int(time.time()) + 3600}"
+                return self._respond(200, json.dumps({"url": object_url}).encode("utf8"))
+            listing_requests.append(self.path)
+            query = parse_qs(url.query)
+            prefix = query.get("prefix", [""])[0]
+            marker = query.get("marker", [""])[0]
+            entries: List[str] = []
+            for name in object_names:
+                if not name.startswith(prefix):
+                    continue
+                entry = prefix + name[len(prefix):].split("/")[0] + ("/" if "/" in name[len(prefix):] else "")
+                if entry > marker and entry not in entries:
+                    entries.append(entry)
+            page = [{"subdir": e} if e.endswith("/") else {"name": e} for e in entries[:int(query["limit"][0])]]
+            return self._respond(200, json.dumps({"objects": page}).encode("utf8"))
+
+        def do_PUT(self):
+            url = urlparse(self.path)
+            if url.path.startswith("/api/v1/buckets/"):
+                object_name = url.path[len("/api/v1/buckets/test-bucket/"):]
+                object_url = f"http://127.0.0.1:{port}/swift/{object_name}?temp_url_expires={int(time.time()) + 3600}"
+                return self._respond(200, json.dumps({"url": object_url}).encode("utf8"))
+            _ = self.rfile.read(int(self.headers["Content-Length"]))
+            object_names.append(url.path[len("/swift/"):])
+            object_names.sort()
+            return self._respond(201, b"")
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDataProxyHandler)
+    port = server.server_address[1]
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    class LocalBucketFs(BucketFs):
+        API_URL = Url(protocol="http", hostname="127.0.0.1", port=port, path=PurePosixPath("/api/v1/buckets"))
+
+    try:
+        fs = LocalBucketFs(bucket_name="test-bucket")
+        listing = fs.list_contents(PurePosixPath("/dir"), page_size=3)
+        assert not isinstance(listing, Exception)
+        assert sorted(f.as_posix() for f in listing.files) == [f"/dir/file{i}.bin" for i in range(7)]
+        assert listing.directories == [PurePosixPath("/dir/subdir")]
+        assert len(listing_requests) == 3
+
+        _ = fs.list_contents(PurePosixPath("/dir"), page_size=3)
+        assert len(listing_requests) == 3 # served from the listing cache
+
+        fs.invalidate_listings(PurePosixPath("/dir/file0.bin"))
+        _ = fs.list_contents(PurePosixPath("/dir"), page_size=3)
+        assert len(listing_requests) == 6
+
+        assert fs.exists(PurePosixPath("/dir/file3.bin")) == True
+        assert fs.exists(PurePosixPath("/dir/subdir")) == True
+        assert fs.exists(PurePosixPath("/dir/nothing_here")) == False
+
+        osfs = OsFs.create()
+        assert not isinstance(osfs, Exception)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = PurePosixPath(tmp_dir) / "source.bin"
+            _ = Path(source_path).write_bytes(b"0123456789")
+            assert fs.transfer_file(source_fs=osfs, source_path=source_path, target_path=PurePosixPath("/dir/file7.bin")) is None
+        listing = fs.list_contents(PurePosixPath("/dir"), page_size=3)
+        assert not isinstance(listing, Exception)
+        assert sorted(f.as_posix() for f in listing.files) == [f"/dir/file{i}.bin" for i in range(8)]
+    finally:
+        server.shutdown()
+
+
 if __name__ == "__main__":
     import inspect
     import sys
     for item_name, item in inspect.getmembers(sys.modules[__name__]):
         if inspect.isfunction(item) and item_name.startswith('test'):
             print(f"Running test: {item_name}")
-            item()
\ No newline at end of file
+            item()
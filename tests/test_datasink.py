@@ -1,7 +1,8 @@
 #pyright: strict
+from typing import List, Tuple
 from tests import create_tmp_dir
 from webilastik.filesystem.os_fs import OsFs
-from pathlib import PurePosixPath
+from pathlib import Path, PurePosixPath
 
 import numpy as np
 from ndstructs.point5D import Point5D, Shape5D
@@ -12,7 +13,11 @@ from webilastik.datasink.precomputed_chunks_sink import PrecomputedChunksSink
 from webilastik.datasource import DataRoi
 from webilastik.datasource.array_datasource import ArrayDataSource
 from webilastik.datasource.n5_datasource import N5DataSource
-from webilastik.datasource.precomputed_chunks_info import RawEncoder
+from webilastik.datasource.precomputed_chunks_info import (
+    CompressedSegmentationEncoder, JpegEncoder, PngEncoder, PrecomputedChunksEncoder, PrecomputedChunksInfo, RawEncoder
+)
+from webilastik.datasource.precomputed_chunks_datasource import PrecomputedChunksDataSource
+from webilastik.datasource.precomputed_chunks_sharding import PrecomputedChunksSharding
 from webilastik.datasource.n5_attributes import RawCompressor
 
 
@@ -137,6 +142,99 @@ def test_writing_to_offset_precomputed_chunks():
     assert (reloaded_data.raw("xyz") == data.raw("xyz")).all()
 
 
+def test_writing_to_sharded_precomputed_chunks():
+    tmp_path = create_tmp_dir(prefix="test_writing_to_sharded_precomputed_chunks")
+    data_at_1000_1000 = data.translated(Point5D(x=1000, y=1000) - data.location)
+    datasource = ArrayDataSource(data=data_at_1000_1000, tile_shape=Shape5D(x=4, y=4, z=4))
+    filesystem = OsFs.create()
+    assert not isinstance(filesystem, Exception)
+    sharding = PrecomputedChunksSharding.create_for_volume(
+        grid_shape=PrecomputedChunksSharding.get_grid_shape(scale_interval=datasource.interval, chunk_shape=datasource.tile_shape),
+        chunks_per_shard=4,
+        data_encoding="gzip",
+    )
+
+    datasink = PrecomputedChunksSink(
+        filesystem=filesystem,
+        path=tmp_path / "mytest.precomputed",
+        dtype=datasource.dtype,
+        encoding=RawEncoder(),
+        interval=datasource.interval,
+        resolution=datasource.spatial_resolution,
+        scale_key=PurePosixPath("my_test_data"),
+        tile_shape=datasource.tile_shape,
+        sharding=sharding,
+    )
+    assert datasink.tile_shape != datasource.tile_shape
+    sink_writer = datasink.open()
+    assert not isinstance(sink_writer, Exception), str(sink_writer)
+
+    for tile in DataRoi(datasource).split(datasink.tile_shape):
+        writing_result = sink_writer.write(tile.retrieve())
+        assert not isinstance(writing_result, Exception)
+
+    assert len(list(Path(tmp_path / "mytest.precomputed/my_test_data").iterdir())) == 3 * 2 * 2 # shards of 2x2x1 chunks
+    precomp_datasource = PrecomputedChunksDataSource.try_load(
+        filesystem=filesystem, path=datasink.path, spatial_resolution=datasink.resolution
+    )
+    assert isinstance(precomp_datasource, PrecomputedChunksDataSource), str(precomp_datasource)
+    assert precomp_datasource == datasink.to_datasource()
+    assert precomp_datasource.retrieve() == data_at_1000_1000
+
+def test_writing_encoded_precomputed_chunks():
+    tmp_path = create_tmp_dir(prefix="test_writing_encoded_precomputed_chunks")
+    filesystem = OsFs.create()
+    assert not isinstance(filesystem, Exception)
+
+    rgb_data = Array5D( # pyright: ignore [reportUnknownMemberType]
+        (np.arange(20 * 10 * 7 * 3).reshape(20, 10, 7, 3) % 256).astype(np.uint8), axiskeys="xyzc"
+    )
+    labels_data = Array5D((np.arange(20 * 10 * 7).reshape(20, 10, 7) // 50).astype(np.uint64), axiskeys="xyz") # pyright: ignore [reportUnknownMemberType]
+    encodings: List[Tuple[Array5D, PrecomputedChunksEncoder, bool]] = [
+        (data, RawEncoder(), True),
+        (rgb_data, PngEncoder(), False),
+        (rgb_data, JpegEncoder(quality=100), False),
+        (labels_data, CompressedSegmentationEncoder(block_size=(4, 4, 2)), True),
+    ]
+    for idx, (test_data, encoding, gzip_chunks) in enumerate(encodings):
+        datasource = ArrayDataSource(data=test_data, tile_shape=Shape5D(x=8, y=8, z=4, c=test_data.shape.c))
+        datasink = PrecomputedChunksSink(
+            filesystem=filesystem,
+            path=tmp_path / f"encoded_{idx}.precomputed",
+            dtype=datasource.dtype,
+            encoding=encoding,
+            interval=datasource.interval,
+            resolution=datasource.spatial_resolution,
+            scale_key=PurePosixPath("my_test_data"),
+            tile_shape=datasource.tile_shape,
+            gzip_chunks=gzip_chunks,
+        )
+        assert encoding.check_compatibility(dtype=datasource.dtype, num_channels=datasource.shape.c) is None
+        sink_writer = datasink.open()
+        assert not isinstance(sink_writer, Exception), str(sink_writer)
+        for tile in datasource.roi.get_datasource_tiles():
+            writing_result = sink_writer.write(tile.retrieve())
+            assert not isinstance(writing_result, Exception)
+
+        info = PrecomputedChunksInfo.tryLoad(filesystem=filesystem, path=datasink.path / "info")
+        assert not isinstance(info, Exception), str(info)
+        # the jpeg quality is a property of the writer and is not recorded in the info file
+        assert info.scales[0].encoding.to_json_value() == encoding.to_json_value()
+
+        reloaded_data = PrecomputedChunksDataSource.from_dto(datasink.to_datasource().to_dto())
+        assert not isinstance(reloaded_data, Exception), str(reloaded_data)
+        if isinstance(encoding, JpegEncoder):
+            difference = reloaded_data.retrieve().raw("xyzc").astype(np.int32) - test_data.raw("xyzc").astype(np.int32)
+            assert np.abs(difference).mean() < 8
+        else:
+            assert reloaded_data.retrieve() == test_data
+
+    assert CompressedSegmentationEncoder().check_compatibility(dtype=np.dtype("uint8"), num_channels=1) is not None
+    assert JpegEncoder().check_compatibility(dtype=np.dtype("uint8"), num_channels=2) is not None
+    assert JpegEncoder(quality=90) == JpegEncoder(quality=90)
+    assert JpegEncoder(quality=90) != JpegEncoder(quality=50)
+
+
 if __name__ == "__main__":
     import inspect
     import sys
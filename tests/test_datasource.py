@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from typing import Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 import tempfile
 from pathlib import PurePosixPath
 import pickle
@@ -12,21 +12,30 @@ import json
 import skimage.io
 from ndstructs.point5D import Shape5D, Interval5D, Point5D
 from ndstructs.array5D import Array5D
-from tests import get_sample_c_cells_datasource, get_test_output_bucket_fs
+from tests import ReadCountingFs, get_sample_c_cells_datasource, get_test_output_bucket_fs
 from webilastik.datasink.deep_zoom_sink import DziLevelSink
 
 from webilastik.datasource import DataRoi
 from webilastik.datasink.n5_dataset_sink import N5DataSink
 from webilastik.datasource.deep_zoom_datasource import DziLevelDataSource
 from webilastik.datasource.deep_zoom_image import DziImageElement, DziSizeElement
-from webilastik.datasource.n5_datasource import N5DataSource
-from webilastik.datasource.n5_attributes import N5Compressor, RawCompressor
-from webilastik.datasource import DataSource
+from webilastik.datasource.n5_datasource import N5Block, N5BlockMode, N5DataSource, decode_n5_object, encode_n5_object
+from webilastik.datasource.n5_attributes import (
+    BloscCompressor, GzipCompressor, Lz4Compressor, N5Compressor, RawCompressor, ZstdCompressor
+)
+from webilastik.datasource import DataSource, DataSourceRegistry, FsDataSource
 from webilastik.datasource.array_datasource import ArrayDataSource
+from webilastik.datasource.read_ahead import ReadAhead
 from webilastik.datasource.skimage_datasource import SkimageDataSource
-from webilastik.filesystem import IFilesystem
+from webilastik.datasource.zarr_datasource import ZarrDataSource
+from webilastik.datasource.precomputed_chunks_datasource import PrecomputedChunksDataSource
+from webilastik.datasource.precomputed_chunks_info import PrecomputedChunksInfo, PrecomputedChunksScale, RawEncoder
+from webilastik.datasource.precomputed_chunks_sharding import PrecomputedChunksSharding, murmurhash3_x86_128
+from webilastik.datasink.zarr_sink import ZarrDataSink
+from webilastik.filesystem import FsFileNotFoundException, FsIoException, FsRead, IFilesystem
 from webilastik.filesystem.os_fs import OsFs
 from webilastik.ui.applet.export_jobs import DownscaleDatasource, ZipDirectoryJob
+from webilastik.server.rpc.dto import SkimageDataSourceDto
 from webilastik.utility import get_now_string
 
 # fmt: off
@@ -153,6 +162,20 @@ def test_retrieve_roi_smaller_than_tile():
     assert np.all(smaller_than_tile.raw("cyx") == expected_cyx)
 
 
+def test_n5_datasource_batches_chunk_reads():
+    data = Array5D(np.arange(20 * 30).reshape(20, 30).astype(np.uint16), axiskeys="yx")
+    fs, path = create_n5(data, chunk_size=Shape5D(x=10, y=10))
+    counting_fs = ReadCountingFs(fs)
+    ds = N5DataSource.try_load(path=path, filesystem=counting_fs)
+    assert not isinstance(ds, Exception), str(ds)
+    num_read_file_calls = counting_fs.num_read_file_calls
+
+    assert ds.retrieve() == data
+    # the 6 chunks are fetched with one read_files instead of one read_file each
+    assert counting_fs.num_read_file_calls == num_read_file_calls
+    assert counting_fs.read_files_batch_sizes == [6]
+
+
 def test_n5_datasource():
     # fmt: off
     data = Array5D(np.asarray([
@@ -180,6 +203,135 @@ def test_n5_datasource():
     ds2 = pickle.loads(pickle.dumps(ds))
     assert ds2.retrieve(x=(0, 3), y=(0, 2)) == expected_raw_piece
 
+def test_n5_compressors_roundtrip():
+    data = Array5D(np.arange(20 * 30 * 3).reshape(3, 20, 30).astype(np.uint16), axiskeys="cyx")
+    for compression in [GzipCompressor(), BloscCompressor(shuffle=2), ZstdCompressor(), Lz4Compressor(blockSize=256)]:
+        fs, path = create_n5(data, chunk_size=Shape5D(x=8, y=8, c=3), compression=compression)
+        ds = N5DataSource.try_load(path=path, filesystem=fs)
+        assert not isinstance(ds, Exception), str(ds)
+        assert ds.compressor == compression
+        assert ds.retrieve() == data
+
+def test_gzip_decompress_into_reads_every_member():
+    compressor = GzipCompressor()
+    first = np.arange(100_000, dtype=np.uint32)
+    second = np.arange(50_000, dtype=np.uint32)[::-1].copy()
+    compressed = compressor.compress(first.tobytes()) + compressor.compress(second.tobytes())
+
+    out = np.zeros(first.size + second.size, dtype=np.uint32)
+    assert compressor.decompress_into(compressed, out)
+    assert np.all(out == np.concatenate([first, second]))
+    assert bytes(compressor.decompress(compressed)) == out.tobytes()
+
+    try:
+        _ = compressor.decompress_into(compressed[:-10], np.zeros_like(out))
+        raised = False
+    except ValueError:
+        raised = True
+    assert raised, "Truncated gzip data should not decompress"
+
+def test_n5_block_modes():
+    block = N5Block(np.arange(4 * 5 * 6).reshape(4, 5, 6).astype(np.float32), axiskeys="zyx")
+    for compression in [RawCompressor(), GzipCompressor()]:
+        for mode in [N5BlockMode.DEFAULT, N5BlockMode.VARLENGTH]:
+            data = b"".join(block.to_n5_chunks(axiskeys="zyx", compression=compression, mode=mode))
+            parsed = N5Block.from_bytes(data, c_axiskeys="zyx", dtype=block.dtype, compression=compression, location=Point5D.zero())
+            assert parsed == block
+
+        object_block = b"".join(encode_n5_object(b"some opaque contents", compression))
+        assert bytes(decode_n5_object(object_block, compression)) == b"some opaque contents" # pyright: ignore
+        try:
+            _ = N5Block.from_bytes(object_block, c_axiskeys="zyx", dtype=block.dtype, compression=compression, location=Point5D.zero())
+            raised = False
+        except ValueError:
+            raised = True
+        assert raised, "An object block should not parse as an array block"
+
+def test_zarr_datasource_and_sink():
+    data = Array5D(np.arange(3 * 20 * 30).reshape(3, 20, 30).astype(np.uint16), axiskeys="cyx")
+    fs = OsFs.create()
+    assert not isinstance(fs, Exception)
+    for zarr_format, shard_shape in [(2, None), (3, None), (3, Shape5D(x=16, y=16, c=3))]:
+        sink = ZarrDataSink(
+            filesystem=fs,
+            path=PurePosixPath(tempfile.mkstemp()[1] + ".zarr/data"),
+            interval=data.interval,
+            chunk_shape=Shape5D(x=8, y=8, c=3),
+            shard_shape=shard_shape,
+            c_axiskeys="cyx",
+            dtype=data.dtype,
+            compressor=ZstdCompressor(),
+            zarr_format=zarr_format,
+        )
+        sink_writer = sink.open()
+        assert not isinstance(sink_writer, Exception)
+        for tile in data.split(sink.tile_shape):
+            writing_result = sink_writer.write(tile)
+            assert not isinstance(writing_result, Exception)
+
+        datasources = ZarrDataSource.try_open(fs=fs, path=sink.path)
+        assert isinstance(datasources, tuple), str(datasources)
+        ds = datasources[0]
+        assert ds == sink.to_datasource()
+        assert ds.tile_shape == Shape5D(x=8, y=8, c=3)
+        assert ds.retrieve() == data
+        assert ds.retrieve(x=(5, 19), y=(3, 17)) == data.cut(x=(5, 19), y=(3, 17))
+
+        ds2 = ZarrDataSource.from_dto(ds.to_dto())
+        assert not isinstance(ds2, Exception)
+        assert ds2.retrieve() == data
+
+def test_murmurhash3_x86_128_reference_vectors():
+    # expected values are those of the reference C implementation (SMHasher's MurmurHash3_x86_128, as bundled in mmh3)
+    vectors = [
+        (b"", 0, "00000000000000000000000000000000"),
+        (b"", 1, "ecadc488b901d254b901d254b901d254"),
+        (b"hello", 0, "a044242bf7de91dbb631db9ab631db9a"),
+        (b"The quick brown fox jumps over the lazy dog", 0, "c383152f672ceeec6cf67b5d2c1de9e5"),
+        (bytes(range(33)), 0x9747B28C, "3dca97b4d73f0dbc8ec9e0598eaa0624"),
+        ((123456789).to_bytes(8, "little"), 0, "27181a19fc766512fc766512fc766512"),
+    ]
+    for key, seed, expected_hash in vectors:
+        assert murmurhash3_x86_128(key, seed=seed).hex() == expected_hash
+
+def test_sharded_precomputed_chunks_datasource():
+    data = Array5D(np.arange(3 * 20 * 30).reshape(3, 20, 30).astype(np.uint16), axiskeys="zyx")
+    chunk_shape = Shape5D(x=8, y=8, z=2)
+    sharding = PrecomputedChunksSharding(
+        preshift_bits=1, hash="murmurhash3_x86_128", minishard_bits=2, shard_bits=1, minishard_index_encoding="gzip"
+    )
+    info = PrecomputedChunksInfo(type_="image", data_type=data.dtype, num_channels=1, scales=tuple([
+        PrecomputedChunksScale(
+            key=PurePosixPath("data"),
+            size=(30, 20, 3),
+            resolution=(1, 1, 1),
+            voxel_offset=(0, 0, 0),
+            chunk_sizes=((8, 8, 2),),
+            encoding=RawEncoder(),
+            sharding=sharding,
+        )
+    ]))
+    fs = OsFs.create()
+    assert not isinstance(fs, Exception)
+    path = PurePosixPath(tempfile.mkstemp()[1] + ".precomputed")
+
+    shards: Dict[int, Dict[int, "bytes | memoryview"]] = {}
+    for chunk in data.split(chunk_shape):
+        chunk_id = sharding.get_chunk_id(tile=chunk.interval, scale_interval=data.interval, chunk_shape=chunk_shape)
+        shard, _ = sharding.get_shard_and_minishard(chunk_id)
+        shards.setdefault(shard, {})[chunk_id] = RawEncoder().encode(chunk)
+    assert len(shards) == 2
+    for shard, chunks in shards.items():
+        shard_path = path / "data" / sharding.get_shard_file_name(shard)
+        assert not isinstance(fs.create_file(path=shard_path, contents=sharding.encode_shard(chunks)), Exception)
+    assert not isinstance(fs.create_file(path=path / "info", contents=json.dumps(info.to_json_value()).encode("utf8")), Exception)
+
+    ds = PrecomputedChunksDataSource.try_load(filesystem=fs, path=path, spatial_resolution=(1, 1, 1))
+    assert isinstance(ds, PrecomputedChunksDataSource), str(ds)
+    assert ds.sharding == sharding
+    assert ds.retrieve() == data
+    assert ds.retrieve(x=(5, 19), y=(3, 17)) == data.cut(x=(5, 19), y=(3, 17))
+
 # def test_h5_datasource():
 #     data_2d = Array5D(np.arange(100).reshape(10, 10), axiskeys="yx")
 #     h5_path = create_h5(data_2d, axiskeys_style="vigra", chunk_shape=Shape5D(x=3, y=3))
@@ -226,6 +378,97 @@ def test_skimage_datasource_tiles():
     assert num_checked_tiles == 6
 
 
+def test_skimage_datasource_decodes_non_tiff_images_once():
+    data = Array5D(np.arange(64 * 48).reshape(64, 48).astype(np.uint8), axiskeys="yx")
+    png_path = create_png(data)
+    fs = OsFs.create()
+    assert not isinstance(fs, Exception)
+    counting_fs = ReadCountingFs(fs)
+    ds = SkimageDataSource(path=png_path, filesystem=counting_fs, tile_shape=Shape5D(x=16, y=16))
+    num_read_file_calls = counting_fs.num_read_file_calls
+
+    assert ds.retrieve() == data
+    assert ds.retrieve(x=(5, 40), y=(3, 60)) == data.cut(x=(5, 40), y=(3, 60))
+    assert counting_fs.num_read_file_calls <= num_read_file_calls + 1
+
+    os_ds = SkimageDataSource(path=png_path, filesystem=fs, tile_shape=Shape5D(x=16, y=16))
+    assert os_ds.retrieve() == data
+    unpickled_ds = pickle.loads(pickle.dumps(os_ds))
+    assert unpickled_ds._decoded_image is None # pyright: ignore [reportPrivateUsage]
+    assert unpickled_ds.retrieve() == data
+
+
+def test_skimage_datasource_reads_tiff_tiles():
+    import tifffile
+    fs = OsFs.create()
+    assert not isinstance(fs, Exception)
+    data = (np.arange(3 * 50 * 70 * 2).reshape(3, 50, 70, 2) % 65521).astype(np.uint16)
+    for tiff_kwargs in [
+        {"byteorder": ">"},
+        {"rowsperstrip": 7, "compression": "zlib"},
+        {"tile": (16, 32), "compression": "zlib"},
+    ]:
+        tiff_path = PurePosixPath(tempfile.mkstemp()[1] + ".tiff")
+        tifffile.imwrite(tiff_path.as_posix(), data, photometric="minisblack", planarconfig="contig", **tiff_kwargs)
+
+        ds = SkimageDataSource(path=tiff_path, filesystem=fs, tile_shape=Shape5D(x=20, y=20, c=2))
+        assert ds.shape == Shape5D(z=3, y=50, x=70, c=2)
+        assert ds.dtype == np.dtype("uint16")
+        for tile in ds.roi.get_datasource_tiles():
+            assert (tile.retrieve().raw("zyxc") == data[tile.z[0]:tile.z[1], tile.y[0]:tile.y[1], tile.x[0]:tile.x[1]]).all()
+
+        reloaded_ds = SkimageDataSource.from_dto(pickle.loads(pickle.dumps(ds)).to_dto())
+        assert not isinstance(reloaded_ds, Exception)
+        assert reloaded_ds == ds
+        assert (reloaded_ds.retrieve(y=(13, 41), x=(5, 66)).raw("zyxc") == data[:, 13:41, 5:66]).all()
+
+def test_datasources_from_equivalent_dtos_are_shared():
+    fs = OsFs.create()
+    assert not isinstance(fs, Exception)
+    datasource_dto = SkimageDataSource(path=png_image, filesystem=fs).to_dto()
+
+    ds1 = FsDataSource.try_from_message(datasource_dto)
+    assert not isinstance(ds1, Exception)
+    # the same DTO, with its fields in a different order, describes the same datasource
+    reordered_json_value = dict(reversed(list(datasource_dto.to_json_value().items())))
+    reordered_dto = SkimageDataSourceDto.from_json_value(reordered_json_value)
+    assert not isinstance(reordered_dto, Exception)
+    ds2 = FsDataSource.try_from_message(reordered_dto)
+    assert ds2 is ds1
+
+    other_tile_shape_dto = SkimageDataSource(path=png_image, filesystem=fs, tile_shape=Shape5D(x=2, y=2)).to_dto()
+    ds3 = FsDataSource.try_from_message(other_tile_shape_dto)
+    assert not isinstance(ds3, Exception)
+    assert ds3 is not ds1
+
+    registry = DataSourceRegistry(max_entries=1)
+    assert registry.put("a", ds1) is ds1
+    assert registry.put("a", ds3) is ds1
+    _ = registry.put("b", ds3)
+    assert registry.get("a") is None
+    assert registry.get("b") is ds3
+
+
+def test_datasources_from_urls_are_registered_by_their_dto():
+    from base64 import b64encode
+    from aiohttp.test_utils import make_mocked_request
+    from webilastik.datasource import datasource_registry
+    from webilastik.ui.datasource import get_encoded_datasource_from_url
+
+    fs = OsFs.create()
+    assert not isinstance(fs, Exception)
+    datasource_dto = SkimageDataSource(path=png_image, filesystem=fs, tile_shape=Shape5D(x=3, y=3)).to_dto()
+    encoded_datasource = b64encode(json.dumps(datasource_dto.to_json_value()).encode("utf8"), altchars=b"-_").decode("utf8")
+    request = make_mocked_request("GET", f"/tiles/{encoded_datasource}", match_info={"datasource": encoded_datasource})
+
+    ds = get_encoded_datasource_from_url("datasource", request)
+    assert not isinstance(ds, Exception), str(ds)
+    assert get_encoded_datasource_from_url("datasource", request) is ds
+    assert FsDataSource.try_from_message(datasource_dto) is ds
+    # the datasource takes a single slot of the registry, under the same key as when it's built from its DTO
+    assert datasource_registry.get(encoded_datasource) is None
+
+
 def test_neighboring_tiles():
     # fmt: off
     arr = Array5D(np.asarray([
@@ -550,7 +793,78 @@ def test_dzip_datasource():
     # retrieved_from_ds_url[0].retrieve().show_images()
     assert retrieved_from_ds_url[0].retrieve() == finest_resolution_level_ds.retrieve()
 
+def test_failed_zip_directory_job_publishes_no_archive():
+    input_fs = OsFs.create_scratch_dir()
+    assert not isinstance(input_fs, Exception)
+    for i in range(3):
+        assert input_fs.create_file(path=PurePosixPath(f"/to_zip/file{i}.bin"), contents=bytes([i]) * 1000) is None
 
+    class FailingReadsFs(ReadCountingFs):
+        def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+            results = super().read_files(reads)
+            return results[:-1] + [FsIoException("Simulated read failure")]
+
+    output_fs = OsFs.create_scratch_dir()
+    assert not isinstance(output_fs, Exception)
+    zip_result = ZipDirectoryJob.zip_directory(
+        input_fs=FailingReadsFs(input_fs),
+        input_directory=PurePosixPath("/to_zip"),
+        delete_source=True,
+        output_fs=output_fs,
+        output_path=PurePosixPath("/out.zip"),
+    )
+    assert isinstance(zip_result, FsIoException)
+    assert output_fs.exists(PurePosixPath("/out.zip")) == False
+    assert input_fs.exists(PurePosixPath("/to_zip/file0.bin")) == True
+
+def test_retrieve_uses_overridden_get_tile():
+    class NegatedArrayDataSource(ArrayDataSource):
+        def get_tile(self, tile: Interval5D) -> Array5D:
+            return Array5D(255 - self._get_tile(tile).raw("tzyxc"), axiskeys="tzyxc", location=tile.start)
+
+    data = Array5D(np.arange(20 * 20, dtype=np.uint8).reshape(20, 20), axiskeys="yx")
+    ds = NegatedArrayDataSource(data=data, tile_shape=Shape5D(x=8, y=8))
+
+    assert (ds.retrieve().raw("yx") == 255 - data.raw("yx")).all()
+
+def test_content_keys_are_stable_and_content_addressed():
+    data = Array5D(np.arange(100, dtype=np.uint8).reshape(10, 10), axiskeys="yx")
+    ds1 = ArrayDataSource(data=data, tile_shape=Shape5D(x=5, y=5))
+    ds2 = ArrayDataSource(data=Array5D(np.arange(100, dtype=np.uint8).reshape(10, 10), axiskeys="yx"), tile_shape=Shape5D(x=5, y=5))
+    other_ds = ArrayDataSource(data=Array5D(np.zeros((10, 10), dtype=np.uint8), axiskeys="yx"), tile_shape=Shape5D(x=5, y=5))
+
+    assert ds1.content_key == ds2.content_key
+    assert ds1.content_key != other_ds.content_key
+    assert pickle.loads(pickle.dumps(ds1)).content_key == ds1.content_key
+
+    roi = DataRoi(ds1, x=(0, 5), y=(0, 5))
+    assert roi.content_key == DataRoi(ds2, x=(0, 5), y=(0, 5)).content_key
+    assert roi.content_key != DataRoi(ds1, x=(5, 10), y=(0, 5)).content_key
+
+def test_concurrent_retrieve_assembles_all_tiles():
+    class ConcurrentArrayDataSource(ArrayDataSource):
+        def get_io_concurrency(self) -> int:
+            return 4
+
+    data = Array5D(np.arange(40 * 30, dtype=np.uint16).reshape(40, 30), axiskeys="yx")
+    ds = ConcurrentArrayDataSource(data=data, tile_shape=Shape5D(x=7, y=6))
+
+    assert (ds.retrieve().raw("yx") == data.raw("yx")).all()
+    assert (ds.retrieve(x=(3, 25), y=(5, 33)).raw("yx") == data.raw("yx")[5:33, 3:25]).all()
+
+def test_read_ahead_follows_access_direction():
+    data = Array5D(np.zeros((100, 100), dtype=np.uint8), axiskeys="yx")
+    ds = ArrayDataSource(data=data, tile_shape=Shape5D(x=10, y=10))
+    read_ahead = ReadAhead(max_outstanding_bytes=1024 ** 2, max_depth=3)
+
+    ring = read_ahead.plan(ds, Interval5D.zero(x=(40, 50), y=(40, 50)))
+    assert len(ring) == 8
+
+    _ = read_ahead.plan(ds, Interval5D.zero(x=(50, 60), y=(40, 50)))
+    panning_right = read_ahead.plan(ds, Interval5D.zero(x=(60, 70), y=(40, 50)))
+    assert panning_right[0] == DataRoi(ds, x=(70, 80), y=(40, 50))
+    assert max(tile.x[1] for tile in panning_right) == 100
+    assert min(tile.x[0] for tile in panning_right) == 50
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
 import numpy as np
 from ndstructs.array5D import Array5D
 from global_cache import global_cache
+from webilastik.caching import ByteBudgetedCache, CacheMiss, GenerationalCache, SingleFlight
 
 def test_global_cache():
     @global_cache
@@ -20,4 +25,55 @@ def test_global_cache():
     x: str = SomeClass().some_method(123)
     y: str = SomeClass().some_method(123)
 
-    assert x == y
\ No newline at end of file
+    assert x == y
+
+def test_byte_budgeted_cache_evicts_cheap_entries_first():
+    cache: ByteBudgetedCache[Array5D] = ByteBudgetedCache(max_bytes=1000)
+    cache.put("cheap", Array5D(np.zeros((20, 20), dtype=np.uint8), axiskeys="yx"), cost=0.001)
+    cache.put("expensive", Array5D(np.zeros((20, 20), dtype=np.uint8), axiskeys="yx"), cost=10)
+    cache.put("newest", Array5D(np.zeros((20, 20), dtype=np.uint8), axiskeys="yx"), cost=0.5)
+
+    assert "cheap" not in cache
+    assert "expensive" in cache
+    assert "newest" in cache
+    assert cache.info().current_bytes == 800
+
+    assert isinstance(cache.get("cheap"), CacheMiss)
+    assert not isinstance(cache.get("expensive"), CacheMiss)
+
+    cache.put("too_big", Array5D(np.zeros((40, 40), dtype=np.uint8), axiskeys="yx"), cost=100)
+    assert "too_big" not in cache
+    assert cache.info().current_bytes <= cache.max_bytes
+
+def test_single_flight_coalesces_concurrent_calls():
+    single_flight: SingleFlight[int] = SingleFlight()
+    num_computations = 0
+    computations_lock = threading.Lock()
+
+    def compute() -> int:
+        nonlocal num_computations
+        with computations_lock:
+            num_computations += 1
+        time.sleep(0.2)
+        return 123
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: single_flight.do("some_key", compute), range(8)))
+
+    assert results == [123] * 8
+    assert num_computations == 1
+    assert single_flight.num_coalesced == 7
+
+def test_generational_cache_drops_stale_generations():
+    cache: GenerationalCache[str] = GenerationalCache(max_bytes=1024 ** 2)
+    cache.set_generation(1)
+    cache.put(1, "tile", "gen 1 predictions", cost=1)
+    assert cache.get(1, "tile") == "gen 1 predictions"
+
+    cache.set_generation(2)
+    assert isinstance(cache.get(1, "tile"), CacheMiss)
+    assert isinstance(cache.get(2, "tile"), CacheMiss)
+
+    cache.put(1, "tile", "late gen 1 predictions", cost=1)
+    assert isinstance(cache.get(1, "tile"), CacheMiss)
+    assert cache.info().num_entries == 0
@@ -0,0 +1,162 @@
+from pathlib import Path
+from types import ModuleType
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+from ndstructs.array5D import Array5D
+from ndstructs.point5D import Point5D
+
+from webilastik.caching import call_many
+from webilastik.caching.array_codec import decode_value, encode_value, is_compression_available
+
+
+GLOBAL_CACHE_IMPLS_DIR = Path(__file__).parent.parent / "global_cache_impls"
+
+def load_global_cache_impl(impl_name: str) -> ModuleType:
+    # impl modules are all called 'global_cache', so they're loaded under another name to not shadow the default one
+    spec = importlib.util.spec_from_file_location(f"{impl_name}_global_cache", GLOBAL_CACHE_IMPLS_DIR / impl_name / "global_cache/__init__.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@contextmanager
+def run_redis_server() -> Iterator[Optional[Path]]:
+    """Runs a throwaway redis-server for the duration of the block, yielding None if redis-server is not installed"""
+    redis_server_path = shutil.which("redis-server")
+    if redis_server_path is None:
+        yield None
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = Path(tmp_dir) / "redis.sock"
+        redis_process = subprocess.Popen(
+            [redis_server_path, "--port", "0", "--unixsocket", str(socket_path), "--save", "", "--appendonly", "no"],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            for _ in range(50):
+                if socket_path.exists():
+                    break
+                time.sleep(0.1)
+            os.environ["REDIS_UNIX_SOCKET_PATH"] = str(socket_path)
+            yield socket_path
+        finally:
+            del os.environ["REDIS_UNIX_SOCKET_PATH"]
+            redis_process.terminate()
+            _ = redis_process.wait()
+
+def test_array_codec_roundtrip():
+    array = Array5D(np.arange(2 * 3 * 4, dtype=np.float32).reshape(2, 3, 4), axiskeys="cyx", location=Point5D(x=10, y=20))
+    for compression in ("none", "lz4", "zstd"):
+        if not is_compression_available(compression):
+            continue
+        decoded = decode_value(encode_value(array, compression))
+        assert isinstance(decoded, Array5D)
+        assert decoded.location == array.location
+        assert decoded.dtype == array.dtype
+        assert (decoded.raw("tzyxc") == array.raw("tzyxc")).all()
+    assert decode_value(encode_value({"some": "value"})) == {"some": "value"}
+
+def test_redis_cache():
+    with run_redis_server() as socket_path:
+        if socket_path is None:
+            print("redis-server is not available, skipping test_redis_cache")
+            return
+        redis_cache_module: Any = load_global_cache_impl("redis_cache")
+        calls: List[int] = []
+
+        def make_array(x: int) -> Array5D:
+            calls.append(x)
+            return Array5D(np.full((4, 4), x, dtype=np.uint8), axiskeys="yx", location=Point5D(x=x))
+
+        cached_make_array = redis_cache_module.redis_cache(ttl=10)(make_array)
+
+        assert cached_make_array(1).location == Point5D(x=1)
+        assert cached_make_array(1).location == Point5D(x=1)
+        assert calls == [1]
+
+        results = call_many(cached_make_array, [(1,), (2,), (3,)])
+        assert [r.location.x for r in results] == [1, 2, 3]
+        assert calls == [1, 2, 3]
+
+        client = redis_cache_module.get_redis_client()
+        assert all(0 < client.ttl(key) <= 10 for key in client.keys("*"))
+
+def test_tiered_cache():
+    with run_redis_server() as socket_path:
+        if socket_path is None:
+            print("redis-server is not available, skipping test_tiered_cache")
+            return
+        tiered_cache_module: Any = load_global_cache_impl("tiered_cache")
+        calls: List[int] = []
+
+        def make_array(x: int) -> Array5D:
+            calls.append(x)
+            return Array5D(np.full((4, 4), x, dtype=np.uint8), axiskeys="yx", location=Point5D(x=x))
+
+        cached_make_array = tiered_cache_module.global_cache(make_array)
+        _ = cached_make_array(1) # miss in both tiers
+        _ = cached_make_array(1) # L1 hit
+        tiered_cache_module._l1.clear() # simulates another process, with its own empty L1
+        _ = cached_make_array(1) # L2 hit, promoted to L1
+        _ = cached_make_array(1) # L1 hit
+        assert calls == [1]
+
+        info = tiered_cache_module.get_cache_info()
+        assert (info.l1.hits, info.l1.misses) == (2, 2)
+        assert (info.l2_hits, info.l2_misses) == (1, 1)
+
+
+def slow_make_array(x: int, log_path: str) -> Array5D:
+    with open(log_path, "a") as log:
+        _ = log.write(f"{x}\n")
+    time.sleep(1)
+    return Array5D(np.full((4, 4), x, dtype=np.uint8), axiskeys="yx", location=Point5D(x=x))
+
+def _call_slow_make_array_from_another_process(log_path: str, barrier: Any) -> None:
+    redis_cache_module: Any = load_global_cache_impl("redis_cache")
+    cached_slow_make_array = redis_cache_module.global_cache(slow_make_array)
+    _ = barrier.wait()
+    assert cached_slow_make_array(3, log_path).location == Point5D(x=3)
+    _ = barrier.wait()
+    results = call_many(cached_slow_make_array, [(x, log_path) for x in range(3)])
+    assert [r.location.x for r in results] == [0, 1, 2]
+
+def test_redis_cache_computes_once_across_processes():
+    with run_redis_server() as socket_path:
+        if socket_path is None:
+            print("redis-server is not available, skipping test_redis_cache_computes_once_across_processes")
+            return
+        mp_context = multiprocessing.get_context("spawn")
+        num_processes = 2
+        barrier = mp_context.Barrier(num_processes)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = str(Path(tmp_dir) / "computations.log")
+            processes = [
+                mp_context.Process(target=_call_slow_make_array_from_another_process, args=(log_path, barrier))
+                for _ in range(num_processes)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            assert all(process.exitcode == 0 for process in processes)
+            with open(log_path) as log:
+                assert sorted(log.read().split()) == ["0", "1", "2", "3"]
+
+
+if __name__ == "__main__":
+    import inspect
+    import sys
+    for item_name, item in inspect.getmembers(sys.modules[__name__]):
+        if inspect.isfunction(item) and item_name.startswith('test'):
+            print(f"Running test: {item_name}")
+            item()
@@ -0,0 +1,170 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterator, List
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+from ndstructs.array5D import Array5D
+
+from webilastik.caching import CacheMiss
+from webilastik.caching.shm_arena import SharedMemoryArena
+
+
+SHM_CACHE_MODULE_PATH = Path(__file__).parent.parent / "global_cache_impls/shm_cache/global_cache/__init__.py"
+SHM_ENV_VARS = ("GLOBAL_CACHE_SHM_NAME", "GLOBAL_CACHE_SHM_LOCK_PATH", "GLOBAL_CACHE_SHM_BYTES")
+
+def load_shm_cache_module() -> Any:
+    # the impl module is called 'global_cache', so it's loaded under another name to not shadow the default one
+    spec = importlib.util.spec_from_file_location("shm_cache_global_cache", SHM_CACHE_MODULE_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@contextmanager
+def fresh_shm_cache_module() -> Iterator[ModuleType]:
+    """A fresh 64KiB arena, advertised in the environment so that spawned processes attach to it"""
+    previous_env: Dict[str, "str | None"] = {name: os.environ.pop(name, None) for name in SHM_ENV_VARS}
+    os.environ["GLOBAL_CACHE_SHM_BYTES"] = str(64 * 1024)
+    module = load_shm_cache_module()
+    try:
+        yield module
+    finally:
+        module._arena.close()
+        for name, value in previous_env.items():
+            if value is None:
+                _ = os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+def make_tile(x: int) -> Array5D:
+    # 8KiB, so that a few of them wrap the 64KiB arena around
+    return Array5D(np.full((64, 128), x % 256, dtype=np.uint8), axiskeys="yx")
+
+
+def _put_from_another_process(name: str, lock_path: Path) -> None:
+    arena = SharedMemoryArena.attach(name=name, lock_path=lock_path)
+    assert arena.put(b"some_key", b"some_value")
+    arena.close()
+
+def test_shared_memory_arena():
+    arena = SharedMemoryArena.create(data_size=4096)
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            executor.submit(_put_from_another_process, arena.shm.name, arena.lock_path).result()
+        value = arena.get(b"some_key")
+        assert value == b"some_value"
+
+        # entries are overwritten as the arena wraps around
+        for i in range(8):
+            assert arena.put(f"key_{i}".encode("utf8"), bytes([i]) * 1000)
+        assert isinstance(arena.get(b"some_key"), CacheMiss)
+        assert isinstance(arena.get(b"key_0"), CacheMiss)
+        assert arena.get(b"key_7") == bytes([7]) * 1000
+
+        assert not arena.put(b"too_big", bytes(4096))
+    finally:
+        arena.close()
+
+
+def test_shm_global_cache():
+    with fresh_shm_cache_module() as shm_cache_module:
+        calls: List[int] = []
+
+        def counted_make_tile(x: int) -> Array5D:
+            calls.append(x)
+            return make_tile(x)
+
+        cached_make_tile = shm_cache_module.global_cache(counted_make_tile)
+        assert (cached_make_tile(1).raw("yx") == 1).all()
+        assert (cached_make_tile(1).raw("yx") == 1).all()
+        assert calls == [1]
+
+        info = shm_cache_module.get_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        assert info.num_entries == 1
+
+
+def _overwrite_arena_from_another_process(num_tiles: int) -> None:
+    shm_cache_module = load_shm_cache_module() # attaches to the arena advertised in the environment
+    cached_make_tile = shm_cache_module.global_cache(make_tile)
+    for x in range(100, 100 + num_tiles):
+        _ = cached_make_tile(x)
+
+def test_shm_global_cache_values_survive_the_arena_wrapping_around():
+    with fresh_shm_cache_module() as shm_cache_module:
+        cached_make_tile = shm_cache_module.global_cache(make_tile)
+        _ = cached_make_tile(7)
+        cached_tile = cached_make_tile(7) # a hit, served from the shared memory
+        assert (cached_tile.raw("yx") == 7).all()
+
+        # another process caches enough data to overwrite every byte of the arena a few times over
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            executor.submit(_overwrite_arena_from_another_process, 32).result()
+
+        assert (cached_tile.raw("yx") == 7).all()
+        assert (cached_make_tile(7).raw("yx") == 7).all()
+        assert shm_cache_module.get_cache_info().misses == 2
+
+
+def _try_compute_lease(arena: SharedMemoryArena, key: bytes) -> bool:
+    with arena.compute_lease(key, timeout=0.1) as acquired:
+        return acquired
+
+def test_compute_lease_excludes_other_threads():
+    arena = SharedMemoryArena.create(data_size=4096)
+    try:
+        with arena.compute_lease(b"some_key", timeout=1) as acquired:
+            assert acquired
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                assert not executor.submit(_try_compute_lease, arena, b"some_key").result()
+        assert _try_compute_lease(arena, b"some_key")
+    finally:
+        arena.close()
+
+
+def slow_make_tile(x: int, log_path: str) -> Array5D:
+    with open(log_path, "a") as log:
+        _ = log.write(f"{x}\n")
+    time.sleep(1)
+    return make_tile(x)
+
+def _call_slow_make_tile_from_another_process(log_path: str, barrier: Any) -> None:
+    shm_cache_module = load_shm_cache_module() # attaches to the arena advertised in the environment
+    cached_slow_make_tile = shm_cache_module.global_cache(slow_make_tile)
+    _ = barrier.wait()
+    assert (cached_slow_make_tile(3, log_path).raw("yx") == 3).all()
+
+def test_shm_global_cache_computes_once_across_processes():
+    with fresh_shm_cache_module() as shm_cache_module:
+        mp_context = multiprocessing.get_context("spawn")
+        num_processes = 3
+        barrier = mp_context.Barrier(num_processes)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = str(Path(tmp_dir) / "computations.log")
+            processes = [
+                mp_context.Process(target=_call_slow_make_tile_from_another_process, args=(log_path, barrier))
+                for _ in range(num_processes)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            assert all(process.exitcode == 0 for process in processes)
+            with open(log_path) as log:
+                assert log.read().split() == ["3"]
+
+
+if __name__ == "__main__":
+    import inspect
+    import sys
+    for item_name, item in inspect.getmembers(sys.modules[__name__]):
+        if inspect.isfunction(item) and item_name.startswith('test'):
+            print(f"Running test: {item_name}")
+            item()
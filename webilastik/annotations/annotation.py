@@ -6,6 +6,7 @@ from ndstructs.point5D import Interval5D, Point5D
 from ndstructs.array5D import Array5D, All, ScalarData, StaticLine
 
 from webilastik.datasource import DataSource, DataRoi, FsDataSource
+from webilastik.caching import make_content_key
 from webilastik.features.feature_extractor import FeatureExtractor, FeatureData
 from executor_getter import get_executor
 from webilastik.server.rpc.dto import ColorDto, MessageParsingError, PixelAnnotationDto
@@ -97,17 +98,10 @@ class Annotation(ScalarData):
     """User annotation attached to the raw data onto which they were drawn"""
 
     def __hash__(self):
-        return hash(self._data.tobytes())
+        return hash(self.content_key)
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Annotation) or self.interval != other.interval:
-            return False
-        if not isinstance(self.raw_data, FsDataSource) or not isinstance(other.raw_data, FsDataSource):
-            return False #FIXME
-        if self.raw_data.url != other.raw_data.url:
-            return False
-        equal = np.all(self.raw(Point5D.LABELS) == other.raw(Point5D.LABELS))
-        return bool(equal)
+        return isinstance(other, Annotation) and self.content_key == other.content_key
 
     def __init__(
         self, arr: "np.ndarray[Any, Any]", *, axiskeys: str, location: Point5D = Point5D.zero(), raw_data: DataSource
@@ -117,6 +111,10 @@ class Annotation(ScalarData):
         if not raw_data.interval.contains(self.interval):
             raise AnnotationOutOfBounds(annotation_roi=self.interval, raw_data=raw_data)
         self.raw_data = raw_data
+        # annotations are never modified, so their (potentially large) masks are only ever hashed once
+        self.content_key: bytes = make_content_key(
+            self.__class__, raw_data, self.interval, self.raw(Point5D.LABELS).tobytes()
+        )
 
     def rebuild(self, arr: "np.ndarray[Any, Any]", *, axiskeys: str, location: "Point5D | None" = None) -> "Annotation":
         location = self.location if location is None else location
@@ -0,0 +1,398 @@
+# pyright: strict
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Final, Generic, Hashable, List, Mapping, Sequence, Tuple, TypeVar
+import hashlib
+import heapq
+import os
+import pickle
+import sys
+import threading
+
+import numpy as np
+from ndstructs.array5D import Array5D
+from ndstructs.point5D import Interval5D, Point5D
+
+
+V = TypeVar("V")
+
+class CacheMiss:
+    pass
+
+_MISS: Final[CacheMiss] = CacheMiss()
+
+
+def get_nbytes(value: Any) -> int:
+    """Size of a cached value, as accounted against a ByteBudgetedCache's budget"""
+    if isinstance(value, Array5D):
+        return value.raw(value.axiskeys).nbytes
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes) # pyright: ignore [reportUnknownArgumentType, reportUnknownMemberType]
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(get_nbytes(item) for item in value) # pyright: ignore [reportUnknownVariableType]
+    return sys.getsizeof(value)
+
+def to_key_part(value: Any) -> Any:
+    """Reduces a value to something small, hashable and with a stable pickle representation across processes.
+
+    Objects that can be expensive to hash or pickle (datasources, operators, annotations) expose a precomputed
+    'content_key' digest, which is used in their stead
+    """
+    content_key = getattr(value, "content_key", None)
+    if isinstance(content_key, bytes):
+        return content_key
+    if isinstance(value, Interval5D):
+        return (value.start.to_tuple("tzyxc"), value.stop.to_tuple("tzyxc"))
+    if isinstance(value, Point5D):
+        return value.to_tuple("tzyxc")
+    if isinstance(value, np.dtype):
+        return value.str
+    if isinstance(value, (tuple, list)):
+        return tuple(to_key_part(item) for item in value) # pyright: ignore [reportUnknownVariableType]
+    return value
+
+def make_content_key(*parts: Any) -> bytes:
+    """A digest of 'parts' that, unlike hash(), is identical across processes. Classes are identified by their full name"""
+    reduced_parts = tuple(
+        f"{part.__module__}.{part.__qualname__}" if isinstance(part, type) else to_key_part(part)
+        for part in parts
+    )
+    return hashlib.blake2b(pickle.dumps(reduced_parts, protocol=4), digest_size=16).digest()
+
+def make_call_key(func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Mapping[str, Any]) -> Hashable:
+    return (
+        f"{func.__module__}.{func.__qualname__}",
+        tuple(to_key_part(arg) for arg in args),
+        tuple(sorted((name, to_key_part(value)) for name, value in kwargs.items())),
+    )
+
+# computes the results of several calls to a function at once, e.g. with a single batch of reads
+ComputeMany = Callable[[Sequence[Tuple[Any, ...]]], List[V]]
+
+def call_many(
+    func: Callable[..., V], calls: Sequence[Tuple[Any, ...]], compute_many: "ComputeMany[V] | None" = None
+) -> List[V]:
+    """Calls a (possibly global_cache'd) function once per tuple of positional args in 'calls'.
+
+    global_cache implementations can attach a 'call_many' attribute to their wrappers to batch the lookups,
+    e.g. into a single round trip to a remote cache, and to hand all of the calls that missed to 'compute_many'
+    (if given) instead of calling the undecorated function once per miss. Otherwise this is the same as calling
+    func in a loop.
+    """
+    batched: "Callable[[Sequence[Tuple[Any, ...]], ComputeMany[V] | None], List[V]] | None" = getattr(func, "call_many", None)
+    if batched is not None:
+        return batched(calls, compute_many)
+    return [func(*args) for args in calls]
+
+
+class _Flight(Generic[V]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: "V | None" = None
+        self.exception: "BaseException | None" = None
+        super().__init__()
+
+class SingleFlight(Generic[V]):
+    """Coalesces concurrent computations of the same key within a process.
+
+    The first caller of 'do' for a key runs 'compute'; callers with an equal key that arrive while it is
+    running wait for and share its result (or exception) instead of computing it again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight[V]] = {}
+        self.num_coalesced = 0
+        super().__init__()
+
+    def do(self, key: Hashable, compute: Callable[[], V]) -> V:
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.num_coalesced += 1
+        if not is_leader:
+            _ = flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result # pyright: ignore [reportReturnType]
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as e:
+            flight.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def do_many(self, keys: Sequence[Hashable], compute_many: Callable[[Sequence[int]], List[V]]) -> List[V]:
+        """Like 'do', for many keys at once.
+
+        compute_many(indices) must return the values of keys[i] for each i in 'indices', which are the keys that
+        weren't already being computed by some other caller
+        """
+        led_flights: Dict[Hashable, _Flight[V]] = {}
+        led_indices: List[int] = []
+        flights: List[_Flight[V]] = []
+        with self._lock:
+            for idx, key in enumerate(keys):
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = led_flights[key] = _Flight()
+                    led_indices.append(idx)
+                elif key not in led_flights:
+                    self.num_coalesced += 1
+                flights.append(flight)
+        if led_indices:
+            try:
+                for idx, value in zip(led_indices, compute_many(led_indices)):
+                    flights[idx].result = value
+            except BaseException as e:
+                for flight in led_flights.values():
+                    flight.exception = e
+                raise
+            finally:
+                with self._lock:
+                    for key in led_flights:
+                        del self._flights[key]
+                for flight in led_flights.values():
+                    flight.done.set()
+        values: List[V] = []
+        for flight in flights:
+            _ = flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            values.append(flight.result) # pyright: ignore [reportArgumentType]
+        return values
+
+
+@dataclass
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    num_entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        num_lookups = self.hits + self.misses
+        return 0.0 if num_lookups == 0 else self.hits / num_lookups
+
+    def __str__(self) -> str:
+        return (
+            f"hits={self.hits} misses={self.misses} hit_ratio={self.hit_ratio:.3f} evictions={self.evictions} "
+            f"entries={self.num_entries} bytes={self.current_bytes}/{self.max_bytes}"
+        )
+
+
+@dataclass
+class TieredCacheInfo:
+    l1: CacheInfo
+    l2_hits: int
+    l2_misses: int
+
+    @property
+    def l2_hit_ratio(self) -> float:
+        num_lookups = self.l2_hits + self.l2_misses
+        return 0.0 if num_lookups == 0 else self.l2_hits / num_lookups
+
+    @property
+    def hit_ratio(self) -> float:
+        num_lookups = self.l1.hits + self.l1.misses
+        return 0.0 if num_lookups == 0 else (self.l1.hits + self.l2_hits) / num_lookups
+
+    def __str__(self) -> str:
+        return (
+            f"L1: {self.l1} | L2: hits={self.l2_hits} misses={self.l2_misses} hit_ratio={self.l2_hit_ratio:.3f} | "
+            f"overall hit_ratio={self.hit_ratio:.3f}"
+        )
+
+
+class _Entry(Generic[V]):
+    def __init__(self, *, value: V, nbytes: int, cost: float, priority: float) -> None:
+        self.value = value
+        self.nbytes = nbytes
+        self.cost = cost
+        self.priority = priority
+        super().__init__()
+
+
+class ByteBudgetedCache(Generic[V]):
+    """A thread-safe mapping whose total size (as reported by get_nbytes) never exceeds max_bytes.
+
+    Eviction follows the GreedyDual-Size policy: each entry gets a priority of 'clock + cost / nbytes',
+    where cost is the time it took to compute the value. A hit refreshes the entry's priority, and every
+    eviction advances 'clock' to the priority of the evicted entry, so that entries that are cheap to
+    recompute per byte they occupy and that haven't been used in a while are the first to go.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes: Final[int] = max_bytes
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, _Entry[V]] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._heap_counter = 0
+        self._clock: float = 0.0
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        super().__init__()
+
+    def _push(self, key: Hashable, entry: _Entry[V]) -> None:
+        # heap items are never updated in place; stale ones are skipped when popped
+        self._heap_counter += 1
+        heapq.heappush(self._heap, (entry.priority, self._heap_counter, key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e.priority, self._heap_counter + idx, k) for idx, (k, e) in enumerate(self._entries.items())]
+            self._heap_counter += len(self._heap)
+            heapq.heapify(self._heap)
+
+    def _evict_one(self) -> None:
+        while self._heap:
+            priority, _, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry.priority != priority:
+                continue
+            del self._entries[key]
+            self._current_bytes -= entry.nbytes
+            self._clock = priority
+            self._evictions += 1
+            return
+
+    def get(self, key: Hashable) -> "V | CacheMiss":
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return _MISS
+            self._hits += 1
+            entry.priority = self._clock + entry.cost / max(entry.nbytes, 1)
+            self._push(key, entry)
+            return entry.value
+
+    def peek(self, key: Hashable) -> "V | CacheMiss":
+        """Like 'get', but without counting as a lookup or refreshing the entry's priority"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return _MISS if entry is None else entry.value
+
+    def put(self, key: Hashable, value: V, *, cost: float, nbytes: "int | None" = None) -> None:
+        nbytes = get_nbytes(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._current_bytes -= old_entry.nbytes
+            while self._current_bytes + nbytes > self.max_bytes and self._entries:
+                self._evict_one()
+            entry = _Entry(value=value, nbytes=nbytes, cost=cost, priority=self._clock + cost / max(nbytes, 1))
+            self._entries[key] = entry
+            self._current_bytes += nbytes
+            self._push(key, entry)
+
+    def pop(self, key: Hashable) -> "V | CacheMiss":
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return _MISS
+            self._current_bytes -= entry.nbytes
+            return entry.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+            self._current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                num_entries=len(self._entries),
+                current_bytes=self._current_bytes,
+                max_bytes=self.max_bytes,
+            )
+
+
+class GenerationalCache(Generic[V]):
+    """A ByteBudgetedCache whose entries are only valid for a single generation (e.g. of a classifier).
+
+    Moving to a different generation drops all entries at once, and values computed for any generation other
+    than the current one are never stored.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lock = threading.Lock()
+        self._cache: "ByteBudgetedCache[V]" = ByteBudgetedCache(max_bytes=max_bytes)
+        self._generation: int = 0
+        super().__init__()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def set_generation(self, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._cache.clear()
+
+    def get(self, generation: int, key: Hashable) -> "V | CacheMiss":
+        with self._lock:
+            if generation != self._generation:
+                return _MISS
+            return self._cache.get(key)
+
+    def put(self, generation: int, key: Hashable, value: V, *, cost: float) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._cache.put(key, value, cost=cost)
+
+    def info(self) -> CacheInfo:
+        return self._cache.info()
+
+
+def parse_byte_size(value: str) -> "int | ValueError":
+    """Parses sizes like '1073741824', '512M' or '2G' into a number of bytes"""
+    multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    value = value.strip().upper().rstrip("B").rstrip("I")
+    multiplier = 1
+    if value and value[-1] in multipliers:
+        multiplier = multipliers[value[-1]]
+        value = value[:-1]
+    try:
+        num_bytes = int(float(value) * multiplier)
+    except ValueError as e:
+        return e
+    if num_bytes < 0:
+        return ValueError(f"Byte size must not be negative: {value}")
+    return num_bytes
+
+def get_max_bytes_from_env(var_name: str, default: int) -> int:
+    raw_value = os.environ.get(var_name)
+    if raw_value is None:
+        return default
+    parsed = parse_byte_size(raw_value)
+    if isinstance(parsed, Exception):
+        print(f"Bad value for {var_name}: {raw_value}", file=sys.stderr)
+        exit(1)
+    return parsed
@@ -0,0 +1,149 @@
+# pyright: strict
+
+"""A compact binary encoding for cached values.
+
+Arrays are encoded as a small fixed-layout header (dtype, shape, axiskeys, location and the array class) followed
+by the raw array bytes, optionally compressed with lz4 or zstd. Anything that is not an Array5D falls back to pickle.
+"""
+
+from typing import Any, Dict, Final, Literal, Tuple, Type
+import importlib
+import os
+import pickle
+import struct
+import sys
+
+import numpy as np
+from ndstructs.array5D import Array5D
+from ndstructs.point5D import Point5D
+
+Compression = Literal["none", "lz4", "zstd"]
+
+_MAGIC: Final[bytes] = b"W5"
+_VERSION: Final[int] = 1
+
+_KIND_ARRAY: Final[int] = 0
+_KIND_PICKLE: Final[int] = 1
+
+_COMPRESSION_IDS: Final[Dict[Compression, int]] = {"none": 0, "lz4": 1, "zstd": 2}
+_COMPRESSION_NAMES: Final[Dict[int, Compression]] = {v: k for k, v in _COMPRESSION_IDS.items()}
+
+# magic, version, kind, compression
+_PREAMBLE = struct.Struct("<2sBBB")
+# location (tzyxc), ndim, dtype string length, class path length
+_ARRAY_HEADER = struct.Struct("<5qBBH")
+
+_LOCATION_AXES: Final[str] = "tzyxc"
+
+
+class ArrayCodecException(Exception):
+    pass
+
+
+def is_compression_available(compression: Compression) -> bool:
+    try:
+        if compression == "lz4":
+            import lz4.frame # pyright: ignore [reportMissingImports, reportUnusedImport]
+        elif compression == "zstd":
+            import zstandard # pyright: ignore [reportMissingImports, reportUnusedImport]
+    except ImportError:
+        return False
+    return True
+
+def _compress(data: "bytes | memoryview", compression: Compression) -> bytes:
+    if compression == "lz4":
+        import lz4.frame # pyright: ignore [reportMissingImports]
+        return lz4.frame.compress(data) # pyright: ignore
+    if compression == "zstd":
+        import zstandard # pyright: ignore [reportMissingImports]
+        return zstandard.ZstdCompressor(level=1).compress(data) # pyright: ignore
+    return bytes(data)
+
+def _decompress(data: "bytes | memoryview", compression: Compression) -> "bytes | memoryview":
+    if compression == "lz4":
+        import lz4.frame # pyright: ignore [reportMissingImports]
+        return lz4.frame.decompress(data) # pyright: ignore
+    if compression == "zstd":
+        import zstandard # pyright: ignore [reportMissingImports]
+        return zstandard.ZstdDecompressor().decompress(data) # pyright: ignore
+    return data
+
+def _get_class_path(klass: Type[Any]) -> str:
+    return f"{klass.__module__}:{klass.__qualname__}"
+
+def _load_class(class_path: str) -> Type[Array5D]:
+    module_name, qualname = class_path.split(":")
+    obj: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    if not (isinstance(obj, type) and issubclass(obj, Array5D)):
+        raise ArrayCodecException(f"Not an Array5D class: {class_path}")
+    return obj
+
+
+def encode_value(value: Any, compression: Compression = "none") -> bytes:
+    if not isinstance(value, Array5D):
+        payload = _compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), compression)
+        return _PREAMBLE.pack(_MAGIC, _VERSION, _KIND_PICKLE, _COMPRESSION_IDS[compression]) + payload
+
+    raw: "np.ndarray[Any, Any]" = np.ascontiguousarray(value.raw(value.axiskeys))
+    dtype_str = raw.dtype.str.encode("ascii")
+    class_path = _get_class_path(value.__class__).encode("utf8")
+    header = _PREAMBLE.pack(_MAGIC, _VERSION, _KIND_ARRAY, _COMPRESSION_IDS[compression]) + _ARRAY_HEADER.pack(
+        *value.location.to_tuple(_LOCATION_AXES), len(value.axiskeys), len(dtype_str), len(class_path)
+    )
+    shape = struct.pack(f"<{raw.ndim}Q", *raw.shape)
+    payload = _compress(memoryview(raw).cast("B"), compression)
+    return b"".join([header, dtype_str, value.axiskeys.encode("ascii"), shape, class_path, payload])
+
+
+def decode_value(data: "bytes | memoryview") -> Any:
+    """Decodes the output of encode_value.
+
+    Decoded arrays are views into the (decompressed) payload, so uncompressed values decoded from a
+    (read-only) memoryview share its memory without any copies
+    """
+    if len(data) < _PREAMBLE.size:
+        raise ArrayCodecException("Truncated cache value")
+    magic, version, kind, compression_id = _PREAMBLE.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ArrayCodecException(f"Bad cache value header: {bytes(data[:_PREAMBLE.size])!r}")
+    compression = _COMPRESSION_NAMES.get(compression_id)
+    if compression is None:
+        raise ArrayCodecException(f"Unknown compression id: {compression_id}")
+
+    buffer = memoryview(data)
+    if kind == _KIND_PICKLE:
+        return pickle.loads(_decompress(buffer[_PREAMBLE.size:], compression))
+    if kind != _KIND_ARRAY:
+        raise ArrayCodecException(f"Unknown value kind: {kind}")
+
+    offset = _PREAMBLE.size
+    t, z, y, x, c, ndim, dtype_len, class_path_len = _ARRAY_HEADER.unpack_from(data, offset)
+    offset += _ARRAY_HEADER.size
+    dtype = np.dtype(bytes(buffer[offset:offset + dtype_len]).decode("ascii"))
+    offset += dtype_len
+    axiskeys = bytes(buffer[offset:offset + ndim]).decode("ascii")
+    offset += ndim
+    shape: Tuple[int, ...] = struct.unpack_from(f"<{ndim}Q", data, offset)
+    offset += 8 * ndim
+    class_path = bytes(buffer[offset:offset + class_path_len]).decode("utf8")
+    offset += class_path_len
+
+    raw_bytes = _decompress(buffer[offset:], compression)
+    raw: "np.ndarray[Any, Any]" = np.frombuffer(raw_bytes, dtype=dtype).reshape(shape)
+    # Array5D subclasses that are cached (e.g. FeatureData) keep Array5D's constructor signature
+    klass = _load_class(class_path)
+    return klass(raw, axiskeys=axiskeys, location=Point5D(t=t, z=z, y=y, x=x, c=c))
+
+
+def get_compression_from_env(var_name: str, default: Compression = "none") -> Compression:
+    raw_value = os.environ.get(var_name, default)
+    if raw_value not in _COMPRESSION_IDS:
+        print(f"Bad value for {var_name}: {raw_value}. Expected one of {list(_COMPRESSION_IDS.keys())}", file=sys.stderr)
+        exit(1)
+    compression: Compression = raw_value # pyright: ignore [reportAssignmentType]
+    if not is_compression_available(compression):
+        print(f"[WARNING] Compression '{compression}' is not available. Caching values uncompressed", file=sys.stderr)
+        return "none"
+    return compression
@@ -0,0 +1,173 @@
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+from pathlib import Path
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+import uuid
+
+import redis # pyright: ignore [reportMissingTypeStubs]
+
+from webilastik.caching import CacheMiss, make_call_key
+from webilastik.caching.array_codec import Compression, decode_value, encode_value, get_compression_from_env
+from webilastik.utility import get_env_var_or_exit
+
+
+def parse_ip_port(value: str) -> Tuple[str, int]:
+    ip_str, port = value.split(":")
+    return ip_str, int(port)
+
+def _create_connection_pool(max_connections: int) -> redis.ConnectionPool:
+    REDIS_HOST_PORT = os.environ.get("REDIS_HOST_PORT")
+    if REDIS_HOST_PORT is not None:
+        redis_host, port = parse_ip_port(REDIS_HOST_PORT)
+        return redis.BlockingConnectionPool(host=redis_host, port=port, max_connections=max_connections)
+    REDIS_UNIX_SOCKET_PATH = get_env_var_or_exit(var_name="REDIS_UNIX_SOCKET_PATH", parser=Path)
+    if not REDIS_UNIX_SOCKET_PATH.exists():
+        print(f"Redis socket path {REDIS_UNIX_SOCKET_PATH} does not exist", file=sys.stderr)
+        exit(1)
+    if not REDIS_UNIX_SOCKET_PATH.is_socket():
+        print(f"Redis socket path {REDIS_UNIX_SOCKET_PATH} is not a socket", file=sys.stderr)
+        exit(1)
+    return redis.BlockingConnectionPool(
+        connection_class=redis.UnixDomainSocketConnection,
+        path=str(REDIS_UNIX_SOCKET_PATH),
+        max_connections=max_connections,
+    )
+
+def make_redis_key(func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Mapping[str, Any]) -> bytes:
+    # hashing keeps keys small in redis' memory no matter how large the pickled arguments are
+    return b"wi:" + hashlib.blake2b(pickle.dumps(make_call_key(func, args, kwargs)), digest_size=20).digest()
+
+
+class RedisBackend:
+    """Encodes values into (and decodes them out of) a redis server shared by all processes of a session.
+
+    Connections come from a per-process pool; since sockets must not be shared with forked children, a new
+    pool is created whenever the pid changes.
+    """
+
+    def __init__(self, *, ttl: int, compression: Compression, max_connections: int, lock_timeout: float) -> None:
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.compression: Compression = compression
+        self.max_connections = max_connections
+        self._pool_lock = threading.Lock()
+        self._pool: redis.ConnectionPool = _create_connection_pool(max_connections)
+        self._pool_pid: int = os.getpid()
+        super().__init__()
+
+    @classmethod
+    def from_env(cls) -> "RedisBackend":
+        return RedisBackend(
+            # a value of 0 disables expiry
+            ttl=get_env_var_or_exit(var_name="REDIS_CACHE_TTL_SECONDS", parser=int, default=60 * 60),
+            compression=get_compression_from_env("REDIS_CACHE_COMPRESSION", default="lz4"),
+            max_connections=get_env_var_or_exit(var_name="REDIS_CACHE_MAX_CONNECTIONS", parser=int, default=32),
+            lock_timeout=get_env_var_or_exit(var_name="REDIS_CACHE_LOCK_TIMEOUT_SECONDS", parser=float, default=60.0),
+        )
+
+    def get_client(self) -> redis.Redis:
+        with self._pool_lock:
+            if self._pool_pid != os.getpid():
+                self._pool = _create_connection_pool(self.max_connections)
+                self._pool_pid = os.getpid()
+            return redis.Redis(connection_pool=self._pool)
+
+    def _decode(self, raw_value: "bytes | None") -> Any:
+        if raw_value is None:
+            return CacheMiss()
+        return decode_value(raw_value)
+
+    def get(self, key: bytes) -> Any:
+        return self._decode(self.get_client().get(key)) # pyright: ignore [reportArgumentType]
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Any]:
+        if len(keys) == 0:
+            return []
+        return [self._decode(raw) for raw in self.get_client().mget(keys)] # pyright: ignore
+
+    def put(self, key: bytes, value: Any, ttl: Optional[int] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        _ = self.get_client().set(key, encode_value(value, self.compression), ex=ttl or None)
+
+    def put_many(self, items: Sequence[Tuple[bytes, Any]], ttl: Optional[int] = None) -> None:
+        if len(items) == 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        pipeline = self.get_client().pipeline(transaction=False)
+        for key, value in items:
+            _ = pipeline.set(key, encode_value(value, self.compression), ex=ttl or None)
+        _ = pipeline.execute()
+
+    def compute_once(self, key: bytes, compute: Callable[[], Any], ttl: Optional[int] = None) -> Any:
+        """Computes and stores the value for 'key' unless another process is already doing so, in which case
+        this waits for that value to show up instead.
+
+        The process computing a value holds a lease on it that expires after 'lock_timeout' seconds, so that
+        waiters take over if it dies (or takes too long) without ever publishing a result.
+        """
+        client = self.get_client()
+        lock_key = b"lock:" + key
+        token = uuid.uuid4().bytes
+        poll_interval = 0.005
+        while True:
+            if client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000)):
+                try:
+                    # the previous lease holder might have published the value before releasing its lease
+                    value = self.get(key)
+                    if isinstance(value, CacheMiss):
+                        value = compute()
+                        self.put(key, value, ttl=ttl)
+                    return value
+                finally:
+                    _ = client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            value = self.get(key)
+            if not isinstance(value, CacheMiss):
+                return value
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, 0.1)
+
+    def compute_many(self, keys: Sequence[bytes], compute: Callable[[Sequence[int]], List[Any]], ttl: Optional[int] = None) -> List[Any]:
+        """Computes and stores the values for 'keys' that no other process is computing, with compute(indices)
+        producing the values of keys[i] for each i in 'indices'. Leases are taken, values are computed and values
+        are stored in a single batch each.
+
+        Keys whose lease is held by someone else are left as CacheMiss, to be waited for with e.g. compute_once.
+        """
+        if len(keys) == 0:
+            return []
+        client = self.get_client()
+        lock_keys = [b"lock:" + key for key in keys]
+        tokens = [uuid.uuid4().bytes for _ in keys]
+        pipeline = client.pipeline(transaction=False)
+        for lock_key, token in zip(lock_keys, tokens):
+            _ = pipeline.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000))
+        leased_indices = [idx for idx, is_leased in enumerate(pipeline.execute()) if is_leased]
+
+        values: List[Any] = [CacheMiss()] * len(keys)
+        try:
+            # previous lease holders might have published their values before releasing their leases
+            for idx, value in zip(leased_indices, self.get_many([keys[idx] for idx in leased_indices])):
+                values[idx] = value
+            to_compute = [idx for idx in leased_indices if isinstance(values[idx], CacheMiss)]
+            if to_compute:
+                for idx, value in zip(to_compute, compute(to_compute)):
+                    values[idx] = value
+                self.put_many([(keys[idx], values[idx]) for idx in to_compute], ttl=ttl)
+        finally:
+            pipeline = client.pipeline(transaction=False)
+            for idx in leased_indices:
+                _ = pipeline.eval(_RELEASE_LOCK_SCRIPT, 1, lock_keys[idx], tokens[idx])
+            _ = pipeline.execute()
+        return values
+
+# deletes the lock only if it is still held by whoever is releasing it, rather than by someone who took over
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
@@ -0,0 +1,215 @@
+# pyright: strict
+
+"""A fixed-size cache in shared memory, usable by unrelated processes on the same node.
+
+The arena is a log: values are appended at an ever-increasing position, and physically stored at that position
+modulo the size of the data region, overwriting the oldest values as it wraps around. Since positions never decrease,
+an entry at 'position' is still intact as long as 'log_end - position <= data_size'; there is no need to track or
+scan evicted entries.
+
+Values are found via a hash table of 'NUM_BUCKETS' buckets of 'BUCKET_WAYS' slots each, guarded by striped locks.
+Because workers may be spawned (rather than forked) and so can't inherit multiprocessing locks, each stripe is
+a byte-range lock on a lock file, paired with a threading lock for the threads within a process.
+"""
+
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Final, Iterator, List, Tuple
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from webilastik.caching import CacheMiss
+
+_MAGIC: Final[bytes] = b"WISHMC01"
+# magic, data_size, log_end, num_buckets
+_HEADER = struct.Struct("<8sQQQ")
+_LOG_END_OFFSET: Final[int] = 16
+# key digest, position, length. A length of 0 means the slot is empty
+_SLOT = struct.Struct("<16sQQ")
+_DIGEST_SIZE: Final[int] = 16
+
+NUM_BUCKETS: Final[int] = 16 * 1024
+BUCKET_WAYS: Final[int] = 8
+NUM_STRIPES: Final[int] = 64
+_ALLOCATOR_LOCK_INDEX: Final[int] = NUM_STRIPES
+NUM_COMPUTE_LEASES: Final[int] = 4096
+_COMPUTE_LEASES_OFFSET: Final[int] = NUM_STRIPES + 1
+
+
+def _align(value: int, alignment: int = 64) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+class SharedMemoryArena:
+    def __init__(self, *, shm: SharedMemory, lock_path: Path, is_owner: bool) -> None:
+        magic, data_size, _, num_buckets = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or num_buckets != NUM_BUCKETS:
+            raise ValueError(f"Shared memory segment {shm.name} is not a compatible cache arena")
+        self.shm: Final[SharedMemory] = shm
+        self.lock_path: Final[Path] = lock_path
+        self.is_owner: Final[bool] = is_owner
+        self.data_size: Final[int] = data_size
+        self._index_offset: Final[int] = _align(_HEADER.size)
+        self._data_offset: Final[int] = _align(self._index_offset + NUM_BUCKETS * BUCKET_WAYS * _SLOT.size)
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_locks: Final[List[threading.Lock]] = [threading.Lock() for _ in range(NUM_STRIPES + 1)]
+        # fcntl locks are held by the process, so threads contending for a lease are kept apart by these first
+        self._lease_thread_locks: Final[List[threading.Lock]] = [threading.Lock() for _ in range(NUM_COMPUTE_LEASES)]
+        self._closed = False
+        super().__init__()
+
+    @classmethod
+    def create(cls, *, data_size: int) -> "SharedMemoryArena":
+        index_size = NUM_BUCKETS * BUCKET_WAYS * _SLOT.size
+        shm = SharedMemory(create=True, size=_align(_align(_HEADER.size) + index_size) + data_size)
+        shm.buf[:_align(_HEADER.size) + index_size] = bytes(_align(_HEADER.size) + index_size)
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, data_size, 0, NUM_BUCKETS)
+        lock_fd, lock_path = tempfile.mkstemp(prefix=f"{shm.name}_", suffix=".lock")
+        os.close(lock_fd)
+        return SharedMemoryArena(shm=shm, lock_path=Path(lock_path), is_owner=True)
+
+    @classmethod
+    def attach(cls, *, name: str, lock_path: Path) -> "SharedMemoryArena":
+        shm = SharedMemory(name=name)
+        if multiprocessing.parent_process() is None:
+            # An unrelated process has its own resource tracker, which would unlink the segment when this
+            # (non-owner) process exits. Children of the owner share the owner's tracker, so they're left alone
+            resource_tracker.unregister(shm._name, "shared_memory") # pyright: ignore [reportUnknownMemberType, reportAttributeAccessIssue]
+        return SharedMemoryArena(shm=shm, lock_path=lock_path, is_owner=False)
+
+    @contextmanager
+    def _locked(self, lock_index: int) -> Iterator[None]:
+        with self._thread_locks[lock_index]:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, lock_index)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, lock_index)
+
+    @contextmanager
+    def compute_lease(self, key: bytes, timeout: float) -> Iterator[bool]:
+        """Keeps other threads and processes from computing the value for 'key' (or for keys that hash alike) at the same time.
+
+        Waits for up to 'timeout' seconds for the lease, and yields whether it was obtained; callers should
+        check the arena for the value once they get past this point either way.
+        """
+        lease_index = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") % NUM_COMPUTE_LEASES
+        lock_index = _COMPUTE_LEASES_OFFSET + lease_index
+        thread_lock = self._lease_thread_locks[lease_index]
+        deadline = time.monotonic() + timeout
+        poll_interval = 0.001
+        acquired = False
+        while thread_lock.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            try:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, lock_index)
+                acquired = True
+                break
+            except OSError:
+                thread_lock.release()
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 0.05)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, lock_index)
+                thread_lock.release()
+
+    def _get_log_end(self) -> int:
+        # an aligned 8-byte read, which is not torn on the platforms we run on
+        return struct.unpack_from("<Q", self.shm.buf, _LOG_END_OFFSET)[0]
+
+    def _is_intact(self, position: int, log_end: int) -> bool:
+        return log_end - position <= self.data_size
+
+    def _locate(self, key: bytes) -> Tuple[bytes, int, int]:
+        """Returns the key's digest, the offset of its bucket and the index of its stripe lock"""
+        digest = hashlib.blake2b(key, digest_size=_DIGEST_SIZE).digest()
+        bucket_index = int.from_bytes(digest[:8], "little") % NUM_BUCKETS
+        return digest, self._index_offset + bucket_index * BUCKET_WAYS * _SLOT.size, bucket_index % NUM_STRIPES
+
+    def get(self, key: bytes) -> "bytes | CacheMiss":
+        """Returns a copy of the value for 'key'.
+
+        Writers don't take the stripe lock while copying their data in, so the arena may wrap around and overwrite
+        an entry while it is being copied out. The entry is checked again after the copy, like a seqlock, and a
+        value that got overwritten in the meantime is reported as a miss
+        """
+        digest, bucket_offset, stripe = self._locate(key)
+        with self._locked(stripe):
+            for way in range(BUCKET_WAYS):
+                slot_digest, position, length = _SLOT.unpack_from(self.shm.buf, bucket_offset + way * _SLOT.size)
+                if length == 0 or slot_digest != digest:
+                    continue
+                if not self._is_intact(position, self._get_log_end()):
+                    return CacheMiss()
+                data_start = self._data_offset + position % self.data_size
+                data = bytes(self.shm.buf[data_start:data_start + length])
+                if not self._is_intact(position, self._get_log_end()):
+                    return CacheMiss()
+                return data
+        return CacheMiss()
+
+    def _reserve(self, length: int) -> int:
+        with self._locked(_ALLOCATOR_LOCK_INDEX):
+            position = self._get_log_end()
+            if position % self.data_size + length > self.data_size:
+                # entries never straddle the end of the data region
+                position = _align(position, self.data_size)
+            struct.pack_into("<Q", self.shm.buf, _LOG_END_OFFSET, position + length)
+            return position
+
+    def put(self, key: bytes, data: "bytes | memoryview") -> bool:
+        length = len(data)
+        if length == 0 or length > self.data_size // 4:
+            return False
+        position = self._reserve(length)
+        data_start = self._data_offset + position % self.data_size
+        self.shm.buf[data_start:data_start + length] = data
+
+        digest, bucket_offset, stripe = self._locate(key)
+        with self._locked(stripe):
+            log_end = self._get_log_end()
+            victim_way = 0
+            victim_position = -1
+            for way in range(BUCKET_WAYS):
+                slot_digest, slot_position, slot_length = _SLOT.unpack_from(self.shm.buf, bucket_offset + way * _SLOT.size)
+                if slot_digest == digest or slot_length == 0 or not self._is_intact(slot_position, log_end):
+                    victim_way = way
+                    break
+                if victim_position < 0 or slot_position < victim_position:
+                    victim_way, victim_position = way, slot_position
+            _SLOT.pack_into(self.shm.buf, bucket_offset + victim_way * _SLOT.size, digest, position, length)
+        return True
+
+    def count_entries(self) -> int:
+        """Approximate number of live entries, since the index is scanned without locking"""
+        log_end = self._get_log_end()
+        return sum(
+            1
+            for _, position, length in _SLOT.iter_unpack(self.shm.buf[self._index_offset:self._data_offset])
+            if length > 0 and self._is_intact(position, log_end)
+        )
+
+    def get_used_bytes(self) -> int:
+        return min(self._get_log_end(), self.data_size)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        os.close(self._lock_fd)
+        self.shm.close()
+        if self.is_owner:
+            self.shm.unlink()
+            self.lock_path.unlink(missing_ok=True)
@@ -7,7 +7,7 @@ import numpy as np
 from ndstructs.point5D import Shape5D, Interval5D
 from ndstructs.array5D import Array5D
 from webilastik.filesystem import IFilesystem
-from webilastik.server.rpc.dto import DataSinkDto, DziLevelSinkDto, PrecomputedChunksSinkDto
+from webilastik.server.rpc.dto import DataSinkDto, DziLevelSinkDto, PrecomputedChunksSinkDto, ZarrDataSinkDto
 from webilastik.utility.url import Url
 
 class IDataSinkWriter(Protocol):
@@ -47,6 +47,9 @@ class DataSink(ABC):
         if isinstance(message, DziLevelSinkDto):
             from webilastik.datasink.deep_zoom_sink import DziLevelSink
             return DziLevelSink.from_dto(message)
+        if isinstance(message, ZarrDataSinkDto):
+            from webilastik.datasink.zarr_sink import ZarrDataSink
+            return ZarrDataSink.from_dto(message)
         from webilastik.datasink.n5_dataset_sink import N5DataSink
         return N5DataSink.from_dto(message)
 
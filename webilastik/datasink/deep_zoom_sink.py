@@ -33,10 +33,8 @@ class DziLevelWriter(IDataSinkWriter):
             out_file,
             self._data_sink.dzi_image.Format.replace("jpg", "jpeg")
         )
-        _ = out_file.seek(0)
-        contents = out_file.read() # FIXME: read() ?
-
-        return self._data_sink.filesystem.create_file(path=chunk_path, contents=contents)
+        # getbuffer exposes the encoded image without copying it out of the BytesIO
+        return self._data_sink.filesystem.create_file(path=chunk_path, contents=out_file.getbuffer())
 
 
 class DziLevelSink(FsDataSink):
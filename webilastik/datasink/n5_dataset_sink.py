@@ -27,7 +27,7 @@ class N5Writer(IDataSinkWriter):
         tile_path = self._data_sink.path / self._data_sink.attributes.get_tile_path(data.interval)
         return self._data_sink.filesystem.create_file(
             path=tile_path,
-            contents=tile.to_n5_bytes(
+            contents=tile.to_n5_chunks(
                 axiskeys=self._data_sink.attributes.c_axiskeys, compression=self._data_sink.attributes.compression
             )
         )
@@ -1,6 +1,7 @@
 from pathlib import PurePosixPath
+import gzip
 import json
-from typing import Any, Tuple, Literal
+from typing import Any, Dict, Optional, Tuple, Literal
 
 import numpy as np
 from ndstructs.point5D import Shape5D, Interval5D
@@ -8,7 +9,10 @@ from ndstructs.array5D import Array5D
 
 from webilastik.datasink import FsDataSink, IDataSinkWriter
 from webilastik.datasource.precomputed_chunks_datasource import PrecomputedChunksDataSource
-from webilastik.datasource.precomputed_chunks_info import PrecomputedChunksInfo, PrecomputedChunksScale, PrecomputedChunksEncoder
+from webilastik.datasource.precomputed_chunks_info import (
+    CompressedSegmentationEncoder, PrecomputedChunksInfo, PrecomputedChunksScale, PrecomputedChunksEncoder
+)
+from webilastik.datasource.precomputed_chunks_sharding import PrecomputedChunksSharding
 from webilastik.filesystem import FsIoException, IFilesystem, create_filesystem_from_message
 from webilastik.server.rpc.dto import Interval5DDto, PrecomputedChunksSinkDto, Shape5DDto
 from webilastik.utility.url import Url
@@ -25,12 +29,35 @@ class PrecomputedChunksWriter(IDataSinkWriter):
     def write(self, data: Array5D) -> "FsIoException | None":
         tile = data.interval
         assert tile.is_tile(tile_shape=self._data_sink.tile_shape, full_interval=self._data_sink.interval, clamped=True), f"Bad tile: {tile}"
+        if self._data_sink.sharding is not None:
+            return self._write_shard(self._data_sink.sharding, data)
         chunk_name = f"{tile.x[0]}-{tile.x[1]}_{tile.y[0]}-{tile.y[1]}_{tile.z[0]}-{tile.z[1]}"
         chunk_path = self._data_sink.path / self._data_sink.scale.key / chunk_name
-        return self._data_sink.filesystem.create_file(path=chunk_path, contents=self._data_sink.scale.encoding.encode(data))
+        contents = self._data_sink.scale.encoding.encode(data)
+        if self._data_sink.gzip_chunks:
+            contents = gzip.compress(contents, compresslevel=6)
+        return self._data_sink.filesystem.create_file(path=chunk_path, contents=contents)
+
+    def _write_shard(self, sharding: PrecomputedChunksSharding, data: Array5D) -> "FsIoException | None":
+        # tiles of sharded sinks are whole shards, so each shard file is written in one go
+        sink = self._data_sink
+        chunks: Dict[int, "bytes | memoryview"] = {}
+        for chunk_interval in data.interval.split(sink.chunk_shape):
+            chunk_id = sharding.get_chunk_id(tile=chunk_interval, scale_interval=sink.interval, chunk_shape=sink.chunk_shape)
+            chunks[chunk_id] = sink.scale.encoding.encode(data.cut(chunk_interval))
+        shard, _ = sharding.get_shard_and_minishard(next(iter(chunks.keys())))
+        shard_path = sink.path / sink.scale.key / sharding.get_shard_file_name(shard)
+        return sink.filesystem.create_file(path=shard_path, contents=sharding.encode_shard(chunks))
 
 
 class PrecomputedChunksSink(FsDataSink):
+    """A sink that writes a scale of a precomputed chunks volume, with chunks of 'tile_shape'.
+
+    If 'sharding' is set, the sink's tiles are whole shards (which must therefore use the identity hash),
+    so that each file written holds many chunks. Otherwise, 'gzip_chunks' gzips each chunk file; readers
+    (this repo's and neuroglancer) detect that from the contents of the chunk itself
+    """
+
     def __init__(
         self,
         *,
@@ -42,7 +69,20 @@ class PrecomputedChunksSink(FsDataSink):
         dtype: "np.dtype[Any]",
         resolution: Tuple[int, int, int],
         encoding: PrecomputedChunksEncoder,
+        sharding: Optional[PrecomputedChunksSharding] = None,
+        gzip_chunks: bool = False,
     ):
+        self.chunk_shape = tile_shape
+        self.sharding = sharding
+        self.gzip_chunks = gzip_chunks
+        if sharding is not None:
+            chunks_per_shard = sharding.get_chunks_per_shard(
+                PrecomputedChunksSharding.get_grid_shape(scale_interval=interval, chunk_shape=tile_shape)
+            )
+            assert not isinstance(chunks_per_shard, Exception), str(chunks_per_shard)
+            tile_shape = tile_shape.updated(
+                x=tile_shape.x * chunks_per_shard[0], y=tile_shape.y * chunks_per_shard[1], z=tile_shape.z * chunks_per_shard[2]
+            )
         super().__init__(
             filesystem=filesystem,
             path=path,
@@ -60,12 +100,13 @@ class PrecomputedChunksSink(FsDataSink):
         self.scale = PrecomputedChunksScale(
             key=self.scale_key,
             chunk_sizes=tuple([
-                (tile_shape.x, tile_shape.y, tile_shape.z)
+                (self.chunk_shape.x, self.chunk_shape.y, self.chunk_shape.z)
             ]),
             encoding=encoding,
             resolution=resolution,
             size=size,
             voxel_offset=offset,
+            sharding=sharding,
         )
 
     @property
@@ -81,7 +122,7 @@ class PrecomputedChunksSink(FsDataSink):
         if not self.filesystem.exists(info_path):
             # _ = self.filesystem.makedirs(self.path.as_posix())
             info = PrecomputedChunksInfo(
-                type_="image",
+                type_="segmentation" if isinstance(self.encoding, CompressedSegmentationEncoder) else "image",
                 data_type=self.dtype,
                 num_channels=self.shape.c,
                 scales=tuple([self.scale]),
@@ -101,7 +142,13 @@ class PrecomputedChunksSink(FsDataSink):
                     deletion_result = self.filesystem.delete(scale_path)
                     if isinstance(deletion_result, Exception):
                         return deletion_result
-                    info = existing_info
+                    # the scale is rewritten, possibly with a different layout (e.g. sharded instead of unsharded)
+                    info = PrecomputedChunksInfo(
+                        type_=existing_info.type_,
+                        data_type=existing_info.data_type,
+                        num_channels=existing_info.num_channels,
+                        scales=tuple(self.scale if s.key == self.scale.key else s for s in existing_info.scales),
+                    )
                     break
             else:
                 info = PrecomputedChunksInfo(
@@ -124,12 +171,13 @@ class PrecomputedChunksSink(FsDataSink):
         return PrecomputedChunksDataSource(
             filesystem=self.filesystem,
             path=self.path,
-            tile_shape=self.tile_shape,
+            tile_shape=self.chunk_shape,
             dtype=self.dtype,
             encoding=self.encoding,
             interval=self.interval,
             scale_key=self.scale_key,
             spatial_resolution=self.resolution,
+            sharding=self.sharding,
         )
 
     def to_dto(self) -> PrecomputedChunksSinkDto:
@@ -142,11 +190,16 @@ class PrecomputedChunksSink(FsDataSink):
             filesystem=self.filesystem.to_dto(),
             path=self.path.as_posix(),
             dtype=type_name,
-            tile_shape=Shape5DDto.from_shape5d(self.tile_shape),
+            tile_shape=Shape5DDto.from_shape5d(self.chunk_shape),
             encoding=self.encoding.to_dto(),
             interval=Interval5DDto.from_interval5d(self.interval),
             resolution=self.resolution,
             scale_key=self.scale_key.as_posix(),
+            sharding=None if self.sharding is None else self.sharding.to_dto(),
+            compressed_segmentation_block_size=(
+                self.encoding.block_size if isinstance(self.encoding, CompressedSegmentationEncoder) else None
+            ),
+            gzip_chunks=self.gzip_chunks,
         )
 
     @classmethod
@@ -154,13 +207,29 @@ class PrecomputedChunksSink(FsDataSink):
         fs_result = create_filesystem_from_message(message.filesystem)
         if isinstance(fs_result, Exception):
             return fs_result
+        encoding = PrecomputedChunksEncoder.from_dto(
+            message.encoding, compressed_segmentation_block_size=message.compressed_segmentation_block_size
+        )
+        interval = message.interval.to_interval5d()
+        compatibility_error = encoding.check_compatibility(dtype=np.dtype(message.dtype), num_channels=interval.shape.c)
+        if compatibility_error is not None:
+            return compatibility_error
+        sharding = None if message.sharding is None else PrecomputedChunksSharding.from_dto(message.sharding)
+        if sharding is not None:
+            chunks_per_shard = sharding.get_chunks_per_shard(PrecomputedChunksSharding.get_grid_shape(
+                scale_interval=interval, chunk_shape=message.tile_shape.to_shape5d()
+            ))
+            if isinstance(chunks_per_shard, Exception):
+                return chunks_per_shard
         return PrecomputedChunksSink(
             filesystem=fs_result,
             path=PurePosixPath(message.path),
             scale_key=PurePosixPath(message.scale_key),
             dtype=np.dtype(message.dtype), #FIXME?
-            interval=message.interval.to_interval5d(),
+            interval=interval,
             tile_shape=message.tile_shape.to_shape5d(),
-            encoding=PrecomputedChunksEncoder.from_dto(message.encoding),
+            encoding=encoding,
             resolution=message.resolution,
+            sharding=sharding,
+            gzip_chunks=message.gzip_chunks,
         )
\ No newline at end of file
@@ -0,0 +1,177 @@
+from typing import Any, List, Literal, Optional, Tuple
+from pathlib import PurePosixPath
+import json
+import math
+
+import numpy as np
+from ndstructs.point5D import Interval5D, Shape5D
+from ndstructs.array5D import Array5D
+
+from webilastik.datasink import FsDataSink, IDataSinkWriter
+from webilastik.datasource.n5_attributes import N5Compressor
+from webilastik.datasource.zarr_datasource import ZarrDataSource
+from webilastik.datasource.zarr_metadata import ZarrArrayMetadata
+from webilastik.filesystem import FsIoException, IFilesystem, create_filesystem_from_message
+from webilastik.server.rpc.dto import Interval5DDto, Shape5DDto, ZarrDataSinkDto, dtype_to_dto
+
+
+class ZarrWriter(IDataSinkWriter):
+    def __init__(self, data_sink: "ZarrDataSink") -> None:
+        super().__init__()
+        self._data_sink = data_sink
+
+    @property
+    def data_sink(self) -> "ZarrDataSink":
+        return self._data_sink
+
+    def write(self, data: Array5D) -> "FsIoException | None":
+        """Writes a tile of the sink, which for sharded sinks is a whole shard, i.e. many chunks in a single file"""
+        sink = self._data_sink
+        tile = data.interval
+        assert tile.is_tile(tile_shape=sink.tile_shape, full_interval=sink.interval, clamped=True), f"Bad tile: {tile}"
+        metadata = sink.metadata
+        # the zarr array starts at the origin, wherever the sink's interval is
+        file_path = sink.path / metadata.get_file_key(tile.translated(-sink.interval.start))
+        if metadata.shard_shape is None:
+            return sink.filesystem.create_file(path=file_path, contents=metadata.encode_chunk(data))
+
+        chunks: List["bytes | memoryview | None"] = [None] * math.prod(metadata.chunks_per_shard)
+        for chunk_interval in tile.split(sink.chunk_shape):
+            chunk_data = data.cut(chunk_interval)
+            if metadata.is_empty_chunk(chunk_data):
+                continue
+            chunk_index = metadata.get_chunk_index_in_shard(chunk_interval.translated(-sink.interval.start))
+            chunks[chunk_index] = metadata.encode_chunk(chunk_data)
+        return sink.filesystem.create_file(path=file_path, contents=metadata.encode_shard(chunks))
+
+
+class ZarrDataSink(FsDataSink):
+    """A sink that writes a zarr array. If 'shard_shape' is set, the array is a sharded zarr v3 array and its
+    tiles are whole shards, so that each file written holds many chunks"""
+
+    def __init__(
+        self,
+        *,
+        filesystem: IFilesystem,
+        path: PurePosixPath,
+        interval: Interval5D,
+        chunk_shape: Shape5D,
+        c_axiskeys: str,
+        dtype: "np.dtype[Any]",
+        compressor: N5Compressor,
+        shard_shape: Optional[Shape5D] = None,
+        zarr_format: Literal[2, 3] = 3,
+        resolution: Tuple[int, int, int] = (1,1,1),
+    ):
+        super().__init__(
+            filesystem=filesystem,
+            path=path,
+            tile_shape=shard_shape or chunk_shape,
+            interval=interval,
+            dtype=dtype,
+            resolution=resolution,
+        )
+        self.resolution = resolution
+        self.chunk_shape = chunk_shape
+        self.shard_shape = shard_shape
+        self.c_axiskeys = c_axiskeys
+        self.compressor = compressor
+        self.zarr_format: Literal[2, 3] = zarr_format
+        self.metadata = ZarrArrayMetadata(
+            zarr_format=zarr_format,
+            shape=interval.shape,
+            chunk_shape=chunk_shape,
+            c_axiskeys=c_axiskeys,
+            dtype=dtype,
+            compressor=compressor,
+            chunk_key_encoding="default" if zarr_format == 3 else "v2",
+            dimension_separator="/",
+            shard_shape=shard_shape,
+        )
+
+        self.outer_path: Optional[PurePosixPath] = None
+        while path != path.parent:
+            if path.suffix.lower() == ".zarr":
+                self.outer_path = path
+                break
+            path = path.parent
+
+    def open(self) -> "Exception | ZarrWriter":
+        if self.shard_shape is not None:
+            shard_shape = self.shard_shape.to_tuple(self.c_axiskeys)
+            chunk_shape = self.chunk_shape.to_tuple(self.c_axiskeys)
+            if any(shard_len % chunk_len != 0 for shard_len, chunk_len in zip(shard_shape, chunk_shape)):
+                return ValueError(f"Shard shape {self.shard_shape} is not a multiple of the chunk shape {self.chunk_shape}")
+
+        # zarr groups must be explicit, so every group between the container and the array gets its metadata
+        if self.outer_path is not None and self.outer_path != self.path:
+            group_path = self.path.parent
+            group_file_name = "zarr.json" if self.zarr_format == 3 else ".zgroup"
+            group_metadata = {"zarr_format": 3, "node_type": "group"} if self.zarr_format == 3 else {"zarr_format": 2}
+            while True:
+                exists_result = self.filesystem.exists(group_path / group_file_name)
+                if isinstance(exists_result, Exception):
+                    return exists_result
+                if not exists_result:
+                    group_write_result = self.filesystem.create_file(
+                        path=group_path / group_file_name, contents=json.dumps(group_metadata).encode("utf8")
+                    )
+                    if isinstance(group_write_result, Exception):
+                        return group_write_result
+                if group_path == self.outer_path:
+                    break
+                group_path = group_path.parent
+
+        try:
+            metadata_files = self.metadata.to_json_files()
+        except Exception as e:
+            return e
+        for file_name, contents in metadata_files.items():
+            metadata_write_result = self.filesystem.create_file(
+                path=self.path / file_name, contents=json.dumps(contents).encode("utf8")
+            )
+            if isinstance(metadata_write_result, Exception):
+                return metadata_write_result
+        return ZarrWriter(self)
+
+    def to_datasource(self) -> ZarrDataSource:
+        return ZarrDataSource(
+            filesystem=self.filesystem,
+            path=self.path,
+            metadata=self.metadata,
+            spatial_resolution=self.resolution,
+        )
+
+    def to_dto(self) -> ZarrDataSinkDto:
+        return ZarrDataSinkDto(
+            filesystem=self.filesystem.to_dto(),
+            path=self.path.as_posix(),
+            interval=Interval5DDto.from_interval5d(self.interval),
+            tile_shape=Shape5DDto.from_shape5d(self.chunk_shape),
+            shard_shape=None if self.shard_shape is None else Shape5DDto.from_shape5d(self.shard_shape),
+            spatial_resolution=self.resolution,
+            c_axiskeys=self.c_axiskeys,
+            dtype=dtype_to_dto(self.dtype),
+            compressor=self.compressor.to_dto(),
+            zarr_format=self.zarr_format,
+        )
+
+    @staticmethod
+    def from_dto(dto: ZarrDataSinkDto) -> "ZarrDataSink | Exception":
+        fs_result = create_filesystem_from_message(dto.filesystem)
+        if isinstance(fs_result, Exception):
+            return fs_result
+        if dto.shard_shape is not None and dto.zarr_format != 3:
+            return ValueError("Only zarr v3 arrays can be sharded")
+        return ZarrDataSink(
+            filesystem=fs_result,
+            path=PurePosixPath(dto.path),
+            interval=dto.interval.to_interval5d(),
+            chunk_shape=dto.tile_shape.to_shape5d(),
+            shard_shape=None if dto.shard_shape is None else dto.shard_shape.to_shape5d(),
+            c_axiskeys=dto.c_axiskeys,
+            dtype=np.dtype(dto.dtype),
+            compressor=N5Compressor.create_from_dto(dto.compressor),
+            zarr_format=dto.zarr_format,
+            resolution=dto.spatial_resolution,
+        )
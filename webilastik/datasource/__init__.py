@@ -2,20 +2,66 @@
 
 import enum
 from abc import abstractmethod, ABC
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import cached_property
 from enum import IntEnum
 from pathlib import PurePosixPath
-from typing import Any, ClassVar, Optional, Tuple, Union, Iterator, Dict, Sequence
+from typing import Any, ClassVar, List, Optional, Set, Tuple, Union, Iterator, Sequence
 from typing_extensions import Final
+import json
+import math
+import os
+import threading
 
 import numpy as np
 
 from ndstructs.point5D import Shape5D, Interval5D, Point5D, SPAN
 from ndstructs.array5D import Array5D, SPAN_OVERRIDE, All
-from webilastik.filesystem import IFilesystem
-from webilastik.server.rpc.dto import FsDataSourceDto, N5DataSourceDto, PrecomputedChunksDataSourceDto, SkimageDataSourceDto
+from webilastik.filesystem import IFilesystem, get_io_concurrency
+from webilastik.server.rpc.dto import FsDataSourceDto, N5DataSourceDto, PrecomputedChunksDataSourceDto, SkimageDataSourceDto, ZarrDataSourceDto
 from webilastik.utility.url import Url
 from webilastik.utility.url import Url, Protocol
 from global_cache import global_cache
+from webilastik.caching import ComputeMany, call_many, get_max_bytes_from_env, make_content_key
+from webilastik.datasource.read_ahead import ReadAhead
+
+
+_IO_THREAD_PREFIX = "datasource_io_thread_"
+_io_executor_lock = threading.Lock()
+_io_executor: "ThreadPoolExecutor | None" = None
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """A bounded pool shared by all datasources in this process, so that concurrent retrieves can't pile up threads"""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("DATASOURCE_IO_THREADS", "32")),
+                thread_name_prefix=_IO_THREAD_PREFIX,
+            )
+        return _io_executor
+
+_read_ahead_executor_lock = threading.Lock()
+_read_ahead_executor: "ThreadPoolExecutor | None" = None
+
+def _get_read_ahead_executor() -> ThreadPoolExecutor:
+    """A small pool of its own for prefetches, so that they never hold up tiles that were actually requested"""
+    global _read_ahead_executor
+    with _read_ahead_executor_lock:
+        if _read_ahead_executor is None:
+            _read_ahead_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("DATASOURCE_READ_AHEAD_THREADS", "4")),
+                # prefetches count as io threads, so that the retrieves they cause upstream are not nested in the pool
+                thread_name_prefix=_IO_THREAD_PREFIX + "read_ahead_",
+            )
+        return _read_ahead_executor
+
+# read-ahead is opt-in, by giving it a budget for the bytes of tiles being prefetched at any one time
+_read_ahead: "ReadAhead | None" = None
+_read_ahead_max_bytes = get_max_bytes_from_env("DATASOURCE_READ_AHEAD_MAX_BYTES", default=0)
+if _read_ahead_max_bytes > 0:
+    _read_ahead = ReadAhead(max_outstanding_bytes=_read_ahead_max_bytes)
 
 
 @enum.unique
@@ -36,6 +82,8 @@ class DataSource(ABC):
     spatial_resolution: Final[Tuple[int, int, int]]
     roi: Final["DataRoi"]
 
+    TILE_LOOKUP_BATCH_SIZE: ClassVar[int] = 16
+
     def __init__(
         self,
         *,
@@ -60,6 +108,14 @@ class DataSource(ABC):
     def __hash__(self) -> int:
         return hash((self.tile_shape, self.dtype, self.interval, self.spatial_resolution))
 
+    @cached_property
+    def content_key(self) -> bytes:
+        """A digest identifying the data in this datasource, stable across processes and used in cache keys"""
+        return make_content_key(self.__class__, *self._get_content_key_parts())
+
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (self.tile_shape, self.dtype, self.interval, self.spatial_resolution)
+
     @abstractmethod
     def __eq__(self, other: object) -> bool:
         return (
@@ -84,6 +140,22 @@ class DataSource(ABC):
     def close(self) -> None:
         pass
 
+    def get_io_concurrency(self) -> int:
+        """How many batches of tiles 'retrieve' may fetch at once"""
+        return 1
+
+    def _get_uncached_tiles(self, tiles: Sequence[Interval5D]) -> List[Array5D]:
+        """Like _get_tile, for many tiles at once. Datasources that can fetch many tiles more cheaply than one by
+        one (e.g. with a single IFilesystem.read_files) should override this"""
+        return [self._get_tile(tile) for tile in tiles]
+
+    def _get_tiles(self, tiles: Sequence[Interval5D]) -> List[Array5D]:
+        # tiles missing from the cache are fetched in one batch, unless get_tile is overridden and must see them all
+        compute_many: "ComputeMany[Array5D] | None" = None
+        if type(self).get_tile is DataSource.get_tile:
+            compute_many = lambda calls: self._get_uncached_tiles([tile for _, tile in calls])
+        return call_many(type(self).get_tile, [(self, tile) for tile in tiles], compute_many=compute_many)
+
     def _allocate(self, interval: Union[Shape5D, Interval5D], fill_value: int, axiskeys_hint: str = "tzyxc") -> Array5D:
         return Array5D.allocate(interval, dtype=self.dtype, value=fill_value, axiskeys=axiskeys_hint)
 
@@ -107,12 +179,48 @@ class DataSource(ABC):
             c=self.interval.c if isinstance(c, All) else c,
         )
         out = self._allocate(interval, fill_value=0, axiskeys_hint=axiskeys_hint)
-        for tile in self.roi.clamped(interval).get_datasource_tiles(clamp_to_datasource=True):
-            tile_data = self.get_tile(tile)
-            out.set(tile_data, autocrop=True)
+        tiles = list(self.roi.clamped(interval).get_datasource_tiles(clamp_to_datasource=True))
+        # Tiles of upstream datasources (e.g. when downscaling) are fetched serially from within the io threads,
+        # so that waiting on them can't starve the pool
+        is_nested = threading.current_thread().name.startswith(_IO_THREAD_PREFIX)
+        self._fetch_tiles(out, tiles, concurrency=1 if is_nested else self.get_io_concurrency())
+        # prefetching starts only once the requested tiles are in, and runs in a pool of its own.
+        # Only sources that benefit from concurrent reads are worth reading ahead; in-memory ones are already fast
+        if _read_ahead is not None and self.get_io_concurrency() > 1 and not is_nested:
+            _read_ahead.on_retrieve(self, interval, _get_read_ahead_executor())
         out.setflags(write=False)
         return out
 
+    def _fetch_tiles(self, out: Array5D, tiles: Sequence["DataRoi"], concurrency: int) -> None:
+        # tiles are looked up in batches so that remote caches can serve them in fewer round trips, but batches
+        # are kept small enough to give every concurrent fetch some work
+        batch_size = max(1, min(self.TILE_LOOKUP_BATCH_SIZE, math.ceil(len(tiles) / concurrency)))
+        batches = [tiles[batch_start : batch_start + batch_size] for batch_start in range(0, len(tiles), batch_size)]
+
+        if concurrency == 1 or len(batches) == 1:
+            for batch in batches:
+                for tile_data in self._get_tiles(batch):
+                    out.set(tile_data, autocrop=True)
+            return
+
+        executor = _get_io_executor()
+        pending: "Set[Future[List[Array5D]]]" = set()
+        try:
+            for batch in batches:
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for tile_data in future.result():
+                            out.set(tile_data, autocrop=True)
+                pending.add(executor.submit(self._get_tiles, batch))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for tile_data in future.result():
+                        out.set(tile_data, autocrop=True)
+        finally:
+            for future in pending:
+                _ = future.cancel()
 
 class DataRoi(Interval5D):
     datasource: Final[DataSource]
@@ -139,6 +247,10 @@ class DataRoi(Interval5D):
     def __hash__(self) -> int:
         return hash((super().__hash__(), self.datasource))
 
+    @property
+    def content_key(self) -> bytes:
+        return make_content_key(self.datasource, self.start, self.stop)
+
     def __eq__(self, other: object) -> bool:
         if not super().__eq__(other):
             return False
@@ -241,6 +353,12 @@ class FsDataSource(DataSource):
     def __hash__(self) -> int:
         return hash((super().__hash__(), self.url))
 
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (*super()._get_content_key_parts(), self.url.raw)
+
+    def get_io_concurrency(self) -> int:
+        return get_io_concurrency(self.filesystem)
+
     @abstractmethod
     def __eq__(self, other: object) -> bool:
         return (
@@ -262,13 +380,66 @@ class FsDataSource(DataSource):
         from webilastik.datasource.n5_datasource import N5DataSource
         from webilastik.datasource.skimage_datasource import SkimageDataSource
         from webilastik.datasource.deep_zoom_datasource import DziLevelDataSource
+        from webilastik.datasource.zarr_datasource import ZarrDataSource
 
+        # the same datasource is described by the same DTO, so its live instance (with its open filesystem and
+        # parsed metadata) can be handed out again instead of being rebuilt
+        registry_key = json.dumps(message.to_json_value(), sort_keys=True, separators=(",", ":"))
+        registered = datasource_registry.get(registry_key)
+        if registered is not None:
+            return registered
+
+        datasource: "FsDataSource | Exception"
         if isinstance(message, PrecomputedChunksDataSourceDto):
-            return PrecomputedChunksDataSource.from_dto(message)
-        if isinstance(message, SkimageDataSourceDto):
-            return SkimageDataSource.from_dto(message)
-        if isinstance(message, N5DataSourceDto):
-            return N5DataSource.from_dto(message)
-        return DziLevelDataSource.from_dto(message)
-
-    _datasource_cache: ClassVar[Dict[Url, Sequence['FsDataSource']]] = {}
+            datasource = PrecomputedChunksDataSource.from_dto(message)
+        elif isinstance(message, SkimageDataSourceDto):
+            datasource = SkimageDataSource.from_dto(message)
+        elif isinstance(message, N5DataSourceDto):
+            datasource = N5DataSource.from_dto(message)
+        elif isinstance(message, ZarrDataSourceDto):
+            datasource = ZarrDataSource.from_dto(message)
+        else:
+            datasource = DziLevelDataSource.from_dto(message)
+        if isinstance(datasource, Exception):
+            return datasource
+        return datasource_registry.put(registry_key, datasource)
+
+
+class DataSourceRegistry:
+    """Keeps the most recently used datasources alive, keyed by an encoding of the DTO they were built from.
+
+    Tile requests describe their datasource in every URL; looking it up here skips decoding, parsing and
+    reconnecting the filesystem, and lets all requests share the datasource's lazily loaded metadata
+    """
+
+    def __init__(self, *, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, FsDataSource]" = OrderedDict()
+        super().__init__()
+
+    def get(self, key: str) -> "FsDataSource | None":
+        with self._lock:
+            datasource = self._entries.get(key)
+            if datasource is not None:
+                self._entries.move_to_end(key)
+            return datasource
+
+    def put(self, key: str, datasource: FsDataSource) -> FsDataSource:
+        """Registers 'datasource' under 'key', unless a concurrent caller got there first, and returns the registered one
+
+        Evicted datasources are just dropped rather than closed: requests that looked them up earlier may still be using
+        them, and whatever they hold (e.g. the connection pool of their filesystem) is released once they're unreferenced
+        """
+        with self._lock:
+            registered = self._entries.setdefault(key, datasource)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+            return registered
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+datasource_registry = DataSourceRegistry(max_entries=int(os.environ.get("DATASOURCE_REGISTRY_MAX_ENTRIES", "256")))
@@ -1,9 +1,10 @@
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 from ndstructs.point5D import Shape5D, Interval5D
 from ndstructs.array5D import Array5D
 
 from webilastik.datasource import DataSource
+from webilastik.caching import make_content_key
 
 class ArrayDataSource(DataSource):
     """A DataSource backed by an Array5D"""
@@ -28,6 +29,9 @@ class ArrayDataSource(DataSource):
     def __hash__(self) -> int:
         return hash((self._data, self.tile_shape))
 
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (*super()._get_content_key_parts(), make_content_key(self._data.raw("tzyxc").tobytes()))
+
     def __eq__(self, other: object) -> bool:
         return (
             isinstance(other, ArrayDataSource) and
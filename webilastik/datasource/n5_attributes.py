@@ -1,21 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ClassVar, List, Sequence, Tuple, TypeVar
 
 from pathlib import PurePosixPath
 import gzip
+import itertools
 import bz2
 import lzma
 import json
+import os
+import struct
+import threading
+import zlib
 import numpy as np
 
 from ndstructs.point5D import Interval5D, Shape5D
 from webilastik.datasource import guess_axiskeys
 from webilastik.serialization.json_serialization import parse_json
 from webilastik.server.rpc.dto import (
-    N5DatasetAttributesDto, N5Bzip2CompressorDto, N5CompressorDto, N5GzipCompressorDto, N5XzCompressorDto, N5RawCompressorDto, dtype_to_dto
+    N5BloscCompressorDto,
+    N5DatasetAttributesDto,
+    N5Bzip2CompressorDto,
+    N5CompressorDto,
+    N5GzipCompressorDto,
+    N5Lz4CompressorDto,
+    N5XzCompressorDto,
+    N5RawCompressorDto,
+    N5ZstdCompressorDto,
+    dtype_to_dto,
 )
 from webilastik.filesystem import IFilesystem
 
+
+_CODEC_THREAD_PREFIX = "n5_codec_thread_"
+_codec_executor_lock = threading.Lock()
+_codec_executor: "ThreadPoolExecutor | None" = None
+
+def get_codec_threads() -> int:
+    return int(os.environ.get("N5_CODEC_THREADS", str(os.cpu_count() or 1)))
+
+def _get_codec_executor() -> ThreadPoolExecutor:
+    global _codec_executor
+    with _codec_executor_lock:
+        if _codec_executor is None:
+            _codec_executor = ThreadPoolExecutor(max_workers=get_codec_threads(), thread_name_prefix=_CODEC_THREAD_PREFIX)
+        return _codec_executor
+
+_ITEM = TypeVar("_ITEM")
+_RESULT = TypeVar("_RESULT")
+
+def _map_in_codec_pool(func: Callable[[_ITEM], _RESULT], items: Sequence[_ITEM]) -> List[_RESULT]:
+    """Runs 'func' over 'items' in the codec pool. The codecs used here release the GIL, so this scales with cores"""
+    if len(items) <= 1 or threading.current_thread().name.startswith(_CODEC_THREAD_PREFIX):
+        return [func(item) for item in items]
+    return list(_get_codec_executor().map(func, items))
+
+# below this size, splitting the work of compressing a block across threads costs more than it saves
+_MIN_MULTITHREADED_CODEC_BYTES = 4 * 1024 * 1024
+
+# the largest temporary buffer codecs without a native "decompress into" should produce at a time
+_DECOMPRESSION_PIECE_SIZE = 1024 * 1024
+
 class N5Compressor(ABC):
     def __init__(self) -> None:
         super().__init__()
@@ -32,16 +77,30 @@ class N5Compressor(ABC):
             return Bzip2Compressor.from_dto(dto)
         if isinstance(dto, N5XzCompressorDto):
             return XzCompressor.from_dto(dto)
+        if isinstance(dto, N5BloscCompressorDto):
+            return BloscCompressor.from_dto(dto)
+        if isinstance(dto, N5ZstdCompressorDto):
+            return ZstdCompressor.from_dto(dto)
+        if isinstance(dto, N5Lz4CompressorDto):
+            return Lz4Compressor.from_dto(dto)
         return RawCompressor.from_dto(dto)
 
     @abstractmethod
-    def compress(self, raw: bytes) -> bytes:
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> "bytes | memoryview":
+        """'typesize' is the size of the items in 'raw', which some codecs (e.g. blosc's shuffle) can make use of"""
         pass
 
     @abstractmethod
-    def decompress(self, compressed: bytes) -> bytes:
+    def decompress(self, compressed: "bytes | memoryview") -> "bytes | memoryview":
         pass
 
+    def decompress_into(self, compressed: "bytes | memoryview", out: "np.ndarray[Any, Any]") -> bool:
+        """Decompresses straight into the (contiguous) array 'out', which must be exactly as big as the decompressed data.
+
+        Returns False if this codec can't, in which case callers should use 'decompress' instead
+        """
+        return False
+
 class GzipCompressor(N5Compressor):
     def __init__(self, level: int = 1):
         self.level = level
@@ -57,12 +116,52 @@ class GzipCompressor(N5Compressor):
     def from_dto(dto: N5GzipCompressorDto) -> "GzipCompressor":
         return GzipCompressor(level=dto.level)
 
-    def compress(self, raw: bytes) -> bytes:
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> bytes:
         return gzip.compress(raw, compresslevel=self.level)
 
-    def decompress(self, compressed: bytes) -> bytes:
+    def decompress(self, compressed: "bytes | memoryview") -> bytes:
         return gzip.decompress(compressed)
 
+    def decompress_into(self, compressed: "bytes | memoryview", out: "np.ndarray[Any, Any]") -> bool:
+        # inflating in bounded pieces means no temporary buffer is ever as big as the whole block
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        data = memoryview(compressed).cast("B")
+        out_view = memoryview(out).cast("B")
+        filled = 0
+        data_offset = 0
+        pending: "bytes | memoryview" = b""
+        at_member_start = True
+        while True:
+            if len(pending) == 0:
+                if data_offset >= len(data):
+                    break
+                pending = data[data_offset:data_offset + _DECOMPRESSION_PIECE_SIZE]
+                data_offset += _DECOMPRESSION_PIECE_SIZE
+            if at_member_start:
+                # like gzip.decompress, tolerate zero padding between and after members
+                pending = bytes(pending).lstrip(b"\x00")
+                if len(pending) == 0:
+                    continue
+                at_member_start = False
+            # asking for at least one byte even when 'out' is full is how overlong data gets noticed
+            piece = decompressor.decompress(pending, max(1, min(len(out_view) - filled, _DECOMPRESSION_PIECE_SIZE)))
+            if filled + len(piece) > len(out_view):
+                raise ValueError(f"Gzip data decompresses to more than {len(out_view)} bytes")
+            out_view[filled:filled + len(piece)] = piece
+            filled += len(piece)
+            if decompressor.eof:
+                # concatenated gzip members decompress to the concatenation of their contents
+                pending = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+                at_member_start = True
+            else:
+                pending = decompressor.unconsumed_tail
+        if not at_member_start:
+            raise ValueError("Gzip data is truncated")
+        if filled != len(out_view):
+            raise ValueError(f"Gzip data ended after {filled} of {len(out_view)} bytes")
+        return True
+
 
 class Bzip2Compressor(N5Compressor):
     def __init__(self, compressionLevel: int = 9):
@@ -79,10 +178,10 @@ class Bzip2Compressor(N5Compressor):
     def from_dto(dto: N5Bzip2CompressorDto) -> "Bzip2Compressor":
         return Bzip2Compressor(compressionLevel=dto.blockSize)
 
-    def compress(self, raw: bytes) -> bytes:
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> bytes:
         return bz2.compress(raw, self.compressionLevel)
 
-    def decompress(self, compressed: bytes) -> bytes:
+    def decompress(self, compressed: "bytes | memoryview") -> bytes:
         return bz2.decompress(compressed)
 
 
@@ -101,13 +200,190 @@ class XzCompressor(N5Compressor):
     def from_dto(dto: N5XzCompressorDto) -> "XzCompressor":
         return XzCompressor(preset=dto.preset)
 
-    def compress(self, raw: bytes) -> bytes:
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> bytes:
         return lzma.compress(raw, preset=self.preset)
 
-    def decompress(self, compressed: bytes) -> bytes:
+    def decompress(self, compressed: "bytes | memoryview") -> bytes:
         return lzma.decompress(compressed)
 
 
+class BloscCompressor(N5Compressor):
+    """Same layout as n5-blosc and zarr's Blosc codec"""
+
+    def __init__(self, cname: str = "lz4", clevel: int = 5, shuffle: int = 1, blocksize: int = 0):
+        self.cname = cname
+        self.clevel = clevel
+        self.shuffle = shuffle
+        self.blocksize = blocksize
+        super().__init__()
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, BloscCompressor) and
+            self.cname == other.cname and
+            self.clevel == other.clevel and
+            self.shuffle == other.shuffle and
+            self.blocksize == other.blocksize
+        )
+
+    def to_dto(self) -> N5BloscCompressorDto:
+        return N5BloscCompressorDto(cname=self.cname, clevel=self.clevel, shuffle=self.shuffle, blocksize=self.blocksize)
+
+    @staticmethod
+    def from_dto(dto: N5BloscCompressorDto) -> "BloscCompressor":
+        return BloscCompressor(cname=dto.cname, clevel=dto.clevel, shuffle=dto.shuffle, blocksize=dto.blocksize)
+
+    _blosc_configured: ClassVar[bool] = False
+
+    @classmethod
+    def _import_blosc(cls) -> Any:
+        import blosc # pyright: ignore [reportMissingImports]
+        if not cls._blosc_configured:
+            # blosc runs its own threads, and with releasegil it uses its thread-safe, GIL-free entry points
+            _ = blosc.set_releasegil(True) # pyright: ignore
+            _ = blosc.set_nthreads(get_codec_threads()) # pyright: ignore
+            cls._blosc_configured = True
+        return blosc # pyright: ignore
+
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> bytes:
+        blosc = self._import_blosc()
+        return blosc.compress(raw, typesize=typesize, clevel=self.clevel, shuffle=self.shuffle, cname=self.cname)
+
+    def decompress(self, compressed: "bytes | memoryview") -> bytes:
+        return self._import_blosc().decompress(compressed)
+
+    def decompress_into(self, compressed: "bytes | memoryview", out: "np.ndarray[Any, Any]") -> bool:
+        blosc = self._import_blosc()
+        decompressed_size: int = blosc.get_cbuffer_sizes(np.frombuffer(compressed, dtype=np.uint8))[0]
+        if decompressed_size != out.nbytes or not out.flags.c_contiguous:
+            raise ValueError(f"Can't decompress {decompressed_size} bytes of blosc data into {out.nbytes} bytes")
+        _ = blosc.decompress_ptr(compressed, out.ctypes.data)
+        return True
+
+
+class ZstdCompressor(N5Compressor):
+    def __init__(self, level: int = 3):
+        self.level = level
+        super().__init__()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ZstdCompressor) and self.level == other.level
+
+    def to_dto(self) -> N5ZstdCompressorDto:
+        return N5ZstdCompressorDto(level=self.level)
+
+    @staticmethod
+    def from_dto(dto: N5ZstdCompressorDto) -> "ZstdCompressor":
+        return ZstdCompressor(level=dto.level)
+
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> bytes:
+        import zstandard # pyright: ignore [reportMissingImports]
+        # zstd can split a large frame across its own worker threads
+        threads = get_codec_threads() if memoryview(raw).nbytes >= _MIN_MULTITHREADED_CODEC_BYTES else 0
+        return zstandard.ZstdCompressor(level=self.level, threads=threads).compress(raw) # pyright: ignore
+
+    def decompress(self, compressed: "bytes | memoryview") -> bytes:
+        import zstandard # pyright: ignore [reportMissingImports]
+        # frames written by streaming encoders (e.g. n5-zstandard) don't record their size, so decompress as a stream
+        return zstandard.ZstdDecompressor().decompressobj().decompress(compressed) # pyright: ignore
+
+    def decompress_into(self, compressed: "bytes | memoryview", out: "np.ndarray[Any, Any]") -> bool:
+        import zstandard # pyright: ignore [reportMissingImports]
+        reader: Any = zstandard.ZstdDecompressor().stream_reader(compressed) # pyright: ignore
+        out_view = memoryview(out).cast("B")
+        filled = 0
+        while filled < len(out_view):
+            num_read: int = reader.readinto(out_view[filled:])
+            if num_read == 0:
+                raise ValueError(f"Zstd data ended after {filled} of {len(out_view)} bytes")
+            filled += num_read
+        return True
+
+
+class Lz4Compressor(N5Compressor):
+    """The lz4 block stream written by N5's (java) Lz4Compression, i.e. the format of lz4-java's LZ4BlockOutputStream
+
+    Each block is (de)compressed independently, so blocks are spread over the codec threads. Checksums are written
+    (they are required by java readers) but not verified on reading.
+    """
+
+    MAGIC = b"LZ4Block"
+    HEADER = struct.Struct("<8sBiii") # magic, method | level, compressed length, decompressed length, checksum
+    METHOD_RAW = 0x10
+    METHOD_LZ4 = 0x20
+    CHECKSUM_SEED = 0x9747B28C
+
+    def __init__(self, blockSize: int = 65536):
+        self.blockSize = blockSize
+        super().__init__()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Lz4Compressor) and self.blockSize == other.blockSize
+
+    def to_dto(self) -> N5Lz4CompressorDto:
+        return N5Lz4CompressorDto(blockSize=self.blockSize)
+
+    @staticmethod
+    def from_dto(dto: N5Lz4CompressorDto) -> "Lz4Compressor":
+        return Lz4Compressor(blockSize=dto.blockSize)
+
+    def _get_compression_level(self) -> int:
+        return max(0, (self.blockSize - 1).bit_length() - 10)
+
+    def _compress_block(self, block: memoryview) -> bytes:
+        import lz4.block # pyright: ignore [reportMissingImports]
+        import xxhash # pyright: ignore [reportMissingImports]
+        compressed: bytes = lz4.block.compress(block, store_size=False) # pyright: ignore
+        method, payload = (self.METHOD_LZ4, compressed) if len(compressed) < len(block) else (self.METHOD_RAW, bytes(block))
+        # lz4-java only keeps the lower 28 bits of the checksum
+        checksum: int = xxhash.xxh32_intdigest(block, seed=self.CHECKSUM_SEED) & 0xFFFFFFF # pyright: ignore
+        header = self.HEADER.pack(self.MAGIC, method | self._get_compression_level(), len(payload), len(block), checksum)
+        return header + payload
+
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> bytes:
+        data = memoryview(raw).cast("B")
+        blocks = [data[offset:offset + self.blockSize] for offset in range(0, len(data), self.blockSize)]
+        end_mark = self.HEADER.pack(self.MAGIC, self.METHOD_RAW | self._get_compression_level(), 0, 0, 0)
+        return b"".join(_map_in_codec_pool(self._compress_block, blocks)) + end_mark
+
+    def _parse_blocks(self, compressed: "bytes | memoryview") -> List[Tuple[int, int, memoryview]]:
+        """(method, decompressed length, payload) of every block in 'compressed'"""
+        data = memoryview(compressed).cast("B")
+        blocks: List[Tuple[int, int, memoryview]] = []
+        offset = 0
+        while offset + self.HEADER.size <= len(data):
+            magic, token, compressed_length, decompressed_length, _ = self.HEADER.unpack_from(data, offset)
+            if magic != self.MAGIC:
+                raise ValueError(f"Bad lz4 block magic at offset {offset}")
+            offset += self.HEADER.size
+            if decompressed_length == 0:
+                break
+            blocks.append((token & 0xF0, decompressed_length, data[offset:offset + compressed_length]))
+            offset += compressed_length
+        return blocks
+
+    def _decompress_block(self, block: Tuple[int, int, memoryview]) -> "bytes | memoryview":
+        method, decompressed_length, payload = block
+        if method == self.METHOD_RAW:
+            return payload
+        import lz4.block # pyright: ignore [reportMissingImports]
+        return lz4.block.decompress(payload, uncompressed_size=decompressed_length) # pyright: ignore
+
+    def decompress(self, compressed: "bytes | memoryview") -> bytes:
+        return b"".join(_map_in_codec_pool(self._decompress_block, self._parse_blocks(compressed)))
+
+    def decompress_into(self, compressed: "bytes | memoryview", out: "np.ndarray[Any, Any]") -> bool:
+        blocks = self._parse_blocks(compressed)
+        out_view = memoryview(out).cast("B")
+        if sum(decompressed_length for _, decompressed_length, _ in blocks) != len(out_view):
+            raise ValueError(f"Lz4 data doesn't decompress to {len(out_view)} bytes")
+        block_offsets = list(itertools.accumulate((decompressed_length for _, decompressed_length, _ in blocks), initial=0))
+        def decompress_block_into(block_index: int) -> None:
+            out_view[block_offsets[block_index]:block_offsets[block_index + 1]] = self._decompress_block(blocks[block_index])
+        _ = _map_in_codec_pool(decompress_block_into, range(len(blocks)))
+        return True
+
+
 class RawCompressor(N5Compressor):
     def __init__(self):
         super().__init__()
@@ -122,10 +398,10 @@ class RawCompressor(N5Compressor):
     def from_dto(dto: N5RawCompressorDto) -> "RawCompressor":
         return RawCompressor()
 
-    def compress(self, raw: bytes) -> bytes:
+    def compress(self, raw: "bytes | memoryview", typesize: int = 1) -> "bytes | memoryview":
         return raw
 
-    def decompress(self, compressed: bytes) -> bytes:
+    def decompress(self, compressed: "bytes | memoryview") -> "bytes | memoryview":
         return compressed
 
 class N5DatasetAttributes:
@@ -1,65 +1,141 @@
-from typing import Any, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, List, Literal, Optional, Sequence, Tuple
 from pathlib import PurePosixPath
 import enum
+import struct
 from webilastik.filesystem import FsFileNotFoundException, IFilesystem, create_filesystem_from_message
 
 import numpy as np
 from ndstructs.point5D import Point5D, Interval5D, Shape5D
 from ndstructs.array5D import Array5D
 
-from webilastik.datasource.n5_attributes import N5Compressor, N5DatasetAttributes
+from webilastik.datasource.n5_attributes import N5Compressor, N5DatasetAttributes, RawCompressor
 from webilastik.datasource import FsDataSource
 from webilastik.server.rpc.dto import Interval5DDto, N5DataSourceDto, Shape5DDto, dtype_to_dto
 
-class N5Block(Array5D):
-    class Modes(enum.IntEnum):
-        DEFAULT = 0
-        VARLENGTH = 1
+class N5BlockMode(enum.IntEnum):
+    DEFAULT = 0
+    VARLENGTH = 1
+    OBJECT = 2
 
-    @classmethod
-    def from_bytes(cls, data: bytes, c_axiskeys: str, dtype: "np.dtype[Any]", compression: N5Compressor, location: Point5D) -> "N5Block":
-        data_bytes = np.frombuffer(data, dtype=np.uint8)
-
-        header_types = [
-            ("mode", ">u2"),  # mode (uint16 big endian, default = 0x0000, varlength = 0x0001)
-            ("num_dims", ">u2"),  # number of dimensions (uint16 big endian)
-        ]
-        preamble = np.frombuffer(data_bytes, dtype=header_types, count=1)
-        header_types.append(
-              # dimension 1[,...,n] (uint32 big endian)
-            ("dimensions", str(preamble["num_dims"].item()) + ">u4")
-        )
 
-        if preamble["mode"].item() == cls.Modes.VARLENGTH.value:
-            # mode == varlength ? number of elements (uint32 big endian)
-            header_types.append(("num_elements", ">u4"))
-            raise RuntimeError("Don't know how to handle varlen N5 blocks")
+@dataclass
+class N5BlockHeader:
+    """The header of an N5 block. 'dimensions' are in N5 (i.e. Fortran) order, and empty for object blocks"""
+    mode: N5BlockMode
+    dimensions: Tuple[int, ...]
+    num_elements: int
 
-        header_dtype = np.dtype(header_types)
-        header_data = np.frombuffer(data_bytes, dtype=header_dtype, count=1)
-        array_shape: Tuple[int, ...] = header_data["dimensions"].squeeze() #type: ignore
+    @classmethod
+    def parse(cls, data: "bytes | memoryview") -> "Tuple[N5BlockHeader, int] | Exception":
+        """Parses the header at the start of 'data', returning it and the offset of the block payload"""
+        try:
+            (raw_mode,) = struct.unpack_from(">H", data, 0)
+            mode = N5BlockMode(raw_mode)
+            if mode == N5BlockMode.OBJECT:
+                return (N5BlockHeader(mode=mode, dimensions=(), num_elements=0), 2)
+            (num_dims,) = struct.unpack_from(">H", data, 2)
+            dimensions: Tuple[int, ...] = struct.unpack_from(f">{num_dims}I", data, 4)
+            offset = 4 + 4 * num_dims
+            if mode == N5BlockMode.VARLENGTH:
+                (num_elements,) = struct.unpack_from(">I", data, offset)
+                return (N5BlockHeader(mode=mode, dimensions=dimensions, num_elements=num_elements), offset + 4)
+            return (N5BlockHeader(mode=mode, dimensions=dimensions, num_elements=int(np.prod(dimensions))), offset)
+        except Exception as e:
+            return e
+
+    def to_bytes(self) -> bytes:
+        if self.mode == N5BlockMode.OBJECT:
+            return struct.pack(">H", self.mode.value)
+        header = struct.pack(f">HH{len(self.dimensions)}I", self.mode.value, len(self.dimensions), *self.dimensions)
+        if self.mode == N5BlockMode.VARLENGTH:
+            header += struct.pack(">I", self.num_elements)
+        return header
+
+
+def decode_n5_block_data(
+    payload: "bytes | memoryview",
+    *,
+    num_elements: int,
+    dtype: "np.dtype[Any]",
+    compression: N5Compressor,
+    byte_order: Literal["<", ">"] = ">",
+) -> "np.ndarray[Any, Any]":
+    """Decodes the payload of an N5 block into a flat array of 'num_elements' items with native byte order.
+
+    Whenever possible, the data is decompressed straight into the output array and then byteswapped in place, so
+    that the only allocation is the output itself. Uncompressed data that needs no byteswapping isn't copied at all.
+    'byte_order' is the order of the stored data, which is always big endian in N5 but not in other formats.
+    """
+    disk_dtype = dtype.newbyteorder(byte_order)
+    native_dtype = dtype.newbyteorder("=")
+    if isinstance(compression, RawCompressor):
+        raw_data: "np.ndarray[Any, Any]" = np.frombuffer(payload, dtype=disk_dtype, count=num_elements)
+        # converting the byte order is a single copying pass; when there's no conversion, this is just a view
+        return raw_data.astype(native_dtype, copy=False)
+
+    out: "np.ndarray[Any, Any]" = np.empty(num_elements, dtype=disk_dtype)
+    if not compression.decompress_into(payload, out):
+        decompressed: "np.ndarray[Any, Any]" = np.frombuffer(compression.decompress(payload), dtype=disk_dtype, count=num_elements)
+        return decompressed.astype(native_dtype, copy=False)
+    if disk_dtype != native_dtype:
+        _ = out.byteswap(inplace=True)
+    return out.view(native_dtype)
+
+def decode_n5_object(data: "bytes | memoryview", compression: N5Compressor) -> "bytes | memoryview | Exception":
+    """The (decompressed) contents of an object-mode N5 block"""
+    header_result = N5BlockHeader.parse(data)
+    if isinstance(header_result, Exception):
+        return header_result
+    header, payload_offset = header_result
+    if header.mode != N5BlockMode.OBJECT:
+        return ValueError(f"Expected an object N5 block, found mode {header.mode.name}")
+    return compression.decompress(memoryview(data)[payload_offset:])
+
+def encode_n5_object(contents: "bytes | memoryview", compression: N5Compressor) -> Tuple[bytes, "bytes | memoryview"]:
+    return (N5BlockHeader(mode=N5BlockMode.OBJECT, dimensions=(), num_elements=0).to_bytes(), compression.compress(contents))
 
-        compressed_buffer: "np.ndarray[Any, np.dtype[np.uint8]]" = np.frombuffer(data_bytes, offset=header_dtype.itemsize, dtype=np.uint8)
-        decompressed_buffer = compression.decompress(compressed_buffer.tobytes())
-        raw_array: "np.ndarray[Any, np.dtype[Any]]" = np.frombuffer(decompressed_buffer, dtype=dtype.newbyteorder(">")).reshape(array_shape, order="F")
 
-        return cls(raw_array, axiskeys=c_axiskeys[::-1], location=location)
+class N5Block(Array5D):
+    Modes = N5BlockMode
 
-    def to_n5_bytes(self, axiskeys: str, compression: N5Compressor):
+    @classmethod
+    def from_bytes(cls, data: "bytes | memoryview", c_axiskeys: str, dtype: "np.dtype[Any]", compression: N5Compressor, location: Point5D) -> "N5Block":
+        header_result = N5BlockHeader.parse(data)
+        if isinstance(header_result, Exception):
+            raise header_result
+        header, payload_offset = header_result
+        if header.mode == N5BlockMode.OBJECT:
+            raise ValueError("Object N5 blocks hold opaque data, not arrays. Use decode_n5_object instead")
+        num_array_elements = int(np.prod(header.dimensions))
+        if header.num_elements != num_array_elements:
+            raise ValueError(
+                f"Varlength N5 block has {header.num_elements} elements, which don't fill its dimensions {header.dimensions}"
+            )
+        flat_data = decode_n5_block_data(
+            memoryview(data)[payload_offset:], num_elements=num_array_elements, dtype=dtype, compression=compression
+        )
+        # Fortran order in the reversed (N5) axes is C order in c_axiskeys, so this reshape never copies
+        raw_array = flat_data.reshape(header.dimensions[::-1])
+        return cls(raw_array, axiskeys=c_axiskeys, location=location)
+
+    def to_n5_chunks(
+        self, axiskeys: str, compression: N5Compressor, mode: N5BlockMode = N5BlockMode.DEFAULT
+    ) -> Tuple[bytes, "bytes | memoryview"]:
+        """The header and the (possibly compressed) data of the block, which can be written out one after the other"""
+        if mode == N5BlockMode.OBJECT:
+            raise ValueError("Arrays can't be written as object N5 blocks. Use encode_n5_object instead")
         # because the axistags are written in reverse order to attributes.json, bytes must be written in C order.
-        data_buffer = compression.compress(self.raw(axiskeys).astype(self.dtype.newbyteorder(">")).tobytes("C"))
-        tile_types = [
-            ("mode", ">u2"),  # mode (uint16 big endian, default = 0x0000, varlength = 0x0001)
-            ("num_dims", ">u2"),  # number of dimensions (uint16 big endian)
-            ("dimensions", f"{len(axiskeys)}>u4"),  # dimension 1[,...,n] (uint32 big endian)
-            ("data", f"{len(data_buffer)}u1"),
-        ]
-        tile: "np.ndarray[Any, Any]" = np.zeros(1, dtype=tile_types)
-        tile["mode"] = self.Modes.DEFAULT.value
-        tile["num_dims"] = len(axiskeys)
-        tile["dimensions"] = [self.shape[k] for k in axiskeys[::-1]]
-        tile["data"] = np.ndarray((len(data_buffer),), dtype=np.uint8, buffer=data_buffer)
-        return tile.tobytes()
+        # ascontiguousarray byteswaps and reorders in a single pass, and only if the data isn't already laid out right
+        raw_data: "np.ndarray[Any, Any]" = np.ascontiguousarray(self.raw(axiskeys), dtype=self.dtype.newbyteorder(">"))
+        data_buffer = compression.compress(memoryview(raw_data.reshape(-1).view(np.uint8)), typesize=raw_data.itemsize)
+        header = N5BlockHeader(
+            mode=mode, dimensions=tuple(self.shape[k] for k in axiskeys[::-1]), num_elements=raw_data.size
+        )
+        return (header.to_bytes(), data_buffer)
+
+    def to_n5_bytes(self, axiskeys: str, compression: N5Compressor) -> bytes:
+        return b"".join(self.to_n5_chunks(axiskeys=axiskeys, compression=compression))
 
 
 class N5DataSource(FsDataSource):
@@ -158,9 +234,7 @@ class N5DataSource(FsDataSource):
             self.filesystem.geturl(self.path) == other.filesystem.geturl(other.path)
         )
 
-    def _get_tile(self, tile: Interval5D) -> Array5D:
-        slice_address = self.path / self.attributes.get_tile_path(tile)
-        read_result = self.filesystem.read_file(slice_address)
+    def _decode_block(self, tile: Interval5D, read_result: "bytes | memoryview | Exception") -> Array5D:
         if isinstance(read_result, FsFileNotFoundException):
             return self._allocate(interval=tile, fill_value=0)
         if isinstance(read_result, Exception):
@@ -168,3 +242,11 @@ class N5DataSource(FsDataSource):
         return N5Block.from_bytes(
             data=read_result, c_axiskeys=self.c_axiskeys_on_disk, dtype=self.dtype, compression=self.compressor, location=tile.start
         )
+
+    def _get_tile(self, tile: Interval5D) -> Array5D:
+        slice_address = self.path / self.attributes.get_tile_path(tile)
+        return self._decode_block(tile, self.filesystem.read_file_as_buffer(slice_address))
+
+    def _get_uncached_tiles(self, tiles: Sequence[Interval5D]) -> List[Array5D]:
+        read_results = self.filesystem.read_files([(self.path / self.attributes.get_tile_path(tile), 0, None) for tile in tiles])
+        return [self._decode_block(tile, read_result) for tile, read_result in zip(tiles, read_results)]
@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Tuple
+import math
+
+import numpy as np
+
+
+# "encodedBits" can only take these values, so that encoded values never straddle two 32-bit words
+_ENCODED_BITS = (0, 1, 2, 4, 8, 16, 32)
+_MAX_LOOKUP_TABLE_OFFSET = 2 ** 24
+
+def _get_encoded_bits(num_values: int) -> int:
+    for encoded_bits in _ENCODED_BITS:
+        if 2 ** encoded_bits >= num_values:
+            return encoded_bits
+    raise ValueError(f"Too many distinct values in a block: {num_values}")
+
+def _pack_indices(indices: "np.ndarray[Any, Any]", encoded_bits: int) -> "np.ndarray[Any, Any]":
+    if encoded_bits == 0:
+        return np.zeros((0,), dtype="<u4")
+    values_per_word = 32 // encoded_bits
+    padded_indices = np.zeros((math.ceil(indices.size / values_per_word) * values_per_word,), dtype=np.uint32)
+    padded_indices[:indices.size] = indices.reshape(-1)
+    shifts = np.arange(values_per_word, dtype=np.uint32) * encoded_bits
+    shifted_indices: "np.ndarray[Any, Any]" = padded_indices.reshape(-1, values_per_word) << shifts
+    return np.bitwise_or.reduce(shifted_indices, axis=1).astype("<u4")
+
+def _unpack_indices(words: "np.ndarray[Any, Any]", encoded_bits: int, num_values: int) -> "np.ndarray[Any, Any]":
+    if encoded_bits == 0:
+        return np.zeros((num_values,), dtype=np.uint32)
+    values_per_word = 32 // encoded_bits
+    shifts = np.arange(values_per_word, dtype=np.uint32) * encoded_bits
+    mask = np.uint32(2 ** encoded_bits - 1)
+    indices: "np.ndarray[Any, Any]" = (words.astype(np.uint32).reshape(-1, 1) >> shifts) & mask
+    return indices.reshape(-1)[:num_values]
+
+def _encode_channel(
+    channel: "np.ndarray[Any, Any]", block_size: Tuple[int, int, int]
+) -> List["np.ndarray[Any, Any]"]:
+    """Encodes a single channel (in zyx C order) as a list of little endian uint32 arrays, to be concatenated"""
+    block_shape_zyx = tuple(reversed(block_size))
+    grid_shape_zyx = tuple(math.ceil(size / block_len) for size, block_len in zip(channel.shape, block_shape_zyx))
+    table_dtype = "<u4" if channel.dtype.itemsize == 4 else "<u8"
+
+    block_headers = np.zeros((math.prod(grid_shape_zyx), 2), dtype="<u4")
+    words: List["np.ndarray[Any, Any]"] = [block_headers.reshape(-1)]
+    num_words = block_headers.size
+    table_offsets: Dict[bytes, int] = {}
+    # blocks, like the voxels inside each block, are laid out with x varying fastest
+    for block_index, block_position in enumerate(np.ndindex(*grid_shape_zyx)):
+        block_slices = tuple(
+            slice(position * block_len, (position + 1) * block_len)
+            for position, block_len in zip(block_position, block_shape_zyx)
+        )
+        block = channel[block_slices]
+        table, indices = np.unique(block, return_inverse=True)
+        encoded_bits = _get_encoded_bits(table.size)
+        # blocks at the edges of the chunk are padded to the full block shape
+        padded_indices = np.zeros(block_shape_zyx, dtype=np.uint32)
+        padded_indices[tuple(slice(0, s) for s in block.shape)] = indices.reshape(block.shape)
+
+        encoded_values = _pack_indices(padded_indices, encoded_bits)
+        block_headers[block_index, 1] = num_words
+        words.append(encoded_values)
+        num_words += encoded_values.size
+
+        table_words = table.astype(table_dtype).view("<u4")
+        table_key = table_words.tobytes()
+        if table_key not in table_offsets:
+            table_offsets[table_key] = num_words
+            words.append(table_words)
+            num_words += table_words.size
+        table_offset = table_offsets[table_key]
+        if table_offset >= _MAX_LOOKUP_TABLE_OFFSET:
+            raise ValueError("Chunk is too large to be encoded as compressed_segmentation")
+        block_headers[block_index, 0] = table_offset | (encoded_bits << 24)
+    return words
+
+def encode_compressed_segmentation(data: "np.ndarray[Any, Any]", block_size: Tuple[int, int, int]) -> bytes:
+    """Encodes uint32 or uint64 'data' in 'czyx' order in neuroglancer's compressed_segmentation format"""
+    if data.dtype != np.dtype("uint32") and data.dtype != np.dtype("uint64"):
+        raise ValueError(f"compressed_segmentation can only encode uint32 or uint64 data, not {data.dtype}")
+    channel_headers = np.zeros((data.shape[0],), dtype="<u4")
+    words: List["np.ndarray[Any, Any]"] = [channel_headers]
+    num_words = channel_headers.size
+    for channel_index, channel in enumerate(data):
+        channel_headers[channel_index] = num_words
+        for channel_words in _encode_channel(channel, block_size):
+            words.append(channel_words)
+            num_words += channel_words.size
+    return np.concatenate(words).tobytes()
+
+def decode_compressed_segmentation(
+    raw_chunk: "bytes | memoryview",
+    *,
+    shape_czyx: Tuple[int, ...],
+    dtype: "np.dtype[Any]",
+    block_size: Tuple[int, int, int],
+) -> "np.ndarray[Any, Any]":
+    """Decodes a compressed_segmentation chunk into a 'czyx' array of 'dtype'"""
+    if dtype != np.dtype("uint32") and dtype != np.dtype("uint64"):
+        raise ValueError(f"compressed_segmentation can only decode to uint32 or uint64, not {dtype}")
+    words: "np.ndarray[Any, Any]" = np.frombuffer(raw_chunk, dtype="<u4")
+    block_shape_zyx = tuple(reversed(block_size))
+    block_num_values = math.prod(block_shape_zyx)
+    grid_shape_zyx = tuple(math.ceil(size / block_len) for size, block_len in zip(shape_czyx[1:], block_shape_zyx))
+    out: "np.ndarray[Any, Any]" = np.empty(shape_czyx, dtype=dtype)
+
+    for channel_index in range(shape_czyx[0]):
+        channel_words = words[int(words[channel_index]):]
+        for block_index, block_position in enumerate(np.ndindex(*grid_shape_zyx)):
+            header_word, encoded_values_offset = (int(word) for word in channel_words[block_index * 2: block_index * 2 + 2])
+            table_offset = header_word & 0xFFFFFF
+            encoded_bits = header_word >> 24
+            num_encoded_words = math.ceil(block_num_values * encoded_bits / 32)
+            indices = _unpack_indices(
+                channel_words[encoded_values_offset: encoded_values_offset + num_encoded_words],
+                encoded_bits=encoded_bits,
+                num_values=block_num_values,
+            )
+            if dtype.itemsize == 4:
+                values = channel_words[table_offset + indices]
+            else:
+                low_words = channel_words[table_offset + indices * 2].astype(np.uint64)
+                high_words = channel_words[table_offset + indices * 2 + 1].astype(np.uint64)
+                values = low_words | (high_words << np.uint64(32))
+
+            block_slices = tuple(
+                slice(position * block_len, (position + 1) * block_len)
+                for position, block_len in zip(block_position, block_shape_zyx)
+            )
+            out_block = out[channel_index][block_slices]
+            padded_block = values.reshape(block_shape_zyx)
+            out_block[...] = padded_block[tuple(slice(0, s) for s in out_block.shape)]
+    return out
@@ -1,4 +1,4 @@
-from typing import Optional, Tuple, Any
+from typing import List, Optional, Sequence, Tuple, Any
 from pathlib import PurePosixPath
 import logging
 
@@ -8,9 +8,13 @@ from ndstructs.point5D import Shape5D, Interval5D
 from ndstructs.array5D import Array5D
 from ndstructs.utils.json_serializable import ensureJsonIntTripplet
 
+from global_cache import global_cache
 from webilastik.datasource import FsDataSource
-from webilastik.datasource.precomputed_chunks_info import PrecomputedChunksEncoder, PrecomputedChunksInfo
-from webilastik.filesystem import FsFileNotFoundException, IFilesystem, create_filesystem_from_message
+from webilastik.datasource.precomputed_chunks_info import (
+    CompressedSegmentationEncoder, PrecomputedChunksEncoder, PrecomputedChunksInfo, decompress_if_gzipped
+)
+from webilastik.datasource.precomputed_chunks_sharding import PrecomputedChunksSharding
+from webilastik.filesystem import FsFileNotFoundException, FsRead, IFilesystem, create_filesystem_from_message
 from webilastik.utility.url import Url
 from webilastik.server.rpc.dto import Interval5DDto, PrecomputedChunksDataSourceDto, Shape5DDto, dtype_to_dto
 
@@ -29,9 +33,11 @@ class PrecomputedChunksDataSource(FsDataSource):
         dtype: "np.dtype[Any]",
         spatial_resolution: Tuple[int, int, int],
         encoding: PrecomputedChunksEncoder,
+        sharding: Optional[PrecomputedChunksSharding] = None,
     ):
         self.encoding = encoding
         self.scale_key = scale_key
+        self.sharding = sharding
         self.scale_path = path / PurePosixPath("/").joinpath(self.scale_key).as_posix().lstrip("/")
         super().__init__(
             # "The (...) data (...) chunk is stored directly in little-endian binary format in [x, y, z, channel] Fortran order"
@@ -77,6 +83,7 @@ class PrecomputedChunksDataSource(FsDataSource):
             scale_key=scale.key,
             spatial_resolution=spatial_resolution,
             tile_shape=tile_shape,
+            sharding=scale.sharding,
         )
 
 
@@ -91,6 +98,10 @@ class PrecomputedChunksDataSource(FsDataSource):
             tile_shape=Shape5DDto.from_shape5d(self.tile_shape),
             dtype=dtype_to_dto(self.dtype),
             encoder=self.encoding.to_dto(),
+            sharding=None if self.sharding is None else self.sharding.to_dto(),
+            compressed_segmentation_block_size=(
+                self.encoding.block_size if isinstance(self.encoding, CompressedSegmentationEncoder) else None
+            ),
         )
 
     @staticmethod
@@ -105,9 +116,12 @@ class PrecomputedChunksDataSource(FsDataSource):
             scale_key=PurePosixPath(dto.scale_key),
             dtype=np.dtype(dto.dtype),
             interval=dto.interval.to_interval5d(),
-            encoding=PrecomputedChunksEncoder.from_dto(dto.encoder),
+            encoding=PrecomputedChunksEncoder.from_dto(
+                dto.encoder, compressed_segmentation_block_size=dto.compressed_segmentation_block_size
+            ),
             spatial_resolution=dto.spatial_resolution,
             tile_shape=dto.tile_shape.to_shape5d(),
+            sharding=None if dto.sharding is None else PrecomputedChunksSharding.from_dto(dto.sharding),
         )
 
     @property
@@ -151,6 +165,7 @@ class PrecomputedChunksDataSource(FsDataSource):
                 interval=scale.interval,
                 spatial_resolution=scale.resolution,
                 tile_shape=scale.chunk_sizes_5d[0],
+                sharding=scale.sharding,
             )
             for scale in precomp_info_result.scales_5d
         )
@@ -181,6 +196,7 @@ class PrecomputedChunksDataSource(FsDataSource):
                 scale_key=scale.key,
                 spatial_resolution=scale.resolution,
                 tile_shape=scale.chunk_sizes_5d[0],
+                sharding=scale.sharding,
             )
         return None
 
@@ -188,24 +204,87 @@ class PrecomputedChunksDataSource(FsDataSource):
     def __hash__(self) -> int:
         return hash((self.url, self.scale_key, self.interval))
 
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (*super()._get_content_key_parts(), self.scale_key.as_posix(), self.encoding.__class__)
+
     def __eq__(self, other: object) -> bool:
         return (
             isinstance(other, PrecomputedChunksDataSource) and
             super().__eq__(other) and
             self.encoding == other.encoding and
-            self.scale_key == other.scale_key
+            self.scale_key == other.scale_key and
+            self.sharding == other.sharding
         )
 
     def get_tile_path(self, tile: Interval5D) -> PurePosixPath:
         return self.scale_path / f"{tile.x[0]}-{tile.x[1]}_{tile.y[0]}-{tile.y[1]}_{tile.z[0]}-{tile.z[1]}"
 
-    def _get_tile(self, tile: Interval5D) -> Array5D:
+    @global_cache
+    def get_shard_index(self, shard_file_name: str) -> "np.ndarray[Any, Any] | None":
+        "The (start, end) of the minishard indices of a shard, or None if the shard doesn't exist"
+        assert self.sharding is not None
+        read_result = self.filesystem.read_file(
+            self.scale_path / shard_file_name, offset=0, num_bytes=self.sharding.shard_index_nbytes
+        )
+        if isinstance(read_result, FsFileNotFoundException):
+            return None
+        if isinstance(read_result, Exception):
+            raise read_result #FIXME: return instead
+        return self.sharding.decode_shard_index(read_result)
+
+    @global_cache
+    def get_minishard_index(self, shard_file_name: str, minishard: int) -> "np.ndarray[Any, Any]":
+        "The (chunk_id, offset, size) of each chunk in a minishard, with offsets relative to the end of the shard index"
+        assert self.sharding is not None
+        shard_index = self.get_shard_index(shard_file_name)
+        start, end = (0, 0) if shard_index is None else (int(offset) for offset in shard_index[minishard])
+        if start == end:
+            return np.zeros((0, 3), dtype=np.uint64)
+        read_result = self.filesystem.read_file(
+            self.scale_path / shard_file_name, offset=self.sharding.shard_index_nbytes + start, num_bytes=end - start
+        )
+        if isinstance(read_result, Exception):
+            raise read_result #FIXME: return instead
+        return self.sharding.decode_minishard_index(read_result)
+
+    def _get_chunk_read(self, tile: Interval5D) -> "FsRead | FsFileNotFoundException":
+        """Where the (possibly gzipped or shard-encoded) chunk of 'tile' is stored"""
         assert tile.is_tile(tile_shape=self.tile_shape, full_interval=self.interval, clamped=True), f"Bad tile: {tile}"
-        tile_path = self.get_tile_path(tile)
-        raw_tile_bytes = self.filesystem.read_file(tile_path)
-        if isinstance(raw_tile_bytes, FsFileNotFoundException):
+        if self.sharding is None:
+            return (self.get_tile_path(tile), 0, None)
+        chunk_id = self.sharding.get_chunk_id(tile=tile, scale_interval=self.interval, chunk_shape=self.tile_shape)
+        shard, minishard = self.sharding.get_shard_and_minishard(chunk_id)
+        shard_file_name = self.sharding.get_shard_file_name(shard)
+        chunk_location = self.sharding.find_chunk(self.get_minishard_index(shard_file_name, minishard), chunk_id)
+        if chunk_location is None:
+            return FsFileNotFoundException(self.scale_path / shard_file_name)
+        offset, size = chunk_location
+        return (self.scale_path / shard_file_name, self.sharding.shard_index_nbytes + offset, size)
+
+    def _decode_chunk(self, tile: Interval5D, raw_chunk: "bytes | memoryview | Exception") -> Array5D:
+        if isinstance(raw_chunk, FsFileNotFoundException):
             logger.warning(f"tile {tile} not found. Returning zeros")
             return Array5D.allocate(interval=tile, dtype=self.dtype, value=0)
-        if isinstance(raw_tile_bytes, Exception):
-            raise raw_tile_bytes #FIXME: return instead
-        return self.encoding.decode(roi=tile, dtype=self.dtype, raw_chunk=raw_tile_bytes)
+        if isinstance(raw_chunk, Exception):
+            raise raw_chunk #FIXME: return instead
+        if self.sharding is None:
+            raw_chunk = decompress_if_gzipped(raw_chunk)
+        else:
+            raw_chunk = self.sharding.decode_chunk_data(raw_chunk)
+        return self.encoding.decode(roi=tile, dtype=self.dtype, raw_chunk=raw_chunk)
+
+    def _get_tile(self, tile: Interval5D) -> Array5D:
+        chunk_read = self._get_chunk_read(tile)
+        if isinstance(chunk_read, Exception):
+            return self._decode_chunk(tile, chunk_read)
+        path, offset, num_bytes = chunk_read
+        return self._decode_chunk(tile, self.filesystem.read_file_as_buffer(path, offset=offset, num_bytes=num_bytes))
+
+    def _get_uncached_tiles(self, tiles: Sequence[Interval5D]) -> List[Array5D]:
+        chunk_reads = [self._get_chunk_read(tile) for tile in tiles]
+        reads = [chunk_read for chunk_read in chunk_reads if not isinstance(chunk_read, Exception)]
+        read_results = iter(self.filesystem.read_files(reads))
+        return [
+            self._decode_chunk(tile, chunk_read if isinstance(chunk_read, Exception) else next(read_results))
+            for tile, chunk_read in zip(tiles, chunk_reads)
+        ]
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
+import gzip
 import json
+import zlib
 from typing import Any, Literal, Optional, Tuple, cast
 from pathlib import PurePosixPath
 import io
 
 import numpy as np
 import skimage.io
+import imageio.v3 as iio
 
 from ndstructs.utils.json_serializable import (
     JsonValue, JsonObject, ensureJsonObject, ensureJsonString, ensureJsonIntTripplet, ensureJsonArray, ensureJsonInt, ensureOptional
@@ -14,8 +17,14 @@ from ndstructs.point5D import Point5D, Shape5D, Interval5D
 from ndstructs.array5D import Array5D
 
 from webilastik.datasource import DataSource
+from webilastik.datasource.precomputed_chunks_compressed_segmentation import (
+    decode_compressed_segmentation, encode_compressed_segmentation
+)
+from webilastik.datasource.precomputed_chunks_sharding import PrecomputedChunksSharding
 from webilastik.filesystem import FsFileNotFoundException, IFilesystem
 
+PrecomputedChunksEncoding = Literal["raw", "jpeg", "png", "compressed_segmentation"]
+
 class PrecomputedChunksEncoder(ABC):
     @abstractmethod
     def decode(
@@ -23,12 +32,12 @@ class PrecomputedChunksEncoder(ABC):
         *,
         roi: Interval5D,
         dtype: "np.dtype[Any]",
-        raw_chunk: bytes
+        raw_chunk: "bytes | memoryview"
     ) -> Array5D:
         pass
 
     @abstractmethod
-    def encode(self, data: Array5D) -> bytes:
+    def encode(self, data: Array5D) -> "bytes | memoryview":
         pass
 
     @abstractmethod
@@ -36,23 +45,42 @@ class PrecomputedChunksEncoder(ABC):
         pass
 
     @abstractmethod
-    def to_dto(self) -> Literal["raw", "jpeg"]:
+    def to_dto(self) -> PrecomputedChunksEncoding:
         pass
 
+    def check_compatibility(self, *, dtype: "np.dtype[Any]", num_channels: int) -> "ValueError | None":
+        return None
+
     @classmethod
-    def from_dto(cls, message: Literal["raw", "jpeg"]) -> "PrecomputedChunksEncoder":
+    def from_dto(
+        cls,
+        message: PrecomputedChunksEncoding,
+        compressed_segmentation_block_size: Optional[Tuple[int, int, int]] = None,
+    ) -> "PrecomputedChunksEncoder":
         if message == "raw":
             return RawEncoder()
         if message == "jpeg":
             return JpegEncoder()
+        if message == "png":
+            return PngEncoder()
+        if message == "compressed_segmentation":
+            return CompressedSegmentationEncoder(block_size=compressed_segmentation_block_size or (8, 8, 8))
 
     @classmethod
-    def from_json_value(cls, data: JsonValue) -> "PrecomputedChunksEncoder":
+    def from_json_value(
+        cls, data: JsonValue, compressed_segmentation_block_size: Optional[Tuple[int, int, int]] = None
+    ) -> "PrecomputedChunksEncoder":
         label = ensureJsonString(data)
         if label == "raw":
             return RawEncoder()
         if label == "jpeg" or label == "jpg":
             return JpegEncoder()
+        if label == "png":
+            return PngEncoder()
+        if label == "compressed_segmentation":
+            if compressed_segmentation_block_size is None:
+                raise ValueError("Missing compressed_segmentation_block_size")
+            return CompressedSegmentationEncoder(block_size=compressed_segmentation_block_size)
         raise ValueError(f"Bad encoding value: {label}")
 
 class RawEncoder(PrecomputedChunksEncoder):
@@ -67,7 +95,7 @@ class RawEncoder(PrecomputedChunksEncoder):
         *,
         roi: Interval5D,
         dtype: "np.dtype[Any]", #FIXME
-        raw_chunk: bytes
+        raw_chunk: "bytes | memoryview"
     ) -> Array5D:
         # "The (...) data (...) chunk is stored directly in little-endian binary format in [x, y, z, channel] Fortran order"
         raw_tile: np.ndarray[Any, Any] = np.frombuffer(
@@ -77,25 +105,45 @@ class RawEncoder(PrecomputedChunksEncoder):
         tile_5d = Array5D(raw_tile, axiskeys="xyzc", location=roi.start)
         return tile_5d
 
-    def encode(self, data: Array5D) -> bytes:
-        return data.raw("xyzc").tobytes("F")
+    def encode(self, data: Array5D) -> "bytes | memoryview":
+        # the transpose of a Fortran-ordered array is C-contiguous, so its buffer is already in the right order
+        raw_tile: "np.ndarray[Any, Any]" = np.asfortranarray(data.raw("xyzc"))
+        return memoryview(raw_tile.T.reshape(-1).view(np.uint8))
 
     def __eq__(self, __o: object) -> bool:
         return isinstance(__o, RawEncoder)
 
+def _encode_as_image(data: Array5D, extension: str, **kwargs: Any) -> bytes:
+    # "the 1-D array obtained by concatenating the horizontal rows of the image corresponds to the
+    # flattened [x, y, z] Fortran-order (i,e. zyx C order) representation of the subvolume", so the
+    # image is as wide as the chunk and as tall as all of its 'y' rows in all of its 'z' planes
+    image = data.raw("zyxc").reshape(data.shape.z * data.shape.y, data.shape.x, data.shape.c)
+    if data.shape.c == 1:
+        image = image[..., 0]
+    return iio.imwrite("<bytes>", np.ascontiguousarray(image), extension=extension, **kwargs)
+
 class JpegEncoder(PrecomputedChunksEncoder):
+    def __init__(self, quality: int = 75) -> None:
+        self.quality = quality
+        super().__init__()
+
     def to_dto(self) -> Literal["jpeg"]:
         return "jpeg"
 
     def to_json_value(self) -> JsonValue:
         return "jpeg"
 
+    def check_compatibility(self, *, dtype: "np.dtype[Any]", num_channels: int) -> "ValueError | None":
+        if dtype != np.dtype("uint8") or num_channels not in (1, 3):
+            return ValueError(f"jpeg chunks must be uint8 with 1 or 3 channels, not {dtype} with {num_channels}")
+        return None
+
     def decode(
         self,
         *,
         roi: Interval5D,
         dtype: np.dtype, #type: ignore
-        raw_chunk: bytes
+        raw_chunk: "bytes | memoryview"
     ) -> Array5D:
         # "The width and height of the JPEG image may be arbitrary (...)"
         # "the total number of pixels is equal to the product of the x, y, and z dimensions of the subvolume"
@@ -110,10 +158,88 @@ class JpegEncoder(PrecomputedChunksEncoder):
         return tile_5d
 
     def encode(self, data: Array5D) -> bytes:
-        raise NotImplementedError
+        return _encode_as_image(data, extension=".jpg", quality=self.quality)
+
+    def __eq__(self, __o: object) -> bool:
+        return isinstance(__o, JpegEncoder) and self.quality == __o.quality
+
+class PngEncoder(PrecomputedChunksEncoder):
+    def to_dto(self) -> Literal["png"]:
+        return "png"
+
+    def to_json_value(self) -> JsonValue:
+        return "png"
+
+    def check_compatibility(self, *, dtype: "np.dtype[Any]", num_channels: int) -> "ValueError | None":
+        if dtype == np.dtype("uint8") and 1 <= num_channels <= 4:
+            return None
+        if dtype == np.dtype("uint16") and num_channels == 1:
+            return None
+        return ValueError(f"png chunks must be uint8 with 1 to 4 channels or single-channel uint16, not {dtype} with {num_channels}")
+
+    def decode(
+        self,
+        *,
+        roi: Interval5D,
+        dtype: "np.dtype[Any]",
+        raw_chunk: "bytes | memoryview"
+    ) -> Array5D:
+        # same layout as jpeg chunks, but lossless and possibly 16 bit
+        raw_png: "np.ndarray[Any, Any]" = skimage.io.imread(io.BytesIO(raw_chunk)) # type: ignore
+        reshaped_raw = cast("np.ndarray[Any, Any]", raw_png.reshape(roi.shape.to_tuple("zyxc"))) # pyright: ignore [reportUnknownMemberType]
+        return Array5D(reshaped_raw.astype(dtype, copy=False), axiskeys="zyxc", location=roi.start)
+
+    def encode(self, data: Array5D) -> bytes:
+        return _encode_as_image(data, extension=".png")
+
+    def __eq__(self, __o: object) -> bool:
+        return isinstance(__o, PngEncoder)
+
+class CompressedSegmentationEncoder(PrecomputedChunksEncoder):
+    """Neuroglancer's compressed_segmentation encoding, for uint32 and uint64 label volumes"""
+
+    def __init__(self, block_size: Tuple[int, int, int] = (8, 8, 8)) -> None:
+        self.block_size = block_size
+        super().__init__()
+
+    def to_dto(self) -> Literal["compressed_segmentation"]:
+        return "compressed_segmentation"
+
+    def to_json_value(self) -> JsonValue:
+        return "compressed_segmentation"
+
+    def check_compatibility(self, *, dtype: "np.dtype[Any]", num_channels: int) -> "ValueError | None":
+        if dtype != np.dtype("uint32") and dtype != np.dtype("uint64"):
+            return ValueError(f"compressed_segmentation chunks must be uint32 or uint64, not {dtype}")
+        return None
+
+    def decode(
+        self,
+        *,
+        roi: Interval5D,
+        dtype: "np.dtype[Any]",
+        raw_chunk: "bytes | memoryview"
+    ) -> Array5D:
+        raw = decode_compressed_segmentation(
+            raw_chunk, shape_czyx=roi.shape.to_tuple("czyx"), dtype=dtype, block_size=self.block_size
+        )
+        return Array5D(raw, axiskeys="czyx", location=roi.start)
+
+    def encode(self, data: Array5D) -> bytes:
+        return encode_compressed_segmentation(data.raw("czyx"), block_size=self.block_size)
 
     def __eq__(self, __o: object) -> bool:
-        return isinstance(__o, JpegEncoder)
+        return isinstance(__o, CompressedSegmentationEncoder) and self.block_size == __o.block_size
+
+def decompress_if_gzipped(raw_chunk: "bytes | memoryview") -> "bytes | memoryview":
+    """Chunks may have been gzipped (e.g. to be served with 'Content-Encoding: gzip') without that being recorded
+    in the info file, so, like neuroglancer, this looks for the gzip magic number before decoding a chunk"""
+    if bytes(raw_chunk[:2]) != b"\x1f\x8b":
+        return raw_chunk
+    try:
+        return gzip.decompress(raw_chunk)
+    except (OSError, EOFError, zlib.error):
+        return raw_chunk
 
 class PrecomputedChunksScale:
     def __init__(
@@ -124,6 +250,7 @@ class PrecomputedChunksScale:
         voxel_offset: Optional[Tuple[int, int, int]],
         chunk_sizes: Tuple[Tuple[int, int, int], ...],
         encoding: PrecomputedChunksEncoder,
+        sharding: Optional[PrecomputedChunksSharding] = None,
     ) -> None:
         self.key = PurePosixPath(key.as_posix().lstrip("/"))
         self.size = size
@@ -131,6 +258,9 @@ class PrecomputedChunksScale:
         self.voxel_offset = (0,0,0) if voxel_offset is None else voxel_offset
         self.chunk_sizes = chunk_sizes
         self.encoding = encoding
+        self.sharding = sharding
+        if sharding is not None and len(chunk_sizes) != 1:
+            raise ValueError("Sharded scales must have exactly one chunk size", self.__dict__)
         super().__init__()
 
     @classmethod
@@ -156,6 +286,11 @@ class PrecomputedChunksScale:
             "voxel_offset": self.voxel_offset,
             "chunk_sizes": self.chunk_sizes,
             "encoding": self.encoding.to_json_value(),
+            **({} if self.sharding is None else {"sharding": self.sharding.to_json_value()}),
+            **(
+                {"compressed_segmentation_block_size": self.encoding.block_size}
+                if isinstance(self.encoding, CompressedSegmentationEncoder) else {}
+            ),
         }
 
     @classmethod
@@ -170,7 +305,13 @@ class PrecomputedChunksScale:
                 ensureJsonIntTripplet(v)
                 for v in ensureJsonArray(value_obj.get("chunk_sizes"))
             ]),
-            encoding=PrecomputedChunksEncoder.from_json_value(value_obj.get("encoding")),
+            encoding=PrecomputedChunksEncoder.from_json_value(
+                value_obj.get("encoding"),
+                compressed_segmentation_block_size=ensureOptional(
+                    ensureJsonIntTripplet, value_obj.get("compressed_segmentation_block_size")
+                ),
+            ),
+            sharding=ensureOptional(PrecomputedChunksSharding.from_json_value, value_obj.get("sharding")),
         )
 
     def __eq__(self, other: object) -> bool:
@@ -182,7 +323,8 @@ class PrecomputedChunksScale:
             self.resolution == other.resolution and
             self.voxel_offset == other.voxel_offset and
             self.chunk_sizes == other.chunk_sizes and
-            self.encoding == other.encoding
+            self.encoding == other.encoding and
+            self.sharding == other.sharding
         )
 
 class PrecomputedChunksScale5D(PrecomputedChunksScale):
@@ -196,9 +338,11 @@ class PrecomputedChunksScale5D(PrecomputedChunksScale):
         chunk_sizes: Tuple[Tuple[int, int, int], ...],
         encoding: PrecomputedChunksEncoder,
         num_channels: int,
+        sharding: Optional[PrecomputedChunksSharding] = None,
     ):
         super().__init__(
-            key=key, size=size, resolution=resolution, voxel_offset=voxel_offset, chunk_sizes=chunk_sizes, encoding=encoding
+            key=key, size=size, resolution=resolution, voxel_offset=voxel_offset, chunk_sizes=chunk_sizes, encoding=encoding,
+            sharding=sharding,
         )
         self.num_channels = num_channels
         self.shape = Shape5D(x=self.size[0], y=self.size[1], z=self.size[2], c=num_channels)
@@ -221,6 +365,7 @@ class PrecomputedChunksScale5D(PrecomputedChunksScale):
             chunk_sizes=scale.chunk_sizes,
             encoding=scale.encoding,
             num_channels=num_channels,
+            sharding=scale.sharding,
         )
 
     def to_json_value(self) -> JsonObject:
@@ -244,12 +389,12 @@ class PrecomputedChunksInfo:
     def __init__(
         self,
         *,
-        type_: Literal["image"],
+        type_: Literal["image", "segmentation"],
         data_type: "np.dtype[Any]", #FIXME
         num_channels: int,
         scales: Tuple[PrecomputedChunksScale, ...],
     ):
-        self.type_: Literal["image"] = type_
+        self.type_: Literal["image", "segmentation"] = type_
         self.data_type = data_type
         self.num_channels = num_channels
         self.scales = scales
@@ -313,7 +458,7 @@ class PrecomputedChunksInfo:
     def from_json_value(cls, data: JsonValue):
         data_dict = ensureJsonObject(data)
         type_ = ensureJsonString(data_dict.get("type"))
-        if type_ != "image":
+        if type_ != "image" and type_ != "segmentation":
             raise ValueError(f"Bad 'type' marker value: {type_}")
         return PrecomputedChunksInfo(
             type_=type_,
@@ -0,0 +1,284 @@
+from typing import Any, Dict, List, Literal, Mapping, Sequence, Tuple
+import gzip
+import math
+import struct
+
+import numpy as np
+from ndstructs.point5D import Interval5D, Shape5D
+from ndstructs.utils.json_serializable import JsonObject, JsonValue, ensureJsonInt, ensureJsonObject, ensureJsonString
+
+from webilastik.server.rpc.dto import PrecomputedChunksShardingDto
+
+
+PrecomputedChunksShardingHash = Literal["identity", "murmurhash3_x86_128"]
+PrecomputedChunksShardingEncoding = Literal["raw", "gzip"]
+
+_MASK_32 = 0xFFFFFFFF
+
+def _rotl32(value: int, bits: int) -> int:
+    return ((value << bits) | (value >> (32 - bits))) & _MASK_32
+
+def _fmix32(value: int) -> int:
+    value ^= value >> 16
+    value = (value * 0x85EBCA6B) & _MASK_32
+    value ^= value >> 13
+    value = (value * 0xC2B2AE35) & _MASK_32
+    value ^= value >> 16
+    return value
+
+def murmurhash3_x86_128(key: bytes, seed: int = 0) -> bytes:
+    """The reference MurmurHash3_x86_128, returning the 16 bytes of the hash in little endian order"""
+    c1, c2, c3, c4 = 0x239B961B, 0xAB0E9789, 0x38B34AE5, 0xA1E38B93
+    multipliers = [(c1, 15, c2), (c2, 16, c3), (c3, 17, c4), (c4, 18, c1)]
+    h = [seed, seed, seed, seed]
+    num_blocks = len(key) // 16
+    for block_index in range(num_blocks):
+        k = struct.unpack_from("<4I", key, block_index * 16)
+        for i, (mul_a, rot, mul_b) in enumerate(multipliers):
+            h[i] ^= (_rotl32((k[i] * mul_a) & _MASK_32, rot) * mul_b) & _MASK_32
+            h[i] = _rotl32(h[i], (19, 17, 15, 13)[i])
+            h[i] = (h[i] + h[(i + 1) % 4]) & _MASK_32
+            h[i] = (h[i] * 5 + (0x561CCD1B, 0x0BCAA747, 0x96CD1C35, 0x32AC3B17)[i]) & _MASK_32
+
+    tail = key[num_blocks * 16:]
+    for i in range(3, -1, -1):
+        lane = tail[i * 4: i * 4 + 4]
+        if len(lane) == 0:
+            continue
+        k = int.from_bytes(lane, "little")
+        mul_a, rot, mul_b = multipliers[i]
+        h[i] ^= (_rotl32((k * mul_a) & _MASK_32, rot) * mul_b) & _MASK_32
+
+    h = [value ^ len(key) for value in h]
+    h[0] = (h[0] + h[1] + h[2] + h[3]) & _MASK_32
+    h[1], h[2], h[3] = [(value + h[0]) & _MASK_32 for value in h[1:]]
+    h = [_fmix32(value) for value in h]
+    h[0] = (h[0] + h[1] + h[2] + h[3]) & _MASK_32
+    h[1], h[2], h[3] = [(value + h[0]) & _MASK_32 for value in h[1:]]
+    return struct.pack("<4I", *h)
+
+def get_compressed_morton_code(grid_position: Sequence[int], grid_shape: Sequence[int]) -> int:
+    """Interleaves the bits of 'grid_position', skipping the axes which already ran out of bits for 'grid_shape'"""
+    axis_bits = [(length - 1).bit_length() for length in grid_shape]
+    code = 0
+    output_bit = 0
+    for bit in range(max(axis_bits, default=0)):
+        for axis, num_bits in enumerate(axis_bits):
+            if bit < num_bits:
+                code |= ((grid_position[axis] >> bit) & 1) << output_bit
+                output_bit += 1
+    return code
+
+
+class PrecomputedChunksSharding:
+    """The 'neuroglancer_uint64_sharded_v1' sharding of a precomputed chunks scale.
+
+    Chunks are grouped into shard files named after the shard number. Each shard starts with an index of
+    (start, end) offsets of its minishard indices, which in turn list (chunk_id, offset, size) of each of their chunks.
+    All offsets are relative to the end of the shard index.
+    """
+
+    def __init__(
+        self,
+        *,
+        preshift_bits: int,
+        hash: PrecomputedChunksShardingHash,
+        minishard_bits: int,
+        shard_bits: int,
+        minishard_index_encoding: PrecomputedChunksShardingEncoding = "raw",
+        data_encoding: PrecomputedChunksShardingEncoding = "raw",
+    ) -> None:
+        if not (0 <= preshift_bits <= 64 and 0 <= minishard_bits <= 32 and 0 <= shard_bits <= 64):
+            raise ValueError(f"Bad sharding bits: {preshift_bits=} {minishard_bits=} {shard_bits=}")
+        self.preshift_bits = preshift_bits
+        self.hash: PrecomputedChunksShardingHash = hash
+        self.minishard_bits = minishard_bits
+        self.shard_bits = shard_bits
+        self.minishard_index_encoding: PrecomputedChunksShardingEncoding = minishard_index_encoding
+        self.data_encoding: PrecomputedChunksShardingEncoding = data_encoding
+        self.shard_index_nbytes = (2 ** minishard_bits) * 16
+        super().__init__()
+
+    @classmethod
+    def create_for_volume(
+        cls, *, grid_shape: Tuple[int, int, int], chunks_per_shard: int = 512, data_encoding: PrecomputedChunksShardingEncoding = "raw"
+    ) -> "PrecomputedChunksSharding":
+        """Identity-hashed sharding where each shard holds an aligned block of up to 'chunks_per_shard' chunks"""
+        total_bits = sum((length - 1).bit_length() for length in grid_shape)
+        bits_per_shard = min(total_bits, max(0, chunks_per_shard.bit_length() - 1))
+        return PrecomputedChunksSharding(
+            preshift_bits=bits_per_shard // 2,
+            hash="identity",
+            minishard_bits=bits_per_shard - bits_per_shard // 2,
+            shard_bits=total_bits - bits_per_shard,
+            minishard_index_encoding="gzip",
+            data_encoding=data_encoding,
+        )
+
+    def to_json_value(self) -> JsonObject:
+        return {
+            "@type": "neuroglancer_uint64_sharded_v1",
+            "preshift_bits": self.preshift_bits,
+            "hash": self.hash,
+            "minishard_bits": self.minishard_bits,
+            "shard_bits": self.shard_bits,
+            "minishard_index_encoding": self.minishard_index_encoding,
+            "data_encoding": self.data_encoding,
+        }
+
+    @classmethod
+    def from_json_value(cls, value: JsonValue) -> "PrecomputedChunksSharding":
+        value_obj = ensureJsonObject(value)
+        type_ = ensureJsonString(value_obj.get("@type"))
+        if type_ != "neuroglancer_uint64_sharded_v1":
+            raise ValueError(f"Unsupported sharding type: {type_}")
+        hash = ensureJsonString(value_obj.get("hash"))
+        if hash != "identity" and hash != "murmurhash3_x86_128":
+            raise ValueError(f"Unsupported sharding hash: {hash}")
+        minishard_index_encoding = ensureJsonString(value_obj.get("minishard_index_encoding", "raw"))
+        data_encoding = ensureJsonString(value_obj.get("data_encoding", "raw"))
+        if minishard_index_encoding != "raw" and minishard_index_encoding != "gzip":
+            raise ValueError(f"Bad minishard index encoding: {minishard_index_encoding}")
+        if data_encoding != "raw" and data_encoding != "gzip":
+            raise ValueError(f"Bad sharding data encoding: {data_encoding}")
+        return PrecomputedChunksSharding(
+            preshift_bits=ensureJsonInt(value_obj.get("preshift_bits")),
+            hash=hash,
+            minishard_bits=ensureJsonInt(value_obj.get("minishard_bits")),
+            shard_bits=ensureJsonInt(value_obj.get("shard_bits")),
+            minishard_index_encoding=minishard_index_encoding,
+            data_encoding=data_encoding,
+        )
+
+    def to_dto(self) -> PrecomputedChunksShardingDto:
+        return PrecomputedChunksShardingDto(
+            preshift_bits=self.preshift_bits,
+            hash=self.hash,
+            minishard_bits=self.minishard_bits,
+            shard_bits=self.shard_bits,
+            minishard_index_encoding=self.minishard_index_encoding,
+            data_encoding=self.data_encoding,
+        )
+
+    @classmethod
+    def from_dto(cls, dto: PrecomputedChunksShardingDto) -> "PrecomputedChunksSharding":
+        return PrecomputedChunksSharding(
+            preshift_bits=dto.preshift_bits,
+            hash=dto.hash,
+            minishard_bits=dto.minishard_bits,
+            shard_bits=dto.shard_bits,
+            minishard_index_encoding=dto.minishard_index_encoding,
+            data_encoding=dto.data_encoding,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PrecomputedChunksSharding) and self.to_json_value() == other.to_json_value()
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.to_json_value().items()))
+
+    def _hash_chunk_id(self, chunk_id: int) -> int:
+        shifted_id = chunk_id >> self.preshift_bits
+        if self.hash == "identity":
+            return shifted_id
+        return int.from_bytes(murmurhash3_x86_128(shifted_id.to_bytes(8, "little"))[:8], "little")
+
+    def get_shard_and_minishard(self, chunk_id: int) -> Tuple[int, int]:
+        hashed_id = self._hash_chunk_id(chunk_id)
+        minishard = hashed_id & ((1 << self.minishard_bits) - 1)
+        shard = (hashed_id >> self.minishard_bits) & ((1 << self.shard_bits) - 1)
+        return (shard, minishard)
+
+    def get_chunk_id(self, *, tile: Interval5D, scale_interval: Interval5D, chunk_shape: Shape5D) -> int:
+        "Chunks of sharded volumes are identified by the compressed morton code of their position in the chunk grid"
+        grid_shape = self.get_grid_shape(scale_interval=scale_interval, chunk_shape=chunk_shape)
+        grid_position = ((tile.start - scale_interval.start) // chunk_shape).to_tuple("xyz")
+        return get_compressed_morton_code(grid_position, grid_shape)
+
+    @staticmethod
+    def get_grid_shape(*, scale_interval: Interval5D, chunk_shape: Shape5D) -> Tuple[int, int, int]:
+        shape = scale_interval.shape
+        return (
+            math.ceil(shape.x / chunk_shape.x),
+            math.ceil(shape.y / chunk_shape.y),
+            math.ceil(shape.z / chunk_shape.z),
+        )
+
+    def get_shard_file_name(self, shard: int) -> str:
+        return f"{shard:0{math.ceil(self.shard_bits / 4)}x}.shard"
+
+    def get_chunks_per_shard(self, grid_shape: Tuple[int, int, int]) -> "Tuple[int, int, int] | Exception":
+        """The (aligned) block of chunks that makes up each shard. Only identity-hashed shards are spatial blocks"""
+        if self.hash != "identity":
+            return ValueError(f"Chunks of '{self.hash}'-hashed shards are not spatially contiguous")
+        axis_bits = [(length - 1).bit_length() for length in grid_shape]
+        if self.preshift_bits + self.minishard_bits + self.shard_bits < sum(axis_bits):
+            return ValueError(f"Sharding has too few bits to address all chunks of a {grid_shape} grid")
+        # the lowest preshift + minishard bits of the morton code index chunks within a shard
+        bits_per_shard = self.preshift_bits + self.minishard_bits
+        shard_bits_per_axis = [0, 0, 0]
+        for bit in range(max(axis_bits, default=0)):
+            for axis, num_bits in enumerate(axis_bits):
+                if bit < num_bits and bits_per_shard > 0:
+                    shard_bits_per_axis[axis] += 1
+                    bits_per_shard -= 1
+        return (2 ** shard_bits_per_axis[0], 2 ** shard_bits_per_axis[1], 2 ** shard_bits_per_axis[2])
+
+    def decode_shard_index(self, raw_index: "bytes | memoryview") -> "np.ndarray[Any, Any]":
+        "The (start, end) of each minishard index of a shard, relative to the end of the shard index"
+        return np.frombuffer(raw_index, dtype="<u8").reshape(2 ** self.minishard_bits, 2)
+
+    def decode_minishard_index(self, raw_minishard_index: "bytes | memoryview") -> "np.ndarray[Any, Any]":
+        "The (chunk_id, offset, size) of each chunk in the minishard, with offsets relative to the end of the shard index"
+        if self.minishard_index_encoding == "gzip":
+            raw_minishard_index = gzip.decompress(raw_minishard_index)
+        index: "np.ndarray[Any, Any]" = np.frombuffer(raw_minishard_index, dtype="<u8").reshape(3, -1)
+        chunk_ids = np.cumsum(index[0], dtype=np.uint64)
+        sizes = index[2]
+        # each offset is stored relative to the end of the previous chunk
+        ends = np.cumsum(index[1] + sizes, dtype=np.uint64)
+        return np.stack([chunk_ids, ends - sizes, sizes], axis=1)
+
+    @staticmethod
+    def find_chunk(minishard_index: "np.ndarray[Any, Any]", chunk_id: int) -> "Tuple[int, int] | None":
+        "The (offset, size) of chunk 'chunk_id' in a decoded minishard index, if it is there"
+        matches = np.nonzero(minishard_index[:, 0] == np.uint64(chunk_id))[0]
+        if len(matches) == 0:
+            return None
+        _, offset, size = (int(value) for value in minishard_index[matches[-1]])
+        return (offset, size)
+
+    def decode_chunk_data(self, raw_chunk: "bytes | memoryview") -> "bytes | memoryview":
+        if self.data_encoding == "gzip":
+            return gzip.decompress(raw_chunk)
+        return raw_chunk
+
+    def encode_shard(self, chunks: Mapping[int, "bytes | memoryview"]) -> List["bytes | memoryview"]:
+        """The contents of a shard file holding 'chunks', by chunk_id. All chunks must belong to the same shard"""
+        minishards: Dict[int, List[int]] = {}
+        for chunk_id in sorted(chunks.keys()):
+            minishards.setdefault(self.get_shard_and_minishard(chunk_id)[1], []).append(chunk_id)
+
+        shard_index: "np.ndarray[Any, Any]" = np.zeros((2 ** self.minishard_bits, 2), dtype="<u8")
+        contents: List["bytes | memoryview"] = [memoryview(shard_index).cast("B")]
+        offset = 0
+        for minishard, chunk_ids in sorted(minishards.items()):
+            minishard_index: "np.ndarray[Any, Any]" = np.zeros((3, len(chunk_ids)), dtype="<u8")
+            previous_chunk_id = 0
+            previous_chunk_end = 0
+            for i, chunk_id in enumerate(chunk_ids):
+                chunk_data = chunks[chunk_id]
+                if self.data_encoding == "gzip":
+                    chunk_data = gzip.compress(chunk_data, compresslevel=6)
+                minishard_index[:, i] = (chunk_id - previous_chunk_id, offset - previous_chunk_end, len(chunk_data))
+                previous_chunk_id = chunk_id
+                previous_chunk_end = offset + len(chunk_data)
+                contents.append(chunk_data)
+                offset += len(chunk_data)
+            raw_minishard_index: "bytes | memoryview" = memoryview(minishard_index).cast("B")
+            if self.minishard_index_encoding == "gzip":
+                raw_minishard_index = gzip.compress(raw_minishard_index, compresslevel=6)
+            shard_index[minishard] = (offset, offset + len(raw_minishard_index))
+            contents.append(raw_minishard_index)
+            offset += len(raw_minishard_index)
+        return contents
@@ -0,0 +1,121 @@
+"""Prefetching of the tiles a client is likely to ask for next.
+
+Feature extraction enlarges every roi by a halo and viewers tend to keep panning in the same direction, so after
+a retrieve the tiles around the requested region (and, while the client keeps moving one way, a few more tiles
+ahead of it) are fetched in the background into the tile cache.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, List, Set, Tuple
+import threading
+
+from ndstructs.point5D import Interval5D
+
+if TYPE_CHECKING:
+    from webilastik.datasource import DataSource, DataRoi
+
+
+_SPATIAL_AXES = "xyz"
+
+@dataclass
+class _AccessHistory:
+    center: Tuple[float, float, float]
+    direction: Tuple[int, int, int]
+    streak: int
+
+
+class ReadAhead:
+    def __init__(self, *, max_outstanding_bytes: int, max_depth: int = 4, max_tracked_datasources: int = 256) -> None:
+        self.max_outstanding_bytes = max_outstanding_bytes
+        self.max_depth = max_depth
+        self.max_tracked_datasources = max_tracked_datasources
+        self._lock = threading.Lock()
+        self._histories: "OrderedDict[bytes, _AccessHistory]" = OrderedDict()
+        self._in_flight: Set[Tuple[bytes, Tuple[int, ...]]] = set()
+        self._outstanding_bytes = 0
+        super().__init__()
+
+    def _get_tile_center(self, datasource: "DataSource", interval: Interval5D) -> Tuple[float, float, float]:
+        """Center of 'interval', in units of tiles"""
+        x, y, z = [
+            (getattr(interval, axis)[0] + getattr(interval, axis)[1]) / 2 / getattr(datasource.tile_shape, axis)
+            for axis in _SPATIAL_AXES
+        ]
+        return (x, y, z)
+
+    def _update_history(self, datasource: "DataSource", interval: Interval5D) -> _AccessHistory:
+        center = self._get_tile_center(datasource, interval)
+        with self._lock:
+            previous = self._histories.pop(datasource.content_key, None)
+            if previous is None:
+                history = _AccessHistory(center=center, direction=(0, 0, 0), streak=0)
+            else:
+                x, y, z = [
+                    0 if abs(delta) < 0.5 else (1 if delta > 0 else -1)
+                    for delta in (c - p for c, p in zip(center, previous.center))
+                ]
+                direction = (x, y, z)
+                if direction == (0, 0, 0):
+                    # re-requesting the same region says nothing new about where the client is heading
+                    history = _AccessHistory(center=center, direction=previous.direction, streak=previous.streak)
+                elif direction == previous.direction:
+                    history = _AccessHistory(center=center, direction=direction, streak=previous.streak + 1)
+                else:
+                    history = _AccessHistory(center=center, direction=direction, streak=1)
+            self._histories[datasource.content_key] = history
+            while len(self._histories) > self.max_tracked_datasources:
+                _ = self._histories.popitem(last=False)
+        return history
+
+    def plan(self, datasource: "DataSource", interval: Interval5D) -> List["DataRoi"]:
+        """Records an access to 'interval' and returns the tiles worth prefetching, most likely ones first.
+
+        That is always the ring of tiles around 'interval', extended by up to 'max_depth' tiles in the direction
+        the client has consistently been moving in
+        """
+        history = self._update_history(datasource, interval)
+        depth = min(self.max_depth, history.streak)
+        spans = {}
+        for axis, step in zip(_SPATIAL_AXES, history.direction):
+            tile_side = getattr(datasource.tile_shape, axis)
+            start, stop = getattr(interval, axis)
+            limit_start, limit_stop = getattr(datasource.interval, axis)
+            spans[axis] = (
+                max(limit_start, start - tile_side * (1 + (depth if step < 0 else 0))),
+                min(limit_stop, stop + tile_side * (1 + (depth if step > 0 else 0))),
+            )
+        region = datasource.roi.updated(**spans)
+        requested = set(datasource.roi.clamped(interval).get_datasource_tiles(clamp_to_datasource=True))
+        candidates = [tile for tile in region.get_datasource_tiles(clamp_to_datasource=True) if tile not in requested]
+
+        predicted_center = tuple(c + step for c, step in zip(history.center, history.direction))
+        def distance_to_prediction(tile: "DataRoi") -> float:
+            return sum((c - p) ** 2 for c, p in zip(self._get_tile_center(datasource, tile), predicted_center))
+        return sorted(candidates, key=distance_to_prediction)
+
+    def on_retrieve(self, datasource: "DataSource", interval: Interval5D, executor: Executor) -> None:
+        for tile in self.plan(datasource, interval):
+            tile_key = (datasource.content_key, tile.start.to_tuple("tzyxc"))
+            tile_nbytes = tile.shape.hypervolume * datasource.dtype.itemsize
+            with self._lock:
+                if tile_key in self._in_flight:
+                    continue
+                if self._outstanding_bytes + tile_nbytes > self.max_outstanding_bytes:
+                    break
+                self._in_flight.add(tile_key)
+                self._outstanding_bytes += tile_nbytes
+            future = executor.submit(datasource.get_tile, tile)
+            future.add_done_callback(lambda f, key=tile_key, nbytes=tile_nbytes: self._on_prefetched(f, key, nbytes))
+
+    def _on_prefetched(self, future: "Future[Any]", tile_key: Tuple[bytes, Tuple[int, ...]], tile_nbytes: int) -> None:
+        # failures are not reported; the tile will be fetched (and fail loudly) if it's ever actually requested
+        _ = future.exception()
+        with self._lock:
+            self._in_flight.discard(tile_key)
+            self._outstanding_bytes -= tile_nbytes
+
+    def get_outstanding_bytes(self) -> int:
+        with self._lock:
+            return self._outstanding_bytes
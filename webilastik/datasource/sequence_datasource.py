@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Any, Iterable, Tuple
 import bisect
 
 from ndstructs.point5D import Interval5D, Point5D
@@ -38,6 +38,9 @@ class SequenceDataSource(DataSource):
     def __hash__(self) -> int:
         return hash(tuple(self.datasources))
 
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (*super()._get_content_key_parts(), self.stack_axis, tuple(self.datasources))
+
     def __eq__(self, other: object) -> bool:
         return (
             isinstance(other, SequenceDataSource) and
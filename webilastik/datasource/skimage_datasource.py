@@ -1,20 +1,94 @@
 #pyright: strict
 
 from pathlib import PurePosixPath
-from typing import Optional, Tuple, Any, cast
-import io
+from typing import List, Optional, Sequence, Tuple, Any, cast
+import math
+import threading
 
-import skimage.io
+import imageio.v3 as iio
+import tifffile
 import numpy as np
 from ndstructs.array5D import Array5D
 from ndstructs.point5D import Interval5D, Point5D, Shape5D
 
+from global_cache import global_cache
+from webilastik.caching import call_many
 from webilastik.datasource import FsDataSource
-from webilastik.filesystem import IFilesystem, create_filesystem_from_message
+from webilastik.filesystem import FsRawFile, IFilesystem, create_filesystem_from_message
 from webilastik.server.rpc.dto import Interval5DDto, Shape5DDto, SkimageDataSourceDto, dtype_to_dto
 
+
+class _TiffLayout:
+    """Where the pixels of each page (i.e. 'z' slice) of the first series of a tiff file are, and how to decode them"""
+
+    def __init__(self, tiff: tifffile.TiffFile) -> None:
+        series = tiff.series[0]
+        keyframe = series.keyframe
+        pages = [page for page in series.pages if page is not None]
+        if keyframe.imagedepth != 1:
+            raise ValueError("Volumetric tiff tiles are not supported")
+        if len(series.shape) - len(keyframe.shape) > 1:
+            raise ValueError(f"Unsupported tiff series with axes {series.axes}")
+
+        self.num_pages = len(pages)
+        self.height: int = keyframe.imagelength
+        self.width: int = keyframe.imagewidth
+        self.num_samples: int = keyframe.samplesperpixel
+        self.dtype: "np.dtype[Any]" = np.dtype(keyframe.dtype)
+        self.on_disk_dtype: "np.dtype[Any]" = self.dtype.newbyteorder(tiff.byteorder)
+        self.is_planar = keyframe.planarconfig == 2 and self.num_samples > 1
+        if keyframe.is_tiled:
+            self.segment_shape: Tuple[int, int] = (keyframe.tilelength, keyframe.tilewidth)
+        else:
+            self.segment_shape = (min(keyframe.rowsperstrip or self.height, self.height), self.width)
+        self.segments_down = math.ceil(self.height / self.segment_shape[0])
+        self.segments_across = math.ceil(self.width / self.segment_shape[1])
+        self.page_offsets = [np.asarray(page.dataoffsets, dtype=np.uint64) for page in pages]
+        self.page_byte_counts = [np.asarray(page.databytecounts, dtype=np.uint64) for page in pages]
+        num_planes = self.num_samples if self.is_planar else 1
+        if any(len(offsets) != num_planes * self.segments_down * self.segments_across for offsets in self.page_offsets):
+            raise ValueError("Unexpected number of strips or tiles in tiff file")
+
+        # uncompressed pages whose rows follow each other can be read straight from the file, a few rows at a time
+        self.is_contiguous = (
+            keyframe.compression == 1 and
+            keyframe.fillorder == 1 and
+            keyframe.bitspersample == self.dtype.itemsize * 8 and
+            not keyframe.is_tiled and
+            not self.is_planar and
+            all(
+                (offsets[1:] == offsets[:-1] + byte_counts[:-1]).all()
+                for offsets, byte_counts in zip(self.page_offsets, self.page_byte_counts)
+            )
+        )
+        self._decode = keyframe.decode
+        self._jpegtables = keyframe.jpegtables
+        super().__init__()
+
+    @property
+    def row_nbytes(self) -> int:
+        return self.width * self.num_samples * self.dtype.itemsize
+
+    def decode_segment(self, raw_segment: "bytes | memoryview", segment_index: int) -> "np.ndarray[Any, Any]":
+        """Decodes a strip or tile of a page into a 'yxc' array, cropped to the bounds of the image"""
+        segment, _, _ = self._decode(bytes(raw_segment), segment_index, jpegtables=self._jpegtables)
+        if segment is None:
+            raise ValueError(f"Could not decode tiff segment {segment_index}")
+        segment_index_in_plane = segment_index % (self.segments_down * self.segments_across)
+        y = segment_index_in_plane // self.segments_across * self.segment_shape[0]
+        x = segment_index_in_plane % self.segments_across * self.segment_shape[1]
+        data = cast("np.ndarray[Any, Any]", segment).reshape(segment.shape[-3:])
+        return data[:self.height - y, :self.width - x].astype(self.dtype, copy=False)
+
+
 class SkimageDataSource(FsDataSource):
-    """A naive implementation of DataSource that can read images using skimage"""
+    """A DataSource for single-file images, like png, jpeg or tiff.
+
+    Nothing is read when the datasource is created with its 'shape' and 'dtype' (e.g. from a DTO). Tiff files are read
+    piecemeal: uncompressed ones straight from the rows of the file that a tile covers, and others from the (cached)
+    strips or tiles of the file that a tile overlaps. Other formats can only be decoded as a whole, which happens once,
+    on the first read of a tile, and is then cached
+    """
     def __init__(
         self,
         *,
@@ -23,30 +97,187 @@ class SkimageDataSource(FsDataSource):
         filesystem: IFilesystem,
         tile_shape: Optional[Shape5D] = None,
         spatial_resolution: Optional[Tuple[int, int, int]] = None,
+        shape: Optional[Shape5D] = None,
+        dtype: "np.dtype[Any] | None" = None,
     ):
-        raw_data_result = filesystem.read_file(path)
-        if isinstance(raw_data_result, Exception):
-            raise raw_data_result #FIXME: return instead
-        file_like = io.BytesIO(raw_data_result)
-        raw_data = cast("np.ndarray[Any, Any]", skimage.io.imread(file_like)) #pyright: ignore [reportUnknownMemberType]
-        c_axiskeys_on_disk = "yxc"[: len(raw_data.shape)]
-        self._data = Array5D(raw_data, axiskeys=c_axiskeys_on_disk, location=location)
+        self._lock = threading.Lock()
+        self._tiff_layout: Optional[_TiffLayout] = None
+        self._decoded_image: "np.ndarray[Any, Any] | None" = None
+        if shape is None or dtype is None:
+            image_info = self._probe(filesystem=filesystem, path=path)
+            if isinstance(image_info, Exception):
+                raise image_info #FIXME: return instead
+            shape, dtype = image_info
 
+        c_axiskeys_on_disk = ("z" if shape.z > 1 else "") + "yx" + ("c" if shape.c > 1 else "")
+        interval = shape.to_interval5d(offset=location)
         if tile_shape is None:
-            tile_shape = Shape5D.hypercube(256).to_interval5d().clamped(self._data.shape).shape
+            tile_shape = Shape5D.hypercube(256).to_interval5d().clamped(shape).shape
 
         super().__init__(
             c_axiskeys_on_disk=c_axiskeys_on_disk,
             filesystem=filesystem,
             path=path,
-            dtype=self._data.dtype,
-            interval=self._data.interval,
+            dtype=dtype,
+            interval=interval,
             tile_shape=tile_shape,
             spatial_resolution=spatial_resolution,
         )
 
+    @classmethod
+    def _is_tiff(cls, path: PurePosixPath) -> bool:
+        return path.suffix.lower() in (".tif", ".tiff")
+
+    @classmethod
+    def _probe(cls, *, filesystem: IFilesystem, path: PurePosixPath) -> "Tuple[Shape5D, np.dtype[Any]] | Exception":
+        """Reads just enough of the file (usually only its header) to know the shape and dtype of the image"""
+        file_result = FsRawFile.open(filesystem=filesystem, path=path)
+        if isinstance(file_result, Exception):
+            return file_result
+        try:
+            with file_result:
+                if cls._is_tiff(path):
+                    with tifffile.TiffFile(file_result) as tiff:
+                        layout = _TiffLayout(tiff)
+                    return (
+                        Shape5D(z=layout.num_pages, y=layout.height, x=layout.width, c=layout.num_samples),
+                        layout.dtype,
+                    )
+                properties = iio.improps(file_result, extension=path.suffix.lower(), index=0)
+                props_shape = properties.shape
+                return (
+                    Shape5D(y=props_shape[0], x=props_shape[1], c=props_shape[2] if len(props_shape) > 2 else 1),
+                    np.dtype(properties.dtype),
+                )
+        except Exception as e:
+            return e
+
+    def _get_tiff_layout(self) -> _TiffLayout:
+        with self._lock:
+            if self._tiff_layout is None:
+                file_result = FsRawFile.open(filesystem=self.filesystem, path=self.path)
+                if isinstance(file_result, Exception):
+                    raise file_result #FIXME: return instead
+                with file_result, tifffile.TiffFile(file_result) as tiff:
+                    self._tiff_layout = _TiffLayout(tiff)
+            return self._tiff_layout
+
+    @global_cache
+    def get_tiff_segment(self, page_index: int, segment_index: int) -> "np.ndarray[Any, Any] | None":
+        """A decoded strip or tile of a tiff page, as 'yxc', or None if the file doesn't have it (i.e. it's empty)"""
+        layout = self._get_tiff_layout()
+        offset = int(layout.page_offsets[page_index][segment_index])
+        num_bytes = int(layout.page_byte_counts[page_index][segment_index])
+        if num_bytes == 0:
+            return None
+        read_result = self.filesystem.read_file_as_buffer(self.path, offset=offset, num_bytes=num_bytes)
+        if isinstance(read_result, Exception):
+            raise read_result #FIXME: return instead
+        return layout.decode_segment(read_result, segment_index)
+
+    def _read_tiff_segments(self, segment_calls: Sequence[Tuple[Any, ...]]) -> List["np.ndarray[Any, Any] | None"]:
+        """Like get_tiff_segment, for the (self, page_index, segment_index) of many segments, in a single read_files"""
+        layout = self._get_tiff_layout()
+        byte_ranges = [
+            (int(layout.page_offsets[page_index][segment_index]), int(layout.page_byte_counts[page_index][segment_index]))
+            for _, page_index, segment_index in segment_calls
+        ]
+        read_results = iter(self.filesystem.read_files([
+            (self.path, offset, num_bytes) for offset, num_bytes in byte_ranges if num_bytes > 0
+        ]))
+        segments: List["np.ndarray[Any, Any] | None"] = []
+        for (_, _, segment_index), (_, num_bytes) in zip(segment_calls, byte_ranges):
+            if num_bytes == 0:
+                segments.append(None)
+                continue
+            read_result = next(read_results)
+            if isinstance(read_result, Exception):
+                raise read_result #FIXME: return instead
+            segments.append(layout.decode_segment(read_result, segment_index))
+        return segments
+
+    def _read_tiff_page_region(self, layout: _TiffLayout, page_index: int, tile: Interval5D) -> "np.ndarray[Any, Any]":
+        y_start, y_stop = tile.y[0] - self.location.y, tile.y[1] - self.location.y
+        x_start, x_stop = tile.x[0] - self.location.x, tile.x[1] - self.location.x
+        if layout.is_contiguous:
+            read_result = self.filesystem.read_file_as_buffer(
+                self.path,
+                offset=int(layout.page_offsets[page_index][0]) + y_start * layout.row_nbytes,
+                num_bytes=(y_stop - y_start) * layout.row_nbytes,
+            )
+            if isinstance(read_result, Exception):
+                raise read_result #FIXME: return instead
+            rows: "np.ndarray[Any, Any]" = np.frombuffer(read_result, dtype=layout.on_disk_dtype).reshape(
+                y_stop - y_start, layout.width, layout.num_samples
+            )
+            return rows[:, x_start:x_stop].astype(layout.dtype)
+
+        out: "np.ndarray[Any, Any]" = np.zeros((y_stop - y_start, x_stop - x_start, layout.num_samples), dtype=layout.dtype)
+        segment_height, segment_width = layout.segment_shape
+        segment_calls: List[Tuple[Any, ...]] = []
+        segment_positions: List[Tuple[int, int, Optional[int]]] = []
+        for segment_row in range(y_start // segment_height, math.ceil(y_stop / segment_height)):
+            for segment_column in range(x_start // segment_width, math.ceil(x_stop / segment_width)):
+                segment_index = segment_row * layout.segments_across + segment_column
+                planes: Sequence[Optional[int]] = range(layout.num_samples) if layout.is_planar else [None]
+                for plane in planes:
+                    plane_offset = (plane or 0) * layout.segments_down * layout.segments_across
+                    segment_calls.append((self, page_index, plane_offset + segment_index))
+                    segment_positions.append((segment_row * segment_height, segment_column * segment_width, plane))
+        segments = call_many(SkimageDataSource.get_tiff_segment, segment_calls, compute_many=self._read_tiff_segments)
+        for (segment_y, segment_x, plane), segment in zip(segment_positions, segments):
+            if segment is None:
+                continue
+            segment_region = segment[
+                max(y_start - segment_y, 0) : y_stop - segment_y,
+                max(x_start - segment_x, 0) : x_stop - segment_x,
+            ]
+            out_y, out_x = max(segment_y - y_start, 0), max(segment_x - x_start, 0)
+            out_region = out[out_y : out_y + segment_region.shape[0], out_x : out_x + segment_region.shape[1]]
+            if plane is None:
+                out_region[...] = segment_region
+            else:
+                out_region[..., plane] = segment_region[..., 0]
+        return out
+
+    @global_cache
+    def get_decoded_image(self) -> "np.ndarray[Any, Any]":
+        """The whole image, as 'yxc', for formats that can't be read piecemeal"""
+        raw_data_result = self.filesystem.read_file(self.path)
+        if isinstance(raw_data_result, Exception):
+            raise raw_data_result #FIXME: return instead
+        raw_data = iio.imread(raw_data_result, extension=self.path.suffix.lower(), index=0)
+        return raw_data.reshape(self.shape.y, self.shape.x, self.shape.c)
+
     def _get_tile(self, tile: Interval5D) -> Array5D:
-        return self._data.cut(tile, copy=True)
+        if self._is_tiff(self.path):
+            layout = self._get_tiff_layout()
+            raw = np.stack([
+                self._read_tiff_page_region(layout, page_index - self.location.z, tile)
+                for page_index in range(tile.z[0], tile.z[1])
+            ])
+            return Array5D(raw, axiskeys="zyxc", location=tile.start)
+
+        # the global cache drops images bigger than its budget (and evicts big ones first), so this instance keeps its
+        # own reference too, lest the image be read and decoded again for every one of its tiles
+        with self._lock:
+            if self._decoded_image is None:
+                self._decoded_image = self.get_decoded_image()
+            decoded_image = self._decoded_image
+        image = Array5D(decoded_image, axiskeys="yxc", location=self.location)
+        return image.cut(tile, copy=True)
+
+    def __getstate__(self) -> Any:
+        # open layouts and decoded pixels are per process; only the description of the image travels
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_tiff_layout"] = None
+        state["_decoded_image"] = None
+        return state
+
+    def __setstate__(self, state: Any) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     def __hash__(self) -> int:
         return super().__hash__()
@@ -56,7 +287,7 @@ class SkimageDataSource(FsDataSource):
 
     @classmethod
     def supports_path(cls, path: PurePosixPath) -> bool:
-        return path.suffix.lower() in (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+        return path.suffix.lower() in (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff")
 
     @staticmethod
     def from_dto(dto: SkimageDataSourceDto) -> "SkimageDataSource | Exception":
@@ -64,10 +295,13 @@ class SkimageDataSource(FsDataSource):
         if isinstance(fs_result, Exception):
             return fs_result
 
+        interval = dto.interval.to_interval5d()
         return SkimageDataSource(
             filesystem=fs_result,
             path=PurePosixPath(dto.path),
-            location=dto.interval.to_interval5d().start,
+            location=interval.start,
+            shape=interval.shape,
+            dtype=np.dtype(dto.dtype),
             tile_shape=dto.tile_shape.to_shape5d(),
             spatial_resolution=dto.spatial_resolution,
         )
@@ -91,4 +325,3 @@ class SkimageDataSource(FsDataSource):
             return SkimageDataSource(path=path, filesystem=fs)
         except Exception as e:
             return e
-
@@ -0,0 +1,263 @@
+from typing import Any, List, Optional, Tuple
+from pathlib import PurePosixPath
+
+import numpy as np
+from ndstructs.point5D import Interval5D
+from ndstructs.array5D import Array5D
+from ndstructs.utils.json_serializable import JsonObject, ensureJsonArray, ensureJsonObject, ensureJsonString, ensureJsonFloat
+
+from global_cache import global_cache
+from webilastik.datasource import FsDataSource
+from webilastik.datasource.n5_attributes import N5Compressor
+from webilastik.datasource.zarr_metadata import SHARD_INDEX_MISSING_CHUNK, ZarrArrayMetadata, load_zarr_json
+from webilastik.filesystem import FsFileNotFoundException, IFilesystem, create_filesystem_from_message
+from webilastik.server.rpc.dto import Interval5DDto, Shape5DDto, ZarrDataSourceDto, dtype_to_dto
+from webilastik.utility.url import Url
+
+
+# OME-Zarr units, in the nanometers of spatial_resolution
+_OME_UNIT_NANOMETERS = {"angstrom": 0.1, "nanometer": 1, "micrometer": 1000, "millimeter": 1000 * 1000}
+
+class ZarrDataSource(FsDataSource):
+    """An FsDataSource representing a zarr (v2 or v3) array, which may be sharded.
+
+    Tiles are the chunks of the array, or the inner chunks of its shards, which are read individually
+    """
+
+    def __init__(
+        self,
+        *,
+        filesystem: IFilesystem,
+        path: PurePosixPath,
+        metadata: ZarrArrayMetadata,
+        spatial_resolution: Optional[Tuple[int, int, int]] = None,
+    ):
+        self.metadata = metadata
+        super().__init__(
+            c_axiskeys_on_disk=metadata.c_axiskeys,
+            filesystem=filesystem,
+            path=path,
+            tile_shape=metadata.chunk_shape,
+            interval=metadata.interval,
+            dtype=metadata.dtype,
+            spatial_resolution=spatial_resolution,
+        )
+
+    @classmethod
+    def try_load(
+        cls,
+        *,
+        filesystem: IFilesystem,
+        path: PurePosixPath,
+        spatial_resolution: Optional[Tuple[int, int, int]] = None,
+    ) -> "ZarrDataSource | Exception":
+        metadata_result = ZarrArrayMetadata.try_load(filesystem=filesystem, path=path)
+        if isinstance(metadata_result, Exception):
+            return metadata_result
+        return ZarrDataSource(filesystem=filesystem, path=path, metadata=metadata_result, spatial_resolution=spatial_resolution)
+
+    @classmethod
+    def supports_url(cls, url: Url) -> bool:
+        return url.datascheme == "zarr" or any(part.lower().endswith(".zarr") for part in url.path.parts)
+
+    @classmethod
+    def try_open(cls, *, fs: IFilesystem, path: PurePosixPath) -> "Tuple[ZarrDataSource, ...] | None | Exception":
+        """Opens the zarr array at 'path' or, if 'path' is an OME-Zarr image, all of its scales.
+
+        Returns None if there is no zarr array or group at 'path'
+        """
+        zarr_json_result = load_zarr_json(fs, path / "zarr.json")
+        if isinstance(zarr_json_result, FsFileNotFoundException):
+            zgroup_result = load_zarr_json(fs, path / ".zgroup")
+            if isinstance(zgroup_result, FsFileNotFoundException):
+                metadata_result = ZarrArrayMetadata.try_load(filesystem=fs, path=path)
+                if isinstance(metadata_result, FsFileNotFoundException):
+                    return None
+                if isinstance(metadata_result, Exception):
+                    return metadata_result
+                return (ZarrDataSource(filesystem=fs, path=path, metadata=metadata_result),)
+            if isinstance(zgroup_result, Exception):
+                return zgroup_result
+            zattrs_result = load_zarr_json(fs, path / ".zattrs")
+            if isinstance(zattrs_result, Exception):
+                return zattrs_result
+            group_attributes = zattrs_result
+        elif isinstance(zarr_json_result, Exception):
+            return zarr_json_result
+        elif zarr_json_result.get("node_type") == "array":
+            metadata_result = ZarrArrayMetadata.from_v3_json(zarr_json_result)
+            if isinstance(metadata_result, Exception):
+                return metadata_result
+            return (ZarrDataSource(filesystem=fs, path=path, metadata=metadata_result),)
+        else:
+            try:
+                group_attributes = ensureJsonObject(zarr_json_result.get("attributes", {}))
+            except Exception as e:
+                return e
+        return cls._try_open_ome_multiscales(fs=fs, path=path, group_attributes=group_attributes)
+
+    @classmethod
+    def _try_open_ome_multiscales(
+        cls, *, fs: IFilesystem, path: PurePosixPath, group_attributes: JsonObject
+    ) -> "Tuple[ZarrDataSource, ...] | Exception":
+        try:
+            # since OME-Zarr 0.5, the multiscales metadata lives under an "ome" key
+            ome_attributes = ensureJsonObject(group_attributes.get("ome", group_attributes))
+            if "multiscales" not in ome_attributes:
+                return ValueError(f"Zarr group at {path} is not an OME-Zarr image")
+            multiscale = ensureJsonObject(ensureJsonArray(ome_attributes.get("multiscales"))[0])
+            axis_names: List[str] = []
+            axis_units: List[Optional[str]] = []
+            for axis in ensureJsonArray(multiscale.get("axes", ())):
+                if isinstance(axis, str): # OME-Zarr 0.3
+                    axis_names.append(axis.lower())
+                    axis_units.append(None)
+                    continue
+                axis_obj = ensureJsonObject(axis)
+                axis_names.append(ensureJsonString(axis_obj.get("name")).lower())
+                unit = axis_obj.get("unit")
+                axis_units.append(unit if isinstance(unit, str) else None)
+            c_axiskeys = "".join(axis_names) if all(len(name) == 1 and name in "tzyxc" for name in axis_names) else None
+
+            datasources: List[ZarrDataSource] = []
+            for dataset in ensureJsonArray(multiscale.get("datasets")):
+                dataset_obj = ensureJsonObject(dataset)
+                dataset_path = path / ensureJsonString(dataset_obj.get("path"))
+                scale: Optional[List[float]] = None
+                for transformation in ensureJsonArray(dataset_obj.get("coordinateTransformations", ())):
+                    transformation_obj = ensureJsonObject(transformation)
+                    if transformation_obj.get("type") == "scale":
+                        scale = [ensureJsonFloat(factor) for factor in ensureJsonArray(transformation_obj.get("scale"))]
+                spatial_resolution: List[int] = []
+                for key in "xyz":
+                    if scale is None or key not in axis_names or len(scale) != len(axis_names):
+                        spatial_resolution.append(1)
+                        continue
+                    axis_index = axis_names.index(key)
+                    nanometers = scale[axis_index] * _OME_UNIT_NANOMETERS.get(axis_units[axis_index] or "nanometer", 1)
+                    spatial_resolution.append(max(1, round(nanometers)))
+
+                metadata_result = ZarrArrayMetadata.try_load(filesystem=fs, path=dataset_path, c_axiskeys=c_axiskeys)
+                if isinstance(metadata_result, Exception):
+                    return metadata_result
+                datasources.append(ZarrDataSource(
+                    filesystem=fs,
+                    path=dataset_path,
+                    metadata=metadata_result,
+                    spatial_resolution=(spatial_resolution[0], spatial_resolution[1], spatial_resolution[2]),
+                ))
+            return tuple(datasources)
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def from_dto(dto: ZarrDataSourceDto) -> "ZarrDataSource | Exception":
+        fs_result = create_filesystem_from_message(dto.filesystem)
+        if isinstance(fs_result, Exception):
+            return fs_result
+        if dto.dimension_separator != "/" and dto.dimension_separator != ".":
+            return ValueError(f"Bad zarr dimension separator: {dto.dimension_separator}")
+        dtype = np.dtype(dto.dtype)
+        c_axiskeys = dto.c_axiskeys_on_disk
+        try:
+            metadata = ZarrArrayMetadata(
+                zarr_format=dto.zarr_format,
+                shape=dto.interval.to_interval5d().shape,
+                chunk_shape=dto.tile_shape.to_shape5d(),
+                c_axiskeys=c_axiskeys,
+                dtype=dtype,
+                compressor=N5Compressor.create_from_dto(dto.compressor),
+                fill_value=dtype.type(dto.fill_value),
+                byte_order="<" if dto.endian == "little" else ">",
+                order=dto.order,
+                chunk_key_encoding=dto.chunk_key_encoding,
+                dimension_separator=dto.dimension_separator,
+                chunk_checksum=dto.chunk_checksum,
+                shard_shape=None if dto.shard_shape is None else dto.shard_shape.to_shape5d(),
+                shard_index_location=dto.shard_index_location,
+                shard_index_checksum=dto.shard_index_checksum,
+            )
+        except Exception as e:
+            return e
+        return ZarrDataSource(
+            filesystem=fs_result,
+            path=PurePosixPath(dto.path),
+            metadata=metadata,
+            spatial_resolution=dto.spatial_resolution,
+        )
+
+    def to_dto(self) -> ZarrDataSourceDto:
+        return ZarrDataSourceDto(
+            url=self.url.to_dto(),
+            filesystem=self.filesystem.to_dto(),
+            path=self.path.as_posix(),
+            interval=Interval5DDto.from_interval5d(self.interval),
+            tile_shape=Shape5DDto.from_shape5d(self.tile_shape),
+            spatial_resolution=self.spatial_resolution,
+            dtype=dtype_to_dto(self.dtype),
+            c_axiskeys_on_disk=self.c_axiskeys_on_disk,
+            zarr_format=self.metadata.zarr_format,
+            compressor=self.metadata.compressor.to_dto(),
+            fill_value=str(self.metadata.fill_value),
+            endian="little" if self.metadata.byte_order == "<" else "big",
+            order=self.metadata.order,
+            chunk_key_encoding=self.metadata.chunk_key_encoding,
+            dimension_separator=self.metadata.dimension_separator,
+            chunk_checksum=self.metadata.chunk_checksum,
+            shard_shape=None if self.metadata.shard_shape is None else Shape5DDto.from_shape5d(self.metadata.shard_shape),
+            shard_index_location=self.metadata.shard_index_location,
+            shard_index_checksum=self.metadata.shard_index_checksum,
+        )
+
+    @property
+    def url(self) -> Url:
+        return super().url.updated_with(datascheme="zarr")
+
+    def __hash__(self) -> int:
+        return hash((self.url, self.interval))
+
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (*super()._get_content_key_parts(), self.metadata.file_shape, self.metadata.compressor.__class__)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ZarrDataSource) and
+            super().__eq__(other) and
+            self.metadata == other.metadata
+        )
+
+    @global_cache
+    def get_shard_index(self, shard_key: str) -> "np.ndarray[Any, Any] | None":
+        """The (offset, nbytes) of each inner chunk of a shard, or None if the shard was never written.
+
+        Indices are cached so that reading each inner chunk costs a single ranged read
+        """
+        index_nbytes = self.metadata.shard_index_nbytes
+        read_result = self.filesystem.read_file(
+            self.path / shard_key,
+            offset=0 if self.metadata.shard_index_location == "start" else -index_nbytes,
+            num_bytes=index_nbytes,
+        )
+        if isinstance(read_result, FsFileNotFoundException):
+            return None
+        if isinstance(read_result, Exception):
+            raise read_result #FIXME: return instead
+        return self.metadata.decode_shard_index(read_result)
+
+    def _get_tile(self, tile: Interval5D) -> Array5D:
+        file_key = self.metadata.get_file_key(tile)
+        if self.metadata.shard_shape is None:
+            read_result = self.filesystem.read_file_as_buffer(self.path / file_key)
+        else:
+            shard_index = self.get_shard_index(file_key.as_posix())
+            if shard_index is None:
+                return Array5D.allocate(interval=tile, dtype=self.dtype, value=self.metadata.fill_value)
+            chunk_offset, chunk_nbytes = (int(entry) for entry in shard_index[self.metadata.get_chunk_index_in_shard(tile)])
+            if chunk_offset == SHARD_INDEX_MISSING_CHUNK:
+                return Array5D.allocate(interval=tile, dtype=self.dtype, value=self.metadata.fill_value)
+            read_result = self.filesystem.read_file_as_buffer(self.path / file_key, offset=chunk_offset, num_bytes=chunk_nbytes)
+        if isinstance(read_result, FsFileNotFoundException):
+            return Array5D.allocate(interval=tile, dtype=self.dtype, value=self.metadata.fill_value)
+        if isinstance(read_result, Exception):
+            raise read_result #FIXME: return instead
+        return self.metadata.decode_chunk(read_result, tile=tile)
@@ -0,0 +1,538 @@
+from dataclasses import dataclass
+from typing import Any, List, Literal, Mapping, Optional, Sequence, Tuple
+from pathlib import PurePosixPath
+import json
+import math
+
+import numpy as np
+
+from ndstructs.point5D import Interval5D, Shape5D
+from ndstructs.array5D import Array5D
+from ndstructs.utils.json_serializable import (
+    JsonObject, JsonValue, ensureJsonArray, ensureJsonInt, ensureJsonObject, ensureJsonString
+)
+
+from webilastik.datasource import guess_axiskeys
+from webilastik.datasource.n5_attributes import (
+    BloscCompressor, Bzip2Compressor, GzipCompressor, N5Compressor, RawCompressor, XzCompressor, ZstdCompressor
+)
+from webilastik.datasource.n5_datasource import decode_n5_block_data
+from webilastik.filesystem import FsFileNotFoundException, IFilesystem
+from webilastik.serialization.json_serialization import parse_json
+
+
+ZarrFormat = Literal[2, 3]
+ZarrByteOrder = Literal["<", ">"]
+ZarrOrder = Literal["C", "F"]
+ZarrChunkKeyEncoding = Literal["default", "v2"]
+ZarrDimensionSeparator = Literal["/", "."]
+ZarrShardIndexLocation = Literal["start", "end"]
+
+_BLOSC_SHUFFLE_NAMES = ("noshuffle", "shuffle", "bitshuffle")
+_CRC32C_NBYTES = 4
+# offset and nbytes of an inner chunk that isn't stored in its shard
+SHARD_INDEX_MISSING_CHUNK = 2 ** 64 - 1
+
+
+def _parse_v2_compressor(value: JsonValue, typesize: int) -> N5Compressor:
+    if value is None:
+        return RawCompressor()
+    value_obj = ensureJsonObject(value)
+    codec_id = ensureJsonString(value_obj.get("id"))
+    if codec_id == "gzip":
+        return GzipCompressor(level=ensureJsonInt(value_obj.get("level", 1)))
+    if codec_id == "zstd":
+        return ZstdCompressor(level=ensureJsonInt(value_obj.get("level", 3)))
+    if codec_id == "bz2":
+        return Bzip2Compressor(compressionLevel=ensureJsonInt(value_obj.get("level", 9)))
+    if codec_id == "lzma" and value_obj.get("format", 1) == 1 and value_obj.get("filters") is None:
+        preset = value_obj.get("preset")
+        return XzCompressor(preset=6 if preset is None else ensureJsonInt(preset))
+    if codec_id == "blosc":
+        shuffle = ensureJsonInt(value_obj.get("shuffle", 1))
+        if shuffle == -1: # numcodecs' AUTOSHUFFLE
+            shuffle = 2 if typesize == 1 else 1
+        return BloscCompressor(
+            cname=ensureJsonString(value_obj.get("cname", "lz4")),
+            clevel=ensureJsonInt(value_obj.get("clevel", 5)),
+            shuffle=shuffle,
+            blocksize=ensureJsonInt(value_obj.get("blocksize", 0)),
+        )
+    raise ValueError(f"Unsupported zarr v2 compressor: {json.dumps(value)}")
+
+def _compressor_to_v2_json(compressor: N5Compressor) -> JsonValue:
+    if isinstance(compressor, RawCompressor):
+        return None
+    if isinstance(compressor, GzipCompressor):
+        return {"id": "gzip", "level": compressor.level}
+    if isinstance(compressor, ZstdCompressor):
+        return {"id": "zstd", "level": compressor.level}
+    if isinstance(compressor, Bzip2Compressor):
+        return {"id": "bz2", "level": compressor.compressionLevel}
+    if isinstance(compressor, XzCompressor):
+        return {"id": "lzma", "format": 1, "check": -1, "preset": compressor.preset, "filters": None}
+    if isinstance(compressor, BloscCompressor):
+        return {
+            "id": "blosc",
+            "cname": compressor.cname,
+            "clevel": compressor.clevel,
+            "shuffle": compressor.shuffle,
+            "blocksize": compressor.blocksize,
+        }
+    raise ValueError(f"{compressor.__class__.__name__} can't be used in zarr arrays")
+
+def _parse_v3_compressor(name: str, configuration: JsonObject) -> "N5Compressor | None":
+    if name == "gzip":
+        return GzipCompressor(level=ensureJsonInt(configuration.get("level", 1)))
+    if name == "zstd":
+        return ZstdCompressor(level=ensureJsonInt(configuration.get("level", 3)))
+    if name == "blosc":
+        return BloscCompressor(
+            cname=ensureJsonString(configuration.get("cname", "lz4")),
+            clevel=ensureJsonInt(configuration.get("clevel", 5)),
+            shuffle=_BLOSC_SHUFFLE_NAMES.index(ensureJsonString(configuration.get("shuffle", "noshuffle"))),
+            blocksize=ensureJsonInt(configuration.get("blocksize", 0)),
+        )
+    return None
+
+def _compressor_to_v3_json(compressor: N5Compressor, typesize: int) -> Tuple[JsonObject, ...]:
+    if isinstance(compressor, RawCompressor):
+        return ()
+    if isinstance(compressor, GzipCompressor):
+        return ({"name": "gzip", "configuration": {"level": compressor.level}},)
+    if isinstance(compressor, ZstdCompressor):
+        return ({"name": "zstd", "configuration": {"level": compressor.level, "checksum": False}},)
+    if isinstance(compressor, BloscCompressor):
+        return ({"name": "blosc", "configuration": {
+            "cname": compressor.cname,
+            "clevel": compressor.clevel,
+            "shuffle": _BLOSC_SHUFFLE_NAMES[compressor.shuffle],
+            "typesize": typesize,
+            "blocksize": compressor.blocksize,
+        }},)
+    raise ValueError(f"{compressor.__class__.__name__} can't be used in zarr v3 arrays")
+
+
+@dataclass
+class _ZarrV3Codecs:
+    order: ZarrOrder
+    byte_order: ZarrByteOrder
+    compressor: N5Compressor
+    checksum: bool
+    sharding: "JsonObject | None"
+
+    @classmethod
+    def parse(cls, codecs: JsonValue, ndim: int) -> "_ZarrV3Codecs":
+        order: ZarrOrder = "C"
+        byte_order: ZarrByteOrder = "<"
+        compressor: N5Compressor = RawCompressor()
+        checksum = False
+        sharding: "JsonObject | None" = None
+        for codec in ensureJsonArray(codecs):
+            codec_obj = ensureJsonObject(codec)
+            name = ensureJsonString(codec_obj.get("name"))
+            configuration = ensureJsonObject(codec_obj.get("configuration", {}))
+            if checksum:
+                raise ValueError(f"Unsupported zarr codec after crc32c: {name}")
+            if name == "transpose":
+                transpose_order = tuple(ensureJsonInt(axis) for axis in ensureJsonArray(configuration.get("order")))
+                if transpose_order == tuple(reversed(range(ndim))):
+                    order = "F"
+                elif transpose_order != tuple(range(ndim)):
+                    raise ValueError(f"Unsupported zarr transpose order: {transpose_order}")
+            elif name == "bytes":
+                byte_order = ">" if configuration.get("endian", "little") == "big" else "<"
+            elif name == "sharding_indexed":
+                sharding = configuration
+            elif name == "crc32c":
+                checksum = True
+            else:
+                parsed_compressor = _parse_v3_compressor(name, configuration)
+                if parsed_compressor is None or not isinstance(compressor, RawCompressor):
+                    raise ValueError(f"Unsupported zarr codec: {json.dumps(codec_obj)}")
+                compressor = parsed_compressor
+        return _ZarrV3Codecs(order=order, byte_order=byte_order, compressor=compressor, checksum=checksum, sharding=sharding)
+
+    def to_json_value(self, ndim: int, typesize: int) -> Tuple[JsonObject, ...]:
+        transpose: Tuple[JsonObject, ...] = ()
+        if self.order == "F":
+            transpose = ({"name": "transpose", "configuration": {"order": tuple(reversed(range(ndim)))}},)
+        endian = "big" if self.byte_order == ">" else "little"
+        checksum: Tuple[JsonObject, ...] = ({"name": "crc32c"},) if self.checksum else ()
+        return (
+            *transpose,
+            {"name": "bytes", "configuration": {"endian": endian}},
+            *_compressor_to_v3_json(self.compressor, typesize=typesize),
+            *checksum,
+        )
+
+
+def _get_c_axiskeys(dimension_names: JsonValue, ndim: int) -> str:
+    if dimension_names is not None:
+        names = [ensureJsonString(name).lower() for name in ensureJsonArray(dimension_names)]
+        if len(names) == ndim and len(set(names)) == ndim and all(len(n) == 1 and n in "tzyxc" for n in names):
+            return "".join(names)
+    if ndim < 1 or ndim > 5:
+        raise ValueError(f"Can't guess the axes of a zarr array with {ndim} dimensions")
+    return guess_axiskeys(tuple(range(ndim)))
+
+def _parse_fill_value(value: JsonValue, dtype: "np.dtype[Any]") -> Any:
+    if value is None:
+        return dtype.type(0)
+    if isinstance(value, str):
+        special_floats = {"NaN": "nan", "Infinity": "inf", "-Infinity": "-inf"}
+        if value not in special_floats:
+            raise ValueError(f"Unsupported zarr fill value: {value}")
+        return dtype.type(special_floats[value])
+    if isinstance(value, (bool, int, float)):
+        return dtype.type(value)
+    raise ValueError(f"Unsupported zarr fill value: {json.dumps(value)}")
+
+def _fill_value_to_json(fill_value: Any) -> JsonValue:
+    if isinstance(fill_value, np.bool_):
+        return bool(fill_value)
+    if isinstance(fill_value, np.floating):
+        if np.isnan(fill_value):
+            return "NaN"
+        if np.isinf(fill_value):
+            return "Infinity" if fill_value > 0 else "-Infinity"
+        return float(fill_value)
+    return int(fill_value)
+
+def load_zarr_json(filesystem: IFilesystem, path: PurePosixPath) -> "JsonObject | FsFileNotFoundException | Exception":
+    "Loads one of the JSON files (e.g. 'zarr.json', '.zarray' or '.zattrs') in which zarr keeps its metadata"
+    read_result = filesystem.read_file(path)
+    if isinstance(read_result, Exception):
+        return read_result
+    json_result = parse_json(read_result)
+    if isinstance(json_result, Exception):
+        return json_result
+    try:
+        return ensureJsonObject(json_result)
+    except Exception as e:
+        return e
+
+
+class ZarrArrayMetadata:
+    """The metadata of a zarr array. Like everywhere else in ndstructs, c_axiskeys are C-ordered.
+
+    In sharded arrays, 'chunk_shape' is the shape of the inner chunks (i.e. the smallest unit that can be read),
+    and 'shard_shape' is the shape of each stored shard, which is what must be written all at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        zarr_format: ZarrFormat,
+        shape: Shape5D,
+        chunk_shape: Shape5D,
+        c_axiskeys: str,
+        dtype: "np.dtype[Any]",
+        compressor: N5Compressor,
+        fill_value: Any = 0,
+        byte_order: ZarrByteOrder = "<",
+        order: ZarrOrder = "C",
+        chunk_key_encoding: ZarrChunkKeyEncoding = "default",
+        dimension_separator: ZarrDimensionSeparator = "/",
+        chunk_checksum: bool = False,
+        shard_shape: Optional[Shape5D] = None,
+        shard_index_location: ZarrShardIndexLocation = "end",
+        shard_index_checksum: bool = False,
+    ):
+        assert shard_shape is None or zarr_format == 3, "Only zarr v3 arrays can be sharded"
+        self.zarr_format: ZarrFormat = zarr_format
+        self.shape = shape
+        self.chunk_shape = chunk_shape
+        self.c_axiskeys = c_axiskeys
+        self.dtype: "np.dtype[Any]" = dtype.newbyteorder("=")
+        self.compressor = compressor
+        self.fill_value = self.dtype.type(fill_value)
+        self.byte_order: ZarrByteOrder = byte_order
+        self.order: ZarrOrder = order
+        self.chunk_key_encoding: ZarrChunkKeyEncoding = chunk_key_encoding
+        self.dimension_separator: ZarrDimensionSeparator = dimension_separator
+        self.chunk_checksum = chunk_checksum
+        self.shard_shape = shard_shape
+        self.shard_index_location: ZarrShardIndexLocation = shard_index_location
+        self.shard_index_checksum = shard_index_checksum
+        self.interval = self.shape.to_interval5d()
+
+        self.file_shape = self.shard_shape or self.chunk_shape
+        """the shape of the region stored in each file, i.e. of each shard or, if the array isn't sharded, of each chunk"""
+        if self.shard_shape is None:
+            self.chunks_per_shard: Tuple[int, ...] = tuple(1 for _ in self.c_axiskeys)
+        else:
+            self.chunks_per_shard = tuple(
+                shard_len // chunk_len
+                for shard_len, chunk_len in zip(self.shard_shape.to_tuple(c_axiskeys), self.chunk_shape.to_tuple(c_axiskeys))
+            )
+        self.shard_index_nbytes = math.prod(self.chunks_per_shard) * 16 + (_CRC32C_NBYTES if shard_index_checksum else 0)
+        super().__init__()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ZarrArrayMetadata) and self.to_json_files() == other.to_json_files()
+
+    def _get_grid_coords(self, tile: Interval5D, grid_shape: Shape5D) -> Tuple[int, ...]:
+        tile_offset = tile.translated(-self.interval.start).start.to_tuple(self.c_axiskeys)
+        return tuple(offset // length for offset, length in zip(tile_offset, grid_shape.to_tuple(self.c_axiskeys)))
+
+    def get_file_key(self, tile: Interval5D) -> PurePosixPath:
+        "The path, relative to the array, of the file (i.e. the chunk or the shard) holding 'tile'"
+        coords = [str(coord) for coord in self._get_grid_coords(tile, self.file_shape)]
+        if self.chunk_key_encoding == "default":
+            return PurePosixPath(self.dimension_separator.join(["c", *coords]))
+        return PurePosixPath(self.dimension_separator.join(coords) or "0")
+
+    def get_chunk_index_in_shard(self, tile: Interval5D) -> int:
+        "The position of the inner chunk 'tile' in the index of its shard"
+        shard_coords = self._get_grid_coords(tile, self.file_shape)
+        chunk_coords = self._get_grid_coords(tile, self.chunk_shape)
+        return int(np.ravel_multi_index(
+            tuple(chunk - shard * per_shard for chunk, shard, per_shard in zip(chunk_coords, shard_coords, self.chunks_per_shard)),
+            self.chunks_per_shard,
+        ))
+
+    def decode_chunk(self, raw_chunk: "bytes | memoryview", tile: Interval5D) -> Array5D:
+        """Decodes the stored chunk containing 'tile'. Zarr stores chunks at full size, even at the edges of the array"""
+        chunk_shape = self.chunk_shape.to_tuple(self.c_axiskeys)
+        if self.chunk_checksum:
+            raw_chunk = memoryview(raw_chunk)[:-_CRC32C_NBYTES]
+        flat_data = decode_n5_block_data(
+            raw_chunk,
+            num_elements=math.prod(chunk_shape),
+            dtype=self.dtype,
+            compression=self.compressor,
+            byte_order=self.byte_order,
+        )
+        chunk_data = flat_data.reshape(chunk_shape, order=self.order)
+        tile_slices = tuple(slice(0, length) for length in tile.shape.to_tuple(self.c_axiskeys))
+        return Array5D(chunk_data[tile_slices], axiskeys=self.c_axiskeys, location=tile.start)
+
+    def encode_chunk(self, data: Array5D) -> "bytes | memoryview":
+        if self.chunk_checksum:
+            raise ValueError("Writing checksummed zarr chunks is not supported")
+        chunk_shape = self.chunk_shape.to_tuple(self.c_axiskeys)
+        disk_dtype = self.dtype.newbyteorder(self.byte_order)
+        raw_data: "np.ndarray[Any, Any]" = data.raw(self.c_axiskeys)
+        if raw_data.shape == chunk_shape:
+            # only copies if the data isn't already laid out (and byte-ordered) like on disk
+            chunk_data: "np.ndarray[Any, Any]" = np.asarray(raw_data, dtype=disk_dtype, order=self.order)
+        else:
+            # chunks at the edges of the array are padded up to the full chunk shape
+            chunk_data = np.full(chunk_shape, self.fill_value, dtype=disk_dtype, order=self.order)
+            chunk_data[tuple(slice(0, length) for length in raw_data.shape)] = raw_data
+        return self.compressor.compress(
+            memoryview(chunk_data.ravel(order=self.order).view(np.uint8)), typesize=disk_dtype.itemsize
+        )
+
+    def is_empty_chunk(self, data: Array5D) -> bool:
+        "Chunks holding nothing but the fill value don't need to be stored in shards"
+        return bool(np.all(data.raw(self.c_axiskeys) == self.fill_value))
+
+    def decode_shard_index(self, raw_index: "bytes | memoryview") -> "np.ndarray[Any, Any]":
+        "The (offset, nbytes) of each inner chunk of a shard, in C order"
+        num_chunks = math.prod(self.chunks_per_shard)
+        return np.frombuffer(raw_index, dtype="<u8", count=num_chunks * 2).reshape(num_chunks, 2)
+
+    def encode_shard(self, chunks: Sequence["bytes | memoryview | None"]) -> List["bytes | memoryview"]:
+        """The contents of a shard with the given encoded inner chunks (in C order, and None where missing)"""
+        if self.shard_index_checksum:
+            raise ValueError("Writing checksummed zarr shard indices is not supported")
+        index: "np.ndarray[Any, Any]" = np.full((len(chunks), 2), SHARD_INDEX_MISSING_CHUNK, dtype="<u8")
+        offset = self.shard_index_nbytes if self.shard_index_location == "start" else 0
+        stored_chunks: List["bytes | memoryview"] = []
+        for chunk_index, chunk in enumerate(chunks):
+            if chunk is None:
+                continue
+            chunk_nbytes = memoryview(chunk).nbytes
+            index[chunk_index] = (offset, chunk_nbytes)
+            offset += chunk_nbytes
+            stored_chunks.append(chunk)
+        if self.shard_index_location == "start":
+            return [index.tobytes(), *stored_chunks]
+        return [*stored_chunks, index.tobytes()]
+
+    def to_json_files(self) -> Mapping[str, JsonObject]:
+        "The contents of the metadata files of this array, by file name"
+        shape = self.shape.to_tuple(self.c_axiskeys)
+        if self.zarr_format == 2:
+            return {
+                ".zarray": {
+                    "zarr_format": 2,
+                    "shape": shape,
+                    "chunks": self.chunk_shape.to_tuple(self.c_axiskeys),
+                    "dtype": self.dtype.newbyteorder(self.byte_order).str,
+                    "compressor": _compressor_to_v2_json(self.compressor),
+                    "fill_value": _fill_value_to_json(self.fill_value),
+                    "order": self.order,
+                    "filters": None,
+                    "dimension_separator": self.dimension_separator,
+                },
+                ".zattrs": {"_ARRAY_DIMENSIONS": tuple(self.c_axiskeys)},
+            }
+
+        codecs = _ZarrV3Codecs(
+            order=self.order, byte_order=self.byte_order, compressor=self.compressor, checksum=self.chunk_checksum, sharding=None
+        ).to_json_value(ndim=len(shape), typesize=self.dtype.itemsize)
+        if self.shard_shape is not None:
+            index_codecs = _ZarrV3Codecs(
+                order="C", byte_order="<", compressor=RawCompressor(), checksum=self.shard_index_checksum, sharding=None
+            ).to_json_value(ndim=len(shape) + 1, typesize=8)
+            codecs = ({"name": "sharding_indexed", "configuration": {
+                "chunk_shape": self.chunk_shape.to_tuple(self.c_axiskeys),
+                "codecs": codecs,
+                "index_codecs": index_codecs,
+                "index_location": self.shard_index_location,
+            }},)
+        return {
+            "zarr.json": {
+                "zarr_format": 3,
+                "node_type": "array",
+                "shape": shape,
+                "data_type": self.dtype.name,
+                "chunk_grid": {"name": "regular", "configuration": {"chunk_shape": self.file_shape.to_tuple(self.c_axiskeys)}},
+                "chunk_key_encoding": {"name": self.chunk_key_encoding, "configuration": {"separator": self.dimension_separator}},
+                "fill_value": _fill_value_to_json(self.fill_value),
+                "codecs": codecs,
+                "dimension_names": tuple(self.c_axiskeys),
+                "attributes": {},
+            }
+        }
+
+    @classmethod
+    def from_v2_json(
+        cls, zarray: JsonObject, zattrs: "JsonObject | None" = None, c_axiskeys: Optional[str] = None
+    ) -> "ZarrArrayMetadata | Exception":
+        "'c_axiskeys' overrides the axes in the '_ARRAY_DIMENSIONS' attribute, e.g. with those of OME-Zarr multiscales"
+        try:
+            if zarray.get("filters") is not None:
+                return ValueError(f"Unsupported zarr filters: {json.dumps(zarray.get('filters'))}")
+            raw_shape = tuple(ensureJsonInt(length) for length in ensureJsonArray(zarray.get("shape")))
+            c_axiskeys = c_axiskeys or _get_c_axiskeys((zattrs or {}).get("_ARRAY_DIMENSIONS"), ndim=len(raw_shape))
+            disk_dtype: "np.dtype[Any]" = np.dtype(ensureJsonString(zarray.get("dtype")))
+            order = ensureJsonString(zarray.get("order", "C"))
+            dimension_separator = ensureJsonString(zarray.get("dimension_separator", "."))
+            if order != "C" and order != "F":
+                return ValueError(f"Bad zarr order: {order}")
+            if dimension_separator != "/" and dimension_separator != ".":
+                return ValueError(f"Bad zarr dimension separator: {dimension_separator}")
+            return ZarrArrayMetadata(
+                zarr_format=2,
+                shape=Shape5D.create(raw_shape=raw_shape, axiskeys=c_axiskeys),
+                chunk_shape=Shape5D.create(
+                    raw_shape=tuple(ensureJsonInt(length) for length in ensureJsonArray(zarray.get("chunks"))), axiskeys=c_axiskeys
+                ),
+                c_axiskeys=c_axiskeys,
+                dtype=disk_dtype,
+                compressor=_parse_v2_compressor(zarray.get("compressor"), typesize=disk_dtype.itemsize),
+                fill_value=_parse_fill_value(zarray.get("fill_value"), disk_dtype),
+                byte_order="<" if disk_dtype.newbyteorder("<") == disk_dtype else ">",
+                order=order,
+                chunk_key_encoding="v2",
+                dimension_separator=dimension_separator,
+            )
+        except Exception as e:
+            return e
+
+    @classmethod
+    def from_v3_json(cls, value: JsonObject, c_axiskeys: Optional[str] = None) -> "ZarrArrayMetadata | Exception":
+        "'c_axiskeys' overrides the axes in 'dimension_names', e.g. with those of OME-Zarr multiscales"
+        try:
+            if value.get("node_type") != "array":
+                return ValueError(f"Not a zarr array: {json.dumps(value)}")
+            raw_shape = tuple(ensureJsonInt(length) for length in ensureJsonArray(value.get("shape")))
+            c_axiskeys = c_axiskeys or _get_c_axiskeys(value.get("dimension_names"), ndim=len(raw_shape))
+            dtype: "np.dtype[Any]" = np.dtype(ensureJsonString(value.get("data_type")))
+
+            chunk_grid = ensureJsonObject(value.get("chunk_grid"))
+            if chunk_grid.get("name") != "regular":
+                return ValueError(f"Unsupported zarr chunk grid: {json.dumps(chunk_grid)}")
+            file_shape = Shape5D.create(
+                raw_shape=tuple(
+                    ensureJsonInt(length)
+                    for length in ensureJsonArray(ensureJsonObject(chunk_grid.get("configuration")).get("chunk_shape"))
+                ),
+                axiskeys=c_axiskeys,
+            )
+            chunk_key_encoding = ensureJsonObject(value.get("chunk_key_encoding", {"name": "default"}))
+            chunk_key_encoding_name = ensureJsonString(chunk_key_encoding.get("name"))
+            dimension_separator = ensureJsonString(
+                ensureJsonObject(chunk_key_encoding.get("configuration", {})).get(
+                    "separator", "/" if chunk_key_encoding_name == "default" else "."
+                )
+            )
+            if chunk_key_encoding_name != "default" and chunk_key_encoding_name != "v2":
+                return ValueError(f"Unsupported zarr chunk key encoding: {chunk_key_encoding_name}")
+            if dimension_separator != "/" and dimension_separator != ".":
+                return ValueError(f"Bad zarr chunk key separator: {dimension_separator}")
+
+            codecs = _ZarrV3Codecs.parse(value.get("codecs"), ndim=len(raw_shape))
+            shard_shape: Optional[Shape5D] = None
+            chunk_shape = file_shape
+            index_location: ZarrShardIndexLocation = "end"
+            index_checksum = False
+            if codecs.sharding is not None:
+                sharding = codecs.sharding
+                shard_shape = file_shape
+                chunk_shape = Shape5D.create(
+                    raw_shape=tuple(ensureJsonInt(length) for length in ensureJsonArray(sharding.get("chunk_shape"))),
+                    axiskeys=c_axiskeys,
+                )
+                if any(s % c != 0 for s, c in zip(shard_shape.to_tuple(c_axiskeys), chunk_shape.to_tuple(c_axiskeys))):
+                    return ValueError(f"Shard shape {shard_shape} is not a multiple of the chunk shape {chunk_shape}")
+                codecs = _ZarrV3Codecs.parse(sharding.get("codecs"), ndim=len(raw_shape))
+                if codecs.sharding is not None:
+                    return ValueError("Nested zarr sharding is not supported")
+                index_codecs = _ZarrV3Codecs.parse(
+                    sharding.get("index_codecs", ({"name": "bytes", "configuration": {"endian": "little"}}, {"name": "crc32c"})),
+                    ndim=len(raw_shape) + 1,
+                )
+                if index_codecs.byte_order != "<" or not isinstance(index_codecs.compressor, RawCompressor) or index_codecs.order != "C":
+                    return ValueError(f"Unsupported zarr shard index codecs: {json.dumps(sharding.get('index_codecs'))}")
+                index_checksum = index_codecs.checksum
+                raw_index_location = ensureJsonString(sharding.get("index_location", "end"))
+                if raw_index_location != "start" and raw_index_location != "end":
+                    return ValueError(f"Bad zarr shard index location: {raw_index_location}")
+                index_location = raw_index_location
+
+            return ZarrArrayMetadata(
+                zarr_format=3,
+                shape=Shape5D.create(raw_shape=raw_shape, axiskeys=c_axiskeys),
+                chunk_shape=chunk_shape,
+                c_axiskeys=c_axiskeys,
+                dtype=dtype,
+                compressor=codecs.compressor,
+                fill_value=_parse_fill_value(value.get("fill_value"), dtype),
+                byte_order=codecs.byte_order,
+                order=codecs.order,
+                chunk_key_encoding=chunk_key_encoding_name,
+                dimension_separator=dimension_separator,
+                chunk_checksum=codecs.checksum,
+                shard_shape=shard_shape,
+                shard_index_location=index_location,
+                shard_index_checksum=index_checksum,
+            )
+        except Exception as e:
+            return e
+
+    @classmethod
+    def try_load(
+        cls, filesystem: IFilesystem, path: PurePosixPath, c_axiskeys: Optional[str] = None
+    ) -> "ZarrArrayMetadata | FsFileNotFoundException | Exception":
+        "Loads the metadata of the (v3 or v2) zarr array at 'path'"
+        zarr_json_result = load_zarr_json(filesystem, path / "zarr.json")
+        if not isinstance(zarr_json_result, FsFileNotFoundException):
+            if isinstance(zarr_json_result, Exception):
+                return zarr_json_result
+            return ZarrArrayMetadata.from_v3_json(zarr_json_result, c_axiskeys=c_axiskeys)
+
+        zarray_result = load_zarr_json(filesystem, path / ".zarray")
+        if isinstance(zarray_result, Exception):
+            return zarray_result
+        zattrs_result = load_zarr_json(filesystem, path / ".zattrs")
+        if isinstance(zattrs_result, FsFileNotFoundException):
+            zattrs_result = None
+        elif isinstance(zattrs_result, Exception):
+            return zattrs_result
+        return ZarrArrayMetadata.from_v2_json(zarray_result, zattrs=zattrs_result, c_axiskeys=c_axiskeys)
+
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from functools import cached_property
 from typing import Any, Dict, Iterable, Protocol
 from concurrent.futures import Future
 
@@ -9,6 +10,7 @@ from ndstructs.array5D import Array5D
 from webilastik.serialization.json_serialization import IJsonable
 from webilastik.datasource import DataSource, DataRoi
 from webilastik.operator import Operator
+from webilastik.caching import make_content_key
 from executor_getter import get_executor
 
 class FeatureData(Array5D):
@@ -37,11 +39,18 @@ class FeatureExtractor(Operator[DataRoi, FeatureData], Protocol):
         if not self.is_applicable_to(datasource):
             raise FeatureDataMismatchException(self, datasource)
 
+    @cached_property
+    def content_key(self) -> bytes:
+        """A digest of this extractor's parameters (including e.g. its preprocessor), stable across processes"""
+        return make_content_key(
+            self.__class__, *((name, value) for name, value in sorted(self.__dict__.items()) if name != "content_key")
+        )
+
     def __hash__(self):
-        return hash((self.__class__, tuple(self.__dict__.values())))
+        return hash(self.content_key)
 
     def __eq__(self, other):
-        return self.__class__ == other.__class__ and self.__dict__ == other.__dict__
+        return self.__class__ == other.__class__ and self.content_key == other.content_key
 
 
 class FeatureExtractorCollection(FeatureExtractor):
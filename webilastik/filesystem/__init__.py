@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import PurePosixPath
+import io
+import os
+import threading
 import typing
-from typing import Sequence, Tuple, List
+from typing import Callable, Iterable, Iterator, Sequence, Tuple, List, TypeVar, Union
 
 from webilastik.server.rpc.dto import BucketFSDto, HttpFsDto, OsfsDto, ZipFsDto, FsDto
 from webilastik.utility.url import Url
@@ -46,6 +50,63 @@ def create_filesystem_from_url(url: Url) -> "Tuple[IFilesystem, PurePosixPath] |
 
     return Exception(f"Could not open filesystem from {url}")
 
+# How many reads are worth having in flight at once against each kind of filesystem. Local disks gain little from
+# more than a handful, while remote stores hide their latency behind many concurrent requests
+_DEFAULT_IO_CONCURRENCY: typing.Dict[str, int] = {
+    "OsFs": 4,
+    "HttpFs": 16,
+    "BucketFs": 16,
+}
+
+def get_io_concurrency(fs: "IFilesystem") -> int:
+    """Number of concurrent reads to issue against 'fs'.
+
+    Can be overridden per filesystem class via e.g. IO_CONCURRENCY_HTTPFS=32
+    """
+    from webilastik.filesystem.zip_fs import ZipFs
+    if isinstance(fs, ZipFs):
+        # members are read via ranged reads into the archive, so they can go as wide as the underlying fs
+        return get_io_concurrency(fs.zip_file_fs)
+    class_name = fs.__class__.__name__
+    override = os.environ.get(f"IO_CONCURRENCY_{class_name.upper()}")
+    if override is not None:
+        return max(1, int(override))
+    return _DEFAULT_IO_CONCURRENCY.get(class_name, 1)
+
+_READ_THREAD_PREFIX = "fs_read_thread_"
+_read_executor_lock = threading.Lock()
+_read_executor: "ThreadPoolExecutor | None" = None
+
+def _get_read_executor() -> ThreadPoolExecutor:
+    global _read_executor
+    with _read_executor_lock:
+        if _read_executor is None:
+            _read_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("FS_READ_THREADS", "64")),
+                thread_name_prefix=_READ_THREAD_PREFIX,
+            )
+        return _read_executor
+
+_ITEM = TypeVar("_ITEM")
+_RESULT = TypeVar("_RESULT")
+
+def run_concurrently(items: Sequence[_ITEM], func: Callable[[_ITEM], _RESULT], concurrency: int) -> List[_RESULT]:
+    """Maps 'func' over 'items' with at most 'concurrency' calls in flight, preserving order.
+
+    Calls made from within the pool itself (e.g. a ZipFs reading from a BucketFs) run serially so that they
+    can't deadlock the pool waiting on each other
+    """
+    if concurrency <= 1 or len(items) <= 1 or threading.current_thread().name.startswith(_READ_THREAD_PREFIX):
+        return [func(item) for item in items]
+    num_workers = min(concurrency, len(items))
+    def run_stride(worker_index: int) -> List[_RESULT]:
+        return [func(item) for item in items[worker_index::num_workers]]
+    strides = list(_get_read_executor().map(run_stride, range(num_workers)))
+    out: List[_RESULT] = []
+    for item_index in range(len(items)):
+        out.append(strides[item_index % num_workers][item_index // num_workers])
+    return out
+
 
 #########################################333
 
@@ -62,15 +123,55 @@ class FsIoException(Exception):
 
 #####################################
 
+# (path, offset, num_bytes), with the same meaning as the arguments of IFilesystem.read_file
+FsRead = Tuple[PurePosixPath, int, "int | None"]
+
+# the contents of a file being created: either a single buffer or an iterable of chunks that get written out one after
+# the other, so that callers never have to join them into a single blob
+FsFileContents = Union[bytes, memoryview, Iterable[Union[bytes, memoryview]]]
+
+def iter_file_contents(contents: FsFileContents) -> Iterator[memoryview]:
+    """Yields the chunks of 'contents' as flat byte views, without copying them"""
+    chunks: Iterable["bytes | memoryview"] = [contents] if isinstance(contents, (bytes, memoryview)) else contents
+    for chunk in chunks:
+        view = memoryview(chunk)
+        yield view if view.ndim == 1 and view.format == "B" else view.cast("B")
+
+def get_file_contents_buffer(contents: FsFileContents) -> "bytes | memoryview":
+    """Returns 'contents' as a single buffer, only copying if it is made of more than one chunk"""
+    if isinstance(contents, bytes):
+        return contents
+    chunks = list(iter_file_contents(contents))
+    if len(chunks) == 1:
+        return chunks[0]
+    return b"".join(chunks)
+
+def make_request_body(contents: FsFileContents) -> "bytes | memoryview | Iterator[memoryview]":
+    """Single buffers are sent as they are (with a Content-Length), while chunked contents are streamed"""
+    if isinstance(contents, (bytes, memoryview)):
+        return get_file_contents_buffer(contents)
+    return iter_file_contents(contents)
+
 class IFilesystem(typing.Protocol):
     def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
         ...
-    def create_file(self, *, path: PurePosixPath, contents: bytes) -> "None | FsIoException":
+    def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
         ...
     def create_directory(self, path: PurePosixPath) -> "None | FsIoException":
         ...
     def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
         ...
+    def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+        """Performs all 'reads', returning their results in the same order.
+
+        Implementations are free to schedule the reads however suits them best, e.g. concurrently
+        """
+        return [self.read_file(path, offset=offset, num_bytes=num_bytes) for path, offset, num_bytes in reads]
+    def read_file_as_buffer(
+        self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None
+    ) -> "bytes | memoryview | FsIoException | FsFileNotFoundException":
+        """Like read_file, but filesystems that can may return a read-only view into the file instead of a copy of it"""
+        return self.read_file(path, offset=offset, num_bytes=num_bytes)
     def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
         ...
     def delete(self, path: PurePosixPath) -> "None | FsIoException":
@@ -95,3 +196,60 @@ class IFilesystem(typing.Protocol):
 class FsDirectoryContents:
     files: List[PurePosixPath]
     directories: List[PurePosixPath]
+
+
+class FsRawFile(io.RawIOBase):
+    """A read-only file over ranged reads of a filesystem, so that parsers only fetch the bytes they look at.
+
+    Wrap it in an io.BufferedReader (see 'open') so that small reads don't each become a request
+    """
+
+    def __init__(self, *, filesystem: IFilesystem, path: PurePosixPath, size: int) -> None:
+        super().__init__()
+        self.filesystem = filesystem
+        self.path = path
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.size + offset
+        else:
+            raise ValueError(f"Bad seek whence: {whence}")
+        return self.position
+
+    def readinto(self, buffer: typing.Any) -> int:
+        out = memoryview(buffer).cast("B")
+        num_bytes = min(len(out), self.size - self.position)
+        if num_bytes <= 0:
+            return 0
+        read_result = self.filesystem.read_file(self.path, offset=self.position, num_bytes=num_bytes)
+        if isinstance(read_result, Exception):
+            raise OSError(str(read_result))
+        out[:len(read_result)] = read_result
+        self.position += len(read_result)
+        return len(read_result)
+
+    @classmethod
+    def open(
+        cls, *, filesystem: IFilesystem, path: PurePosixPath, size: "int | None" = None, buffer_size: int = 64 * 1024
+    ) -> "io.BufferedReader | FsIoException | FsFileNotFoundException":
+        if size is None:
+            size_result = filesystem.get_size(path)
+            if isinstance(size_result, Exception):
+                return size_result
+            size = size_result
+        return io.BufferedReader(cls(filesystem=filesystem, path=path, size=size), buffer_size=buffer_size)
@@ -0,0 +1,266 @@
+# pyright: strict
+
+"""Non-blocking counterparts of the filesystems, for use from within the server's event loop.
+
+Remote filesystems talk to their servers through the server's own aiohttp session (and therefore its connection
+pool), while local (or otherwise blocking) ones have their calls run in a worker thread.
+"""
+
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Literal, Mapping, Tuple
+import asyncio
+import typing
+
+from aiohttp import ClientSession
+
+from webilastik.filesystem import (
+    FsDirectoryContents, FsFileContents, FsFileNotFoundException, FsIoException, IFilesystem, make_request_body
+)
+from webilastik.filesystem.bucket_fs import STALE_OBJECT_URL_STATUSES, BucketFs
+from webilastik.filesystem.http_fs import HttpFs
+from webilastik.utility.request import ErrRequestCompletedAsFailure, async_request, async_request_size
+from webilastik.utility.url import Url
+
+
+class IAsyncFilesystem(typing.Protocol):
+    async def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
+        ...
+    async def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        ...
+    async def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        ...
+    async def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
+        ...
+    async def exists(self, path: PurePosixPath) -> "bool | FsIoException":
+        ...
+    async def delete(self, path: PurePosixPath) -> "None | FsIoException":
+        ...
+
+
+class ThreadedAsyncFs(IAsyncFilesystem):
+    """Runs the calls of a blocking filesystem in a worker thread"""
+
+    def __init__(self, fs: IFilesystem) -> None:
+        self.fs = fs
+        super().__init__()
+
+    async def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
+        return await asyncio.to_thread(self.fs.list_contents, path)
+
+    async def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        return await asyncio.to_thread(lambda: self.fs.create_file(path=path, contents=contents))
+
+    async def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        return await asyncio.to_thread(self.fs.read_file, path, offset, num_bytes)
+
+    async def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
+        return await asyncio.to_thread(self.fs.get_size, path)
+
+    async def exists(self, path: PurePosixPath) -> "bool | FsIoException":
+        return await asyncio.to_thread(self.fs.exists, path)
+
+    async def delete(self, path: PurePosixPath) -> "None | FsIoException":
+        return await asyncio.to_thread(self.fs.delete, path)
+
+
+class AsyncHttpFs(IAsyncFilesystem):
+    def __init__(self, fs: HttpFs, session: ClientSession) -> None:
+        self.fs = fs
+        self.session = session
+        super().__init__()
+
+    async def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
+        return FsIoException("Can't reliably list contents of http dir yet")
+
+    async def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        result = await async_request(session=self.session, method="post", url=self.fs.geturl(path), data=make_request_body(contents))
+        if isinstance(result, Exception):
+            return FsIoException(result)
+
+    async def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        result = await async_request(session=self.session, method="get", url=self.fs.geturl(path), offset=offset, num_bytes=num_bytes)
+        if isinstance(result, ErrRequestCompletedAsFailure) and result.status_code == 404:
+            return FsFileNotFoundException(path)
+        if isinstance(result, Exception):
+            return FsIoException(result)
+        return result[0]
+
+    async def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
+        size_result = await async_request_size(session=self.session, url=self.fs.geturl(path))
+        if isinstance(size_result, ErrRequestCompletedAsFailure) and size_result.status_code == 404:
+            return FsFileNotFoundException(path)
+        if isinstance(size_result, Exception):
+            return FsIoException(size_result)
+        return size_result
+
+    async def exists(self, path: PurePosixPath) -> "bool | FsIoException":
+        size_result = await self.get_size(path)
+        if isinstance(size_result, FsFileNotFoundException):
+            return False
+        if isinstance(size_result, Exception):
+            return size_result
+        return True
+
+    async def delete(self, path: PurePosixPath) -> "None | FsIoException":
+        result = await async_request(session=self.session, method="delete", url=self.fs.geturl(path))
+        if isinstance(result, Exception):
+            return FsIoException(result)
+
+
+class AsyncBucketFs(IAsyncFilesystem):
+    def __init__(self, fs: BucketFs, session: ClientSession) -> None:
+        self.fs = fs
+        self.session = session
+        super().__init__()
+
+    async def _request_from_data_proxy(
+        self, method: Literal["get", "put", "delete"], url: Url, refresh_on_401: bool = True
+    ) -> "Tuple[bytes, Mapping[str, str]] | FsFileNotFoundException | Exception":
+        from webilastik.libebrains.global_user_login import GlobalLogin
+        user_token = GlobalLogin.get_token()
+        response_result = await async_request(
+            session=self.session, method=method, url=url, headers=user_token.as_ebrains_auth_header()
+        )
+        if not isinstance(response_result, ErrRequestCompletedAsFailure):
+            return response_result
+        if response_result.status_code == 404:
+            return FsFileNotFoundException(url.path)
+        if response_result.status_code != 401 or not refresh_on_401:
+            return response_result
+        # refreshing is rare and serialized by GlobalLogin, so it's fine for it to block a worker thread
+        refreshed_token_result = await asyncio.to_thread(GlobalLogin.refresh_token, stale_token=user_token)
+        if isinstance(refreshed_token_result, Exception):
+            return refreshed_token_result
+        return await self._request_from_data_proxy(method=method, url=url, refresh_on_401=False)
+
+    async def get_swift_object_url(self, path: PurePosixPath) -> "Url | FsIoException | FsFileNotFoundException":
+        cached_url = self.fs.get_cached_swift_object_url(path)
+        if cached_url is not None:
+            return cached_url
+        return await self.resolve_swift_object_url(path)
+
+    async def resolve_swift_object_url(self, path: PurePosixPath) -> "Url | FsIoException | FsFileNotFoundException":
+        file_url = self.fs.url.concatpath(path).updated_with(extra_search={"redirect": "false"})
+        data_proxy_response = await self._request_from_data_proxy(method="get", url=file_url)
+        if isinstance(data_proxy_response, FsFileNotFoundException):
+            return FsFileNotFoundException(path)
+        if isinstance(data_proxy_response, Exception):
+            return FsIoException(data_proxy_response)
+        cscs_url_result = self.fs.parse_url_from_data_proxy_response(data_proxy_response[0])
+        if isinstance(cscs_url_result, Exception):
+            return FsIoException(f"Could not parse CSCS object URL (read): {cscs_url_result}")
+        self.fs.cache_swift_object_url(path, cscs_url_result)
+        return cscs_url_result
+
+    async def _get_from_object_url(
+        self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None, method: Literal["get", "head"] = "get"
+    ) -> "Tuple[bytes, Mapping[str, str]] | FsIoException | FsFileNotFoundException":
+        """Requests the object at 'path', retrying once with a fresh url if a cached one was rejected"""
+        object_url = await self.get_swift_object_url(path=path)
+        if isinstance(object_url, Exception):
+            return object_url
+        response = await async_request(session=self.session, method=method, url=object_url, offset=offset, num_bytes=num_bytes)
+        if (
+            isinstance(response, ErrRequestCompletedAsFailure) and
+            response.status_code in STALE_OBJECT_URL_STATUSES and
+            self.fs.invalidate_swift_object_url(path, url=object_url)
+        ):
+            object_url = await self.resolve_swift_object_url(path)
+            if isinstance(object_url, Exception):
+                return object_url
+            response = await async_request(session=self.session, method=method, url=object_url, offset=offset, num_bytes=num_bytes)
+        if isinstance(response, ErrRequestCompletedAsFailure) and response.status_code == 404:
+            return FsFileNotFoundException(path)
+        if isinstance(response, Exception):
+            return FsIoException(response)
+        return response
+
+    async def iter_contents(self, path: PurePosixPath, page_size: int = 500) -> AsyncIterator["FsDirectoryContents | FsIoException"]:
+        marker: "str | None" = None
+        while True:
+            response = await self._request_from_data_proxy(method="get", url=self.fs.get_listing_url(path, page_size=page_size, marker=marker))
+            if isinstance(response, Exception):
+                yield FsIoException(response)
+                return
+            try:
+                page, marker = self.fs.parse_listing_page(response[0], page_size=page_size)
+            except Exception as e:
+                yield FsIoException(e)
+                return
+            yield page
+            if marker is None:
+                return
+
+    async def list_contents(self, path: PurePosixPath, page_size: int = 500) -> "FsDirectoryContents | FsIoException":
+        cached_contents = self.fs.get_cached_listing(path)
+        if cached_contents is not None:
+            return cached_contents
+        contents = FsDirectoryContents(files=[], directories=[])
+        async for page in self.iter_contents(path, page_size=page_size):
+            if isinstance(page, Exception):
+                return page
+            contents.files.extend(page.files)
+            contents.directories.extend(page.directories)
+        self.fs.cache_listing(path, contents)
+        return contents
+
+    async def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        _ = self.fs.invalidate_swift_object_url(path)
+        response = await self._request_from_data_proxy(method="put", url=self.fs.url.concatpath(path))
+        if isinstance(response, Exception):
+            return FsIoException(response)
+        cscs_url_result = self.fs.parse_url_from_data_proxy_response(response[0])
+        if isinstance(cscs_url_result, Exception):
+            return FsIoException(f"Could not parse CSCS object URL (write): {cscs_url_result}")
+        cscs_response = await async_request(session=self.session, method="put", url=cscs_url_result, data=make_request_body(contents))
+        self.fs.invalidate_listings(path)
+        if isinstance(cscs_response, Exception):
+            return FsIoException(cscs_response)
+        return None
+
+    async def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        cscs_response = await self._get_from_object_url(path, offset=offset, num_bytes=num_bytes)
+        if isinstance(cscs_response, Exception):
+            return cscs_response
+        return cscs_response[0]
+
+    async def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
+        cscs_response = await self._get_from_object_url(path, method="head")
+        if isinstance(cscs_response, Exception):
+            return cscs_response
+        try:
+            return int(cscs_response[1]["content-length"])
+        except Exception as e:
+            return FsIoException(e)
+
+    async def exists(self, path: PurePosixPath) -> "bool | FsIoException":
+        object_url_result = await self.get_swift_object_url(path)
+        if not isinstance(object_url_result, Exception):
+            return True
+        if not isinstance(object_url_result, FsFileNotFoundException):
+            return object_url_result
+        async for first_page in self.iter_contents(path, page_size=1):
+            if isinstance(first_page, Exception):
+                return first_page
+            return len(first_page.files) + len(first_page.directories) > 0
+        return False
+
+    async def delete(self, path: PurePosixPath) -> "None | FsIoException":
+        # deleting directories involves waiting for the bucket listing to catch up, which BucketFs already does
+        return await asyncio.to_thread(self.fs.delete, path)
+
+
+def make_async_filesystem(fs: IFilesystem, session: ClientSession) -> IAsyncFilesystem:
+    if isinstance(fs, HttpFs):
+        return AsyncHttpFs(fs=fs, session=session)
+    if isinstance(fs, BucketFs):
+        return AsyncBucketFs(fs=fs, session=session)
+    return ThreadedAsyncFs(fs)
+
+async def transfer_file(
+    *, source_fs: IAsyncFilesystem, source_path: PurePosixPath, target_fs: IAsyncFilesystem, target_path: PurePosixPath
+) -> "None | FsIoException | FsFileNotFoundException":
+    contents = await source_fs.read_file(source_path)
+    if isinstance(contents, Exception):
+        return contents
+    return await target_fs.create_file(path=target_path, contents=contents)
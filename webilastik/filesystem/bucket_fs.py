@@ -1,15 +1,19 @@
 #pyright: strict
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import json
-from typing import Iterator, Literal, Optional, Tuple, List
+from typing import Callable, Dict, Iterator, Literal, Optional, Sequence, Set, Tuple, List, TypeVar
 from pathlib import Path, PurePosixPath
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 from ndstructs.utils.json_serializable import ensureJsonArray, ensureJsonObject, ensureJsonString
 from requests.models import CaseInsensitiveDict
 
-from webilastik.filesystem import IFilesystem, FsIoException, FsFileNotFoundException, FsDirectoryContents
+from webilastik.filesystem import IFilesystem, FsIoException, FsFileNotFoundException, FsDirectoryContents, FsFileContents, FsRead, get_io_concurrency, make_request_body, run_concurrently
 from webilastik.filesystem.http_fs import HttpFs
 from webilastik.filesystem.os_fs import OsFs
 from webilastik.serialization.json_serialization import parse_json
@@ -21,9 +25,134 @@ from webilastik.utility.request import ErrRequestCompletedAsFailure, request_siz
 
 _cscs_session = requests.Session()
 _data_proxy_session = requests.Session()
+# batched reads issue many requests at once, so each of them should find a pooled connection to reuse
+for _session in (_cscs_session, _data_proxy_session):
+    _session.mount("https://", HTTPAdapter(pool_maxsize=64))
 
 logger = Logger()
 
+_T = TypeVar("_T")
+
+class ObjectUrlCache:
+    """Remembers the object URLs that the data-proxy redirects to, so that reads can go straight to the object store.
+
+    Object URLs are signed and expire; their expiry is read from their 'temp_url_expires' parameter if they have
+    one, and otherwise assumed to be 'default_ttl' seconds away. URLs that are about to expire are handed out
+    one last time while a fresh one is resolved in the background, so steady-state reads never wait on the data-proxy
+    """
+
+    def __init__(self, *, max_entries: int = 16 * 1024, default_ttl: float = 60, refresh_margin: float = 30) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, PurePosixPath], Tuple[Url, float]]" = OrderedDict()
+        self._refreshing: Set[Tuple[str, PurePosixPath]] = set()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bucket_fs_url_refresher_")
+        super().__init__()
+
+    def _get_expiry(self, url: Url) -> float:
+        raw_expiry = url.search.get("temp_url_expires")
+        try:
+            return float(raw_expiry) if raw_expiry is not None else time.time() + self.default_ttl
+        except ValueError:
+            return time.time() + self.default_ttl
+
+    def get(self, key: Tuple[str, PurePosixPath], resolve: Callable[[], "Url | Exception"]) -> "Url | None":
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            url, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            needs_refresh = expires_at - now < self.refresh_margin and key not in self._refreshing
+            if needs_refresh:
+                self._refreshing.add(key)
+        if needs_refresh:
+            _ = self._refresher.submit(self._refresh, key, resolve)
+        return url
+
+    def _refresh(self, key: Tuple[str, PurePosixPath], resolve: Callable[[], "Url | Exception"]) -> None:
+        try:
+            _ = resolve() # resolving puts the fresh url in the cache
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def put(self, key: Tuple[str, PurePosixPath], url: Url) -> None:
+        with self._lock:
+            self._entries[key] = (url, self._get_expiry(url))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def invalidate(self, key: Tuple[str, PurePosixPath], url: "Url | None" = None) -> bool:
+        """Drops the entry for 'key' (only if it still points to 'url', if that is given). Returns whether it did"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (url is not None and entry[0] != url):
+                return False
+            del self._entries[key]
+            return True
+
+_object_url_cache = ObjectUrlCache()
+
+
+class ListingCache:
+    """Keeps directory listings for a few seconds, since browsing and exporting tend to list the same prefixes repeatedly.
+
+    Entries are dropped whenever a BucketFs in this process writes to or deletes something that could show up in them
+    """
+
+    def __init__(self, *, ttl: float = 5, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, PurePosixPath], Tuple[FsDirectoryContents, float]]" = OrderedDict()
+        super().__init__()
+
+    def get(self, key: Tuple[str, PurePosixPath]) -> "FsDirectoryContents | None":
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            contents, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            # copies, so callers can't mutate the cached listing
+            return FsDirectoryContents(files=list(contents.files), directories=list(contents.directories))
+
+    def put(self, key: Tuple[str, PurePosixPath], contents: FsDirectoryContents) -> None:
+        with self._lock:
+            self._entries[key] = (
+                FsDirectoryContents(files=list(contents.files), directories=list(contents.directories)),
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def invalidate(self, bucket_name: str, path: PurePosixPath) -> None:
+        """Drops the listings of the ancestors of 'path' (where it or one of its parent dirs shows up), of
+        'path' itself, and of everything under it"""
+        with self._lock:
+            for key in list(self._entries.keys()):
+                listed_bucket, listed_path = key
+                if listed_bucket != bucket_name:
+                    continue
+                if listed_path == path or listed_path in path.parents or path in listed_path.parents:
+                    del self._entries[key]
+
+_listing_cache = ListingCache()
+
+# statuses with which the object store rejects object urls that expired or were revoked earlier than expected
+STALE_OBJECT_URL_STATUSES = (401, 403, 404)
+
 def _requests_from_data_proxy(
     method: Literal["get", "put", "delete"],
     url: Url,
@@ -91,31 +220,100 @@ class BucketFs(IFilesystem):
     def to_dto(self) -> BucketFSDto:
         return BucketFSDto(bucket_name=self.bucket_name)
 
-    def list_contents(self, path: PurePosixPath, limit: Optional[int] = 500) -> "FsDirectoryContents | FsIoException":
-        list_objects_path = self.url.updated_with(extra_search={
+    def get_listing_url(self, path: PurePosixPath, page_size: int = 500, marker: Optional[str] = None) -> Url:
+        extra_search = {
             "delimiter": "/",
             "prefix": "" if path.as_posix() == "/" else path.as_posix().lstrip("/").rstrip("/") + "/",
-            "limit": str(limit)
-        })
-        response = _requests_from_data_proxy(method="get", url=list_objects_path, data=None)
-        if isinstance(response, Exception):
-            return FsIoException(response)
-        payload_obj = ensureJsonObject(json.loads(response[0])) #FIXME: use DTOs everywhere?
+            "limit": str(page_size),
+        }
+        if marker is not None:
+            extra_search["marker"] = marker
+        return self.url.updated_with(extra_search=extra_search)
+
+    @classmethod
+    def parse_listing_page(cls, response_payload: bytes, page_size: int) -> "Tuple[FsDirectoryContents, str | None]":
+        """Parses a page of a listing, returning its contents and the marker of the next page, if there might be one"""
+        payload_obj = ensureJsonObject(json.loads(response_payload)) #FIXME: use DTOs everywhere?
         raw_objects = ensureJsonArray(payload_obj.get("objects"))
 
         files: List[PurePosixPath] = []
         directories: List[PurePosixPath] = []
+        last_name: "str | None" = None
         for raw_obj in raw_objects:
             obj = ensureJsonObject(raw_obj)
             if "subdir" in obj:
-                path = PurePosixPath("/") / ensureJsonString(obj.get("subdir")) #FIXME: Use DTO ?
-                directories.append(path)
+                last_name = ensureJsonString(obj.get("subdir")) #FIXME: Use DTO ?
+                directories.append(PurePosixPath("/") / last_name)
             else:
-                path = PurePosixPath("/") / ensureJsonString(obj.get("name")) #FIXME: Use DTO ?
-                files.append(path)
-        return FsDirectoryContents(files=files, directories=directories)
+                last_name = ensureJsonString(obj.get("name")) #FIXME: Use DTO ?
+                files.append(PurePosixPath("/") / last_name)
+        next_marker = last_name if len(raw_objects) >= page_size else None
+        return (FsDirectoryContents(files=files, directories=directories), next_marker)
+
+    def iter_contents(self, path: PurePosixPath, page_size: int = 500) -> Iterator["FsDirectoryContents | FsIoException"]:
+        """Streams the listing of 'path' one page at a time, bypassing the listing cache"""
+        marker: "str | None" = None
+        while True:
+            response = _requests_from_data_proxy(method="get", url=self.get_listing_url(path, page_size=page_size, marker=marker), data=None)
+            if isinstance(response, Exception):
+                yield FsIoException(response)
+                return
+            try:
+                page, marker = self.parse_listing_page(response[0], page_size=page_size)
+            except Exception as e:
+                yield FsIoException(e)
+                return
+            yield page
+            if marker is None:
+                return
+
+    def get_cached_listing(self, path: PurePosixPath) -> "FsDirectoryContents | None":
+        return _listing_cache.get((self.bucket_name, path))
+
+    def cache_listing(self, path: PurePosixPath, contents: FsDirectoryContents) -> None:
+        _listing_cache.put((self.bucket_name, path), contents)
+
+    def invalidate_listings(self, path: PurePosixPath) -> None:
+        _listing_cache.invalidate(self.bucket_name, path)
+
+    def _fetch_contents(self, path: PurePosixPath, page_size: int = 500) -> "FsDirectoryContents | FsIoException":
+        contents = FsDirectoryContents(files=[], directories=[])
+        for page in self.iter_contents(path, page_size=page_size):
+            if isinstance(page, Exception):
+                return page
+            contents.files.extend(page.files)
+            contents.directories.extend(page.directories)
+        self.cache_listing(path, contents)
+        return contents
 
-    def _parse_url_from_data_proxy_response(self, response_payload: bytes) -> "Url | Exception":
+    def list_contents(self, path: PurePosixPath, page_size: int = 500) -> "FsDirectoryContents | FsIoException":
+        cached_contents = self.get_cached_listing(path)
+        if cached_contents is not None:
+            return cached_contents
+        return self._fetch_contents(path, page_size=page_size)
+
+    def exists(self, path: PurePosixPath) -> "bool | FsIoException":
+        # files are found by asking for their size instead of listing their whole parent dir. The object url is resolved
+        # afresh (warming up the cache for a subsequent read), since a cached one might outlive the object it points to,
+        # and the data-proxy signing an url doesn't mean that there is an object behind it
+        object_url_result = self.resolve_swift_object_url(path)
+        if isinstance(object_url_result, FsIoException):
+            return object_url_result
+        if isinstance(object_url_result, Url):
+            size_result = request_size(session=_cscs_session, url=object_url_result)
+            # any successful response will do, even one without a usable content-length
+            if not isinstance(size_result, (ErrRequestCompletedAsFailure, ErrRequestCrashed)):
+                return True
+            if isinstance(size_result, ErrRequestCrashed) or size_result.status_code != 404:
+                return FsIoException(size_result)
+            _ = self.invalidate_swift_object_url(path, url=object_url_result)
+        # ... while dirs only exist as prefixes, so it's enough to see that anything at all is listed under them
+        first_page = next(self.iter_contents(path, page_size=1))
+        if isinstance(first_page, Exception):
+            return first_page
+        return len(first_page.files) + len(first_page.directories) > 0
+
+    def parse_url_from_data_proxy_response(self, response_payload: bytes) -> "Url | Exception":
         response_json_result = parse_json(response_payload)
         if isinstance(response_json_result, Exception):
             return response_json_result
@@ -127,14 +325,16 @@ class BucketFs(IFilesystem):
             return Exception("Could not parse URL from data proxy response")
         return out_url
 
-    def create_file(self, *, path: PurePosixPath, contents: bytes) -> "None | FsIoException":
+    def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        _ = self.invalidate_swift_object_url(path)
         response = _requests_from_data_proxy(method="put", url=self.url.concatpath(path), data=None)
         if isinstance(response, Exception):
             return FsIoException(response)
-        cscs_url_result = self._parse_url_from_data_proxy_response(response[0])
+        cscs_url_result = self.parse_url_from_data_proxy_response(response[0])
         if isinstance(cscs_url_result, Exception):
             return FsIoException(f"Could not parse CSCS object URL (write): {cscs_url_result}")
-        response = safe_request(session=_cscs_session, method="put", url=cscs_url_result, data=contents)
+        response = safe_request(session=_cscs_session, method="put", url=cscs_url_result, data=make_request_body(contents))
+        self.invalidate_listings(path)
         if isinstance(response, Exception):
             return FsIoException(response)
         return None
@@ -142,32 +342,94 @@ class BucketFs(IFilesystem):
     def create_directory(self, path: PurePosixPath) -> "None | FsIoException":
         return None
 
+    def get_cached_swift_object_url(self, path: PurePosixPath) -> "Url | None":
+        return _object_url_cache.get((self.bucket_name, path), resolve=lambda: self.resolve_swift_object_url(path))
+
+    def cache_swift_object_url(self, path: PurePosixPath, url: Url) -> None:
+        _object_url_cache.put((self.bucket_name, path), url)
+
+    def invalidate_swift_object_url(self, path: PurePosixPath, url: "Url | None" = None) -> bool:
+        return _object_url_cache.invalidate((self.bucket_name, path), url=url)
+
     def get_swift_object_url(self, path: PurePosixPath) -> "Url | FsIoException | FsFileNotFoundException":
+        cached_url = self.get_cached_swift_object_url(path)
+        if cached_url is not None:
+            return cached_url
+        return self.resolve_swift_object_url(path)
+
+    def resolve_swift_object_url(self, path: PurePosixPath) -> "Url | FsIoException | FsFileNotFoundException":
+        """Asks the data-proxy for the object url of 'path', bypassing (but updating) the cache"""
         file_url = self.url.concatpath(path).updated_with(extra_search={"redirect": "false"})
         data_proxy_response = _requests_from_data_proxy(method="get", url=file_url, data=None)
         if isinstance(data_proxy_response, FsFileNotFoundException):
+            _ = self.invalidate_swift_object_url(path)
             return FsFileNotFoundException(path)
         if isinstance(data_proxy_response, Exception):
             return FsIoException(data_proxy_response) # FIXME: pass exception directly into other?
-        cscs_url_result = self._parse_url_from_data_proxy_response(data_proxy_response[0])
+        cscs_url_result = self.parse_url_from_data_proxy_response(data_proxy_response[0])
         if isinstance(cscs_url_result, Exception):
             return FsIoException(f"Could not parse CSCS object URL (read): {cscs_url_result}")
+        self.cache_swift_object_url(path, cscs_url_result)
         return cscs_url_result
 
-    def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None"  = None) -> "bytes | FsIoException | FsFileNotFoundException":
-        cscs_url_result = self.get_swift_object_url(path=path)
-        if isinstance(cscs_url_result, Exception):
-            return cscs_url_result
-        cscs_response = safe_request(session=_cscs_session, method="get", url=cscs_url_result, offset=offset, num_bytes=num_bytes)
+    def _with_object_url(
+        self,
+        path: PurePosixPath,
+        object_url: "Url | FsIoException | FsFileNotFoundException",
+        request: "Callable[[Url], _T | ErrRequestCompletedAsFailure | Exception]",
+    ) -> "_T | ErrRequestCompletedAsFailure | Exception":
+        """Runs 'request' against the object url of 'path', retrying once with a fresh url if a cached one was rejected"""
+        if isinstance(object_url, Exception):
+            return object_url
+        result = request(object_url)
+        if (
+            isinstance(result, ErrRequestCompletedAsFailure) and
+            result.status_code in STALE_OBJECT_URL_STATUSES and
+            self.invalidate_swift_object_url(path, url=object_url)
+        ):
+            fresh_url = self.resolve_swift_object_url(path)
+            if isinstance(fresh_url, Exception):
+                return fresh_url
+            return request(fresh_url)
+        return result
+
+    def _read_object(
+        self, path: PurePosixPath, object_url: "Url | FsIoException | FsFileNotFoundException", offset: int, num_bytes: "int | None"
+    ) -> "bytes | FsIoException | FsFileNotFoundException":
+        cscs_response = self._with_object_url(
+            path,
+            object_url,
+            lambda url: safe_request(session=_cscs_session, method="get", url=url, offset=offset, num_bytes=num_bytes),
+        )
+        if isinstance(cscs_response, (FsIoException, FsFileNotFoundException)):
+            return cscs_response
         if isinstance(cscs_response, Exception):
             return FsIoException(cscs_response) # FIXME: pass exception directly into other?
         return cscs_response[0]
 
+    def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None"  = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        return self._read_object(path, self.get_swift_object_url(path=path), offset=offset, num_bytes=num_bytes)
+
+    def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+        concurrency = get_io_concurrency(self)
+        # every object URL is resolved only once, no matter how many ranges of that object are read
+        unique_paths = list(dict.fromkeys(path for path, _, _ in reads))
+        object_urls: Dict[PurePosixPath, "Url | FsIoException | FsFileNotFoundException"] = dict(zip(
+            unique_paths, run_concurrently(unique_paths, lambda path: self.get_swift_object_url(path=path), concurrency=concurrency)
+        ))
+
+        return run_concurrently(
+            reads,
+            lambda read: self._read_object(read[0], object_urls[read[0]], offset=read[1], num_bytes=read[2]),
+            concurrency=concurrency,
+        )
+
     def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
-        cscs_url_result = self.get_swift_object_url(path=path)
-        if isinstance(cscs_url_result, Exception):
-            return cscs_url_result
-        size_result = request_size(session=_cscs_session, url=cscs_url_result)
+        size_result = self._with_object_url(
+            path, self.get_swift_object_url(path=path), lambda url: request_size(session=_cscs_session, url=url)
+        )
+        if isinstance(size_result, (FsIoException, FsFileNotFoundException)):
+            return size_result
         if isinstance(size_result, ErrRequestCompletedAsFailure):
             if size_result.status_code == 404:
                 return FsFileNotFoundException(path)
@@ -180,11 +442,13 @@ class BucketFs(IFilesystem):
     def delete(
         self, path: PurePosixPath, dir_wait_time: Seconds = Seconds(5), dir_wait_interval: Seconds = Seconds(0.2)
     ) -> "None | FsIoException":
-        dir_contents_result = self.list_contents(path.parent)
+        _ = self.invalidate_swift_object_url(path)
+        dir_contents_result = self._fetch_contents(path.parent)
         if isinstance(dir_contents_result, Exception):
             return dir_contents_result
 
         deletion_response = _requests_from_data_proxy(method="delete", url=self.url.concatpath(path), data=None)
+        self.invalidate_listings(path)
         #FIXME: what about not found?
         if isinstance(deletion_response, Exception):
             return FsIoException(deletion_response)
@@ -193,7 +457,7 @@ class BucketFs(IFilesystem):
             return None
         if path in dir_contents_result.directories:
             while dir_wait_time > Seconds(0):
-                parent_contents_result = self.list_contents(path.parent)
+                parent_contents_result = self._fetch_contents(path.parent)
                 if isinstance(parent_contents_result, Exception):
                     return parent_contents_result
                 if path not in parent_contents_result.directories:
@@ -230,6 +494,7 @@ class BucketFs(IFilesystem):
     ) -> "FsIoException | FsFileNotFoundException | None":
         if not isinstance(source_fs, OsFs):
             return super().transfer_file(source_fs=source_fs, source_path=source_path, target_path=target_path)
+        _ = self.invalidate_swift_object_url(target_path)
 
         response = _requests_from_data_proxy(method="put", url=self.url.concatpath(target_path), data=None)
         if isinstance(response, Exception):
@@ -239,6 +504,8 @@ class BucketFs(IFilesystem):
 
         source_file = source_fs.resolve_path(source_path).open("rb")
         response = safe_request(session=_cscs_session, method="put", url=cscs_url, data=source_file)
+        # a listing that is refetched while the upload is still in flight might not show it yet
+        self.invalidate_listings(target_path)
         if isinstance(response, Exception):
             return FsIoException(response)
         return None
\ No newline at end of file
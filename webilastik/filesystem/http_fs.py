@@ -1,11 +1,12 @@
-from typing import Dict, Iterator, Literal, Optional, Mapping, Final, Tuple
+from typing import Dict, Iterator, List, Literal, Optional, Mapping, Final, Sequence, Tuple
 from pathlib import PurePosixPath, Path
 import sys
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import CaseInsensitiveDict
 
-from webilastik.filesystem import IFilesystem, FsIoException, FsFileNotFoundException, FsDirectoryContents
+from webilastik.filesystem import IFilesystem, FsIoException, FsFileNotFoundException, FsDirectoryContents, FsFileContents, FsRead, get_io_concurrency, make_request_body, run_concurrently
 from webilastik.utility.url import Url
 from webilastik.server.rpc.dto import HttpFsDto
 from webilastik.utility.request import ErrRequestCompletedAsFailure, ErrRequestCrashed, request as safe_request, request_size
@@ -31,6 +32,10 @@ class HttpFs(IFilesystem):
             search=search,
         )
         self.session = requests.Session()
+        # enough pooled connections for every concurrent range request to reuse its own
+        adapter = HTTPAdapter(pool_maxsize=get_io_concurrency(self))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     @classmethod
     def try_from(cls, *, url: Url) -> "Tuple[HttpFs, PurePosixPath] | None | Exception":
@@ -81,12 +86,12 @@ class HttpFs(IFilesystem):
     def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
         return FsIoException("Can't reliably list contents of http dir yet")
 
-    def create_file(self, *, path: PurePosixPath, contents: bytes) -> "None | FsIoException":
+    def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
         result = safe_request(
             session=self.session,
             method="post",
             url=self.base.concatpath(path),
-            data=contents,
+            data=make_request_body(contents),
         )
         if isinstance(result, Exception):
             return FsIoException(result)
@@ -110,6 +115,13 @@ class HttpFs(IFilesystem):
             return FsIoException(result)
         return result[0]
 
+    def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+        return run_concurrently(
+            reads,
+            lambda read: self.read_file(read[0], offset=read[1], num_bytes=read[2]),
+            concurrency=get_io_concurrency(self),
+        )
+
     def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
         size_result = request_size(session=self.session, url=self.base.concatpath(path))
         if isinstance(size_result, ErrRequestCompletedAsFailure):
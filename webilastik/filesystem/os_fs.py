@@ -1,10 +1,12 @@
-from typing import List, Final, Tuple
+from typing import ClassVar, Dict, List, Final, Sequence, Tuple
 from pathlib import PurePosixPath, Path
 import uuid
+import mmap
 import os
+import re
 from webilastik.config import WorkflowConfig
 
-from webilastik.filesystem import IFilesystem, FsIoException, FsFileNotFoundException, FsDirectoryContents
+from webilastik.filesystem import IFilesystem, FsIoException, FsFileNotFoundException, FsDirectoryContents, FsFileContents, FsRead, get_io_concurrency, iter_file_contents, run_concurrently
 from webilastik.utility.url import Url
 from webilastik.server.rpc.dto import OsfsDto
 from webilastik.utility import Seconds
@@ -13,6 +15,11 @@ class _PrivateMarker:
     pass
 
 class OsFs(IFilesystem):
+    # below this size, mapping a file costs more than just copying its contents
+    MMAP_MIN_BYTES: ClassVar[int] = 64 * 1024
+    # files being written by create_file (or left behind by a crashed writer) are not part of the directory's contents
+    TEMP_FILE_NAME_PATTERN: ClassVar["re.Pattern[str]"] = re.compile(r"^\..+\.[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.tmp$")
+
     def __init__(self, _marker: _PrivateMarker, base: Path = Path("/")) -> None:
         self.base: Final[Path] = base
         super().__init__()
@@ -63,6 +70,8 @@ class OsFs(IFilesystem):
                 fixed_path = PurePosixPath("/") / child.relative_to(self.base)
                 if child.is_dir():
                     directories.append(fixed_path)
+                elif self.TEMP_FILE_NAME_PATTERN.match(child.name):
+                    continue
                 else:
                     files.append(fixed_path)
             return FsDirectoryContents(files=files, directories=directories)
@@ -75,13 +84,21 @@ class OsFs(IFilesystem):
         except Exception as e:
             return FsIoException(e)
 
-    def create_file(self, *, path: PurePosixPath, contents: bytes) -> "None | FsIoException":
+    def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
         file_path = self.resolve_path(path)
+        # files are replaced instead of overwritten in place so that buffers handed out by read_file_as_buffer
+        # keep seeing the old contents rather than a truncated file
+        temp_path = file_path.parent / f".{file_path.name}.{uuid.uuid4()}.tmp"
         try:
             file_path.parent.mkdir(parents=True, exist_ok=True)
-            with file_path.open("wb", buffering=0) as f:
-                _ = f.write(contents)
+            with temp_path.open("wb", buffering=0) as f:
+                for chunk in iter_file_contents(contents):
+                    # unbuffered writes can be short, so keep going until the whole chunk is out
+                    while len(chunk) > 0:
+                        chunk = chunk[f.write(chunk):]
+            os.replace(temp_path, file_path)
         except Exception as e:
+            temp_path.unlink(missing_ok=True)
             return FsIoException(e)
 
     def create_directory(self, path: PurePosixPath) -> "None | FsIoException":
@@ -102,6 +119,60 @@ class OsFs(IFilesystem):
         except Exception as e:
             return FsIoException(e)
 
+    def read_file_as_buffer(
+        self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None
+    ) -> "bytes | memoryview | FsIoException | FsFileNotFoundException":
+        """Returns a read-only view of a memory-mapped file, so that reading it doesn't copy anything out of the page cache"""
+        file_path = self.resolve_path(path)
+        try:
+            with open(file_path, "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                start = offset if offset >= 0 else max(0, file_size + offset)
+                stop = file_size if num_bytes is None else min(file_size, start + num_bytes)
+                if stop - start < self.MMAP_MIN_BYTES:
+                    return os.pread(f.fileno(), max(0, stop - start), start)
+                # the mapping outlives the file descriptor and is unmapped once the last view into it is gone
+                mapped_file = mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ)
+            return memoryview(mapped_file)[start:stop]
+        except FileNotFoundError:
+            return FsFileNotFoundException(path=path)
+        except Exception as e:
+            return FsIoException(e)
+
+    def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+        # each file is opened only once, and its ranges are read with pread so that they don't share a file position
+        reads_by_path: Dict[PurePosixPath, List[int]] = {}
+        for read_index, (path, _, _) in enumerate(reads):
+            reads_by_path.setdefault(path, []).append(read_index)
+
+        out: List["bytes | FsIoException | FsFileNotFoundException"] = [FsIoException("Not read")] * len(reads)
+        def read_ranges(path: PurePosixPath) -> None:
+            try:
+                fd = os.open(self.resolve_path(path), os.O_RDONLY)
+            except FileNotFoundError:
+                for read_index in reads_by_path[path]:
+                    out[read_index] = FsFileNotFoundException(path=path)
+                return
+            except Exception as e:
+                for read_index in reads_by_path[path]:
+                    out[read_index] = FsIoException(e)
+                return
+            try:
+                file_size = os.fstat(fd).st_size
+                for read_index in reads_by_path[path]:
+                    _, offset, num_bytes = reads[read_index]
+                    start = offset if offset >= 0 else max(0, file_size + offset)
+                    length = max(0, file_size - start) if num_bytes is None else num_bytes
+                    try:
+                        out[read_index] = os.pread(fd, length, start)
+                    except Exception as e:
+                        out[read_index] = FsIoException(e)
+            finally:
+                os.close(fd)
+
+        _ = run_concurrently(list(reads_by_path.keys()), read_ranges, concurrency=get_io_concurrency(self))
+        return out
+
     def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
         try:
             return self.resolve_path(path).stat().st_size
@@ -1,14 +1,19 @@
 # pyright: strict
 
+from collections import OrderedDict
 from pathlib import PurePosixPath
-from typing import Final, Any, Tuple, Set, Dict
-from webilastik.filesystem import FsDirectoryContents, FsFileNotFoundException, FsIoException, IFilesystem, create_filesystem_from_message, create_filesystem_from_url
+from typing import Final, Any, Iterable, Iterator, List, Sequence, Tuple, Set, Dict
+from webilastik.filesystem import FsDirectoryContents, FsFileContents, FsFileNotFoundException, FsIoException, FsRawFile, FsRead, IFilesystem, create_filesystem_from_message, create_filesystem_from_url, iter_file_contents
 from dataclasses import dataclass
+import queue
+import struct
+import threading
+import time
 import zipfile
+import zlib
 import io
 
-import netzip # pyright: ignore [reportMissingTypeStubs]
-
+from webilastik.caching import ByteBudgetedCache, CacheMiss, get_max_bytes_from_env
 from webilastik.server.rpc.dto import ZipFsDto
 from webilastik.utility.url import Url
 
@@ -16,53 +21,6 @@ class _PrivateMarker:
     pass
 
 
-class _FsSource(netzip.Source):
-
-    def __init__(self, *, _marker: _PrivateMarker, fs: IFilesystem, zip_path: PurePosixPath, size: int) -> None:
-        super().__init__()
-        self.fs = fs
-        self.zip_path = zip_path
-        self._size = size
-
-    @classmethod
-    def create(cls, fs: IFilesystem, zip_path: PurePosixPath) -> "_FsSource | FsIoException | FsFileNotFoundException":
-        size_result = fs.get_size(zip_path)
-        if isinstance(size_result, FsIoException):
-            return size_result
-        if isinstance(size_result, FsFileNotFoundException):
-            #FIXME: once we can write to zips, this dummy stuff should probably be removed
-            buffer = io.BytesIO()
-            empty_file = zipfile.ZipFile(buffer, "w")
-            empty_file.close()
-            _ = buffer.seek(0)
-            contents = buffer.read()
-            file_creation_result = fs.create_file(path=zip_path, contents=contents)
-            if isinstance(file_creation_result, Exception):
-                return file_creation_result
-            size_result = len(contents)
-        return _FsSource(_marker=_PrivateMarker(), fs=fs, zip_path=zip_path, size=size_result)
-
-    def read(self, offset: int, size: int = -1) -> bytes:
-        """Read the given number of bytes at the specified offset.
-
-        If offset is negative, it is relative to the end of the source.
-        If size is negative, read all remaining bytes.
-        """
-        if offset < 0:
-            offset = max(0, self.size() + offset) # if size == 3, offset == -1 produces actual offset==2
-        read_result = self.fs.read_file(self.zip_path, offset=offset, num_bytes=None if size < 0 else size)
-        if isinstance(read_result, Exception):
-            raise read_result
-        return read_result
-
-    def size(self) -> int:
-        """Return the total number of bytes in the source.
-
-        Implementations are highliy recommended to cache the result.
-        """
-        return self._size
-
-
 @dataclass
 class _ZipDir:
     files: Set[str]
@@ -76,7 +34,200 @@ class _ZipDir:
         for d_name, d in self.dirs.items():
             d.print(name=d_name, indent=indent + 1)
 
+
+_LOCAL_HEADER_STRUCT = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+
+class _ZipDirectory:
+    """The parsed central directory of a zip archive, plus the data offsets of the members that have been read so far"""
+
+    def __init__(self, entries: Dict[str, zipfile.ZipInfo]) -> None:
+        self.entries: Final[Dict[str, zipfile.ZipInfo]] = entries
+        # where each member's data starts, which is only known after reading its local header
+        self.data_offsets: Dict[str, int] = {}
+        self.root = _ZipDir(files=set(), dirs={})
+        for entry_name in entries.keys():
+            self._add_to_tree(entry_name)
+        super().__init__()
+
+    def _add_to_tree(self, entry_name: str) -> None:
+        entry_path = ZipFs.normalize_path(entry_name)
+        cursor = self.root
+        for part in entry_path.parts[1:-1]:
+            new_cursor = cursor.dirs.get(part)
+            if new_cursor is None:
+                new_cursor = cursor.dirs[part] = _ZipDir(files=set(), dirs={})
+            cursor = new_cursor
+        if entry_name.endswith("/"):
+            _ = cursor.dirs.setdefault(entry_path.name, _ZipDir(files=set(), dirs={}))
+        else:
+            cursor.files.add(entry_path.name)
+
+    def add(self, info: zipfile.ZipInfo) -> None:
+        self.entries[info.filename] = info
+        self._add_to_tree(info.filename)
+
+    @classmethod
+    def parse(cls, *, fs: IFilesystem, zip_path: PurePosixPath, size: int) -> "_ZipDirectory | FsIoException | FsFileNotFoundException":
+        # zipfile only seeks to the end of the archive and reads the central directory from there
+        file_result = FsRawFile.open(filesystem=fs, path=zip_path, size=size)
+        if isinstance(file_result, Exception):
+            return file_result
+        try:
+            with file_result, zipfile.ZipFile(file_result) as zip_file:
+                return _ZipDirectory({info.filename: info for info in zip_file.infolist()})
+        except Exception as e:
+            return FsIoException(e)
+
+
+class _ZipDirectoryCache:
+    """Parsed central directories of the archives opened recently, so that re-opening a zip (e.g. for every request
+    that carries a ZipFs in its DTO) doesn't read and parse its directory again"""
+
+    def __init__(self, *, max_entries: int = 64) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], _ZipDirectory]" = OrderedDict()
+        super().__init__()
+
+    def get(self, key: Tuple[str, int]) -> "_ZipDirectory | None":
+        with self._lock:
+            directory = self._entries.get(key)
+            if directory is not None:
+                self._entries.move_to_end(key)
+            return directory
+
+    def put(self, key: Tuple[str, int], directory: _ZipDirectory) -> None:
+        with self._lock:
+            self._entries[key] = directory
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def forget(self, url: str) -> None:
+        """Drops the directories of every version of the archive at 'url'"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == url]:
+                del self._entries[key]
+
+_directory_cache = _ZipDirectoryCache()
+
+# compressed members are inflated whole, so the small ones are kept around for the next ranged read into them
+_MAX_CACHED_MEMBER_BYTES = 16 * 1024 * 1024
+_member_cache: "ByteBudgetedCache[bytes]" = ByteBudgetedCache(
+    max_bytes=get_max_bytes_from_env("ZIP_MEMBER_CACHE_MAX_BYTES", default=256 * 1024 * 1024)
+)
+
+
+class _ZipUploadStream(io.RawIOBase):
+    """The write end of an archive being streamed into a file of another filesystem.
+
+    Whatever zipfile writes here is handed, in chunks of at least 'chunk_size' bytes, to a single 'create_file' call
+    running in a background thread. At most 'max_queued_chunks' chunks are held in memory at any time; writers block
+    until the upload catches up
+    """
+
+    def __init__(self, *, fs: IFilesystem, path: PurePosixPath, chunk_size: int, max_queued_chunks: int) -> None:
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.num_bytes_written = 0
+        self._pending = bytearray()
+        self._chunks: "queue.Queue[bytes | None]" = queue.Queue(maxsize=max_queued_chunks)
+        self._upload_result: "None | FsIoException" = None
+        self._upload_done = threading.Event()
+        self._aborted = False
+        self._upload_thread = threading.Thread(
+            target=self._upload, kwargs={"fs": fs, "path": path}, name="zip_fs_upload_thread", daemon=True
+        )
+        self._upload_thread.start()
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                if self._aborted:
+                    # failing the upload, rather than just ending it, is what keeps the partial archive from being published
+                    raise OSError("Upload of zip file was aborted")
+                return
+            yield chunk
+
+    def _upload(self, fs: IFilesystem, path: PurePosixPath) -> None:
+        chunks = self._iter_chunks()
+        try:
+            self._upload_result = fs.create_file(path=path, contents=chunks)
+        except Exception as e:
+            self._upload_result = FsIoException(e)
+        self._upload_done.set()
+        # if the upload gave up early, chunks are still drained so that writers don't block forever
+        for _ in chunks:
+            pass
+
+    def writable(self) -> bool:
+        return True
+
+    def _put(self, chunk: "bytes | None") -> None:
+        while True:
+            if self._upload_done.is_set() and chunk is not None:
+                raise OSError(f"Upload of zip file failed: {self._upload_result}")
+            try:
+                self._chunks.put(chunk, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def write(self, buffer: Any) -> int:
+        data = memoryview(buffer).cast("B")
+        if self._aborted:
+            # e.g. the central directory that zipfile writes when it is garbage collected
+            return len(data)
+        self._pending += data
+        self.num_bytes_written += len(data)
+        if len(self._pending) >= self.chunk_size:
+            self._put(bytes(self._pending))
+            self._pending.clear()
+        return len(data)
+
+    def finish(self) -> "None | FsIoException":
+        """Sends out whatever is still pending and waits for the upload to complete"""
+        try:
+            if len(self._pending) > 0:
+                self._put(bytes(self._pending))
+                self._pending.clear()
+            self._put(None)
+        except Exception as e:
+            return FsIoException(e)
+        self._upload_thread.join()
+        return self._upload_result
+
+    def abort(self) -> bool:
+        """Fails the upload without sending out whatever is still pending, so that nothing is written at its path.
+
+        Returns whether the filesystem took the (truncated) upload regardless
+        """
+        self._aborted = True
+        self._pending.clear()
+        self._put(None)
+        self._upload_thread.join()
+        return self._upload_result is None
+
+
+class _ZipStreamWriter:
+    def __init__(self, *, fs: IFilesystem, path: PurePosixPath, chunk_size: int, max_queued_chunks: int) -> None:
+        self.stream = _ZipUploadStream(fs=fs, path=path, chunk_size=chunk_size, max_queued_chunks=max_queued_chunks)
+        # the stream can't seek, so zipfile writes sizes and checksums after each member's data
+        self.zip_file = zipfile.ZipFile(self.stream, mode="w", compression=zipfile.ZIP_STORED)
+        self.lock = threading.Lock()
+        super().__init__()
+
+
 class ZipFs(IFilesystem):
+    """The members of a zip archive that lives in another filesystem.
+
+    Only the central directory and the members being read are ever fetched. Members that are stored uncompressed
+    (as in .dzip files) are read with ranged reads straight from the archive; deflated ones are inflated whole.
+
+    Archives are either read or, if created with 'create_writable', written from scratch as a stream
+    """
     @classmethod
     def try_from(cls, *, url: Url) -> "Tuple[ZipFs, PurePosixPath] | None | Exception":
         parts = url.path.parts[1:] # discard '/' from url paths, which are always absolute
@@ -107,48 +258,61 @@ class ZipFs(IFilesystem):
         return PurePosixPath("/") / path
 
     @classmethod
-    def raw_path(cls, path: PurePosixPath) -> bytes:
-        return path.as_posix().lstrip("/").encode("utf8")
-
-    def __init__(self, _marker: _PrivateMarker, archive: netzip.Archive, source: _FsSource) -> None:
-        self.archive: Final[netzip.Archive] = archive
-        self.source: Final[_FsSource] = source
-        self.root = _ZipDir(files=set(), dirs={})
-
-        for raw_entry_name in self.archive.files.keys():
-            entry_name = raw_entry_name.decode("utf8")
-            entry_path = self.normalize_path(entry_name)
-            cursor = self.root
-            for part in entry_path.parts[1:-1]:
-                new_cursor = cursor.dirs.get(part)
-                if new_cursor is None:
-                    new_cursor = cursor.dirs[part] = _ZipDir(files=set(), dirs={})
-                cursor = new_cursor
-            if entry_name.endswith("/"):
-                cursor.dirs[entry_path.name] = _ZipDir(files=set(), dirs={})
-            else:
-                cursor.files.add(entry_path.name)
-
+    def entry_name(cls, path: PurePosixPath) -> str:
+        return path.as_posix().lstrip("/")
+
+    def __init__(
+        self,
+        _marker: _PrivateMarker,
+        *,
+        zip_file_fs: IFilesystem,
+        zip_file_path: PurePosixPath,
+        zip_file_size: int,
+        directory: _ZipDirectory,
+        writer: "_ZipStreamWriter | None" = None,
+    ) -> None:
+        self.zip_file_fs: Final[IFilesystem] = zip_file_fs
+        self.zip_file_path: Final[PurePosixPath] = zip_file_path
+        self.zip_file_size = zip_file_size
+        self._directory = directory
+        self._writer = writer
+        self._archive_key = (zip_file_fs.geturl(zip_file_path).raw, zip_file_size)
+        self.root = directory.root
         super().__init__()
 
-    @property
-    def zip_file_fs(self) -> IFilesystem:
-        return self.source.fs
-
-    @property
-    def zip_file_path(self) -> PurePosixPath:
-        return self.source.zip_path
-
     @classmethod
     def create(cls, zip_file_fs: IFilesystem, zip_file_path: PurePosixPath) -> "ZipFs | FsIoException | FsFileNotFoundException":
-        source_result = _FsSource.create(fs=zip_file_fs, zip_path=zip_file_path)
-        if isinstance(source_result, Exception):
-            return source_result
-        try:
-            archive = netzip.Archive(source_result)
-        except Exception as e:
-            return FsIoException(e)
-        return ZipFs(_marker=_PrivateMarker(), archive=archive, source=source_result)
+        size_result = zip_file_fs.get_size(zip_file_path)
+        if isinstance(size_result, FsIoException):
+            return size_result
+        if isinstance(size_result, FsFileNotFoundException):
+            #FIXME: once we can write to zips, this dummy stuff should probably be removed
+            buffer = io.BytesIO()
+            empty_file = zipfile.ZipFile(buffer, "w")
+            empty_file.close()
+            contents = buffer.getvalue()
+            file_creation_result = zip_file_fs.create_file(path=zip_file_path, contents=contents)
+            if isinstance(file_creation_result, Exception):
+                return file_creation_result
+            size_result = len(contents)
+
+        # archives are identified by their url and size, so one that is rewritten with a different size isn't served from
+        # a stale directory. A rewrite that keeps the exact same size is only noticed if it happens through ZipFs.close
+        directory_key = (zip_file_fs.geturl(zip_file_path).raw, size_result)
+        directory = _directory_cache.get(directory_key)
+        if directory is None:
+            directory_result = _ZipDirectory.parse(fs=zip_file_fs, zip_path=zip_file_path, size=size_result)
+            if isinstance(directory_result, Exception):
+                return directory_result
+            directory = directory_result
+            _directory_cache.put(directory_key, directory)
+        return ZipFs(
+            _PrivateMarker(),
+            zip_file_fs=zip_file_fs,
+            zip_file_path=zip_file_path,
+            zip_file_size=size_result,
+            directory=directory,
+        )
 
     def list_contents(self, path: PurePosixPath) -> "FsDirectoryContents | FsIoException":
         path = self.normalize_path(path)
@@ -167,45 +331,231 @@ class ZipFs(IFilesystem):
             directories=[cursor_path / d for d in cursor.dirs.keys()]
         )
 
-    def create_file(self, *, path: PurePosixPath, contents: bytes) -> "None | FsIoException":
-        return FsIoException("Not implemented")
+    @classmethod
+    def create_writable(
+        cls,
+        *,
+        zip_file_fs: IFilesystem,
+        zip_file_path: PurePosixPath,
+        chunk_size: int = 8 * 1024 * 1024,
+        max_queued_chunks: int = 4,
+    ) -> "ZipFs":
+        """A ZipFs for a new archive at 'zip_file_path', which is streamed into 'zip_file_fs' as its members are created.
+
+        Members are appended in the order they are created and can't be read back until the archive is 'close'd
+        """
+        return ZipFs(
+            _PrivateMarker(),
+            zip_file_fs=zip_file_fs,
+            zip_file_path=zip_file_path,
+            zip_file_size=0,
+            directory=_ZipDirectory({}),
+            writer=_ZipStreamWriter(
+                fs=zip_file_fs, path=zip_file_path, chunk_size=chunk_size, max_queued_chunks=max_queued_chunks
+            ),
+        )
+
+    def close(self) -> "None | FsIoException":
+        """Writes the central directory of a writable ZipFs and waits for the archive to be fully written out"""
+        writer = self._writer
+        if writer is None:
+            return None
+        with writer.lock:
+            try:
+                writer.zip_file.close()
+            except Exception as e:
+                _ = writer.stream.finish()
+                return FsIoException(e)
+            finish_result = writer.stream.finish()
+            if isinstance(finish_result, Exception):
+                return finish_result
+            # the archive is complete, so its members can be read like those of any other archive
+            self.zip_file_size = writer.stream.num_bytes_written
+            self._archive_key = (self.zip_file_fs.geturl(self.zip_file_path).raw, self.zip_file_size)
+            _directory_cache.forget(self._archive_key[0])
+            _directory_cache.put(self._archive_key, self._directory)
+            self._writer = None
+
+    def abort(self) -> "None | FsIoException":
+        """Gives up on a writable ZipFs without writing its central directory, leaving nothing at 'zip_file_path'"""
+        writer = self._writer
+        if writer is None:
+            return None
+        with writer.lock:
+            self._writer = None
+            self._directory = _ZipDirectory({})
+            self.root = self._directory.root
+            if writer.stream.abort():
+                return self.zip_file_fs.delete(self.zip_file_path)
+            return None
+
+    def create_file(self, *, path: PurePosixPath, contents: FsFileContents) -> "None | FsIoException":
+        writer = self._writer
+        if writer is None:
+            return FsIoException(f"Zip file {self.zip_file_path} is not open for writing")
+        entry_name = self.entry_name(path)
+        info = zipfile.ZipInfo(entry_name, date_time=time.localtime(time.time())[:6])
+        info.compress_type = zipfile.ZIP_STORED
+        if isinstance(contents, (bytes, memoryview)):
+            buffers = list(iter_file_contents(contents))
+            info.file_size = len(buffers[0])
+            chunks: Iterable[memoryview] = buffers
+            force_zip64 = False
+        else:
+            # the size of chunked contents is unknown up front, so the member must be able to grow past 4GiB
+            chunks = iter_file_contents(contents)
+            force_zip64 = True
+        with writer.lock:
+            if self._writer is None:
+                return FsIoException(f"Zip file {self.zip_file_path} was closed")
+            if entry_name in self._directory.entries:
+                return FsIoException(f"Zip file {self.zip_file_path} already has an entry at {path}")
+            try:
+                with writer.zip_file.open(info, mode="w", force_zip64=force_zip64) as entry:
+                    for chunk in chunks:
+                        _ = entry.write(chunk)
+            except Exception as e:
+                return FsIoException(e)
+            self._directory.add(info)
 
     def create_directory(self, path: PurePosixPath) -> "None | FsIoException":
-        return FsIoException("Not implemented")
+        if self._writer is None:
+            return FsIoException(f"Zip file {self.zip_file_path} is not open for writing")
+        # directories in zip files are implied by the paths of their members
+        return None
 
-    def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
-        try:
-            data = self.archive[self.raw_path(path)]
-        except KeyError as e:
-            return FsFileNotFoundException(path)
-        except Exception as e:
-            return FsIoException(e)
-        data_len = len(data)
+    def _plan_member_data_read(self, info: zipfile.ZipInfo, offset: int, num_bytes: int) -> Tuple[FsRead, bool]:
+        """Where to read 'num_bytes' of the (possibly compressed) data of a member from, starting 'offset' bytes into it,
+        and whether that read includes the member's local header, which is fetched along with the data until it's parsed
+        """
+        data_offset = self._directory.data_offsets.get(info.filename)
+        if data_offset is not None:
+            return ((self.zip_file_path, data_offset + offset, num_bytes), False)
+        # the name and extra fields of the local header are usually the same as in the central directory, but if they
+        # are longer a second read is needed
+        expected_header_nbytes = _LOCAL_HEADER_STRUCT.size + len(info.filename.encode("utf8")) + len(info.extra)
+        return ((self.zip_file_path, info.header_offset, expected_header_nbytes + offset + num_bytes), True)
+
+    def _finish_member_data_read(
+        self,
+        info: zipfile.ZipInfo,
+        offset: int,
+        num_bytes: int,
+        includes_header: bool,
+        read_result: "bytes | FsIoException | FsFileNotFoundException",
+    ) -> "bytes | FsIoException":
+        if isinstance(read_result, FsFileNotFoundException):
+            return FsIoException(f"Zip file {self.zip_file_path} disappeared")
+        if isinstance(read_result, Exception) or not includes_header:
+            return read_result
+        if len(read_result) < _LOCAL_HEADER_STRUCT.size:
+            return FsIoException(f"Truncated local header for {info.filename} in {self.zip_file_path}")
+        header = _LOCAL_HEADER_STRUCT.unpack_from(read_result)
+        if header[0] != _LOCAL_HEADER_SIGNATURE:
+            return FsIoException(f"Bad local header for {info.filename} in {self.zip_file_path}")
+        header_nbytes = _LOCAL_HEADER_STRUCT.size + header[10] + header[11] # file name and extra field lengths
+        self._directory.data_offsets[info.filename] = info.header_offset + header_nbytes
+        if len(read_result) >= header_nbytes + offset + num_bytes:
+            return read_result[header_nbytes + offset : header_nbytes + offset + num_bytes]
+        (path, read_offset, read_num_bytes), _ = self._plan_member_data_read(info, offset=offset, num_bytes=num_bytes)
+        return self._finish_member_data_read(
+            info, offset, num_bytes, False, self.zip_file_fs.read_file(path, offset=read_offset, num_bytes=read_num_bytes)
+        )
 
-        start = offset
-        if start >= data_len:
-            return FsIoException("Offset greater than data length")
+    def _decode_member(self, info: zipfile.ZipInfo, raw_result: "bytes | FsIoException", fetch_cost: float) -> "bytes | FsIoException":
+        """The whole decompressed contents of a member, out of its raw data"""
+        if isinstance(raw_result, Exception):
+            return raw_result
+        start = time.perf_counter()
+        if info.compress_type == zipfile.ZIP_STORED:
+            data = raw_result
+        elif info.compress_type == zipfile.ZIP_DEFLATED:
+            try:
+                data = zlib.decompress(raw_result, wbits=-zlib.MAX_WBITS)
+            except zlib.error as e:
+                return FsIoException(e)
+        else:
+            return FsIoException(f"Unsupported compression method {info.compress_type} for {info.filename}")
+        if len(data) != info.file_size or zlib.crc32(data) != info.CRC:
+            return FsIoException(f"Corrupted zip member {info.filename} in {self.zip_file_path}")
+
+        if info.compress_type != zipfile.ZIP_STORED and len(data) <= _MAX_CACHED_MEMBER_BYTES:
+            cost = fetch_cost + time.perf_counter() - start
+            _member_cache.put((*self._archive_key, info.filename), data, cost=cost, nbytes=len(data))
+        return data
 
-        end: "int | None" = None
-        if num_bytes is not None:
-            end = offset + num_bytes
-            if end >= data_len:
-                return FsIoException("Requested range exceeds available data")
+    def read_file(self, path: PurePosixPath, offset: int = 0, num_bytes: "int | None" = None) -> "bytes | FsIoException | FsFileNotFoundException":
+        return self.read_files([(path, offset, num_bytes)])[0]
+
+    def read_files(self, reads: Sequence[FsRead]) -> "List[bytes | FsIoException | FsFileNotFoundException]":
+        """Reads the data of all members that aren't cached out of the archive with a single read_files"""
+        if self._writer is not None:
+            return [FsIoException(f"Zip file {self.zip_file_path} is still being written") for _ in reads]
+        results: "List[bytes | FsIoException | FsFileNotFoundException]" = []
+        # (index into results, member, offset and num_bytes of the read, and whether it needs the whole member)
+        pending: List[Tuple[int, zipfile.ZipInfo, int, int, bool]] = []
+        archive_reads: List[Tuple[FsRead, bool]] = []
+        for path, offset, num_bytes in reads:
+            info = self._directory.entries.get(self.entry_name(path))
+            if info is None or info.is_dir():
+                results.append(FsFileNotFoundException(path))
+                continue
+            data_len = info.file_size
+            if offset > data_len:
+                results.append(FsIoException("Offset greater than data length"))
+                continue
+            if num_bytes is None:
+                num_bytes = data_len - offset
+            if offset + num_bytes > data_len:
+                results.append(FsIoException("Requested range exceeds available data"))
+                continue
+            if num_bytes == 0:
+                results.append(bytes())
+                continue
 
-        return data[start:end]
+            if info.compress_type == zipfile.ZIP_STORED and (offset, num_bytes) != (0, data_len):
+                # ranges of stored members are read straight out of the archive
+                pending.append((len(results), info, offset, num_bytes, False))
+                archive_reads.append(self._plan_member_data_read(info, offset=offset, num_bytes=num_bytes))
+            else:
+                cached = _member_cache.get((*self._archive_key, info.filename))
+                if not isinstance(cached, CacheMiss):
+                    results.append(cached[offset:offset + num_bytes])
+                    continue
+                pending.append((len(results), info, offset, num_bytes, True))
+                archive_reads.append(self._plan_member_data_read(info, offset=0, num_bytes=info.compress_size))
+            results.append(bytes()) # replaced once the archive is read
+
+        start = time.perf_counter()
+        archive_results = self.zip_file_fs.read_files([archive_read for archive_read, _ in archive_reads])
+        fetch_cost = (time.perf_counter() - start) / max(len(archive_reads), 1)
+        for (result_index, info, offset, num_bytes, is_whole_member), (_, includes_header), archive_result in zip(pending, archive_reads, archive_results):
+            if not is_whole_member:
+                results[result_index] = self._finish_member_data_read(info, offset, num_bytes, includes_header, archive_result)
+                continue
+            data_result = self._decode_member(
+                info,
+                self._finish_member_data_read(info, 0, info.compress_size, includes_header, archive_result),
+                fetch_cost=fetch_cost,
+            )
+            if isinstance(data_result, Exception) or (offset, num_bytes) == (0, info.file_size):
+                results[result_index] = data_result
+            else:
+                results[result_index] = data_result[offset:offset + num_bytes]
+        return results
 
     def get_size(self, path: PurePosixPath) -> "int | FsIoException | FsFileNotFoundException":
-        entry = self.archive.files.get(self.raw_path(path))
-        if entry is None:
+        info = self._directory.entries.get(self.entry_name(path))
+        if info is None:
             return FsFileNotFoundException(path)
-        return entry.size
+        return info.file_size
 
     def delete(self, path: PurePosixPath) -> "None | FsIoException":
         return FsIoException("Not implemented")
 
     def to_dto(self) -> ZipFsDto:
-        fs_dto: Any = self.source.fs.to_dto()  #FIXME: fix ZipFsDto.zip_file_fs type and remove this Any
-        return ZipFsDto(zip_file_fs=fs_dto, zip_file_path=self.source.zip_path.as_posix())
+        fs_dto: Any = self.zip_file_fs.to_dto()  #FIXME: fix ZipFsDto.zip_file_fs type and remove this Any
+        return ZipFsDto(zip_file_fs=fs_dto, zip_file_path=self.zip_file_path.as_posix())
 
     @classmethod
     def from_dto(cls, dto: ZipFsDto) -> "ZipFs | Exception":
@@ -216,7 +566,8 @@ class ZipFs(IFilesystem):
         return cls.create(zip_file_fs=fs_result, zip_file_path=path)
 
     def geturl(self, path: PurePosixPath) -> Url:
-        return self.source.fs.geturl(self.source.zip_path).concatpath(path) #FIXME: double check this
+        return self.zip_file_fs.geturl(self.zip_file_path).concatpath(path) #FIXME: double check this
 
     def exists(self, path: PurePosixPath) -> "bool | FsIoException":
-        return self.raw_path(path) in self.archive.files
\ No newline at end of file
+        entry_name = self.entry_name(path)
+        return entry_name in self._directory.entries or entry_name + "/" in self._directory.entries
@@ -1,6 +1,8 @@
+from functools import cached_property
 from typing import Protocol, TypeVar
 
 from webilastik.datasource import DataRoi
+from webilastik.caching import make_content_key
 from ndstructs.array5D import Array5D
 
 IN = TypeVar("IN", contravariant=True)
@@ -13,5 +15,10 @@ class OpRetriever(Operator[DataRoi, Array5D]):
     def __init__(self, axiskeys_hint: str = "ctzyx") -> None:
         self.axiskeys_hint = axiskeys_hint
         super().__init__()
+
+    @cached_property
+    def content_key(self) -> bytes:
+        return make_content_key(self.__class__, self.axiskeys_hint)
+
     def __call__(self, /, roi: DataRoi) -> Array5D:
         return roi.retrieve(axiskeys_hint=self.axiskeys_hint)
@@ -127,9 +127,9 @@ class LabelHeaderDto(DataTransferObject):
 Protocol = Literal["http", "https", "file", "memory"]
 
 
-def parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_(
+def parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_(
     value: JsonValue,
-) -> "Literal['precomputed', 'n5', 'deepzoom'] | MessageParsingError":
+) -> "Literal['precomputed', 'n5', 'deepzoom', 'zarr'] | MessageParsingError":
     tmp_0 = parse_as_str(value)
     if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "precomputed":
         return tmp_0
@@ -139,8 +139,11 @@ def parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzo
     tmp_2 = parse_as_str(value)
     if not isinstance(tmp_2, MessageParsingError) and tmp_2 == "deepzoom":
         return tmp_2
+    tmp_3 = parse_as_str(value)
+    if not isinstance(tmp_3, MessageParsingError) and tmp_3 == "zarr":
+        return tmp_3
     return MessageParsingError(
-        f"Could not parse {value} as Literal['precomputed', 'n5', 'deepzoom']"
+        f"Could not parse {value} as Literal['precomputed', 'n5', 'deepzoom', 'zarr']"
     )
 
 
@@ -151,10 +154,10 @@ def parse_as_None(value: JsonValue) -> "None | MessageParsingError":
     return MessageParsingError(f"Could not parse {json.dumps(value)} as None")
 
 
-def parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_0None_endof_(
+def parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_0None_endof_(
     value: JsonValue,
-) -> "Union[Literal['precomputed', 'n5', 'deepzoom'], None] | MessageParsingError":
-    parsed_option_0 = parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_(
+) -> "Union[Literal['precomputed', 'n5', 'deepzoom', 'zarr'], None] | MessageParsingError":
+    parsed_option_0 = parse_as_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_(
         value
     )
     if not isinstance(parsed_option_0, MessageParsingError):
@@ -163,7 +166,7 @@ def parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quo
     if not isinstance(parsed_option_1, MessageParsingError):
         return parsed_option_1
     return MessageParsingError(
-        f"Could not parse {json.dumps(value)} into Union[Literal['precomputed', 'n5', 'deepzoom'], None]"
+        f"Could not parse {json.dumps(value)} into Union[Literal['precomputed', 'n5', 'deepzoom', 'zarr'], None]"
     )
 
 
@@ -257,7 +260,7 @@ def parse_as_UrlDto(value: JsonValue) -> "UrlDto | MessageParsingError":
         return MessageParsingError(f"Could not parse {json.dumps(value)} as UrlDto")
     if value.get("__class__") != "UrlDto":
         return MessageParsingError(f"Could not parse {json.dumps(value)} as UrlDto")
-    tmp_datascheme = parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote__endof_0None_endof_(
+    tmp_datascheme = parse_as_Union_of_Literal_of__quote_precomputed_quote_0_quote_n5_quote_0_quote_deepzoom_quote_0_quote_zarr_quote__endof_0None_endof_(
         value.get("datascheme")
     )
     if isinstance(tmp_datascheme, MessageParsingError):
@@ -297,7 +300,7 @@ def parse_as_UrlDto(value: JsonValue) -> "UrlDto | MessageParsingError":
 
 @dataclass
 class UrlDto(DataTransferObject):
-    datascheme: Optional[Literal["precomputed", "n5", "deepzoom"]]
+    datascheme: Optional[Literal["precomputed", "n5", "deepzoom", "zarr"]]
     protocol: Literal["http", "https", "file", "memory"]
     hostname: str
     port: Optional[int]
@@ -682,6 +685,108 @@ def dtype_to_dto(dtype: "np.dtype[Any]") -> DtypeDto:
     return cast(DtypeDto, str(dtype))
 
 
+def parse_as_Literal_of__quote_identity_quote_0_quote_murmurhash3_x86_128_quote__endof_(
+    value: JsonValue,
+) -> "Literal['identity', 'murmurhash3_x86_128'] | MessageParsingError":
+    tmp_0 = parse_as_str(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "identity":
+        return tmp_0
+    tmp_1 = parse_as_str(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "murmurhash3_x86_128":
+        return tmp_1
+    return MessageParsingError(
+        f"Could not parse {value} as Literal['identity', 'murmurhash3_x86_128']"
+    )
+
+
+def parse_as_Literal_of__quote_raw_quote_0_quote_gzip_quote__endof_(
+    value: JsonValue,
+) -> "Literal['raw', 'gzip'] | MessageParsingError":
+    tmp_0 = parse_as_str(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "raw":
+        return tmp_0
+    tmp_1 = parse_as_str(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "gzip":
+        return tmp_1
+    return MessageParsingError(f"Could not parse {value} as Literal['raw', 'gzip']")
+
+
+def parse_as_PrecomputedChunksShardingDto(
+    value: JsonValue,
+) -> "PrecomputedChunksShardingDto | MessageParsingError":
+    from collections.abc import Mapping
+
+    if not isinstance(value, Mapping):
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as PrecomputedChunksShardingDto"
+        )
+    if value.get("__class__") != "PrecomputedChunksShardingDto":
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as PrecomputedChunksShardingDto"
+        )
+    tmp_preshift_bits = parse_as_int(value.get("preshift_bits"))
+    if isinstance(tmp_preshift_bits, MessageParsingError):
+        return tmp_preshift_bits
+    tmp_hash = parse_as_Literal_of__quote_identity_quote_0_quote_murmurhash3_x86_128_quote__endof_(
+        value.get("hash")
+    )
+    if isinstance(tmp_hash, MessageParsingError):
+        return tmp_hash
+    tmp_minishard_bits = parse_as_int(value.get("minishard_bits"))
+    if isinstance(tmp_minishard_bits, MessageParsingError):
+        return tmp_minishard_bits
+    tmp_shard_bits = parse_as_int(value.get("shard_bits"))
+    if isinstance(tmp_shard_bits, MessageParsingError):
+        return tmp_shard_bits
+    tmp_minishard_index_encoding = (
+        parse_as_Literal_of__quote_raw_quote_0_quote_gzip_quote__endof_(
+            value.get("minishard_index_encoding")
+        )
+    )
+    if isinstance(tmp_minishard_index_encoding, MessageParsingError):
+        return tmp_minishard_index_encoding
+    tmp_data_encoding = parse_as_Literal_of__quote_raw_quote_0_quote_gzip_quote__endof_(
+        value.get("data_encoding")
+    )
+    if isinstance(tmp_data_encoding, MessageParsingError):
+        return tmp_data_encoding
+    return PrecomputedChunksShardingDto(
+        preshift_bits=tmp_preshift_bits,
+        hash=tmp_hash,
+        minishard_bits=tmp_minishard_bits,
+        shard_bits=tmp_shard_bits,
+        minishard_index_encoding=tmp_minishard_index_encoding,
+        data_encoding=tmp_data_encoding,
+    )
+
+
+@dataclass
+class PrecomputedChunksShardingDto(DataTransferObject):
+    preshift_bits: int
+    hash: Literal["identity", "murmurhash3_x86_128"]
+    minishard_bits: int
+    shard_bits: int
+    minishard_index_encoding: Literal["raw", "gzip"]
+    data_encoding: Literal["raw", "gzip"]
+
+    def to_json_value(self) -> JsonObject:
+        return {
+            "__class__": "PrecomputedChunksShardingDto",
+            "preshift_bits": self.preshift_bits,
+            "hash": self.hash,
+            "minishard_bits": self.minishard_bits,
+            "shard_bits": self.shard_bits,
+            "minishard_index_encoding": self.minishard_index_encoding,
+            "data_encoding": self.data_encoding,
+        }
+
+    @classmethod
+    def from_json_value(
+        cls, value: JsonValue
+    ) -> "PrecomputedChunksShardingDto | MessageParsingError":
+        return parse_as_PrecomputedChunksShardingDto(value)
+
+
 def parse_as_Union_of_OsfsDto0HttpFsDto0BucketFSDto0ZipFsDto_endof_(
     value: JsonValue,
 ) -> "Union[OsfsDto, HttpFsDto, BucketFSDto, ZipFsDto] | MessageParsingError":
@@ -751,16 +856,55 @@ def parse_as_Literal_of__quote_uint8_quote_0_quote_uint16_quote_0_quote_uint32_q
     )
 
 
-def parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(
+def parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote_0_quote_png_quote_0_quote_compressed_segmentation_quote__endof_(
     value: JsonValue,
-) -> "Literal['raw', 'jpeg'] | MessageParsingError":
+) -> "Literal['raw', 'jpeg', 'png', 'compressed_segmentation'] | MessageParsingError":
     tmp_0 = parse_as_str(value)
     if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "raw":
         return tmp_0
     tmp_1 = parse_as_str(value)
     if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "jpeg":
         return tmp_1
-    return MessageParsingError(f"Could not parse {value} as Literal['raw', 'jpeg']")
+    tmp_2 = parse_as_str(value)
+    if not isinstance(tmp_2, MessageParsingError) and tmp_2 == "png":
+        return tmp_2
+    tmp_3 = parse_as_str(value)
+    if (
+        not isinstance(tmp_3, MessageParsingError)
+        and tmp_3 == "compressed_segmentation"
+    ):
+        return tmp_3
+    return MessageParsingError(
+        f"Could not parse {value} as Literal['raw', 'jpeg', 'png', 'compressed_segmentation']"
+    )
+
+
+def parse_as_Union_of_PrecomputedChunksShardingDto0None_endof_(
+    value: JsonValue,
+) -> "Union[PrecomputedChunksShardingDto, None] | MessageParsingError":
+    parsed_option_0 = parse_as_PrecomputedChunksShardingDto(value)
+    if not isinstance(parsed_option_0, MessageParsingError):
+        return parsed_option_0
+    parsed_option_1 = parse_as_None(value)
+    if not isinstance(parsed_option_1, MessageParsingError):
+        return parsed_option_1
+    return MessageParsingError(
+        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksShardingDto, None]"
+    )
+
+
+def parse_as_Union_of_Tuple_of_int0int0int_endof_0None_endof_(
+    value: JsonValue,
+) -> "Union[Tuple[int, int, int], None] | MessageParsingError":
+    parsed_option_0 = parse_as_Tuple_of_int0int0int_endof_(value)
+    if not isinstance(parsed_option_0, MessageParsingError):
+        return parsed_option_0
+    parsed_option_1 = parse_as_None(value)
+    if not isinstance(parsed_option_1, MessageParsingError):
+        return parsed_option_1
+    return MessageParsingError(
+        f"Could not parse {json.dumps(value)} into Union[Tuple[int, int, int], None]"
+    )
 
 
 def parse_as_PrecomputedChunksDataSourceDto(
@@ -806,11 +950,23 @@ def parse_as_PrecomputedChunksDataSourceDto(
     )
     if isinstance(tmp_dtype, MessageParsingError):
         return tmp_dtype
-    tmp_encoder = parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(
+    tmp_encoder = parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote_0_quote_png_quote_0_quote_compressed_segmentation_quote__endof_(
         value.get("encoder")
     )
     if isinstance(tmp_encoder, MessageParsingError):
         return tmp_encoder
+    tmp_sharding = parse_as_Union_of_PrecomputedChunksShardingDto0None_endof_(
+        value.get("sharding")
+    )
+    if isinstance(tmp_sharding, MessageParsingError):
+        return tmp_sharding
+    tmp_compressed_segmentation_block_size = (
+        parse_as_Union_of_Tuple_of_int0int0int_endof_0None_endof_(
+            value.get("compressed_segmentation_block_size")
+        )
+    )
+    if isinstance(tmp_compressed_segmentation_block_size, MessageParsingError):
+        return tmp_compressed_segmentation_block_size
     return PrecomputedChunksDataSourceDto(
         url=tmp_url,
         filesystem=tmp_filesystem,
@@ -821,6 +977,8 @@ def parse_as_PrecomputedChunksDataSourceDto(
         spatial_resolution=tmp_spatial_resolution,
         dtype=tmp_dtype,
         encoder=tmp_encoder,
+        sharding=tmp_sharding,
+        compressed_segmentation_block_size=tmp_compressed_segmentation_block_size,
     )
 
 
@@ -834,7 +992,9 @@ class PrecomputedChunksDataSourceDto(DataTransferObject):
     tile_shape: Shape5DDto
     spatial_resolution: Tuple[int, int, int]
     dtype: DtypeDto
-    encoder: Literal["raw", "jpeg"]
+    encoder: Literal["raw", "jpeg", "png", "compressed_segmentation"]
+    sharding: Optional[PrecomputedChunksShardingDto]
+    compressed_segmentation_block_size: Optional[Tuple[int, int, int]]
 
     def to_json_value(self) -> JsonObject:
         return {
@@ -852,6 +1012,10 @@ class PrecomputedChunksDataSourceDto(DataTransferObject):
             ),
             "dtype": self.dtype,
             "encoder": self.encoder,
+            "sharding": convert_to_json_value(self.sharding),
+            "compressed_segmentation_block_size": convert_to_json_value(
+                self.compressed_segmentation_block_size
+            ),
         }
 
     @classmethod
@@ -1261,6 +1425,162 @@ class N5XzCompressorDto(DataTransferObject):
         return parse_as_N5XzCompressorDto(value)
 
 
+def parse_as_N5BloscCompressorDto(
+    value: JsonValue,
+) -> "N5BloscCompressorDto | MessageParsingError":
+    from collections.abc import Mapping
+
+    if not isinstance(value, Mapping):
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as N5BloscCompressorDto"
+        )
+    if value.get("type") != "blosc":
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as N5BloscCompressorDto"
+        )
+    tmp_cname = parse_as_str(value.get("cname"))
+    if isinstance(tmp_cname, MessageParsingError):
+        return tmp_cname
+    tmp_clevel = parse_as_int(value.get("clevel"))
+    if isinstance(tmp_clevel, MessageParsingError):
+        return tmp_clevel
+    tmp_shuffle = parse_as_int(value.get("shuffle"))
+    if isinstance(tmp_shuffle, MessageParsingError):
+        return tmp_shuffle
+    tmp_blocksize = parse_as_int(value.get("blocksize"))
+    if isinstance(tmp_blocksize, MessageParsingError):
+        return tmp_blocksize
+    return N5BloscCompressorDto(
+        cname=tmp_cname,
+        clevel=tmp_clevel,
+        shuffle=tmp_shuffle,
+        blocksize=tmp_blocksize,
+    )
+
+
+@dataclass
+class N5BloscCompressorDto(DataTransferObject):
+    cname: str
+    clevel: int
+    shuffle: int
+    blocksize: int
+
+    @classmethod
+    def tag_key(cls) -> str:
+        return "type"
+
+    @classmethod
+    def tag_value(cls) -> str:
+        return "blosc"
+
+    def to_json_value(self) -> JsonObject:
+        return {
+            "type": "blosc",
+            "cname": self.cname,
+            "clevel": self.clevel,
+            "shuffle": self.shuffle,
+            "blocksize": self.blocksize,
+        }
+
+    @classmethod
+    def from_json_value(
+        cls, value: JsonValue
+    ) -> "N5BloscCompressorDto | MessageParsingError":
+        return parse_as_N5BloscCompressorDto(value)
+
+
+def parse_as_N5ZstdCompressorDto(
+    value: JsonValue,
+) -> "N5ZstdCompressorDto | MessageParsingError":
+    from collections.abc import Mapping
+
+    if not isinstance(value, Mapping):
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as N5ZstdCompressorDto"
+        )
+    if value.get("type") != "zstd":
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as N5ZstdCompressorDto"
+        )
+    tmp_level = parse_as_int(value.get("level"))
+    if isinstance(tmp_level, MessageParsingError):
+        return tmp_level
+    return N5ZstdCompressorDto(
+        level=tmp_level,
+    )
+
+
+@dataclass
+class N5ZstdCompressorDto(DataTransferObject):
+    level: int
+
+    @classmethod
+    def tag_key(cls) -> str:
+        return "type"
+
+    @classmethod
+    def tag_value(cls) -> str:
+        return "zstd"
+
+    def to_json_value(self) -> JsonObject:
+        return {
+            "type": "zstd",
+            "level": self.level,
+        }
+
+    @classmethod
+    def from_json_value(
+        cls, value: JsonValue
+    ) -> "N5ZstdCompressorDto | MessageParsingError":
+        return parse_as_N5ZstdCompressorDto(value)
+
+
+def parse_as_N5Lz4CompressorDto(
+    value: JsonValue,
+) -> "N5Lz4CompressorDto | MessageParsingError":
+    from collections.abc import Mapping
+
+    if not isinstance(value, Mapping):
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as N5Lz4CompressorDto"
+        )
+    if value.get("type") != "lz4":
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as N5Lz4CompressorDto"
+        )
+    tmp_blockSize = parse_as_int(value.get("blockSize"))
+    if isinstance(tmp_blockSize, MessageParsingError):
+        return tmp_blockSize
+    return N5Lz4CompressorDto(
+        blockSize=tmp_blockSize,
+    )
+
+
+@dataclass
+class N5Lz4CompressorDto(DataTransferObject):
+    blockSize: int
+
+    @classmethod
+    def tag_key(cls) -> str:
+        return "type"
+
+    @classmethod
+    def tag_value(cls) -> str:
+        return "lz4"
+
+    def to_json_value(self) -> JsonObject:
+        return {
+            "type": "lz4",
+            "blockSize": self.blockSize,
+        }
+
+    @classmethod
+    def from_json_value(
+        cls, value: JsonValue
+    ) -> "N5Lz4CompressorDto | MessageParsingError":
+        return parse_as_N5Lz4CompressorDto(value)
+
+
 def parse_as_N5RawCompressorDto(
     value: JsonValue,
 ) -> "N5RawCompressorDto | MessageParsingError":
@@ -1300,7 +1620,13 @@ class N5RawCompressorDto(DataTransferObject):
 
 
 N5CompressorDto = Union[
-    N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5RawCompressorDto
+    N5GzipCompressorDto,
+    N5Bzip2CompressorDto,
+    N5XzCompressorDto,
+    N5BloscCompressorDto,
+    N5ZstdCompressorDto,
+    N5Lz4CompressorDto,
+    N5RawCompressorDto,
 ]
 
 
@@ -1350,9 +1676,9 @@ def parse_as_Union_of_Tuple_of_str0_varlen__endof_0None_endof_(
     )
 
 
-def parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+def parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
     value: JsonValue,
-) -> "Union[N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5RawCompressorDto] | MessageParsingError":
+) -> "Union[N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5BloscCompressorDto, N5ZstdCompressorDto, N5Lz4CompressorDto, N5RawCompressorDto] | MessageParsingError":
     parsed_option_0 = parse_as_N5GzipCompressorDto(value)
     if not isinstance(parsed_option_0, MessageParsingError):
         return parsed_option_0
@@ -1362,11 +1688,20 @@ def parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto
     parsed_option_2 = parse_as_N5XzCompressorDto(value)
     if not isinstance(parsed_option_2, MessageParsingError):
         return parsed_option_2
-    parsed_option_3 = parse_as_N5RawCompressorDto(value)
+    parsed_option_3 = parse_as_N5BloscCompressorDto(value)
     if not isinstance(parsed_option_3, MessageParsingError):
         return parsed_option_3
+    parsed_option_4 = parse_as_N5ZstdCompressorDto(value)
+    if not isinstance(parsed_option_4, MessageParsingError):
+        return parsed_option_4
+    parsed_option_5 = parse_as_N5Lz4CompressorDto(value)
+    if not isinstance(parsed_option_5, MessageParsingError):
+        return parsed_option_5
+    parsed_option_6 = parse_as_N5RawCompressorDto(value)
+    if not isinstance(parsed_option_6, MessageParsingError):
+        return parsed_option_6
     return MessageParsingError(
-        f"Could not parse {json.dumps(value)} into Union[N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5RawCompressorDto]"
+        f"Could not parse {json.dumps(value)} into Union[N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5BloscCompressorDto, N5ZstdCompressorDto, N5Lz4CompressorDto, N5RawCompressorDto]"
     )
 
 
@@ -1395,7 +1730,7 @@ def parse_as_N5DatasetAttributesDto(
     )
     if isinstance(tmp_dataType, MessageParsingError):
         return tmp_dataType
-    tmp_compression = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+    tmp_compression = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
         value.get("compression")
     )
     if isinstance(tmp_compression, MessageParsingError):
@@ -1478,7 +1813,7 @@ def parse_as_N5DataSourceDto(
     )
     if isinstance(tmp_dtype, MessageParsingError):
         return tmp_dtype
-    tmp_compressor = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+    tmp_compressor = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
         value.get("compressor")
     )
     if isinstance(tmp_compressor, MessageParsingError):
@@ -1620,11 +1955,263 @@ class SkimageDataSourceDto(DataTransferObject):
         return parse_as_SkimageDataSourceDto(value)
 
 
+def parse_as_Literal_of_203_endof_(
+    value: JsonValue,
+) -> "Literal[2, 3] | MessageParsingError":
+    tmp_0 = parse_as_int(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == 2:
+        return tmp_0
+    tmp_1 = parse_as_int(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == 3:
+        return tmp_1
+    return MessageParsingError(f"Could not parse {value} as Literal[2, 3]")
+
+
+def parse_as_Literal_of__quote_little_quote_0_quote_big_quote__endof_(
+    value: JsonValue,
+) -> "Literal['little', 'big'] | MessageParsingError":
+    tmp_0 = parse_as_str(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "little":
+        return tmp_0
+    tmp_1 = parse_as_str(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "big":
+        return tmp_1
+    return MessageParsingError(f"Could not parse {value} as Literal['little', 'big']")
+
+
+def parse_as_Literal_of__quote_C_quote_0_quote_F_quote__endof_(
+    value: JsonValue,
+) -> "Literal['C', 'F'] | MessageParsingError":
+    tmp_0 = parse_as_str(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "C":
+        return tmp_0
+    tmp_1 = parse_as_str(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "F":
+        return tmp_1
+    return MessageParsingError(f"Could not parse {value} as Literal['C', 'F']")
+
+
+def parse_as_Literal_of__quote_default_quote_0_quote_v2_quote__endof_(
+    value: JsonValue,
+) -> "Literal['default', 'v2'] | MessageParsingError":
+    tmp_0 = parse_as_str(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "default":
+        return tmp_0
+    tmp_1 = parse_as_str(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "v2":
+        return tmp_1
+    return MessageParsingError(f"Could not parse {value} as Literal['default', 'v2']")
+
+
+def parse_as_bool(value: JsonValue) -> "bool | MessageParsingError":
+    if isinstance(value, bool):
+        return value
+
+    return MessageParsingError(f"Could not parse {json.dumps(value)} as bool")
+
+
+def parse_as_Union_of_Shape5DDto0None_endof_(
+    value: JsonValue,
+) -> "Union[Shape5DDto, None] | MessageParsingError":
+    parsed_option_0 = parse_as_Shape5DDto(value)
+    if not isinstance(parsed_option_0, MessageParsingError):
+        return parsed_option_0
+    parsed_option_1 = parse_as_None(value)
+    if not isinstance(parsed_option_1, MessageParsingError):
+        return parsed_option_1
+    return MessageParsingError(
+        f"Could not parse {json.dumps(value)} into Union[Shape5DDto, None]"
+    )
+
+
+def parse_as_Literal_of__quote_start_quote_0_quote_end_quote__endof_(
+    value: JsonValue,
+) -> "Literal['start', 'end'] | MessageParsingError":
+    tmp_0 = parse_as_str(value)
+    if not isinstance(tmp_0, MessageParsingError) and tmp_0 == "start":
+        return tmp_0
+    tmp_1 = parse_as_str(value)
+    if not isinstance(tmp_1, MessageParsingError) and tmp_1 == "end":
+        return tmp_1
+    return MessageParsingError(f"Could not parse {value} as Literal['start', 'end']")
+
+
+def parse_as_ZarrDataSourceDto(
+    value: JsonValue,
+) -> "ZarrDataSourceDto | MessageParsingError":
+    from collections.abc import Mapping
+
+    if not isinstance(value, Mapping):
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as ZarrDataSourceDto"
+        )
+    if value.get("__class__") != "ZarrDataSourceDto":
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as ZarrDataSourceDto"
+        )
+    tmp_url = parse_as_UrlDto(value.get("url"))
+    if isinstance(tmp_url, MessageParsingError):
+        return tmp_url
+    tmp_filesystem = parse_as_Union_of_OsfsDto0HttpFsDto0BucketFSDto0ZipFsDto_endof_(
+        value.get("filesystem")
+    )
+    if isinstance(tmp_filesystem, MessageParsingError):
+        return tmp_filesystem
+    tmp_path = parse_as_str(value.get("path"))
+    if isinstance(tmp_path, MessageParsingError):
+        return tmp_path
+    tmp_interval = parse_as_Interval5DDto(value.get("interval"))
+    if isinstance(tmp_interval, MessageParsingError):
+        return tmp_interval
+    tmp_tile_shape = parse_as_Shape5DDto(value.get("tile_shape"))
+    if isinstance(tmp_tile_shape, MessageParsingError):
+        return tmp_tile_shape
+    tmp_spatial_resolution = parse_as_Tuple_of_int0int0int_endof_(
+        value.get("spatial_resolution")
+    )
+    if isinstance(tmp_spatial_resolution, MessageParsingError):
+        return tmp_spatial_resolution
+    tmp_dtype = parse_as_Literal_of__quote_uint8_quote_0_quote_uint16_quote_0_quote_uint32_quote_0_quote_uint64_quote_0_quote_int64_quote_0_quote_float32_quote__endof_(
+        value.get("dtype")
+    )
+    if isinstance(tmp_dtype, MessageParsingError):
+        return tmp_dtype
+    tmp_c_axiskeys_on_disk = parse_as_str(value.get("c_axiskeys_on_disk"))
+    if isinstance(tmp_c_axiskeys_on_disk, MessageParsingError):
+        return tmp_c_axiskeys_on_disk
+    tmp_zarr_format = parse_as_Literal_of_203_endof_(value.get("zarr_format"))
+    if isinstance(tmp_zarr_format, MessageParsingError):
+        return tmp_zarr_format
+    tmp_compressor = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
+        value.get("compressor")
+    )
+    if isinstance(tmp_compressor, MessageParsingError):
+        return tmp_compressor
+    tmp_fill_value = parse_as_str(value.get("fill_value"))
+    if isinstance(tmp_fill_value, MessageParsingError):
+        return tmp_fill_value
+    tmp_endian = parse_as_Literal_of__quote_little_quote_0_quote_big_quote__endof_(
+        value.get("endian")
+    )
+    if isinstance(tmp_endian, MessageParsingError):
+        return tmp_endian
+    tmp_order = parse_as_Literal_of__quote_C_quote_0_quote_F_quote__endof_(
+        value.get("order")
+    )
+    if isinstance(tmp_order, MessageParsingError):
+        return tmp_order
+    tmp_chunk_key_encoding = (
+        parse_as_Literal_of__quote_default_quote_0_quote_v2_quote__endof_(
+            value.get("chunk_key_encoding")
+        )
+    )
+    if isinstance(tmp_chunk_key_encoding, MessageParsingError):
+        return tmp_chunk_key_encoding
+    tmp_dimension_separator = parse_as_str(value.get("dimension_separator"))
+    if isinstance(tmp_dimension_separator, MessageParsingError):
+        return tmp_dimension_separator
+    tmp_chunk_checksum = parse_as_bool(value.get("chunk_checksum"))
+    if isinstance(tmp_chunk_checksum, MessageParsingError):
+        return tmp_chunk_checksum
+    tmp_shard_shape = parse_as_Union_of_Shape5DDto0None_endof_(value.get("shard_shape"))
+    if isinstance(tmp_shard_shape, MessageParsingError):
+        return tmp_shard_shape
+    tmp_shard_index_location = (
+        parse_as_Literal_of__quote_start_quote_0_quote_end_quote__endof_(
+            value.get("shard_index_location")
+        )
+    )
+    if isinstance(tmp_shard_index_location, MessageParsingError):
+        return tmp_shard_index_location
+    tmp_shard_index_checksum = parse_as_bool(value.get("shard_index_checksum"))
+    if isinstance(tmp_shard_index_checksum, MessageParsingError):
+        return tmp_shard_index_checksum
+    return ZarrDataSourceDto(
+        url=tmp_url,
+        filesystem=tmp_filesystem,
+        path=tmp_path,
+        interval=tmp_interval,
+        tile_shape=tmp_tile_shape,
+        spatial_resolution=tmp_spatial_resolution,
+        dtype=tmp_dtype,
+        c_axiskeys_on_disk=tmp_c_axiskeys_on_disk,
+        zarr_format=tmp_zarr_format,
+        compressor=tmp_compressor,
+        fill_value=tmp_fill_value,
+        endian=tmp_endian,
+        order=tmp_order,
+        chunk_key_encoding=tmp_chunk_key_encoding,
+        dimension_separator=tmp_dimension_separator,
+        chunk_checksum=tmp_chunk_checksum,
+        shard_shape=tmp_shard_shape,
+        shard_index_location=tmp_shard_index_location,
+        shard_index_checksum=tmp_shard_index_checksum,
+    )
+
+
+@dataclass
+class ZarrDataSourceDto(DataTransferObject):
+    url: UrlDto
+    filesystem: FsDto
+    path: str
+    interval: Interval5DDto
+    tile_shape: Shape5DDto
+    spatial_resolution: Tuple[int, int, int]
+    dtype: DtypeDto
+    c_axiskeys_on_disk: str
+    zarr_format: Literal[2, 3]
+    compressor: N5CompressorDto
+    fill_value: str
+    endian: Literal["little", "big"]
+    order: Literal["C", "F"]
+    chunk_key_encoding: Literal["default", "v2"]
+    dimension_separator: str
+    chunk_checksum: bool
+    shard_shape: Optional[Shape5DDto]
+    shard_index_location: Literal["start", "end"]
+    shard_index_checksum: bool
+
+    def to_json_value(self) -> JsonObject:
+        return {
+            "__class__": "ZarrDataSourceDto",
+            "url": self.url.to_json_value(),
+            "filesystem": convert_to_json_value(self.filesystem),
+            "path": self.path,
+            "interval": self.interval.to_json_value(),
+            "tile_shape": self.tile_shape.to_json_value(),
+            "spatial_resolution": (
+                self.spatial_resolution[0],
+                self.spatial_resolution[1],
+                self.spatial_resolution[2],
+            ),
+            "dtype": self.dtype,
+            "c_axiskeys_on_disk": self.c_axiskeys_on_disk,
+            "zarr_format": self.zarr_format,
+            "compressor": convert_to_json_value(self.compressor),
+            "fill_value": self.fill_value,
+            "endian": self.endian,
+            "order": self.order,
+            "chunk_key_encoding": self.chunk_key_encoding,
+            "dimension_separator": self.dimension_separator,
+            "chunk_checksum": self.chunk_checksum,
+            "shard_shape": convert_to_json_value(self.shard_shape),
+            "shard_index_location": self.shard_index_location,
+            "shard_index_checksum": self.shard_index_checksum,
+        }
+
+    @classmethod
+    def from_json_value(
+        cls, value: JsonValue
+    ) -> "ZarrDataSourceDto | MessageParsingError":
+        return parse_as_ZarrDataSourceDto(value)
+
+
 FsDataSourceDto = Union[
     PrecomputedChunksDataSourceDto,
     N5DataSourceDto,
     SkimageDataSourceDto,
     DziLevelDataSourceDto,
+    ZarrDataSourceDto,
 ]
 
 
@@ -1666,11 +2253,26 @@ def parse_as_PrecomputedChunksSinkDto(
     tmp_resolution = parse_as_Tuple_of_int0int0int_endof_(value.get("resolution"))
     if isinstance(tmp_resolution, MessageParsingError):
         return tmp_resolution
-    tmp_encoding = parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote__endof_(
+    tmp_encoding = parse_as_Literal_of__quote_raw_quote_0_quote_jpeg_quote_0_quote_png_quote_0_quote_compressed_segmentation_quote__endof_(
         value.get("encoding")
     )
     if isinstance(tmp_encoding, MessageParsingError):
         return tmp_encoding
+    tmp_sharding = parse_as_Union_of_PrecomputedChunksShardingDto0None_endof_(
+        value.get("sharding")
+    )
+    if isinstance(tmp_sharding, MessageParsingError):
+        return tmp_sharding
+    tmp_compressed_segmentation_block_size = (
+        parse_as_Union_of_Tuple_of_int0int0int_endof_0None_endof_(
+            value.get("compressed_segmentation_block_size")
+        )
+    )
+    if isinstance(tmp_compressed_segmentation_block_size, MessageParsingError):
+        return tmp_compressed_segmentation_block_size
+    tmp_gzip_chunks = parse_as_bool(value.get("gzip_chunks"))
+    if isinstance(tmp_gzip_chunks, MessageParsingError):
+        return tmp_gzip_chunks
     return PrecomputedChunksSinkDto(
         filesystem=tmp_filesystem,
         path=tmp_path,
@@ -1680,6 +2282,9 @@ def parse_as_PrecomputedChunksSinkDto(
         scale_key=tmp_scale_key,
         resolution=tmp_resolution,
         encoding=tmp_encoding,
+        sharding=tmp_sharding,
+        compressed_segmentation_block_size=tmp_compressed_segmentation_block_size,
+        gzip_chunks=tmp_gzip_chunks,
     )
 
 
@@ -1692,7 +2297,10 @@ class PrecomputedChunksSinkDto(DataTransferObject):
     dtype: DtypeDto
     scale_key: str  # fixme?
     resolution: Tuple[int, int, int]
-    encoding: Literal["raw", "jpeg"]
+    encoding: Literal["raw", "jpeg", "png", "compressed_segmentation"]
+    sharding: Optional[PrecomputedChunksShardingDto]
+    compressed_segmentation_block_size: Optional[Tuple[int, int, int]]
+    gzip_chunks: bool
 
     def to_json_value(self) -> JsonObject:
         return {
@@ -1709,6 +2317,11 @@ class PrecomputedChunksSinkDto(DataTransferObject):
                 self.resolution[2],
             ),
             "encoding": self.encoding,
+            "sharding": convert_to_json_value(self.sharding),
+            "compressed_segmentation_block_size": convert_to_json_value(
+                self.compressed_segmentation_block_size
+            ),
+            "gzip_chunks": self.gzip_chunks,
         }
 
     @classmethod
@@ -1756,7 +2369,7 @@ def parse_as_N5DataSinkDto(value: JsonValue) -> "N5DataSinkDto | MessageParsingE
     )
     if isinstance(tmp_dtype, MessageParsingError):
         return tmp_dtype
-    tmp_compressor = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5RawCompressorDto_endof_(
+    tmp_compressor = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
         value.get("compressor")
     )
     if isinstance(tmp_compressor, MessageParsingError):
@@ -1806,12 +2419,118 @@ class N5DataSinkDto(DataTransferObject):
         return parse_as_N5DataSinkDto(value)
 
 
-DataSinkDto = Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto]
+def parse_as_ZarrDataSinkDto(
+    value: JsonValue,
+) -> "ZarrDataSinkDto | MessageParsingError":
+    from collections.abc import Mapping
+
+    if not isinstance(value, Mapping):
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as ZarrDataSinkDto"
+        )
+    if value.get("__class__") != "ZarrDataSinkDto":
+        return MessageParsingError(
+            f"Could not parse {json.dumps(value)} as ZarrDataSinkDto"
+        )
+    tmp_filesystem = parse_as_Union_of_OsfsDto0HttpFsDto0BucketFSDto0ZipFsDto_endof_(
+        value.get("filesystem")
+    )
+    if isinstance(tmp_filesystem, MessageParsingError):
+        return tmp_filesystem
+    tmp_path = parse_as_str(value.get("path"))
+    if isinstance(tmp_path, MessageParsingError):
+        return tmp_path
+    tmp_interval = parse_as_Interval5DDto(value.get("interval"))
+    if isinstance(tmp_interval, MessageParsingError):
+        return tmp_interval
+    tmp_tile_shape = parse_as_Shape5DDto(value.get("tile_shape"))
+    if isinstance(tmp_tile_shape, MessageParsingError):
+        return tmp_tile_shape
+    tmp_shard_shape = parse_as_Union_of_Shape5DDto0None_endof_(value.get("shard_shape"))
+    if isinstance(tmp_shard_shape, MessageParsingError):
+        return tmp_shard_shape
+    tmp_spatial_resolution = parse_as_Tuple_of_int0int0int_endof_(
+        value.get("spatial_resolution")
+    )
+    if isinstance(tmp_spatial_resolution, MessageParsingError):
+        return tmp_spatial_resolution
+    tmp_c_axiskeys = parse_as_str(value.get("c_axiskeys"))
+    if isinstance(tmp_c_axiskeys, MessageParsingError):
+        return tmp_c_axiskeys
+    tmp_dtype = parse_as_Literal_of__quote_uint8_quote_0_quote_uint16_quote_0_quote_uint32_quote_0_quote_uint64_quote_0_quote_int64_quote_0_quote_float32_quote__endof_(
+        value.get("dtype")
+    )
+    if isinstance(tmp_dtype, MessageParsingError):
+        return tmp_dtype
+    tmp_compressor = parse_as_Union_of_N5GzipCompressorDto0N5Bzip2CompressorDto0N5XzCompressorDto0N5BloscCompressorDto0N5ZstdCompressorDto0N5Lz4CompressorDto0N5RawCompressorDto_endof_(
+        value.get("compressor")
+    )
+    if isinstance(tmp_compressor, MessageParsingError):
+        return tmp_compressor
+    tmp_zarr_format = parse_as_Literal_of_203_endof_(value.get("zarr_format"))
+    if isinstance(tmp_zarr_format, MessageParsingError):
+        return tmp_zarr_format
+    return ZarrDataSinkDto(
+        filesystem=tmp_filesystem,
+        path=tmp_path,
+        interval=tmp_interval,
+        tile_shape=tmp_tile_shape,
+        shard_shape=tmp_shard_shape,
+        spatial_resolution=tmp_spatial_resolution,
+        c_axiskeys=tmp_c_axiskeys,
+        dtype=tmp_dtype,
+        compressor=tmp_compressor,
+        zarr_format=tmp_zarr_format,
+    )
+
+
+@dataclass
+class ZarrDataSinkDto(DataTransferObject):
+    filesystem: FsDto
+    path: str
+    interval: Interval5DDto
+    tile_shape: Shape5DDto
+    shard_shape: Optional[Shape5DDto]
+    spatial_resolution: Tuple[int, int, int]
+    c_axiskeys: str
+    dtype: DtypeDto
+    compressor: N5CompressorDto
+    zarr_format: Literal[2, 3]
 
+    def to_json_value(self) -> JsonObject:
+        return {
+            "__class__": "ZarrDataSinkDto",
+            "filesystem": convert_to_json_value(self.filesystem),
+            "path": self.path,
+            "interval": self.interval.to_json_value(),
+            "tile_shape": self.tile_shape.to_json_value(),
+            "shard_shape": convert_to_json_value(self.shard_shape),
+            "spatial_resolution": (
+                self.spatial_resolution[0],
+                self.spatial_resolution[1],
+                self.spatial_resolution[2],
+            ),
+            "c_axiskeys": self.c_axiskeys,
+            "dtype": self.dtype,
+            "compressor": convert_to_json_value(self.compressor),
+            "zarr_format": self.zarr_format,
+        }
 
-def parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    @classmethod
+    def from_json_value(
+        cls, value: JsonValue
+    ) -> "ZarrDataSinkDto | MessageParsingError":
+        return parse_as_ZarrDataSinkDto(value)
+
+
+DataSinkDto = Union[
+    PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, ZarrDataSinkDto
+]
+
+
+def parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
     value: JsonValue,
-) -> "Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto] | MessageParsingError":
+) -> "Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto] | MessageParsingError":
     parsed_option_0 = parse_as_PrecomputedChunksDataSourceDto(value)
     if not isinstance(parsed_option_0, MessageParsingError):
         return parsed_option_0
@@ -1824,8 +2543,11 @@ def parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageData
     parsed_option_3 = parse_as_DziLevelDataSourceDto(value)
     if not isinstance(parsed_option_3, MessageParsingError):
         return parsed_option_3
+    parsed_option_4 = parse_as_ZarrDataSourceDto(value)
+    if not isinstance(parsed_option_4, MessageParsingError):
+        return parsed_option_4
     return MessageParsingError(
-        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto]"
+        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto]"
     )
 
 
@@ -1858,7 +2580,7 @@ def parse_as_PixelAnnotationDto(
         return MessageParsingError(
             f"Could not parse {json.dumps(value)} as PixelAnnotationDto"
         )
-    tmp_raw_data = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    tmp_raw_data = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
         value.get("raw_data")
     )
     if isinstance(tmp_raw_data, MessageParsingError):
@@ -1934,13 +2656,6 @@ class RpcErrorDto(DataTransferObject):
         return parse_as_RpcErrorDto(value)
 
 
-def parse_as_bool(value: JsonValue) -> "bool | MessageParsingError":
-    if isinstance(value, bool):
-        return value
-
-    return MessageParsingError(f"Could not parse {json.dumps(value)} as bool")
-
-
 def parse_as_SetLiveUpdateParams(
     value: JsonValue,
 ) -> "SetLiveUpdateParams | MessageParsingError":
@@ -2572,9 +3287,9 @@ class JobDto(DataTransferObject):
         return parse_as_JobDto(value)
 
 
-def parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
+def parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
     value: JsonValue,
-) -> "Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto] | MessageParsingError":
+) -> "Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, ZarrDataSinkDto] | MessageParsingError":
     parsed_option_0 = parse_as_PrecomputedChunksSinkDto(value)
     if not isinstance(parsed_option_0, MessageParsingError):
         return parsed_option_0
@@ -2584,8 +3299,11 @@ def parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_end
     parsed_option_2 = parse_as_DziLevelSinkDto(value)
     if not isinstance(parsed_option_2, MessageParsingError):
         return parsed_option_2
+    parsed_option_3 = parse_as_ZarrDataSinkDto(value)
+    if not isinstance(parsed_option_3, MessageParsingError):
+        return parsed_option_3
     return MessageParsingError(
-        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto]"
+        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, ZarrDataSinkDto]"
     )
 
 
@@ -2614,10 +3332,8 @@ def parse_as_ExportJobDto(value: JsonValue) -> "ExportJobDto | MessageParsingErr
     )
     if isinstance(tmp_status, MessageParsingError):
         return tmp_status
-    tmp_datasink = (
-        parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
-            value.get("datasink")
-        )
+    tmp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
+        value.get("datasink")
     )
     if isinstance(tmp_datasink, MessageParsingError):
         return tmp_datasink
@@ -2676,10 +3392,8 @@ def parse_as_OpenDatasinkJobDto(
     )
     if isinstance(tmp_status, MessageParsingError):
         return tmp_status
-    tmp_datasink = (
-        parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
-            value.get("datasink")
-        )
+    tmp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
+        value.get("datasink")
     )
     if isinstance(tmp_datasink, MessageParsingError):
         return tmp_datasink
@@ -2836,9 +3550,9 @@ class ZipDirectoryJobDto(JobDto):
         return parse_as_ZipDirectoryJobDto(value)
 
 
-def parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0None_endof_(
+def parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto0None_endof_(
     value: JsonValue,
-) -> "Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, None] | MessageParsingError":
+) -> "Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, ZarrDataSinkDto, None] | MessageParsingError":
     parsed_option_0 = parse_as_PrecomputedChunksSinkDto(value)
     if not isinstance(parsed_option_0, MessageParsingError):
         return parsed_option_0
@@ -2848,11 +3562,14 @@ def parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0Non
     parsed_option_2 = parse_as_DziLevelSinkDto(value)
     if not isinstance(parsed_option_2, MessageParsingError):
         return parsed_option_2
-    parsed_option_3 = parse_as_None(value)
+    parsed_option_3 = parse_as_ZarrDataSinkDto(value)
     if not isinstance(parsed_option_3, MessageParsingError):
         return parsed_option_3
+    parsed_option_4 = parse_as_None(value)
+    if not isinstance(parsed_option_4, MessageParsingError):
+        return parsed_option_4
     return MessageParsingError(
-        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, None]"
+        f"Could not parse {json.dumps(value)} into Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, ZarrDataSinkDto, None]"
     )
 
 
@@ -2886,7 +3603,7 @@ def parse_as_TransferFileJobDto(
     tmp_target_url = parse_as_UrlDto(value.get("target_url"))
     if isinstance(tmp_target_url, MessageParsingError):
         return tmp_target_url
-    tmp_result_sink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0None_endof_(
+    tmp_result_sink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto0None_endof_(
         value.get("result_sink")
     )
     if isinstance(tmp_result_sink, MessageParsingError):
@@ -3017,12 +3734,12 @@ def parse_as_Union_of_Tuple_of_LabelHeaderDto0_varlen__endof_0None_endof_(
     )
 
 
-def parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+def parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
     value: JsonValue,
-) -> "Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto], ...] | MessageParsingError":
+) -> "Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto], ...] | MessageParsingError":
     if not isinstance(value, (list, tuple)):
         return MessageParsingError(
-            f"Could not parse Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto], ...] from {json.dumps(value)}"
+            f"Could not parse Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto], ...] from {json.dumps(value)}"
         )
     items: List[
         Union[
@@ -3030,10 +3747,11 @@ def parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0Sk
             N5DataSourceDto,
             SkimageDataSourceDto,
             DziLevelDataSourceDto,
+            ZarrDataSourceDto,
         ]
     ] = []
     for item in value:
-        parsed = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+        parsed = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
             item
         )
         if isinstance(parsed, MessageParsingError):
@@ -3042,10 +3760,10 @@ def parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0Sk
     return tuple(items)
 
 
-def parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_0None_endof_(
+def parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_0None_endof_(
     value: JsonValue,
-) -> "Union[Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto], ...], None] | MessageParsingError":
-    parsed_option_0 = parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+) -> "Union[Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto], ...], None] | MessageParsingError":
+    parsed_option_0 = parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
         value
     )
     if not isinstance(parsed_option_0, MessageParsingError):
@@ -3054,7 +3772,7 @@ def parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSou
     if not isinstance(parsed_option_1, MessageParsingError):
         return parsed_option_1
     return MessageParsingError(
-        f"Could not parse {json.dumps(value)} into Union[Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto], ...], None]"
+        f"Could not parse {json.dumps(value)} into Union[Tuple[Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto], ...], None]"
     )
 
 
@@ -3083,7 +3801,7 @@ def parse_as_PixelClassificationExportAppletStateDto(
     )
     if isinstance(tmp_populated_labels, MessageParsingError):
         return tmp_populated_labels
-    tmp_datasource_suggestions = parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_0None_endof_(
+    tmp_datasource_suggestions = parse_as_Union_of_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_0None_endof_(
         value.get("datasource_suggestions")
     )
     if isinstance(tmp_datasource_suggestions, MessageParsingError):
@@ -4009,15 +4727,13 @@ def parse_as_StartPixelProbabilitiesExportJobParamsDto(
         return MessageParsingError(
             f"Could not parse {json.dumps(value)} as StartPixelProbabilitiesExportJobParamsDto"
         )
-    tmp_datasource = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    tmp_datasource = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
         value.get("datasource")
     )
     if isinstance(tmp_datasource, MessageParsingError):
         return tmp_datasource
-    tmp_datasink = (
-        parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
-            value.get("datasink")
-        )
+    tmp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
+        value.get("datasink")
     )
     if isinstance(tmp_datasink, MessageParsingError):
         return tmp_datasink
@@ -4059,15 +4775,13 @@ def parse_as_StartSimpleSegmentationExportJobParamsDto(
         return MessageParsingError(
             f"Could not parse {json.dumps(value)} as StartSimpleSegmentationExportJobParamsDto"
         )
-    tmp_datasource = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(
+    tmp_datasource = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(
         value.get("datasource")
     )
     if isinstance(tmp_datasource, MessageParsingError):
         return tmp_datasource
-    tmp_datasink = (
-        parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto_endof_(
-            value.get("datasink")
-        )
+    tmp_datasink = parse_as_Union_of_PrecomputedChunksSinkDto0N5DataSinkDto0DziLevelSinkDto0ZarrDataSinkDto_endof_(
+        value.get("datasink")
     )
     if isinstance(tmp_datasink, MessageParsingError):
         return tmp_datasink
@@ -4245,7 +4959,7 @@ def parse_as_GetDatasourcesFromUrlResponseDto(
         return MessageParsingError(
             f"Could not parse {json.dumps(value)} as GetDatasourcesFromUrlResponseDto"
         )
-    tmp_datasources = parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+    tmp_datasources = parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
         value.get("datasources")
     )
     if isinstance(tmp_datasources, MessageParsingError):
@@ -4371,7 +5085,7 @@ def parse_as_CheckDatasourceCompatibilityParams(
         return MessageParsingError(
             f"Could not parse {json.dumps(value)} as CheckDatasourceCompatibilityParams"
         )
-    tmp_datasources = parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_0_varlen__endof_(
+    tmp_datasources = parse_as_Tuple_of_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_0_varlen__endof_(
         value.get("datasources")
     )
     if isinstance(tmp_datasources, MessageParsingError):
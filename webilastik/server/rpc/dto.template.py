@@ -27,7 +27,7 @@ Protocol = Literal["http", "https", "file", "memory"]
 
 @dataclass
 class UrlDto(DataTransferObject):
-    datascheme: Optional[Literal["precomputed", "n5", "deepzoom"]]
+    datascheme: Optional[Literal["precomputed", "n5", "deepzoom", "zarr"]]
     protocol: Literal["http", "https", "file", "memory"]
     hostname: str
     port: Optional[int]
@@ -100,6 +100,15 @@ DtypeDto = Literal["uint8", "uint16", "uint32", "uint64", "int64", "float32"]
 def dtype_to_dto(dtype: "np.dtype[Any]") -> DtypeDto:
     return cast(DtypeDto, str(dtype))
 
+@dataclass
+class PrecomputedChunksShardingDto(DataTransferObject):
+    preshift_bits: int
+    hash: Literal["identity", "murmurhash3_x86_128"]
+    minishard_bits: int
+    shard_bits: int
+    minishard_index_encoding: Literal["raw", "gzip"]
+    data_encoding: Literal["raw", "gzip"]
+
 @dataclass
 class PrecomputedChunksDataSourceDto(DataTransferObject):
     url: UrlDto
@@ -110,7 +119,9 @@ class PrecomputedChunksDataSourceDto(DataTransferObject):
     tile_shape: Shape5DDto
     spatial_resolution: Tuple[int, int, int]
     dtype: DtypeDto
-    encoder: Literal["raw", "jpeg"]
+    encoder: Literal["raw", "jpeg", "png", "compressed_segmentation"]
+    sharding: Optional[PrecomputedChunksShardingDto]
+    compressed_segmentation_block_size: Optional[Tuple[int, int, int]]
 
 #####################################################
 
@@ -183,6 +194,45 @@ class N5XzCompressorDto(DataTransferObject):
     def tag_value(cls) -> str:
         return "xz"
 
+@dataclass
+class N5BloscCompressorDto(DataTransferObject):
+    cname: str
+    clevel: int
+    shuffle: int
+    blocksize: int
+
+    @classmethod
+    def tag_key(cls) -> str:
+        return "type"
+
+    @classmethod
+    def tag_value(cls) -> str:
+        return "blosc"
+
+@dataclass
+class N5ZstdCompressorDto(DataTransferObject):
+    level: int
+
+    @classmethod
+    def tag_key(cls) -> str:
+        return "type"
+
+    @classmethod
+    def tag_value(cls) -> str:
+        return "zstd"
+
+@dataclass
+class N5Lz4CompressorDto(DataTransferObject):
+    blockSize: int
+
+    @classmethod
+    def tag_key(cls) -> str:
+        return "type"
+
+    @classmethod
+    def tag_value(cls) -> str:
+        return "lz4"
+
 @dataclass
 class N5RawCompressorDto(DataTransferObject):
     @classmethod
@@ -193,7 +243,10 @@ class N5RawCompressorDto(DataTransferObject):
     def tag_value(cls) -> str:
         return "raw"
 
-N5CompressorDto = Union[N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5RawCompressorDto]
+N5CompressorDto = Union[
+    N5GzipCompressorDto, N5Bzip2CompressorDto, N5XzCompressorDto, N5BloscCompressorDto, N5ZstdCompressorDto, N5Lz4CompressorDto,
+    N5RawCompressorDto
+]
 
 @dataclass
 class N5DatasetAttributesDto(DataTransferObject):
@@ -230,8 +283,30 @@ class SkimageDataSourceDto(DataTransferObject):
     spatial_resolution: Tuple[int, int, int]
     dtype: DtypeDto
 
+@dataclass
+class ZarrDataSourceDto(DataTransferObject):
+    url: UrlDto
+    filesystem: FsDto
+    path: str
+    interval: Interval5DDto
+    tile_shape: Shape5DDto
+    spatial_resolution: Tuple[int, int, int]
+    dtype: DtypeDto
+    c_axiskeys_on_disk: str
+    zarr_format: Literal[2, 3]
+    compressor: N5CompressorDto
+    fill_value: str
+    endian: Literal["little", "big"]
+    order: Literal["C", "F"]
+    chunk_key_encoding: Literal["default", "v2"]
+    dimension_separator: str
+    chunk_checksum: bool
+    shard_shape: Optional[Shape5DDto]
+    shard_index_location: Literal["start", "end"]
+    shard_index_checksum: bool
+
 
-FsDataSourceDto = Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto]
+FsDataSourceDto = Union[PrecomputedChunksDataSourceDto, N5DataSourceDto, SkimageDataSourceDto, DziLevelDataSourceDto, ZarrDataSourceDto]
 
 ##################################################333
 
@@ -244,7 +319,10 @@ class PrecomputedChunksSinkDto(DataTransferObject):
     dtype: DtypeDto
     scale_key: str #fixme?
     resolution: Tuple[int, int, int]
-    encoding: Literal["raw", "jpeg"]
+    encoding: Literal["raw", "jpeg", "png", "compressed_segmentation"]
+    sharding: Optional[PrecomputedChunksShardingDto]
+    compressed_segmentation_block_size: Optional[Tuple[int, int, int]]
+    gzip_chunks: bool
 
 #################################################
 
@@ -259,7 +337,20 @@ class N5DataSinkDto(DataTransferObject):
     dtype: DtypeDto
     compressor: N5CompressorDto
 
-DataSinkDto = Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto]
+@dataclass
+class ZarrDataSinkDto(DataTransferObject):
+    filesystem: FsDto
+    path: str
+    interval: Interval5DDto
+    tile_shape: Shape5DDto
+    shard_shape: Optional[Shape5DDto]
+    spatial_resolution: Tuple[int, int, int]
+    c_axiskeys: str
+    dtype: DtypeDto
+    compressor: N5CompressorDto
+    zarr_format: Literal[2, 3]
+
+DataSinkDto = Union[PrecomputedChunksSinkDto, N5DataSinkDto, DziLevelSinkDto, ZarrDataSinkDto]
 
 #################################################################
 
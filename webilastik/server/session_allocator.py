@@ -3,6 +3,7 @@
 
 from functools import wraps
 import getpass
+import hashlib
 import json
 from typing import Any, Callable, Coroutine, Dict, List, Literal, Optional, Set
 from pathlib import Path, PurePosixPath
@@ -66,6 +67,28 @@ def uncachable_json_response(payload: JsonValue, *, status: int) -> web.Response
         }
     )
 
+def make_etag(*parts: Any) -> str:
+    """A strong ETag (quotes included) derived from the repr of 'parts'"""
+    return '"' + hashlib.blake2b(repr(parts).encode("utf8"), digest_size=16).hexdigest() + '"'
+
+def etag_matches(request: web.Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # weak validators from the client still match a strong ETag in If-None-Match (weak comparison, RFC 9110 13.1.2)
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def immutable_response_headers(etag: str) -> Dict[str, str]:
+    """Headers for responses whose contents never change for their URL, like predictions of a given classifier generation"""
+    return {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+
+def not_modified_response(etag: str) -> web.Response:
+    return web.Response(status=304, headers=immutable_response_headers(etag))
+
 async def try_get_user_token_from_request(
     request: web.Request, http_client_session: ClientSession, oidc_client: OidcClient
 ) -> "AccessToken | AccessTokenExpired | AccessTokenInvalid | CantFetchHbpIamKey | EbrainsCommunicationFailure":
@@ -70,6 +70,14 @@ class SimpleSegmenterDataSource(DataSource):
     def __hash__(self) -> int:
         return hash((self.upstream_source, self.segmenter))
 
+    def _get_content_key_parts(self) -> Tuple[Any, ...]:
+        return (
+            *super()._get_content_key_parts(),
+            self.upstream_source,
+            self.segmenter.channel_index,
+            self.segmenter.preprocessor,
+        )
+
     def __eq__(self, other: object) -> bool:
         return (
             isinstance(other, SimpleSegmenterDataSource) and
@@ -3,9 +3,8 @@
 from dataclasses import dataclass
 import math
 from pathlib import PurePosixPath
-from typing import Literal, cast, Any, Sequence, TypeVar, Iterable, Generic
+from typing import ClassVar, Literal, cast, Any, Sequence, TypeVar, Iterable, Generic
 from functools import partial
-from zipfile import ZipFile, ZIP_STORED
 
 from ndstructs.point5D import Interval5D, Point5D
 from ndstructs.array5D import Array5D
@@ -18,7 +17,7 @@ from webilastik.datasink.deep_zoom_sink import DziLevelSink
 from webilastik.datasource.deep_zoom_image import DziImageElement
 from webilastik.datasource.deep_zoom_image import DziImageElement
 from webilastik.filesystem import FsIoException, FsFileNotFoundException, IFilesystem
-from webilastik.filesystem.os_fs import OsFs
+from webilastik.filesystem.zip_fs import ZipFs
 from webilastik.operator import Operator
 from webilastik.scheduling.job import IteratingJob, JobProgressCallback, SimpleJob
 from webilastik.server.rpc.dto import ExportJobDto, TransferFileJobDto, ZipDirectoryJobDto, CreateDziPyramidJobDto
@@ -170,11 +169,14 @@ class CreateDziPyramid(SimpleJob[Sequence[DziLevelSink], Exception]):
 
 
 class ZipDirectoryJob(SimpleJob[None, Exception]):
+    """Zips a directory straight into an archive on 'output_fs', streaming it out as it is written"""
+    READ_BATCH_SIZE: ClassVar[int] = 32
+
     def __init__(
         self,
         *,
         name: str,
-        output_fs: OsFs,
+        output_fs: IFilesystem,
         output_path: PurePosixPath,
         input_fs: IFilesystem,
         input_directory: PurePosixPath,
@@ -198,32 +200,26 @@ class ZipDirectoryJob(SimpleJob[None, Exception]):
         *,
         input_directory: PurePosixPath,
         input_fs: IFilesystem,
-        output_fs: OsFs,
+        output_fs: IFilesystem,
         output_path: PurePosixPath,
         delete_source: bool,
     ) -> "None | Exception":
-        try:
-            from pathlib import Path
-            zip_file_path = Path(output_fs.resolve_path(output_path))
-            zip_file_path.parent.mkdir(parents=True)
-            zip_file = ZipFile(output_fs.resolve_path(output_path), mode="w", compresslevel=ZIP_STORED)
-        except Exception as e:
-            return FsIoException(e)
+        zip_fs = ZipFs.create_writable(zip_file_fs=output_fs, zip_file_path=output_path)
 
         def write_to_zip(dir_path: PurePosixPath) -> "None | FsIoException | FsFileNotFoundException":
             dir_contents_result = input_fs.list_contents(dir_path)
             if isinstance(dir_contents_result, Exception):
                 return dir_contents_result
 
-            for file_path in dir_contents_result.files:
-                data_result = input_fs.read_file(file_path)
-                if isinstance(data_result, Exception):
-                    return data_result
-                arcname = file_path.relative_to(input_directory)
-                try:
-                    zip_file.writestr(arcname.as_posix(), data_result)
-                except Exception as e:
-                    return FsIoException(e)
+            # files are read in batches so the filesystem can fetch them concurrently without loading whole dirs into memory
+            for batch_start in range(0, len(dir_contents_result.files), cls.READ_BATCH_SIZE):
+                batch = dir_contents_result.files[batch_start : batch_start + cls.READ_BATCH_SIZE]
+                for file_path, data_result in zip(batch, input_fs.read_files([(path, 0, None) for path in batch])):
+                    if isinstance(data_result, Exception):
+                        return data_result
+                    writing_result = zip_fs.create_file(path=file_path.relative_to(input_directory), contents=data_result)
+                    if isinstance(writing_result, Exception):
+                        return writing_result
 
             for subdir_path in dir_contents_result.directories:
                 writing_result = write_to_zip(subdir_path)
@@ -232,12 +228,12 @@ class ZipDirectoryJob(SimpleJob[None, Exception]):
 
         zipping_result = write_to_zip(input_directory)
         if isinstance(zipping_result, Exception):
+            # closing would publish an archive that is missing some of the files
+            _ = zip_fs.abort()
             return zipping_result
-
-        try:
-            zip_file.close()
-        except Exception as e:
-            return FsIoException(e)
+        closing_result = zip_fs.close()
+        if isinstance(closing_result, Exception):
+            return closing_result
 
         if delete_source:
             _ = input_fs.delete(input_directory)
@@ -11,7 +11,8 @@ import numpy as np
 from webilastik.ui.applet  import Applet, AppletOutput, CascadeOk, CascadeResult, UserPrompt, applet_output, cascade
 from webilastik.annotations.annotation import Annotation, Color
 from webilastik.features.ilp_filter import IlpFilter, IlpFilterCollection
-from webilastik.classifiers.pixel_classifier import VigraPixelClassifier
+from webilastik.classifiers.pixel_classifier import Predictions, VigraPixelClassifier
+from webilastik.caching import GenerationalCache, get_max_bytes_from_env
 from webilastik.ui.usage_error import UsageError
 
 
@@ -55,6 +56,8 @@ class _State:
 
 Interaction = Callable[[], Optional[UsageError]]
 
+DEFAULT_PREDICTION_CACHE_MAX_BYTES = 256 * 1024 ** 2
+
 class PixelClassificationApplet(Applet):
     def __init__(
         self,
@@ -76,17 +79,39 @@ class PixelClassificationApplet(Applet):
             classifier=pixel_classifier,
             generation=0,
         )
+        self._last_generation = 0
+        # predictions are only valid for the classifier of a single generation
+        self.prediction_cache: "GenerationalCache[Predictions]" = GenerationalCache(
+            max_bytes=get_max_bytes_from_env("PREDICTION_CACHE_MAX_BYTES", default=DEFAULT_PREDICTION_CACHE_MAX_BYTES)
+        )
 
         self.lock = threading.Lock()
         super().__init__(name=name)
 
+    def _set_state(self, state: _State) -> None:
+        self._state = state
+        self._last_generation = max(self._last_generation, state.generation)
+        self.prediction_cache.set_generation(state.generation)
+
+    def _update_state(
+        self,
+        *,
+        classifier: "Future[Classifier | ValueError] | Classifier | None | BaseException",
+        live_update: Optional[bool] = None,
+    ) -> _State:
+        # generations are never reused, not even after restoring a snapshot, so that a generation number
+        # always refers to the same classifier (e.g. in prediction URLs)
+        new_state = self._state.updated_with(classifier=classifier, live_update=live_update, generation=self._last_generation + 1)
+        self._set_state(new_state)
+        return new_state
+
     def take_snapshot(self) -> _State:
         with self.lock:
             return self._state
 
     def restore_snaphot(self, snapshot: _State) -> None:
         with self.lock:
-            self._state = snapshot
+            self._set_state(snapshot)
 
     @applet_output
     def pixel_classifier(self) -> Optional[VigraPixelClassifier[IlpFilter]]:
@@ -105,19 +130,19 @@ class PixelClassificationApplet(Applet):
         with self.lock:
             if not self._state.live_update:
                 # annotations or features changed, so classifier is stale
-                self._state = self._state.updated_with(classifier=None)
+                _ = self._update_state(classifier=None)
                 return CascadeOk()
 
             label_classes = self._in_label_classes()
             feature_extractors = self._in_feature_extractors()
             if sum(len(labels) for labels in label_classes.values()) == 0 or len(feature_extractors.filters) == 0:
-                self._state = self._state.updated_with(classifier=None)
+                _ = self._update_state(classifier=None)
                 return CascadeOk()
 
             classifier_future = self.executor.submit(
                 partial(Classifier.train, feature_extractors.filters), tuple(label_classes.values())
             )
-            previous_state = self._state = self._state.updated_with(classifier=classifier_future)
+            previous_state = self._update_state(classifier=classifier_future)
 
         def on_training_ready(classifier_future: Future["VigraPixelClassifier[IlpFilter] | ValueError"]):
             if classifier_future.cancelled():
@@ -136,11 +161,11 @@ class PixelClassificationApplet(Applet):
     def _set_classifier(self, user_prompt: UserPrompt, classifier: Union[Classifier, BaseException], generation: int) -> CascadeResult:
         with self.lock:
             if self._state.generation == generation:
-                self._state = self._state.updated_with(classifier=classifier)
+                _ = self._update_state(classifier=classifier)
         return CascadeOk()
 
     @cascade(refresh_self=True)
     def set_live_update(self, user_prompt: UserPrompt, live_update: bool) -> CascadeResult:
         with self.lock:
-            self._state = self._state.updated_with(classifier=self._state.classifier, live_update=live_update)
+            _ = self._update_state(classifier=self._state.classifier, live_update=live_update)
         return CascadeOk()
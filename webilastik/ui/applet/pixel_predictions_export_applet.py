@@ -31,7 +31,7 @@ from webilastik.server.rpc.dto import (
 )
 from webilastik.simple_segmenter import SimpleSegmenter
 from webilastik.ui.applet import AppletOutput, StatelesApplet, UserPrompt
-from webilastik.ui.applet.export_jobs import CreateDziPyramid, DownscaleDatasource, ExportJob, TransferFileJob, ZipDirectoryJob
+from webilastik.ui.applet.export_jobs import CreateDziPyramid, DownscaleDatasource, ExportJob, ZipDirectoryJob
 from webilastik.ui.applet.ws_applet import WsApplet
 from webilastik.ui.usage_error import UsageError
 from webilastik.ui.applet.brushing_applet import Label
@@ -232,7 +232,6 @@ class PixelClassificationExportApplet(StatelesApplet):
                 return UsageError("IO Error: Could not write to loca filesystem") #FIXME: this is prolly not a usage error
             scratch_fs_dzi_dir_path = PurePosixPath(f"/dzi")
             scratch_fs_xml_path = scratch_fs_dzi_dir_path / datasink.xml_path.as_posix().lstrip("/")
-            scratch_fs_dzip_path = PurePosixPath("/final_export/output.dzip")
 
             clean_export_on_success = True
             export_job_sink = PrecomputedChunksSink(
@@ -255,27 +254,18 @@ class PixelClassificationExportApplet(StatelesApplet):
                 on_succcess=lambda pyramid: self._launch_convert_to_dzi_job(
                     datasource=export_job_sink.to_datasource(),
                     pyramid=pyramid,
+                    # the archive is streamed straight into its final location, without a local copy of it
                     on_succcess=lambda _: self._launch_job(
                         ZipDirectoryJob(
                             name=f"Zipping results...",
                             input_fs=pyramid[0].filesystem,
                             input_directory=scratch_fs_xml_path.parent,
-                            output_fs=scratch_fs_result,
-                            output_path=scratch_fs_dzip_path,
+                            output_fs=target_fs,
+                            output_path=target_dzip_path,
                             delete_source=True,
                         ),
-                        on_success=lambda _: self._launch_job(
-                            TransferFileJob(
-                                name=f"Uploading results...",
-                                source_fs=scratch_fs_result,
-                                source_path=scratch_fs_dzip_path,
-                                target_fs=target_fs,
-                                target_path=target_dzip_path,
-                                result_sink=datasink,
-                            ),
-                            clean_on_success=False,
-                            on_success=lambda _: print(f"Should have transferred to {target_fs.geturl(target_dzip_path)}")
-                        ),
+                        clean_on_success=False,
+                        on_success=lambda _: print(f"Zipped results to {target_fs.geturl(target_dzip_path)}"),
                     ),
                 )
             )
@@ -1,12 +1,15 @@
 from pathlib import PurePosixPath
 from typing import Optional, List
 import asyncio
+import time
+import uuid
 
 import numpy as np
 from ndstructs.utils.json_serializable import JsonObject, JsonValue, ensureJsonBoolean
 from aiohttp import web
 from webilastik.classifiers.pixel_classifier import PixelClassifier, VigraPixelClassifier
 
+from webilastik.caching import CacheMiss
 from webilastik.datasource import DataRoi, FsDataSource
 from webilastik.datasource.precomputed_chunks_info import PrecomputedChunksInfo, PrecomputedChunksScale, RawEncoder
 from webilastik.server.rpc import MessageParsingError
@@ -16,7 +19,12 @@ from webilastik.ui.applet.pixel_classifier_applet import PixelClassificationAppl
 from webilastik.ui.applet.ws_applet import WsApplet
 from webilastik.ui.usage_error import UsageError
 from webilastik.ui.datasource import get_encoded_datasource_from_url
-from webilastik.server.session_allocator import uncachable_json_response
+from webilastik.server.session_allocator import (
+    etag_matches, immutable_response_headers, make_etag, not_modified_response, uncachable_json_response
+)
+
+# distinguishes ETags issued by different server processes, since generations restart from 0 with each of them
+_SERVER_INSTANCE_ID = uuid.uuid4().hex
 
 class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
     def _get_json_state(self) -> JsonValue:
@@ -71,9 +79,19 @@ class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
         )
 
     async def predictions_precomputed_chunks_info(self, request: web.Request) -> web.Response:
-        classifier = self._state.classifier
+        generation = int(request.match_info.get("generation")) # type: ignore
+        # the contents behind a generation's URL never change, so whatever the client has cached is still good
+        etag = make_etag(_SERVER_INSTANCE_ID, "info", generation, request.match_info.get("encoded_raw_data"))
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+
+        with self.lock:
+            classifier = self._state.classifier
+            current_generation = self._state.generation
         if not isinstance(classifier, PixelClassifier) :
             return web.json_response({"error": "Classifier is not ready yet"}, status=412)
+        if generation != current_generation:
+            return web.json_response({"error": "This classifier is stale"}, status=410)
 
         ds_result = get_encoded_datasource_from_url(match_info_key="encoded_raw_data", request=request)
         if isinstance(ds_result, Exception):
@@ -97,7 +115,7 @@ class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
             ])
         )
 
-        return uncachable_json_response(info.to_json_value(), status=200)
+        return web.json_response(info.to_json_value(), status=200, headers=immutable_response_headers(etag))
 
     async def precomputed_chunks_compute(self, request: web.Request) -> web.Response:
         generation = int(request.match_info.get("generation")) # type: ignore
@@ -108,6 +126,16 @@ class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
         zBegin = int(request.match_info.get("zBegin")) # type: ignore
         zEnd = int(request.match_info.get("zEnd")) # type: ignore
 
+        etag = make_etag(
+            _SERVER_INSTANCE_ID,
+            generation,
+            request.match_info.get("encoded_raw_data"),
+            (xBegin, xEnd, yBegin, yEnd, zBegin, zEnd),
+            request.query.get("format"),
+        )
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+
         ds_result = get_encoded_datasource_from_url(match_info_key="encoded_raw_data", request=request)
         if isinstance(ds_result, Exception):
             return uncachable_json_response(payload=f"Could not get data source from URL: {ds_result}", status=400)
@@ -122,10 +150,12 @@ class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
         if generation != self._state.generation:
             return web.json_response({"error": "This classifier is stale"}, status=410)
 
-        predictions = await asyncio.wrap_future(self.executor.submit(
-            classifier,
-            DataRoi(datasource, x=(xBegin, xEnd), y=(yBegin, yEnd), z=(zBegin, zEnd))
-        ))
+        roi = DataRoi(datasource, x=(xBegin, xEnd), y=(yBegin, yEnd), z=(zBegin, zEnd))
+        predictions = self.prediction_cache.get(generation, roi.content_key)
+        if isinstance(predictions, CacheMiss):
+            start = time.perf_counter()
+            predictions = await asyncio.wrap_future(self.executor.submit(classifier, roi))
+            self.prediction_cache.put(generation, roi.content_key, predictions, cost=time.perf_counter() - start)
 
         if "format" in request.query:
             requested_format = request.query["format"]
@@ -138,10 +168,7 @@ class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
             prediction_png_bytes = list(predictions.to_z_slice_pngs(class_colors))[0] #FIXME assumes shape.t=1 and shape.z=1
             return web.Response(
                 body=prediction_png_bytes.getbuffer(),
-                headers={
-                    "Cache-Control": "no-store, must-revalidate",
-                    "Expires": "0",
-                },
+                headers=immutable_response_headers(etag),
                 content_type="image/png",
             )
 
@@ -150,5 +177,6 @@ class WsPixelClassificationApplet(WsApplet, PixelClassificationApplet):
         resp = predictions.as_uint8().raw("xyzc").tobytes("F")
         return web.Response(
             body=resp,
+            headers=immutable_response_headers(etag),
             content_type="application/octet-stream",
         )
@@ -8,11 +8,12 @@ import json
 from aiohttp import web
 
 from webilastik.datasource import FsDataSource
-from webilastik.server.rpc.dto import parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_
+from webilastik.server.rpc.dto import parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_
 from webilastik.datasource import FsDataSource
 from webilastik.datasource.skimage_datasource import SkimageDataSource
 from webilastik.datasource.precomputed_chunks_datasource import PrecomputedChunksDataSource
 from webilastik.datasource.deep_zoom_datasource import DziLevelDataSource
+from webilastik.datasource.zarr_datasource import ZarrDataSource
 from webilastik.filesystem import FsFileNotFoundException, create_filesystem_from_url
 from webilastik.libebrains.user_token import AccessToken
 
@@ -25,11 +26,16 @@ def get_encoded_datasource_from_url(match_info_key: str, request: web.Request) -
     encoded_datasource = request.match_info.get(match_info_key)
     if not encoded_datasource:
         return Exception("Missing path segment: datasource=...")
-    decoded_datasource = b64decode(encoded_datasource, altchars=b'-_').decode('utf8')
-    datasource_json_value = json.loads(decoded_datasource)
-    datasource_dto = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto_endof_(datasource_json_value)
+    try:
+        decoded_datasource = b64decode(encoded_datasource, altchars=b'-_').decode('utf8')
+        datasource_json_value = json.loads(decoded_datasource)
+    except Exception as e:
+        return e
+    datasource_dto = parse_as_Union_of_PrecomputedChunksDataSourceDto0N5DataSourceDto0SkimageDataSourceDto0DziLevelDataSourceDto0ZarrDataSourceDto_endof_(datasource_json_value)
     if isinstance(datasource_dto, Exception):
         return datasource_dto
+    # the live datasource is looked up in the registry by its DTO, like everywhere else, so that the same datasource
+    # isn't registered twice under differently encoded keys
     return FsDataSource.try_from_message(datasource_dto)
 
 def try_get_datasources_from_url(
@@ -65,6 +71,12 @@ def try_get_datasources_from_url(
         return (skimage_datasource, )
     _ensure_none(skimage_datasource)
 
+    if ZarrDataSource.supports_url(url):
+        zarr_datasources_result = ZarrDataSource.try_open(fs=fs, path=path)
+        if isinstance(zarr_datasources_result, (tuple, Exception)):
+            return zarr_datasources_result
+        _ensure_none(zarr_datasources_result)
+
     precomp_chunks_resolution_result = PrecomputedChunksDataSource.get_resolution_from_url(url)
     if isinstance(precomp_chunks_resolution_result, Exception):
         return precomp_chunks_resolution_result
@@ -25,6 +25,7 @@ from webilastik.serialization.json_serialization import JsonObject, JsonValue, J
 from webilastik.classic_ilastik.ilp.pixel_classification_ilp import IlpPixelClassificationWorkflowGroup
 
 from webilastik.filesystem import FsFileNotFoundException, FsIoException, IFilesystem, create_filesystem_from_message, create_filesystem_from_url
+from webilastik.filesystem.async_fs import make_async_filesystem, transfer_file
 from webilastik.filesystem.os_fs import OsFs
 from webilastik.scheduling.job import PriorityExecutor
 from webilastik.serialization.json_serialization import convert_to_json_value, parse_json
@@ -100,9 +101,6 @@ class RPCPayload:
             "arguments": self.arguments,
         }
 
-def do_save_project(filesystem: IFilesystem, file_path: PurePosixPath, workflow_contents: bytes) -> "None | FsIoException":
-    return filesystem.create_file(path=file_path, contents=workflow_contents)
-
 class WebIlastik:
     @property
     def http_client_session(self) -> ClientSession:
@@ -203,7 +201,7 @@ class WebIlastik:
         fs_result = create_filesystem_from_message(params_result.fs)
         if isinstance(fs_result, Exception):
             return uncachable_json_response(RpcErrorDto(error="Could not create filesystem").to_json_value(), status=400)
-        items_result = fs_result.list_contents(path=PurePosixPath(params_result.path))
+        items_result = await make_async_filesystem(fs_result, self.http_client_session).list_contents(PurePosixPath(params_result.path))
         if isinstance(items_result, Exception):
             return uncachable_json_response(
                 RpcErrorDto(error=str(items_result)).to_json_value(),
@@ -399,12 +397,9 @@ class WebIlastik:
         if len(file_path.parts) == 0 or ".." in file_path.parts:
             return web.Response(status=400, text=f"Bad project file path: {file_path}")
 
-        saving_result = await asyncio.wrap_future(self.executor.submit(
-            do_save_project,
-            filesystem=fs_result,
-            file_path=file_path,
-            workflow_contents=self.workflow.get_ilp_contents()
-        ))
+        saving_result = await make_async_filesystem(fs_result, self.http_client_session).create_file(
+            path=file_path, contents=self.workflow.get_ilp_contents()
+        )
         if isinstance(saving_result, Exception):
             return uncachable_json_response(
                 RpcErrorDto(error=str(saving_result)).to_json_value(),
@@ -436,10 +431,12 @@ class WebIlastik:
                 return uncachable_json_response(RpcErrorDto(error="Could not donwload ilp: no osfs permission").to_json_value(), status=400)
             ilp_fs = ilp_fs_result
 
-            transfer_result = await asyncio.wrap_future(self.executor.submit(
-                ilp_fs.transfer_file,
-                source_fs=input_fs_result, source_path=file_path, target_path=ilp_path
-            ))
+            transfer_result = await transfer_file(
+                source_fs=make_async_filesystem(input_fs_result, self.http_client_session),
+                source_path=file_path,
+                target_fs=make_async_filesystem(ilp_fs, self.http_client_session),
+                target_path=ilp_path,
+            )
             if isinstance(transfer_result, Exception):
                 print(ilp_fs_result)
                 return uncachable_json_response(RpcErrorDto(error="Could not donwload ilp").to_json_value(), status=400)
@@ -1,10 +1,12 @@
 # pyright: strict
 
 from io import IOBase
-from typing import Literal, Mapping, Tuple
+from typing import AsyncIterator, Iterable, Literal, Mapping, Tuple
 import requests
 import sys
 
+import aiohttp
+import yarl
 from requests.models import CaseInsensitiveDict
 
 from webilastik.utility.url import Url
@@ -22,25 +24,25 @@ class ErrRequestCrashed(Exception):
 class ErrBadContentLength(Exception):
     pass
 
+def _make_range_header_value(offset: int, num_bytes: "int | None") -> str:
+    if offset < 0:
+        return f"bytes={offset}"
+    range_header_value = f"bytes={offset}-"
+    if num_bytes is not None:
+        range_end = max(offset, offset + num_bytes - 1)
+        range_header_value += str(range_end)
+    return range_header_value
+
 def request(
     session: requests.Session,
     method: Literal["get", "put", "post", "delete", "head"],
     url: Url,
-    data: "bytes | IOBase | None" = None,
+    data: "bytes | memoryview | Iterable[memoryview] | IOBase | None" = None,
     offset: int = 0,
     num_bytes: "int | None" = None,
     headers: "Mapping[str, str] | None" = None,
 ) -> "Tuple[bytes, CaseInsensitiveDict[str]] | ErrRequestCompletedAsFailure | ErrRequestCrashed":
-    range_header_value: str
-    if offset >= 0:
-        range_header_value = f"bytes={offset}-"
-        if num_bytes is not None:
-            range_end = max(offset, offset + num_bytes - 1)
-            range_header_value += str(range_end)
-    else:
-        range_header_value = f"bytes={offset}"
-
-    headers = {**(headers or {}), "Range": range_header_value}
+    headers = {**(headers or {}), "Range": _make_range_header_value(offset, num_bytes)}
 
     try:
         response = session.request(method=method, url=url.schemeless_raw, data=data, headers=headers)
@@ -65,4 +67,48 @@ def request_size(
     try:
         return int(response[1]["content-length"])
     except Exception:
-        return ErrBadContentLength()
\ No newline at end of file
+        return ErrBadContentLength()
+
+async def _stream_chunks(chunks: Iterable[memoryview]) -> AsyncIterator[memoryview]:
+    # aiohttp streams async iterables (chunked), but would try to encode a plain iterable as a form
+    for chunk in chunks:
+        yield chunk
+
+async def async_request(
+    session: aiohttp.ClientSession,
+    method: Literal["get", "put", "post", "delete", "head"],
+    url: Url,
+    data: "bytes | memoryview | Iterable[memoryview] | None" = None,
+    offset: int = 0,
+    num_bytes: "int | None" = None,
+    headers: "Mapping[str, str] | None" = None,
+) -> "Tuple[bytes, Mapping[str, str]] | ErrRequestCompletedAsFailure | ErrRequestCrashed":
+    """Same as 'request', but on an aiohttp session, so it can share its connection pool with the server"""
+    headers = {**(headers or {}), "Range": _make_range_header_value(offset, num_bytes)}
+    try:
+        # urls are already quoted (e.g. signed object urls), so aiohttp must not quote them again
+        request_url = yarl.URL(url.schemeless_raw, encoded=True)
+        body = data if data is None or isinstance(data, (bytes, memoryview)) else _stream_chunks(data)
+        async with session.request(method=method.upper(), url=request_url, data=body, headers=headers) as response:
+            if not response.ok:
+                return ErrRequestCompletedAsFailure(response.status)
+            content = await response.read()
+            if num_bytes is not None:
+                content = content[:num_bytes]
+            return (content, response.headers)
+    except Exception as e:
+        print(f"HTTP ERROR: {e}", file=sys.stderr)
+        return ErrRequestCrashed(e)
+
+async def async_request_size(
+    session: aiohttp.ClientSession,
+    url: Url,
+    headers: "Mapping[str, str] | None" = None,
+) -> "int | ErrRequestCompletedAsFailure | ErrRequestCrashed | ErrBadContentLength":
+    response = await async_request(session=session, method="head", url=url, headers=headers)
+    if isinstance(response, Exception):
+        return response
+    try:
+        return int(response[1]["content-length"])
+    except Exception:
+        return ErrBadContentLength()
@@ -10,7 +10,7 @@ from urllib.parse import parse_qs, urlencode, quote_plus, quote
 
 from webilastik.server.rpc import dto
 
-DataScheme = Literal["precomputed", "n5", "deepzoom"]
+DataScheme = Literal["precomputed", "n5", "deepzoom", "zarr"]
 Protocol = Literal["http", "https", "file", "memory"]
 
 class SearchQuotingMethod(enum.Enum):
@@ -30,7 +30,7 @@ class Url:
 
     datascheme_pattern: Final[str] = (
         "("
-            r"(?P<datascheme>precomputed|n5|deepzoom)" + r"(\+|://)"
+            r"(?P<datascheme>precomputed|n5|deepzoom|zarr)" + r"(\+|://)"
         ")?"
     )
     hostname_pattern: Final[str] = r"(?P<hostname>[\w\-\.]+)"
@@ -67,7 +67,7 @@ class Url:
         if match is None:
             return None
         datascheme = match.group("datascheme")
-        if datascheme != "precomputed" and datascheme != "n5" and datascheme != "deepzoom":
+        if datascheme != "precomputed" and datascheme != "n5" and datascheme != "deepzoom" and datascheme != "zarr":
             return ValueError(f"unexpected datascheme: {datascheme}")
         return Url(
             datascheme=datascheme,
@@ -83,7 +83,7 @@ class Url:
         if match is None:
             return None
         datascheme = match.group("datascheme")
-        if datascheme is not None and datascheme != "precomputed" and datascheme != "n5" and datascheme != "deepzoom":
+        if datascheme is not None and datascheme != "precomputed" and datascheme != "n5" and datascheme != "deepzoom" and datascheme != "zarr":
             return RuntimeError(f"Bug: unexpected datascheme: {datascheme}")
         protocol = match.group("protocol")
         if protocol != "http" and protocol != "https":